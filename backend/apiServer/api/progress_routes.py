@@ -2,13 +2,12 @@
 Progress streaming routes for real-time execution updates
 """
 
-import asyncio
 import json
 import logging
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from services.sse import progress_sse_manager, ProgressEvent
+from services.sse import progress_sse_manager
 from shared.queue.progress_event_queue import get_progress_event_queue
 
 logger = logging.getLogger("progress-routes")
@@ -67,27 +66,26 @@ async def stream_progress(session_id: str, request: Request):
             except Exception as e:
                 logger.error(f"❌ Error replaying missed events for session {session_id}: {e}")
 
-        # Subscribe to new events
-        queue: asyncio.Queue = asyncio.Queue()
-
-        async def on_progress(event: ProgressEvent):
-            await queue.put(event)
-
-        unsubscribe = progress_sse_manager.subscribe(session_id, on_progress)
+        # Subscribe to new events (bounded per-connection queue; a slow client
+        # only drops its own intermediate progress lines)
+        subscription = progress_sse_manager.subscribe(session_id)
 
         try:
             while True:
-                try:
-                    # Wait for new events with 5s timeout for heartbeat
-                    event = await asyncio.wait_for(queue.get(), timeout=5)
+                # Wait for new events with 5s timeout for heartbeat
+                event = await subscription.get(timeout=5)
+                if subscription.closed:
+                    # Cleared via DELETE /api/progress/{session_id}; end the stream
+                    break
+                if event is not None:
                     yield event.to_sse()
-                except asyncio.TimeoutError:
+                else:
                     # Send heartbeat every 5 seconds of silence
                     yield "data: {\"type\": \"heartbeat\"}\n\n"
         except GeneratorExit:
             pass
         finally:
-            unsubscribe()
+            subscription.close()
 
     return StreamingResponse(
         event_generator(),
@@ -100,6 +98,14 @@ async def stream_progress(session_id: str, request: Request):
     )
 
 
+@router.get("/{session_id}/stats")
+async def get_progress_stats(session_id: str):
+    """
+    Get queued/dropped/delivered counters for a session's live SSE connections
+    """
+    return progress_sse_manager.get_stats(session_id)
+
+
 @router.get("/{session_id}/events")
 async def get_progress_events(session_id: str):
     """
@@ -116,7 +122,7 @@ async def get_progress_events(session_id: str):
 @router.delete("/{session_id}")
 async def clear_progress(session_id: str):
     """
-    Clear all progress events for a session
+    Clear all progress events for a session (closes its live subscriptions)
     """
     progress_sse_manager.clear(session_id)
     return {"success": True, "session_id": session_id, "message": "Progress cleared"}
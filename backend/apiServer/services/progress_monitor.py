@@ -3,13 +3,30 @@ Progress Monitor Service
 
 Monitors progress events from the queue and broadcasts them via SSE.
 This bridges the gap between queue-based worker communication and SSE client updates.
+
+Events are delivered via a MongoDB change stream on ``progress_events`` so they
+reach SSE subscribers as soon as they are inserted. The stream's resume token is
+persisted at most once per save interval (and when the stream closes), so a
+restarted API server resumes close to where it stopped and re-broadcasts at
+most one interval of events. When change streams are unavailable (standalone mongod, e.g. in tests)
+the monitor falls back to polling by timestamp cursor.
+
+Configuration:
+    PROGRESS_MONITOR_MODE           auto | change_stream | poll (default: auto)
+    PROGRESS_MONITOR_ID             Resume token key for this API server (default: hostname)
+    PROGRESS_MONITOR_POLL_INTERVAL  Seconds between polls in fallback mode (default: 0.5)
+    PROGRESS_MONITOR_TOKEN_SAVE_INTERVAL  Seconds between resume token writes (default: 5)
 """
 
 import asyncio
 import logging
+import os
+import socket
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Set
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
 from services.sse import (
     progress_sse_manager, ProgressLevel,
     _sse_progress_info
@@ -17,6 +34,17 @@ from services.sse import (
 
 logger = logging.getLogger("progress-monitor")
 
+# "$changeStream is only supported on replica sets"
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573}
+# Resume token no longer usable (oplog rolled over / invalid token)
+RESUME_TOKEN_INVALID_CODES = {260, 280, 286}
+
+POLL_BATCH_SIZE = 50
+
+
+class ChangeStreamUnavailable(Exception):
+    """Raised when the MongoDB deployment does not support change streams"""
+
 
 class ProgressMonitorService:
     """Monitors progress events from MongoDB and broadcasts via SSE"""
@@ -24,13 +52,27 @@ class ProgressMonitorService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.progress_events_collection: AsyncIOMotorCollection = db["progress_events"]
+        self.state_collection: AsyncIOMotorCollection = db["progress_monitor_state"]
         self.running = False
         self.monitor_task: Optional[asyncio.Task] = None
+        self.mode = os.getenv("PROGRESS_MONITOR_MODE", "auto").lower()
+        self.monitor_id = os.getenv("PROGRESS_MONITOR_ID", socket.gethostname())
+        self.poll_interval = float(os.getenv("PROGRESS_MONITOR_POLL_INTERVAL", "0.5"))
+        self.token_save_interval = float(os.getenv("PROGRESS_MONITOR_TOKEN_SAVE_INTERVAL", "5"))
+        # "change_stream" or "poll" once the loop has started
+        self.active_mode: Optional[str] = None
+        self.events_delivered = 0
         # Cursor for event streaming — events are NEVER marked processed.
         # The MongoDB TTL index handles cleanup. This cursor advances so we
         # never re-broadcast the same event, and events remain queryable for
         # Phase 3 SSE replay (Fix #1).
         self._cursor: Optional[datetime] = None
+        # Event ids broadcast by the catch-up query, skipped if the stream repeats them
+        self._caught_up_ids: Set[Any] = set()
+        # Latest resume token not yet written to MongoDB
+        self._pending_token: Optional[Dict[str, Any]] = None
+        self._token_saved_at = 0.0
+        self.token_saves = 0
         
     async def start(self):
         """Start monitoring progress events"""
@@ -52,9 +94,20 @@ class ProgressMonitorService:
             except asyncio.CancelledError:
                 pass
         logger.info("✅ Progress monitor stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitor delivery mode and counters"""
+        return {
+            "mode": self.active_mode,
+            "configured_mode": self.mode,
+            "monitor_id": self.monitor_id,
+            "events_delivered": self.events_delivered,
+            "token_saves": self.token_saves,
+            "cursor": self._cursor.isoformat() if self._cursor else None,
+        }
         
     async def _monitor_loop(self):
-        """Main monitoring loop"""
+        """Main monitoring loop: change stream, or polling fallback"""
         try:
             logger.info("🔄 Progress monitor loop started")
             # On startup look back 60 seconds to catch events sent just before
@@ -63,40 +116,154 @@ class ProgressMonitorService:
             self._cursor = datetime.utcnow() - timedelta(seconds=60)
             logger.info(f"📡 Progress monitor cursor initialised to {self._cursor.isoformat()}")
 
-            while self.running:
+            if self.mode != "poll":
                 try:
-                    # Fetch events newer than our cursor (events are NEVER marked
-                    # processed — TTL index handles cleanup; cursor prevents re-broadcast)
-                    events = await self.progress_events_collection.find({
-                        "timestamp": {"$gt": self._cursor}
-                    }).sort("timestamp", 1).limit(50).to_list(50)
-
-                    if events:
-                        logger.info(f"📊 Found {len(events)} new progress events since cursor")
+                    await self._change_stream_loop()
+                    return
+                except ChangeStreamUnavailable as e:
+                    if self.mode == "change_stream":
+                        raise
+                    logger.warning(f"⚠️ Change streams unavailable ({e}), falling back to polling")
 
-                    for event in events:
-                        await self._process_event(event)
-                        # Advance cursor past this event
-                        event_ts = event.get("timestamp")
-                        if isinstance(event_ts, datetime) and event_ts > self._cursor:
-                            self._cursor = event_ts
-
-                    # Sleep for a short interval before checking again
-                    await asyncio.sleep(0.5)  # Check every 500ms
-
-                except Exception as e:
-                    logger.error(f"❌ Error in progress monitor loop: {e}")
-                    await asyncio.sleep(5)  # Wait longer on error
+            await self._poll_loop()
 
         except asyncio.CancelledError:
             logger.info("Progress monitor loop cancelled")
             raise
+
+    async def _change_stream_loop(self):
+        """Push delivery: broadcast inserted events as the change stream yields them"""
+        while self.running:
+            resume_token = await self._load_resume_token()
+            try:
+                async with self.progress_events_collection.watch(
+                    [{"$match": {"operationType": "insert"}}],
+                    resume_after=resume_token,
+                    max_await_time_ms=1000,
+                ) as stream:
+                    self.active_mode = "change_stream"
+                    if resume_token is None:
+                        logger.info("📡 Progress monitor change stream opened (no resume token, catching up)")
+                        # Stream is already open, so nothing inserted from here on is missed
+                        await self._catch_up()
+                    else:
+                        logger.info("📡 Progress monitor change stream resumed from persisted token")
+
+                    try:
+                        while self.running and stream.alive:
+                            change = await stream.try_next()
+                            if change is not None:
+                                event = change.get("fullDocument")
+                                if event and event.get("_id") not in self._caught_up_ids:
+                                    await self._deliver(event)
+                                self._pending_token = stream.resume_token
+                            # Idle iterations (every max_await_time_ms) flush a due token too
+                            if time.monotonic() - self._token_saved_at >= self.token_save_interval:
+                                await self._flush_resume_token()
+                    finally:
+                        await self._flush_resume_token()
+
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    raise ChangeStreamUnavailable(str(e))
+                if e.code in RESUME_TOKEN_INVALID_CODES:
+                    logger.warning(f"⚠️ Progress monitor resume token unusable ({e}), restarting from cursor")
+                    self._pending_token = None
+                    await self._clear_resume_token()
+                    continue
+                logger.error(f"❌ Progress monitor change stream failed: {e}")
+                await asyncio.sleep(5)
+            except PyMongoError as e:
+                logger.error(f"❌ Progress monitor change stream error: {e}")
+                await asyncio.sleep(5)
+
+    async def _catch_up(self):
+        """Broadcast events newer than the cursor that were inserted before the stream opened"""
+        self._caught_up_ids.clear()
+        events = await self.progress_events_collection.find({
+            "timestamp": {"$gt": self._cursor}
+        }).sort("timestamp", 1).to_list(None)
+
+        if events:
+            logger.info(f"📊 Catching up {len(events)} progress events since cursor")
+        for event in events:
+            self._caught_up_ids.add(event.get("_id"))
+            await self._deliver(event)
+
+    async def _poll_loop(self):
+        """Fallback delivery: poll for events newer than the cursor"""
+        self.active_mode = "poll"
+        logger.info(f"🔄 Progress monitor polling every {self.poll_interval}s")
+        while self.running:
+            try:
+                # Fetch events newer than our cursor (events are NEVER marked
+                # processed — TTL index handles cleanup; cursor prevents re-broadcast)
+                events = await self.progress_events_collection.find({
+                    "timestamp": {"$gt": self._cursor}
+                }).sort("timestamp", 1).limit(POLL_BATCH_SIZE).to_list(POLL_BATCH_SIZE)
+
+                if events:
+                    logger.info(f"📊 Found {len(events)} new progress events since cursor")
+
+                for event in events:
+                    await self._deliver(event)
+
+                # A full batch means a burst is still pending — fetch again right away
+                if len(events) < POLL_BATCH_SIZE:
+                    await asyncio.sleep(self.poll_interval)
+
+            except Exception as e:
+                logger.error(f"❌ Error in progress monitor loop: {e}")
+                await asyncio.sleep(5)  # Wait longer on error
+
+    async def _deliver(self, event: dict):
+        """Broadcast an event and advance the cursor past it"""
+        await self._process_event(event)
+        self.events_delivered += 1
+        event_ts = event.get("timestamp")
+        if isinstance(event_ts, datetime) and event_ts > self._cursor:
+            self._cursor = event_ts
+
+    async def _load_resume_token(self) -> Optional[Dict[str, Any]]:
+        """Load this monitor's persisted change stream resume token"""
+        try:
+            state = await self.state_collection.find_one({"_id": self.monitor_id})
+            return state.get("resume_token") if state else None
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Failed to load progress monitor resume token: {e}")
+            return None
+
+    async def _flush_resume_token(self):
+        """Persist the latest resume token so a restart continues after the last delivered event"""
+        token = self._pending_token
+        if token is None:
+            return
+        self._pending_token = None
+        self._token_saved_at = time.monotonic()
+        try:
+            await self.state_collection.update_one(
+                {"_id": self.monitor_id},
+                {"$set": {"resume_token": token, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+            self.token_saves += 1
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Failed to persist progress monitor resume token: {e}")
+
+    async def _clear_resume_token(self):
+        try:
+            await self.state_collection.update_one(
+                {"_id": self.monitor_id},
+                {"$unset": {"resume_token": ""}}
+            )
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Failed to clear progress monitor resume token: {e}")
             
     async def _process_event(self, event: dict):
         """Broadcast a single progress event via SSE.
 
         NOTE: Events are intentionally NOT marked as processed here.
-        The cursor in _monitor_loop prevents re-broadcasting.
+        The cursor (and change stream resume token) prevents re-broadcasting.
         Events stay in MongoDB until the TTL index removes them, which
         allows Phase 3 SSE replay (Fix #1) to query missed events.
         """
@@ -128,7 +295,7 @@ class ProgressMonitorService:
 
         except Exception as e:
             logger.error(f"❌ Failed to broadcast progress event: {e}")
-            # Do NOT swallow cursor advancement — handled in _monitor_loop
+            # Do NOT swallow cursor advancement — handled in _deliver
             
     async def _handle_execution_status(self, session_id: str, event: dict):
         """Handle execution status update events - SIMPLIFIED to use _sse_progress_info"""
@@ -10,6 +10,7 @@ For API routes and business logic, use shared.services.progress_service instead.
 from .progress_sse import (
     progress_sse_manager,
     ProgressEvent,
+    ProgressSubscription,
     ProgressLevel,
     ExecutionStatus,
     # Internal SSE functions (prefixed with _sse_)
@@ -22,6 +23,7 @@ from .progress_sse import (
 __all__ = [
     'progress_sse_manager',
     'ProgressEvent',
+    'ProgressSubscription',
     'ProgressLevel', 
     'ExecutionStatus',
     '_sse_emit_progress',
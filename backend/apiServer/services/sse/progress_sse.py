@@ -9,13 +9,19 @@ They should ONLY be used by:
 DO NOT use these in API routes or business logic - use shared.services.progress_service instead.
 """
 
+import asyncio
 import logging
-from typing import Dict, Optional
+import os
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Set
 from datetime import datetime
 from enum import Enum
 
 logger = logging.getLogger("sse-progress")
 
+# Knock events the frontend acts on; never evicted in favour of plain progress
+PRESERVED_EVENT_TYPES = {"message_ready", "execution_status", "analysis_complete"}
+
 
 class ProgressLevel(str, Enum):
     INFO = "info"
@@ -76,14 +82,85 @@ class ProgressEvent:
             return f'data: {{"error": "Serialization failed", "message": "{str(e)}"}}\n\n'
 
 
+class ProgressSubscription:
+    """A single SSE connection's bounded event queue.
+
+    ``offer`` never blocks: when the queue is full the oldest droppable event
+    (plain info/warning progress) is evicted to make room, so a slow browser
+    connection only loses intermediate progress lines for itself. Success/error
+    events and passthrough knocks (e.g. message_ready) are kept unless the
+    queue holds nothing else.
+    """
+
+    def __init__(self, session_id: str, maxsize: int, on_close: Callable[["ProgressSubscription"], None]):
+        self.session_id = session_id
+        self.maxsize = maxsize
+        self._events: Deque[ProgressEvent] = deque()
+        self._ready = asyncio.Event()
+        self._on_close = on_close
+        self.closed = False
+        self.queued = 0
+        self.dropped = 0
+        self.delivered = 0
+
+    @staticmethod
+    def _droppable(event: ProgressEvent) -> bool:
+        if event.level in (ProgressLevel.SUCCESS, ProgressLevel.ERROR):
+            return False
+        return event.details.get("type") not in PRESERVED_EVENT_TYPES
+
+    def offer(self, event: ProgressEvent) -> None:
+        """Queue an event without blocking, evicting an old one if full"""
+        if self.closed:
+            return
+        if len(self._events) >= self.maxsize:
+            victim = next((e for e in self._events if self._droppable(e)), self._events[0])
+            self._events.remove(victim)
+            self.dropped += 1
+        self._events.append(event)
+        self.queued += 1
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ProgressEvent]:
+        """Next event, or None if nothing arrives within timeout or the subscription is closed"""
+        if not self._events and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.closed or not self._events:
+            return None
+        event = self._events.popleft()
+        self.delivered += 1
+        return event
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    def close(self) -> None:
+        """Detach from the manager; safe to call more than once"""
+        if not self.closed:
+            self.closed = True
+            self._events.clear()
+            # Wake a pending get() so the stream loop sees the close
+            self._ready.set()
+            self._on_close(self)
+
+
 class ProgressStreamManager:
-    """Manages progress streams for different sessions"""
+    """Fan-out broker for progress streams of different sessions.
 
-    def __init__(self):
-        import asyncio
-        from typing import List, Callable
-        self.subscribers: Dict[str, List[Callable]] = {}
-        self.locks: Dict[str, asyncio.Lock] = {}
+    Every SSE connection owns a ProgressSubscription; ``emit`` hands the event
+    to each subscription's bounded queue and returns immediately, so delivery
+    never waits on a client. Session state only exists while a session has
+    subscribers; counters of closed subscriptions are folded into totals.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or int(os.getenv("SSE_SUBSCRIBER_QUEUE_SIZE", "100"))
+        self.subscribers: Dict[str, Set[ProgressSubscription]] = {}
+        self.totals = {"queued": 0, "dropped": 0, "delivered": 0, "events_emitted": 0}
 
     async def emit(
         self,
@@ -93,57 +170,70 @@ class ProgressStreamManager:
         details: Optional[Dict] = None,
     ) -> ProgressEvent:
         """Emit a progress event to active subscribers only (fire and forget)"""
-        import asyncio
-        
-        if session_id not in self.locks:
-            self.locks[session_id] = asyncio.Lock()
-
-        async with self.locks[session_id]:
-            event = ProgressEvent(
-                level=level,
-                message=message,
-                details=details,
-            )
-
-            # Notify only active subscribers (no history storage)
-            if session_id in self.subscribers:
-                for callback in self.subscribers[session_id]:
-                    try:
-                        await callback(event)
-                    except Exception as e:
-                        logger.error(f"Error calling progress subscriber: {e}")
-
-            logger.info(f"📊 SSE event emitted: {message} ({session_id}) to {len(self.subscribers.get(session_id, []))} subscribers")
-            return event
-
-    def subscribe(
-        self, session_id: str, callback
-    ):
-        """Subscribe to progress events for a session"""
-        if session_id not in self.subscribers:
-            self.subscribers[session_id] = []
-
-        self.subscribers[session_id].append(callback)
+        event = ProgressEvent(
+            level=level,
+            message=message,
+            details=details,
+        )
+
+        # Notify only active subscribers (no history storage)
+        subscriptions = self.subscribers.get(session_id, ())
+        for subscription in subscriptions:
+            subscription.offer(event)
+        self.totals["events_emitted"] += 1
+
+        logger.info(f"📊 SSE event emitted: {message} ({session_id}) to {len(subscriptions)} subscribers")
+        return event
+
+    def subscribe(self, session_id: str) -> ProgressSubscription:
+        """Open a bounded event queue for one SSE connection; close() it when done"""
+        subscription = ProgressSubscription(session_id, self.queue_size, self._unsubscribe)
+        self.subscribers.setdefault(session_id, set()).add(subscription)
         logger.info(f"📡 New SSE subscriber for session {session_id}. Total: {len(self.subscribers[session_id])}")
-
-        def unsubscribe():
-            if session_id in self.subscribers:
-                try:
-                    self.subscribers[session_id].remove(callback)
-                    logger.info(f"📡 SSE subscriber removed for session {session_id}. Remaining: {len(self.subscribers[session_id])}")
-                except ValueError:
-                    logger.warning(f"📡 Attempted to remove non-existent subscriber for session {session_id}")
-
-        return unsubscribe
+        return subscription
+
+    def _unsubscribe(self, subscription: ProgressSubscription):
+        session_id = subscription.session_id
+        subscriptions = self.subscribers.get(session_id)
+        if not subscriptions or subscription not in subscriptions:
+            logger.warning(f"📡 Attempted to remove non-existent subscriber for session {session_id}")
+            return
+        subscriptions.discard(subscription)
+        for key in ("queued", "dropped", "delivered"):
+            self.totals[key] += getattr(subscription, key)
+        if not subscriptions:
+            # Last connection gone — drop all per-session state
+            del self.subscribers[session_id]
+        logger.info(f"📡 SSE subscriber removed for session {session_id}. Remaining: {len(subscriptions)}")
+
+    def get_stats(self, session_id: Optional[str] = None) -> Dict:
+        """Queued/dropped/delivered counters for one session's live subscribers, or overall"""
+        if session_id is not None:
+            subscriptions = self.subscribers.get(session_id, set())
+            return {
+                "session_id": session_id,
+                "subscribers": len(subscriptions),
+                "queued": sum(s.queued for s in subscriptions),
+                "dropped": sum(s.dropped for s in subscriptions),
+                "delivered": sum(s.delivered for s in subscriptions),
+                "pending": sum(s.pending() for s in subscriptions),
+            }
+        live = [s for subscriptions in self.subscribers.values() for s in subscriptions]
+        return {
+            "sessions": len(self.subscribers),
+            "subscribers": len(live),
+            "events_emitted": self.totals["events_emitted"],
+            **{key: self.totals[key] + sum(getattr(s, key) for s in live) for key in ("queued", "dropped", "delivered")},
+        }
 
     def get_events(self, session_id: str):
         """Get all events for a session (returns empty - no history stored)"""
         return []
 
     def clear(self, session_id: str):
-        """Clear subscribers and locks for a session"""
-        self.subscribers.pop(session_id, None)
-        self.locks.pop(session_id, None)
+        """Close all subscriptions for a session"""
+        for subscription in list(self.subscribers.get(session_id, ())):
+            subscription.close()
 
 
 # Global SSE manager instance
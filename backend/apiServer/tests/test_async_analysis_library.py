@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking analysis library facade
+
+Tests:
+1. Searches run off the event loop
+2. Identical concurrent searches share one embedding + ChromaDB query
+3. Library calls are bounded by the facade's thread pool
+4. save_analyses stores a batch with one add and reports invalid records
+
+Uses an in-process fake ChromaDB collection with a fixed query latency; no
+ChromaDB server or Ollama needed.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.analyze.search import library as library_module
+from shared.analyze.search.library import AnalysisLibrary, AsyncAnalysisLibrary
+
+# Simulated embedding + query latency (seconds)
+QUERY_LATENCY = 0.1
+
+
+class FakeCollection:
+    def __init__(self):
+        self.queries: List[str] = []
+        self.adds: List[List[str]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def query(self, query_texts, n_results, include):
+        with self._lock:
+            self.queries.append(query_texts[0])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(QUERY_LATENCY)
+        with self._lock:
+            self.active -= 1
+        return {
+            "ids": [["a1"]],
+            "distances": [[0.1]],
+            "metadatas": [[{"id": "a1", "question": query_texts[0], "description": "test"}]],
+        }
+
+    def add(self, documents, metadatas, ids):
+        self.adds.append(list(ids))
+
+    def count(self):
+        return sum(len(ids) for ids in self.adds)
+
+
+def build_library() -> AnalysisLibrary:
+    # Skip __init__, which connects to ChromaDB
+    library = AnalysisLibrary.__new__(AnalysisLibrary)
+    library.collection = FakeCollection()
+    library.embedding_cache = None
+    library.local_index = None
+    return library
+
+
+async def test_search_does_not_block_loop():
+    """Test 1: the event loop keeps running during a search"""
+    print("\n✓ Test 1: Search Runs Off the Event Loop")
+
+    async_library = AsyncAnalysisLibrary(build_library(), max_concurrency=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    result = await async_library.search_similar("Volatility of AAPL", top_k=5)
+    task.cancel()
+
+    assert result["success"] and result["analyses"][0]["question"] == "Volatility of AAPL", result
+    assert ticks >= 5, f"loop ticked {ticks} times"
+    print(f"  ✓ Loop ticked {ticks} times during one search")
+
+
+async def test_identical_searches_coalesce():
+    """Test 2: concurrent identical queries share one ChromaDB query"""
+    print("\n✓ Test 2: Identical Concurrent Searches Coalesce")
+
+    library = build_library()
+    async_library = AsyncAnalysisLibrary(library, max_concurrency=4)
+    results = await asyncio.gather(*[async_library.search_similar("SPY drawdown", top_k=5) for _ in range(10)])
+
+    assert library.collection.queries == ["SPY drawdown"], library.collection.queries
+    assert async_library.coalesced_searches == 9
+    assert all(r == results[0] for r in results)
+    # Callers do not share result containers
+    results[0]["analyses"][0]["question"] = "changed"
+    assert results[1]["analyses"][0]["question"] == "SPY drawdown"
+
+    # Different parameters are separate searches; finished searches are not cached
+    await asyncio.gather(async_library.search_similar("SPY drawdown", top_k=3),
+                         async_library.search_similar("SPY drawdown", top_k=5))
+    assert len(library.collection.queries) == 3, library.collection.queries
+    print("  ✓ 10 callers, 1 query")
+
+
+async def test_bounded_concurrency():
+    """Test 3: no more than max_concurrency library calls at once"""
+    print("\n✓ Test 3: Bounded Concurrency")
+
+    library = build_library()
+    async_library = AsyncAnalysisLibrary(library, max_concurrency=2)
+    start = time.perf_counter()
+    await asyncio.gather(*[async_library.search_similar(f"query {i}") for i in range(6)])
+    elapsed = time.perf_counter() - start
+
+    assert library.collection.max_active == 2, library.collection.max_active
+    assert elapsed >= 3 * QUERY_LATENCY * 0.9, f"took {elapsed:.3f}s"
+    print(f"  ✓ 6 queries on 2 workers in {elapsed:.3f}s")
+
+
+async def test_batch_save():
+    """Test 4: one add per batch; invalid records reported, the rest saved"""
+    print("\n✓ Test 4: Batched save_analyses")
+
+    library = build_library()
+    async_library = AsyncAnalysisLibrary(library, max_concurrency=2)
+    records = [
+        {"analysis_id": f"a{i}", "question": f"Question {i}", "metadata": {"description": f"Description {i}"}}
+        for i in range(5)
+    ]
+    records.append({"analysis_id": "bad", "question": "No description"})
+
+    result = await async_library.save_analyses(records)
+    assert result["success"], result
+    assert result["saved"] == [f"a{i}" for i in range(5)], result
+    assert [item["analysis_id"] for item in result["failed"]] == ["bad"], result
+    assert library.collection.adds == [[f"a{i}" for i in range(5)]], library.collection.adds
+
+    original_batch_size = library_module.SAVE_BATCH_SIZE
+    library_module.SAVE_BATCH_SIZE = 2
+    try:
+        library.collection.adds.clear()
+        result = library.save_analyses(records[:5])
+    finally:
+        library_module.SAVE_BATCH_SIZE = original_batch_size
+    assert [len(ids) for ids in library.collection.adds] == [2, 2, 1], library.collection.adds
+
+    single = await async_library.save_analysis("a9", "Question 9", {"description": "Description 9"})
+    assert single["success"], single
+    missing = library.save_analysis("a10", "Question 10")
+    assert not missing["success"] and "description" in missing["error"], missing
+    print("  ✓ Batch saved with one add; invalid record reported")
+
+
+async def run_all_tests():
+    """Run all async analysis library tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Async Analysis Library Tests")
+    print("="*60)
+
+    tests = [
+        ("Non-blocking Search", test_search_does_not_block_loop),
+        ("Search Coalescing", test_identical_searches_coalesce),
+        ("Bounded Concurrency", test_bounded_concurrency),
+        ("Batch Save", test_batch_save),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tests for speculative stage execution in ContextAwareSearch
+
+Tests:
+1. Standalone queries overlap validation and search with classification
+2. Contextual queries cancel the speculative work and search the expanded query
+3. A validator-enhanced query discards the speculative search
+4. Serial and speculative modes return the same results
+5. A speculative search still running when discarded is reported as discarded
+6. Searches share the process-wide async library facade unless one is injected
+
+Uses in-process fakes with fixed latencies for the classifier, expander,
+validator, meaningless check and vector search; no LLM or ChromaDB needed.
+"""
+
+import os
+import sys
+import time
+import asyncio
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.analyze.dialogue.search import context_aware
+from shared.analyze.dialogue.search.context_aware import ContextAwareSearch, format_stage_timings
+from shared.analyze.search.library import AsyncAnalysisLibrary
+
+# Simulated stage latencies (seconds)
+LLM_LATENCY = 0.2
+SEARCH_LATENCY = 0.05
+
+
+class FakeClassifier:
+    def __init__(self, is_contextual: bool):
+        self.is_contextual = is_contextual
+
+    async def classify(self, query, conversation):
+        await asyncio.sleep(LLM_LATENCY)
+        return {"success": True, "is_contextual": self.is_contextual, "reason": "test"}
+
+
+class FakeExpander:
+    async def expand_query(self, query, conversation):
+        await asyncio.sleep(LLM_LATENCY)
+        return {"success": True, "expanded_query": f"{query} for SPY over the last year", "confidence": 0.95}
+
+
+class FakeValidator:
+    def __init__(self, enhance: bool = False):
+        self.enhance = enhance
+        self.calls: List[str] = []
+        self.cancelled = 0
+
+    async def validate(self, query: str):
+        self.calls.append(query)
+        try:
+            await asyncio.sleep(LLM_LATENCY)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        enhanced = f"{query} (daily data, 1 year)" if self.enhance else None
+        return {"success": True, "complete": True, "missing": [], "enhanced_query": enhanced}
+
+
+class FakeLibrary:
+    def __init__(self, latency: float = SEARCH_LATENCY):
+        self.latency = latency
+        self.queries: List[str] = []
+
+    def search_similar(self, query: str, top_k: int = 5, similarity_threshold: float = 0.3) -> Dict[str, Any]:
+        self.queries.append(query)
+        time.sleep(self.latency)
+        return {"success": True, "analyses": [{"question": query, "similarity": 0.9}], "found_similar": True}
+
+
+async def no_progress(*args, **kwargs):
+    return None
+
+
+def build_search(is_contextual: bool, speculative: bool, enhance: bool = False,
+                 search_latency: float = SEARCH_LATENCY) -> ContextAwareSearch:
+    search = ContextAwareSearch(
+        analysis_library=FakeLibrary(search_latency),
+        classifier=FakeClassifier(is_contextual),
+        expander=FakeExpander(),
+        validator=FakeValidator(enhance),
+        speculative=speculative
+    )
+
+    async def is_meaningless(query: str) -> bool:
+        await asyncio.sleep(LLM_LATENCY)
+        return False
+
+    search._is_meaningless_query = is_meaningless
+    return search
+
+
+async def timed_search(search: ContextAwareSearch, query: str):
+    start = time.perf_counter()
+    result = await search.search_with_context(query, session_id="test-session")
+    return result, time.perf_counter() - start
+
+
+async def test_standalone_overlaps_classification():
+    """Test 1: standalone critical path is one LLM latency plus nothing serial"""
+    print("\n✓ Test 1: Standalone Stages Overlap Classification")
+
+    search = build_search(is_contextual=False, speculative=True)
+    result, elapsed = await timed_search(search, "Volatility of AAPL last year")
+
+    assert result["type"] == "search_result", result
+    assert search.analysis_library.queries == ["Volatility of AAPL last year"]
+    stages = result["stage_timings"]["stages"]
+    for name in ("meaningless_check", "validate", "search"):
+        assert stages[f"{name}:speculative"]["status"] == "used", stages
+    # Serial would be classify + meaningless + validate + search
+    assert elapsed < 2 * LLM_LATENCY, f"took {elapsed:.3f}s"
+    print(f"  ✓ {elapsed:.3f}s ({format_stage_timings(result['stage_timings'])})")
+
+
+async def test_contextual_discards_speculation():
+    """Test 2: contextual queries cancel speculative work and search the expansion"""
+    print("\n✓ Test 2: Contextual Query Discards Speculation")
+
+    search = build_search(is_contextual=True, speculative=True)
+    result, elapsed = await timed_search(search, "what about QQQ")
+
+    assert result["type"] == "search_result", result
+    assert result["expanded_query"] == "what about QQQ for SPY over the last year"
+    assert search.validator.calls == ["what about QQQ", "what about QQQ for SPY over the last year"]
+    assert search.validator.cancelled == 1
+    assert search.analysis_library.queries[-1] == result["expanded_query"]
+    stages = result["stage_timings"]["stages"]
+    assert stages["validate:speculative"]["status"] == "cancelled", stages
+    assert stages["validate"]["status"] == "done", stages
+    print(f"  ✓ {elapsed:.3f}s ({format_stage_timings(result['stage_timings'])})")
+
+
+async def test_enhanced_query_discards_search():
+    """Test 3: the speculative search is only used for the unchanged query"""
+    print("\n✓ Test 3: Enhanced Query Re-runs Search")
+
+    search = build_search(is_contextual=False, speculative=True, enhance=True)
+    result, _ = await timed_search(search, "AAPL momentum")
+
+    assert result["expanded_query"] == "AAPL momentum (daily data, 1 year)"
+    assert search.analysis_library.queries == ["AAPL momentum", "AAPL momentum (daily data, 1 year)"]
+    assert result["search_results"][0]["question"] == result["expanded_query"]
+    stages = result["stage_timings"]["stages"]
+    assert stages["search:speculative"]["status"] == "discarded", stages
+    assert stages["search"]["status"] == "done", stages
+    print(f"  ✓ Speculative search discarded, enhanced query searched")
+
+
+async def test_serial_mode_matches():
+    """Test 4: results do not depend on the execution mode"""
+    print("\n✓ Test 4: Serial and Speculative Results Match")
+
+    for is_contextual in (False, True):
+        for enhance in (False, True):
+            results = []
+            for speculative in (False, True):
+                search = build_search(is_contextual, speculative, enhance)
+                result, _ = await timed_search(search, "Compare SPY and QQQ returns")
+                result.pop("stage_timings")
+                results.append(result)
+            assert results[0] == results[1], results
+    print("  ✓ Identical responses for standalone/contextual, with and without enhancement")
+
+
+async def test_running_search_discarded():
+    """Test 5: a search cut off mid-flight is marked discarded, not cancelled"""
+    print("\n✓ Test 5: In-flight Speculative Search Discarded")
+
+    search = build_search(is_contextual=True, speculative=True, search_latency=3 * LLM_LATENCY)
+    result, _ = await timed_search(search, "what about QQQ")
+
+    assert result["type"] == "search_result", result
+    stages = result["stage_timings"]["stages"]
+    # The executor thread cannot be stopped, so the search was not cancelled
+    assert stages["search:speculative"]["status"] == "discarded", stages
+    assert stages["validate:speculative"]["status"] == "cancelled", stages
+    print(f"  ✓ {format_stage_timings(result['stage_timings'])}")
+
+
+async def test_shared_async_library():
+    """Test 6: default searches reuse one facade; an injected library gets its own"""
+    print("\n✓ Test 6: Shared Async Library Facade")
+
+    shared = AsyncAnalysisLibrary(FakeLibrary(), max_concurrency=1)
+    original = context_aware.get_async_analysis_library
+    context_aware.get_async_analysis_library = lambda: shared
+    try:
+        first, second = ContextAwareSearch(validator=FakeValidator()), ContextAwareSearch(validator=FakeValidator())
+    finally:
+        context_aware.get_async_analysis_library = original
+
+    assert first.async_library is shared and second.async_library is shared
+    assert first.analysis_library is shared.library
+
+    injected = AsyncAnalysisLibrary(FakeLibrary(), max_concurrency=1)
+    assert ContextAwareSearch(validator=FakeValidator(), async_library=injected).async_library is injected
+    library = FakeLibrary()
+    wrapped = ContextAwareSearch(analysis_library=library, validator=FakeValidator()).async_library
+    assert wrapped is not shared and wrapped.library is library
+    for facade in (shared, injected, wrapped):
+        facade.shutdown()
+    print("  ✓ One facade shared by default")
+
+
+async def run_all_tests():
+    """Run all speculative context search tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Context Search Speculative Execution Tests")
+    print("="*60)
+
+    # Progress events need the queue backend; not under test here
+    context_aware.send_progress_info = no_progress
+
+    tests = [
+        ("Standalone Overlap", test_standalone_overlaps_classification),
+        ("Contextual Discard", test_contextual_discards_speculation),
+        ("Enhanced Query", test_enhanced_query_discards_search),
+        ("Serial Equivalence", test_serial_mode_matches),
+        ("In-flight Search", test_running_search_discarded),
+        ("Shared Facade", test_shared_async_library),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
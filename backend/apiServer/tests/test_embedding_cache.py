@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the query embedding cache
+
+Tests:
+1. Re-asked questions (modulo whitespace) reuse one embedding
+2. Entries persist across processes through the cache file
+3. Changing the embedding model or clearing invalidates entries
+4. The in-process LRU stays bounded
+5. AnalysisLibrary.search_similar queries ChromaDB with cached vectors
+
+Uses a counting fake embedding function and a temp cache file; no Ollama or
+ChromaDB needed.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.analyze.search.embedding_cache import EmbeddingCache, normalize_text
+from shared.analyze.search.library import AnalysisLibrary
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def __call__(self, input: List[str]):
+        self.calls.append(list(input))
+        return [np.array([len(text), text.count(" "), 1.0]) for text in input]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.query_inputs = []
+
+    def query(self, n_results, include, query_texts=None, query_embeddings=None):
+        self.query_inputs.append({"query_texts": query_texts, "query_embeddings": query_embeddings})
+        return {"ids": [[]], "distances": [[]], "metadatas": [[]]}
+
+
+def temp_cache_path(directory: str) -> str:
+    return os.path.join(directory, "embeddings.sqlite3")
+
+
+async def test_repeated_questions_hit():
+    """Test 1: normalized text shares one entry; misses are embedded in one call"""
+    print("\n✓ Test 1: Repeated Questions Reuse Embeddings")
+
+    embedder = FakeEmbedder()
+    cache = EmbeddingCache("test-model", path="")
+    first = cache.embed(["Volatility of  AAPL", "SPY drawdown"], embedder)
+    again = cache.embed([" Volatility of AAPL\n", "SPY drawdown", "QQQ beta"], embedder)
+
+    assert embedder.calls == [["Volatility of AAPL", "SPY drawdown"], ["QQQ beta"]], embedder.calls
+    assert np.array_equal(first[0], again[0]) and np.array_equal(first[1], again[1])
+    assert normalize_text("Ｑ\tQ  Q ") == "Q Q Q"
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 2 and stats["misses"] == 3, stats
+    print(f"  ✓ hit rate {stats['hit_rate']:.2f} after 5 lookups")
+
+
+async def test_persistent_backing():
+    """Test 2: a new cache on the same file serves earlier entries"""
+    print("\n✓ Test 2: Persistent Backing Store")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = temp_cache_path(directory)
+        writer = EmbeddingCache("test-model", path=path)
+        vectors = writer.embed(["Sharpe ratio of MSFT"], FakeEmbedder())
+        writer.close()
+
+        embedder = FakeEmbedder()
+        reader = EmbeddingCache("test-model", path=path)
+        cached = reader.embed(["Sharpe ratio of MSFT"], embedder)
+        assert embedder.calls == [], embedder.calls
+        assert np.array_equal(cached[0], vectors[0])
+        assert reader.get_stats()["persistent_hits"] == 1
+        reader.close()
+    print("  ✓ Entry served from the cache file without re-embedding")
+
+
+async def test_invalidation():
+    """Test 3: other models' entries are dropped; clear empties memory and file"""
+    print("\n✓ Test 3: Model Change and Clear Invalidate")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = temp_cache_path(directory)
+        old = EmbeddingCache("old-model", path=path)
+        old.embed(["AAPL momentum"], FakeEmbedder())
+        old.close()
+
+        new = EmbeddingCache("new-model", path=path)
+        assert new.get("AAPL momentum") is None
+        new.embed(["AAPL momentum"], FakeEmbedder())
+        new.clear()
+        new.close()
+
+        embedder = FakeEmbedder()
+        EmbeddingCache("new-model", path=path).embed(["AAPL momentum"], embedder)
+        assert embedder.calls == [["AAPL momentum"]], embedder.calls
+        old_again = EmbeddingCache("old-model", path=path)
+        assert old_again.get("AAPL momentum") is None
+        old_again.close()
+    print("  ✓ Stale entries never served")
+
+
+async def test_lru_bound():
+    """Test 4: least recently used entries are evicted from memory"""
+    print("\n✓ Test 4: Bounded LRU")
+
+    cache = EmbeddingCache("test-model", path="", max_entries=2)
+    embedder = FakeEmbedder()
+    cache.embed(["a"], embedder)
+    cache.embed(["b"], embedder)
+    cache.embed(["a"], embedder)
+    cache.embed(["c"], embedder)
+
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get("b") is None
+    assert cache.get_stats()["memory_entries"] == 2
+    print("  ✓ 'b' evicted, 'a' kept after reuse")
+
+
+async def test_library_uses_cached_vectors():
+    """Test 5: search_similar passes cached embeddings instead of query text"""
+    print("\n✓ Test 5: Library Searches with Cached Vectors")
+
+    library = AnalysisLibrary.__new__(AnalysisLibrary)
+    library.collection = FakeCollection()
+    library.embedding_function = FakeEmbedder()
+    library.embedding_cache = EmbeddingCache("test-model", path="")
+    library.local_index = None
+
+    for _ in range(3):
+        result = library.search_similar("Compare SPY and QQQ")
+        assert result["success"], result
+
+    assert library.embedding_function.calls == [["Compare SPY and QQQ"]]
+    assert all(q["query_texts"] is None and q["query_embeddings"] is not None for q in library.collection.query_inputs)
+
+    library.embedding_cache = None
+    library.search_similar("Compare SPY and QQQ")
+    assert library.collection.query_inputs[-1]["query_texts"] == ["Compare SPY and QQQ"]
+    print("  ✓ 3 searches, 1 embedding call")
+
+
+async def run_all_tests():
+    """Run all embedding cache tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Embedding Cache Tests")
+    print("="*60)
+
+    tests = [
+        ("Repeated Questions", test_repeated_questions_hit),
+        ("Persistent Backing", test_persistent_backing),
+        ("Invalidation", test_invalidation),
+        ("LRU Bound", test_lru_bound),
+        ("Library Integration", test_library_uses_cached_vectors),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
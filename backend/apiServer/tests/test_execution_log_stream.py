@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tests for execution log streaming in MongoDBExecutionQueue
+
+Tests:
+1. Entries that arrive out of order on the change stream are yielded in seq order
+2. An entry whose change event never arrives is filled in by a catch-up read
+3. A reserved seq that is never written does not stall the stream forever
+4. The polling fallback holds back entries behind a gap until it is filled
+5. get_status returns log entries without seq/execution_id
+
+Uses in-memory fakes for the execution and log collections and their change
+stream; no MongoDB needed.
+"""
+
+import os
+import sys
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pymongo.errors import OperationFailure
+
+from shared.queue import execution_queue
+from shared.queue.execution_queue import MongoDBExecutionQueue
+
+EXECUTION_ID = "exec-1"
+
+
+class FakeCursor:
+    def __init__(self, docs: List[dict], projection: Dict[str, int]):
+        self.docs = docs
+        self.projection = projection
+
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key])
+        return self
+
+    async def to_list(self, length):
+        return [{k: v for k, v in doc.items() if self.projection.get(k, 1)} for doc in self.docs]
+
+
+class FakeChangeStream:
+    def __init__(self, changes: asyncio.Queue):
+        self.changes = changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def try_next(self):
+        try:
+            return await asyncio.wait_for(self.changes.get(), timeout=0.01)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FakeExecutions:
+    def __init__(self):
+        self.doc = {"execution_id": EXECUTION_ID, "status": "running", "retry_count": 0}
+
+    async def find_one(self, query, projection=None):
+        return dict(self.doc) if query.get("execution_id") == EXECUTION_ID else None
+
+
+class FakeLogs:
+    def __init__(self, supports_change_streams: bool = True):
+        self.docs: List[Dict[str, Any]] = []
+        self.changes: asyncio.Queue = asyncio.Queue()
+        self.supports_change_streams = supports_change_streams
+
+    def insert(self, seq: int, notify: bool = True) -> None:
+        doc = {"execution_id": EXECUTION_ID, "seq": seq, "level": "INFO", "message": f"line {seq}"}
+        self.docs.append(doc)
+        if notify:
+            self.changes.put_nowait({"operationType": "insert", "fullDocument": dict(doc)})
+
+    def watch(self, pipeline, max_await_time_ms=None):
+        if not self.supports_change_streams:
+            raise OperationFailure("$changeStream is only supported on replica sets", code=40573)
+        return FakeChangeStream(self.changes)
+
+    def find(self, query, projection=None):
+        docs = [
+            doc for doc in self.docs
+            if doc["execution_id"] == query["execution_id"] and doc["seq"] >= query["seq"]["$gte"]
+        ]
+        return FakeCursor(docs, projection or {})
+
+
+def build_queue(supports_change_streams: bool = True) -> MongoDBExecutionQueue:
+    collections = {
+        "execution_queue": FakeExecutions(),
+        "execution_queue_logs": FakeLogs(supports_change_streams),
+        "progress_events": None,
+    }
+    return MongoDBExecutionQueue(collections)
+
+
+async def collect(queue: MongoDBExecutionQueue, since: int = 0) -> List[int]:
+    return [entry["seq"] async for entry in queue.stream_logs(EXECUTION_ID, since)]
+
+
+async def finish(queue: MongoDBExecutionQueue) -> None:
+    await asyncio.sleep(0.05)
+    queue.collection.doc["status"] = "completed"
+
+
+async def test_out_of_order_changes():
+    """Test 1: a late lower seq is not dropped"""
+    print("\n✓ Test 1: Out-of-Order Change Events")
+
+    queue = build_queue()
+    queue.logs_collection.insert(0)
+    reader = asyncio.create_task(collect(queue))
+    await asyncio.sleep(0.05)
+
+    # Two writers: seq 2 is inserted before seq 1
+    queue.logs_collection.insert(2)
+    await asyncio.sleep(0.05)
+    queue.logs_collection.insert(1)
+    await finish(queue)
+
+    seqs = await asyncio.wait_for(reader, timeout=2)
+    assert seqs == [0, 1, 2], seqs
+    print(f"  ✓ Yielded {seqs}")
+
+
+async def test_catch_up_read_fills_gap():
+    """Test 2: a stored entry without a change event is read back"""
+    print("\n✓ Test 2: Catch-up Read Fills a Gap")
+
+    queue = build_queue()
+    reader = asyncio.create_task(collect(queue))
+    await asyncio.sleep(0.05)
+    queue.logs_collection.insert(0)
+    queue.logs_collection.insert(1, notify=False)
+    queue.logs_collection.insert(2)
+    await asyncio.sleep(0.05)
+    assert not reader.done()
+    await finish(queue)
+
+    seqs = await asyncio.wait_for(reader, timeout=2)
+    assert seqs == [0, 1, 2], seqs
+    print(f"  ✓ Yielded {seqs}")
+
+
+async def test_unwritten_seq_skipped():
+    """Test 3: a seq that never arrives is skipped after LOG_GAP_TIMEOUT"""
+    print("\n✓ Test 3: Missing Seq Skipped After Timeout")
+
+    queue = build_queue()
+    received: List[int] = []
+
+    async def read():
+        async for entry in queue.stream_logs(EXECUTION_ID):
+            received.append(entry["seq"])
+
+    with patch.object(execution_queue, "LOG_GAP_TIMEOUT", 0.1):
+        reader = asyncio.create_task(read())
+        await asyncio.sleep(0.05)
+        queue.logs_collection.insert(0)
+        queue.logs_collection.insert(2)
+        await asyncio.sleep(0.05)
+        assert received == [0], received
+
+        # Later entries are released once the gap times out, while still running
+        await asyncio.sleep(0.2)
+        assert received == [0, 2], received
+        queue.logs_collection.insert(3)
+        await finish(queue)
+        await asyncio.wait_for(reader, timeout=2)
+    assert received == [0, 2, 3], received
+    print(f"  ✓ Yielded {received}")
+
+
+async def test_polling_fallback_holds_back():
+    """Test 4: incremental reads do not advance past a gap"""
+    print("\n✓ Test 4: Polling Fallback Holds Back Entries")
+
+    queue = build_queue(supports_change_streams=False)
+    with patch.object(execution_queue, "LOG_STREAM_CHECK_INTERVAL", 0.01):
+        queue.logs_collection.insert(0)
+        queue.logs_collection.insert(2)
+        reader = asyncio.create_task(collect(queue))
+        await asyncio.sleep(0.05)
+        queue.logs_collection.insert(1)
+        await finish(queue)
+        seqs = await asyncio.wait_for(reader, timeout=2)
+    assert seqs == [0, 1, 2], seqs
+    print(f"  ✓ Yielded {seqs}")
+
+
+async def test_status_logs_projection():
+    """Test 5: internal log fields stay out of get_status"""
+    print("\n✓ Test 5: get_status Log Entries")
+
+    queue = build_queue()
+    for seq in range(3):
+        queue.logs_collection.insert(seq, notify=False)
+    status = await queue.get_status(EXECUTION_ID)
+    logs = status["execution_logs"]
+    assert [entry["message"] for entry in logs] == ["line 0", "line 1", "line 2"], logs
+    assert all("seq" not in entry and "execution_id" not in entry for entry in logs), logs
+    print("  ✓ seq and execution_id projected out")
+
+
+async def run_all_tests():
+    """Run all execution log stream tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Execution Log Stream Tests")
+    print("="*60)
+
+    tests = [
+        ("Out of Order", test_out_of_order_changes),
+        ("Catch-up Read", test_catch_up_read_fills_gap),
+        ("Missing Seq", test_unwritten_seq_skipped),
+        ("Polling Fallback", test_polling_fallback_holds_back),
+        ("Status Projection", test_status_logs_projection),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for saved-analysis indicator state (shared.execution.indicator_state)
+
+Tests:
+1. Runs with different parameters load and save separate state
+2. Parameter order and None vs {} map to the same state
+3. Unchanged state is not written back
+
+Uses an in-memory script storage; no storage backend needed.
+"""
+
+import os
+import sys
+import asyncio
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.execution.indicator_state import indicator_state_name, load_indicator_state
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files: Dict[str, str] = {}
+        self.writes = 0
+
+    async def read_script(self, name: str) -> str:
+        if name not in self.files:
+            raise FileNotFoundError(name)
+        return self.files[name]
+
+    async def write_script(self, name: str, content: str) -> bool:
+        self.writes += 1
+        self.files[name] = content
+        return True
+
+
+async def run_script(storage: FakeStorage, parameters, new_state=None) -> str:
+    """Load state like the execution worker, optionally replace it, persist it; returns what was loaded"""
+    state = await load_indicator_state(storage, "analysis.py", parameters)
+    try:
+        if new_state is not None:
+            with open(state.path, "w") as f:
+                f.write(new_state)
+        await state.persist(storage)
+        return state.original
+    finally:
+        state.cleanup()
+
+
+async def test_state_per_parameter_set():
+    """Test 1: a run for another symbol does not continue from this one's bars"""
+    print("\n✓ Test 1: State Keyed by Parameters")
+
+    storage = FakeStorage()
+    await run_script(storage, {"symbol": "AAPL"}, '{"bars": "AAPL"}')
+    await run_script(storage, {"symbol": "MSFT"}, '{"bars": "MSFT"}')
+
+    assert await run_script(storage, {"symbol": "AAPL"}) == '{"bars": "AAPL"}'
+    assert await run_script(storage, {"symbol": "MSFT"}) == '{"bars": "MSFT"}'
+    assert await run_script(storage, {"symbol": "TSLA"}) == ""
+    assert len(storage.files) == 2 and all(name.endswith(".state") for name in storage.files), storage.files
+    print(f"  ✓ {sorted(storage.files)}")
+
+
+async def test_equivalent_parameters_share_state():
+    """Test 2: the key does not depend on dict order or None vs {}"""
+    print("\n✓ Test 2: Equivalent Parameters")
+
+    assert indicator_state_name("a.py", {"x": 1, "y": 2}) == indicator_state_name("a.py", {"y": 2, "x": 1})
+    assert indicator_state_name("a.py", None) == indicator_state_name("a.py", {})
+    assert indicator_state_name("a.py", {"x": 1}) != indicator_state_name("a.py", {"x": 2})
+    assert indicator_state_name("a.py", {"x": 1}) != indicator_state_name("b.py", {"x": 1})
+    print("  ✓ Stable, script-scoped names")
+
+
+async def test_unchanged_state_not_written():
+    """Test 3: a run that leaves the state alone costs no storage write"""
+    print("\n✓ Test 3: Unchanged State Not Written")
+
+    storage = FakeStorage()
+    await run_script(storage, {"symbol": "AAPL"}, '{"bars": 1}')
+    writes = storage.writes
+    await run_script(storage, {"symbol": "AAPL"})
+    await run_script(storage, {"symbol": "AAPL"}, '{"bars": 1}')
+    assert storage.writes == writes, storage.writes
+    print("  ✓ No write for unchanged state")
+
+
+async def run_all_tests():
+    """Run all indicator state tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Indicator State Tests")
+    print("="*60)
+
+    tests = [
+        ("Per Parameter Set", test_state_per_parameter_set),
+        ("Equivalent Parameters", test_equivalent_parameters_share_state),
+        ("Unchanged State", test_unchanged_state_not_written),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
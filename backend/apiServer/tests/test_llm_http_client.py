@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled LLM provider HTTP client
+
+Tests:
+1. A failing request through make_request is retried by one layer only
+2. Providers without the pooled client keep make_request's 500 retries
+3. Retry-After is honored and a recovered request succeeds
+4. A client replaced after an event loop change is closed
+
+Runs the OpenAI provider against a local HTTP server; no LLM API needed.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import threading
+import http.server
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.llm import LLMService, LLMConfig
+from shared.llm import http_client
+from shared.llm.http_client import ProviderHttpClient
+
+
+class FakeOpenAIHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Status codes to answer with, in order; 200 once exhausted
+    statuses: List[int] = []
+    requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        FakeOpenAIHandler.requests += 1
+        status = FakeOpenAIHandler.statuses.pop(0) if FakeOpenAIHandler.statuses else 200
+        body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("retry-after", "0")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> str:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def build_openai_service(base_url: str, max_retries: int = 2) -> LLMService:
+    http_client._provider_clients["openai"] = ProviderHttpClient(
+        "openai", max_retries=max_retries, backoff_base=0.001, http2=False
+    )
+    service = LLMService(LLMConfig(provider_type="openai", default_model="test-model", api_key="test", base_url=base_url))
+    # MCP tools are not under test here
+    service._tools_loaded = True
+    return service
+
+
+def reset_server(statuses: List[int]) -> None:
+    FakeOpenAIHandler.statuses = list(statuses)
+    FakeOpenAIHandler.requests = 0
+
+
+async def test_single_retry_layer(base_url: str):
+    """Test 1: 500s are retried max_retries times in total, not per layer"""
+    print("\n✓ Test 1: One Retry Layer")
+
+    service = build_openai_service(base_url, max_retries=2)
+    reset_server([500] * 20)
+    response = await service.make_request([{"role": "user", "content": "hi"}], system_prompt="s", retry_delay=0.001)
+
+    assert not response["success"], response
+    assert FakeOpenAIHandler.requests == 3, FakeOpenAIHandler.requests
+    print(f"  ✓ {FakeOpenAIHandler.requests} upstream attempts")
+
+
+async def test_unpooled_provider_keeps_retries():
+    """Test 2: make_request still retries providers that do not use the pooled client"""
+    print("\n✓ Test 2: Unpooled Providers Keep Service Retries")
+
+    class LocalProvider:
+        _raw_tools = None
+        calls = 0
+
+        def set_system_prompt(self, system_prompt):
+            pass
+
+        def retries_http_errors(self, force_api=False):
+            return False
+
+        async def call_api(self, **kwargs):
+            LocalProvider.calls += 1
+            return {"success": False, "error": "HTTP 500 from local server", "provider": "local"}
+
+    service = LLMService(LLMConfig(provider_type="ollama", default_model="test-model", base_url="http://localhost:1"))
+    service.provider = LocalProvider()
+    service._tools_loaded = True
+    await service.make_request([{"role": "user", "content": "hi"}], system_prompt="s", max_retries=3, retry_delay=0.001)
+    assert LocalProvider.calls == 4, LocalProvider.calls
+    print("  ✓ 4 attempts")
+
+
+async def test_recovers_after_retry(base_url: str):
+    """Test 3: a 429 then a 200 succeeds on the second attempt"""
+    print("\n✓ Test 3: Recovery After 429")
+
+    service = build_openai_service(base_url, max_retries=2)
+    reset_server([429])
+    response = await service.make_request([{"role": "user", "content": "hi"}], system_prompt="s")
+
+    assert response["success"] and response["content"] == "ok", response
+    assert FakeOpenAIHandler.requests == 2
+    assert http_client._provider_clients["openai"].get_metrics()["retries"] == 1
+    print("  ✓ Succeeded on retry")
+
+
+def test_stale_client_closed(base_url: str):
+    """Test 4: each new event loop gets a new client and the old one is closed"""
+    print("\n✓ Test 4: Stale Client Closed After Loop Change")
+
+    client = ProviderHttpClient("test", http2=False)
+    reset_server([])
+    clients = []
+
+    async def request():
+        await client.post(f"{base_url}/chat/completions", json={})
+        clients.append(client._client)
+        # Let the close scheduled for the previous client run
+        await asyncio.sleep(0.05)
+
+    for _ in range(3):
+        asyncio.run(request())
+
+    assert len(set(map(id, clients))) == 3
+    assert [c.is_closed for c in clients] == [True, True, False], [c.is_closed for c in clients]
+    print("  ✓ Replaced clients closed")
+
+
+def run_all_tests():
+    """Run all LLM HTTP client tests"""
+
+    print("\n" + "="*60)
+    print("🧪 LLM Provider HTTP Client Tests")
+    print("="*60)
+
+    base_url = start_server()
+    tests = [
+        ("Single Retry Layer", lambda: asyncio.run(test_single_retry_layer(base_url))),
+        ("Unpooled Provider", lambda: asyncio.run(test_unpooled_provider_keeps_retries())),
+        ("Recovery", lambda: asyncio.run(test_recovers_after_retry(base_url))),
+        ("Stale Client", lambda: test_stale_client_closed(base_url)),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM response cache in LLMService.make_request
+
+Tests:
+1. Repeated opted-in requests skip the provider round trip
+2. Requests without response_cache (or with force_api) always call the provider
+3. Provider, base URL, model, system prompt, tools and messages all take part in the key
+4. Entries expire after the TTL and the LRU stays bounded
+5. Failed responses are not cached; per-service hit rates are reported
+6. Responses are only cached once the service confirms them with cache_response
+
+Uses a fake provider that counts calls; no LLM API needed.
+"""
+
+import os
+import sys
+import asyncio
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.llm import LLMService, LLMConfig
+from shared.llm import response_cache as response_cache_module
+from shared.llm.response_cache import LLMResponseCache
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self.fail = False
+        self.use_cli = False
+        self._raw_tools = None
+        self._raw_system_prompt = None
+
+    def set_tools(self, tools):
+        self._raw_tools = list(tools)
+
+    def set_system_prompt(self, system_prompt):
+        self._raw_system_prompt = system_prompt
+
+    def retries_http_errors(self, force_api=False):
+        return False
+
+    async def call_api(self, model, messages, max_tokens, **kwargs):
+        self.calls.append({"model": model, "messages": messages})
+        if self.fail:
+            return {"success": False, "error": "rate limited", "provider": "fake"}
+        return {"success": True, "data": {"text": f"answer {len(self.calls)}"}, "provider": "fake"}
+
+    def parse_response(self, data):
+        return data["text"], []
+
+
+def build_service(provider_type: str = "ollama", base_url: str = "http://localhost:1") -> LLMService:
+    service = LLMService(LLMConfig(provider_type=provider_type, default_model="test-model", base_url=base_url, api_key="test"))
+    service.provider = FakeProvider()
+    # MCP tools are not under test here
+    service._tools_loaded = True
+    return service
+
+
+def reset_cache(**kwargs) -> LLMResponseCache:
+    response_cache_module._response_cache = LLMResponseCache(use_redis=False, **kwargs)
+    return response_cache_module._response_cache
+
+
+def user(content: str) -> List[Dict[str, str]]:
+    return [{"role": "user", "content": content}]
+
+
+async def request(service: LLMService, *args, **kwargs) -> Dict[str, Any]:
+    """make_request followed by cache_response, as a service does after parsing the response"""
+    response = await service.make_request(*args, **kwargs)
+    await service.cache_response(response)
+    return response
+
+
+async def complete(service: LLMService, *args, **kwargs) -> Dict[str, Any]:
+    response = await service.simple_completion(*args, **kwargs)
+    await service.cache_response(response)
+    return response
+
+
+async def test_repeated_requests_hit():
+    """Test 1: the second identical request is served from the cache"""
+    print("\n✓ Test 1: Repeated Requests Skip the Provider")
+
+    reset_cache(ttl=60)
+    service = build_service()
+    first = await request(service, user("Is this contextual?"), system_prompt="classify", response_cache="context-classifier")
+    second = await request(service, user("Is  this contextual?\n"), system_prompt="classify", response_cache="context-classifier")
+
+    assert len(service.provider.calls) == 1, service.provider.calls
+    assert second["content"] == first["content"] and second["cached"] and "cached" not in first
+    second["tool_calls"].append("mutated")
+    third = await request(service, user("Is this contextual?"), system_prompt="classify", response_cache="context-classifier")
+    assert third["tool_calls"] == [], third
+    print("  ✓ 3 requests, 1 provider call")
+
+
+async def test_opt_in_only():
+    """Test 2: caching is per call; force_api bypasses it"""
+    print("\n✓ Test 2: Opt-in Per Service")
+
+    reset_cache(ttl=60)
+    service = build_service()
+    for _ in range(2):
+        await request(service, user("Summarize"), system_prompt="summarize")
+    assert len(service.provider.calls) == 2
+
+    await request(service, user("Classify"), system_prompt="c", response_cache="intent-classifier")
+    await request(service, user("Classify"), system_prompt="c", response_cache="intent-classifier", force_api=True)
+    assert len(service.provider.calls) == 4
+
+    await complete(service, "Validate AAPL", system_prompt="v", response_cache="completeness-validator")
+    await complete(service, "Validate AAPL", system_prompt="v", response_cache="completeness-validator")
+    assert len(service.provider.calls) == 5
+    print("  ✓ Only opted-in requests are cached")
+
+
+async def test_key_components():
+    """Test 3: any change to provider, base URL, model, system prompt, tools or messages misses"""
+    print("\n✓ Test 3: Key Covers Provider, Model, Prompt, Tools and Messages")
+
+    reset_cache(ttl=60)
+    service = build_service()
+    base = {"messages": user("Select functions"), "system_prompt": "select", "response_cache": "function-selector"}
+    await request(service, **base)
+    await request(service, **{**base, "model": "other-model"})
+    await request(service, **{**base, "system_prompt": "select v2"})
+    await request(service, **{**base, "messages": user("Select other functions")})
+    await request(service, **{**base, "tools": [{"name": "get_prices"}]})
+    assert len(service.provider.calls) == 5, len(service.provider.calls)
+
+    # Same namespace and inputs as the tools request: hit
+    await request(service, **{**base, "tools": [{"name": "get_prices"}]})
+    assert len(service.provider.calls) == 5
+
+    # Same model name served by another endpoint or provider
+    for other in (build_service(base_url="http://localhost:2"), build_service(provider_type="openai")):
+        await request(other, **base)
+        assert len(other.provider.calls) == 1, other.provider_type
+    print("  ✓ 7 distinct keys, repeat hits")
+
+
+async def test_ttl_and_lru():
+    """Test 4: expired entries miss; old entries are evicted"""
+    print("\n✓ Test 4: TTL and LRU Eviction")
+
+    reset_cache(ttl=0.05)
+    service = build_service()
+    await request(service, user("q"), system_prompt="s", response_cache="intent-classifier")
+    await asyncio.sleep(0.1)
+    await request(service, user("q"), system_prompt="s", response_cache="intent-classifier")
+    assert len(service.provider.calls) == 2
+
+    cache = reset_cache(ttl=60, max_entries=2)
+    for query in ("a", "b", "a", "c", "a", "b"):
+        await request(service, user(query), system_prompt="s", response_cache="intent-classifier")
+    # a, b, (a hit), c evicts b, (a hit), b again
+    assert len(service.provider.calls) == 2 + 4, len(service.provider.calls)
+    assert len(cache._entries) == 2
+    print("  ✓ Expired and evicted entries refetched")
+
+
+async def test_failures_and_metrics():
+    """Test 5: errors are not cached; hit rates are tracked per service"""
+    print("\n✓ Test 5: Failures Not Cached, Per-Service Metrics")
+
+    reset_cache(ttl=60)
+    service = build_service()
+    service.provider.fail = True
+    failed = await request(service, user("q"), system_prompt="s", response_cache="context-expander", max_retries=0)
+    assert not failed["success"]
+    service.provider.fail = False
+    for _ in range(3):
+        assert (await request(service, user("q"), system_prompt="s", response_cache="context-expander"))["success"]
+    await request(service, user("q"), system_prompt="s", response_cache="intent-classifier")
+
+    metrics = service.get_config_info()["response_cache"]
+    assert metrics["context-expander"]["misses"] == 2 and metrics["context-expander"]["memory_hits"] == 2, metrics
+    assert metrics["context-expander"]["hit_rate"] == 0.5, metrics
+    assert metrics["intent-classifier"]["hit_rate"] == 0.0, metrics
+    print(f"  ✓ {metrics}")
+
+
+async def test_cache_after_confirmation():
+    """Test 6: a response the service could not parse is not replayed"""
+    print("\n✓ Test 6: Cached Only After Confirmation")
+
+    cache = reset_cache(ttl=60)
+    service = build_service()
+    base = {"messages": user("Classify"), "system_prompt": "c", "response_cache": "intent-classifier"}
+    # Parse failed: the service never calls cache_response
+    for _ in range(2):
+        await service.make_request(**base)
+    assert len(service.provider.calls) == 2 and not cache._entries
+
+    response = await service.make_request(**base)
+    assert await service.cache_response(response)
+    assert "cache_entry" not in response
+    assert not await service.cache_response(response)
+
+    replayed = await service.make_request(**base)
+    assert len(service.provider.calls) == 3 and replayed["cached"] and "cache_entry" not in replayed, replayed
+    # Hits, force_api and uncached requests have nothing to store
+    assert not await service.cache_response(replayed)
+    assert not await service.cache_response(await service.make_request(**base, force_api=True))
+    print("  ✓ Stored only after cache_response")
+
+
+async def run_all_tests():
+    """Run all LLM response cache tests"""
+
+    print("\n" + "="*60)
+    print("🧪 LLM Response Cache Tests")
+    print("="*60)
+
+    tests = [
+        ("Repeated Requests", test_repeated_requests_hit),
+        ("Opt-in", test_opt_in_only),
+        ("Key Components", test_key_components),
+        ("TTL and LRU", test_ttl_and_lru),
+        ("Failures and Metrics", test_failures_and_metrics),
+        ("Confirmation", test_cache_after_confirmation),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
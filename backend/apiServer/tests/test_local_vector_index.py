@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process vector index in AnalysisLibrary
+
+Tests:
+1. Local search returns the same analyses and similarities as ChromaDB (cosine and l2)
+2. Saved analyses are searchable without reloading the index
+3. Analyses saved by another process are picked up on refresh
+4. Reads keep working while ChromaDB is unreachable
+
+Runs against an in-memory ChromaDB client with a deterministic bag-of-words
+embedding function standing in for Ollama; no servers needed.
+"""
+
+import os
+import sys
+import asyncio
+import hashlib
+from typing import List
+
+import numpy as np
+import chromadb
+from chromadb.utils.embedding_functions.ollama_embedding_function import OllamaEmbeddingFunction
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.analyze.search.embedding_cache import EmbeddingCache
+from shared.analyze.search.library import AnalysisLibrary
+
+EMBEDDING_MODEL = "test-embedding"
+TICKERS = ["AAPL", "MSFT", "SPY", "QQQ", "TSLA", "NVDA", "AMZN", "GLD"]
+METRICS = ["volatility", "drawdown", "momentum", "sharpe ratio", "beta", "correlation"]
+
+
+class BagOfWordsEmbedder:
+    """Deterministic stand-in for the Ollama embedding function"""
+
+    def __init__(self, dimension: int = 32):
+        self.dimension = dimension
+        self.calls = 0
+
+    def __call__(self, input: List[str]):
+        self.calls += 1
+        vectors = []
+        for text in input:
+            vector = np.zeros(self.dimension)
+            for word in text.lower().split():
+                seed = int(hashlib.md5(word.encode()).hexdigest()[:8], 16)
+                vector += np.random.default_rng(seed).normal(size=self.dimension)
+            vectors.append(vector)
+        return vectors
+
+
+class UnreachableCollection:
+    def __getattr__(self, name):
+        raise ConnectionError("ChromaDB server unreachable")
+
+
+def build_library(space: str = "cosine") -> AnalysisLibrary:
+    # Skip __init__, which connects to the ChromaDB server and Ollama
+    library = AnalysisLibrary.__new__(AnalysisLibrary)
+    library.client = chromadb.EphemeralClient()
+    name = f"analyses_{space}_{os.urandom(4).hex()}"
+    library.collection = library.client.create_collection(
+        name,
+        # Marks the collection as embedded with our model; never called (vectors are passed in)
+        embedding_function=OllamaEmbeddingFunction(url="http://localhost:1", model_name=EMBEDDING_MODEL),
+        configuration={"hnsw": {"space": space}}
+    )
+    library.embedding_function = BagOfWordsEmbedder()
+    library.embedding_model = EMBEDDING_MODEL
+    library.embedding_cache = EmbeddingCache(EMBEDDING_MODEL, path="")
+    library._setup_local_index()
+    assert library.local_index is not None
+    return library
+
+
+def analysis_records(prefix: str = "a") -> List[dict]:
+    return [
+        {
+            "analysis_id": f"{prefix}{i}-{j}",
+            "question": f"What is the {metric} of {ticker}",
+            "metadata": {"description": f"{metric} of {ticker} over one year", "execution": {"symbol": ticker}}
+        }
+        for i, ticker in enumerate(TICKERS)
+        for j, metric in enumerate(METRICS)
+    ]
+
+
+def chroma_search(library: AnalysisLibrary, query: str, top_k: int, threshold: float) -> dict:
+    local_index, library.local_index = library.local_index, None
+    try:
+        return library.search_similar(query, top_k=top_k, similarity_threshold=threshold)
+    finally:
+        library.local_index = local_index
+
+
+async def test_matches_chromadb():
+    """Test 1: same analyses and similarities as the ChromaDB query path"""
+    print("\n✓ Test 1: Local Results Match ChromaDB")
+
+    queries = ["volatility of SPY", "NVDA momentum and beta", "sharpe ratio", "correlation of GLD and QQQ"]
+    for space, threshold in (("cosine", 0.3), ("l2", -1000.0)):
+        library = build_library(space)
+        assert library.save_analyses(analysis_records())["success"]
+        for query in queries:
+            local = library.search_similar(query, top_k=5, similarity_threshold=threshold)
+            remote = chroma_search(library, query, top_k=5, threshold=threshold)
+            assert local["analyses"], (space, query)
+            assert [a["id"] for a in local["analyses"]] == [a["id"] for a in remote["analyses"]], (space, query)
+            np.testing.assert_allclose([a["similarity"] for a in local["analyses"]],
+                                       [a["similarity"] for a in remote["analyses"]], atol=1e-4)
+            assert local["analyses"] == [dict(a, similarity=b["similarity"]) for a, b in zip(remote["analyses"], local["analyses"])]
+    print("  ✓ cosine and l2 results identical, nested metadata restored")
+
+
+async def test_saves_update_index():
+    """Test 2: save_analysis adds to the index in place"""
+    print("\n✓ Test 2: Saves Keep the Index in Sync")
+
+    library = build_library()
+    library.save_analyses(analysis_records())
+    loads = library.local_index.stats["loads"]
+    result = library.save_analysis("new-1", "Dividend yield of KO", {"description": "KO dividend yield history"})
+    assert result["success"], result
+
+    found = library.search_similar("dividend yield of KO", top_k=1, similarity_threshold=0.5)
+    assert found["analyses"][0]["id"] == "new-1", found
+    assert library.local_index.stats["loads"] == loads
+    assert len(library.local_index) == library.collection.count()
+    print(f"  ✓ {len(library.local_index)} analyses indexed without a reload")
+
+
+async def test_refresh_picks_up_external_writes():
+    """Test 3: a changed collection count triggers a reload"""
+    print("\n✓ Test 3: External Writes Picked Up on Refresh")
+
+    library = build_library()
+    library.save_analyses(analysis_records())
+    # Another process writes straight to ChromaDB
+    document = "Question: Free cash flow of MSFT\nDescription: MSFT free cash flow"
+    library.collection.add(
+        ids=["external-1"], documents=[document],
+        embeddings=library.embedding_function([document]),
+        metadatas=[{"id": "external-1", "question": "Free cash flow of MSFT", "description": "MSFT free cash flow"}]
+    )
+
+    library.local_index_refresh_seconds = 3600
+    stale = library.search_similar("free cash flow of MSFT", top_k=1, similarity_threshold=0.3)
+    assert not stale["analyses"] or stale["analyses"][0]["id"] != "external-1"
+
+    library.local_index_refresh_seconds = 0
+    fresh = library.search_similar("free cash flow of MSFT", top_k=1, similarity_threshold=0.3)
+    assert fresh["analyses"][0]["id"] == "external-1", fresh
+    print("  ✓ Reloaded after the refresh interval")
+
+
+async def test_serves_reads_without_chromadb():
+    """Test 4: searches succeed from the local index when ChromaDB is down"""
+    print("\n✓ Test 4: Reads Served While ChromaDB Is Unreachable")
+
+    library = build_library()
+    library.save_analyses(analysis_records())
+    expected = library.search_similar("momentum of TSLA", top_k=3)
+
+    library.collection = UnreachableCollection()
+    library.local_index_refresh_seconds = 0
+    result = library.search_similar("momentum of TSLA", top_k=3)
+    assert result["success"] and result["analyses"] == expected["analyses"], result
+    assert not library.save_analysis("x", "Question", {"description": "d"})["success"]
+    print(f"  ✓ {len(result['analyses'])} analyses returned from memory")
+
+
+async def run_all_tests():
+    """Run all local vector index tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Local Vector Index Tests")
+    print("="*60)
+
+    tests = [
+        ("ChromaDB Parity", test_matches_chromadb),
+        ("Save Sync", test_saves_update_index),
+        ("Refresh", test_refresh_picks_up_external_writes),
+        ("ChromaDB Unreachable", test_serves_reads_without_chromadb),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for MCPSessionPool slot accounting
+
+Tests:
+1. A call cancelled mid-operation gives its slot back and the next call runs
+2. A call cancelled while its session is starting gives the slot back
+3. A call cancelled during the idle health check gives the slot back
+4. Errors from a healthy server keep the session; a dead one is respawned
+
+Replaces PooledSession with an in-process fake; no MCP server process needed.
+"""
+
+import os
+import sys
+import asyncio
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.integrations.mcp import session_pool
+from shared.integrations.mcp.session_pool import MCPSessionPool
+
+
+class FakePooledSession:
+    start_delay = 0.0
+    ping_delay = 0.0
+    started = 0
+
+    def __init__(self, server_name, server_params):
+        self.session = self
+        self.last_used = 0.0
+        self.calls = 0
+        self.closed = False
+        self.healthy = True
+
+    @property
+    def alive(self) -> bool:
+        return not self.closed
+
+    async def start(self, timeout: float) -> None:
+        await asyncio.sleep(self.start_delay)
+        FakePooledSession.started += 1
+
+    async def ping(self, timeout: float) -> bool:
+        await asyncio.sleep(self.ping_delay)
+        return self.healthy
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def build_pool(start_delay: float = 0.0, ping_delay: float = 0.0, health_check_interval: float = 30) -> MCPSessionPool:
+    FakePooledSession.start_delay = start_delay
+    FakePooledSession.ping_delay = ping_delay
+    FakePooledSession.started = 0
+    return MCPSessionPool(
+        "test", {"command": "true"}, max_sessions=1,
+        call_timeout=5, health_check_interval=health_check_interval
+    )
+
+
+async def answer(session) -> str:
+    return "ok"
+
+
+async def hang(session) -> None:
+    await asyncio.sleep(30)
+
+
+async def cancel_after(coroutine, delay: float = 0.05) -> None:
+    task = asyncio.create_task(coroutine)
+    await asyncio.sleep(delay)
+    task.cancel()
+    try:
+        await task
+        raise AssertionError("expected CancelledError")
+    except asyncio.CancelledError:
+        pass
+
+
+def assert_slot_free(pool: MCPSessionPool, idle: Optional[int] = None) -> None:
+    metrics = pool.get_metrics()
+    assert metrics["open_sessions"] == (idle or 0) and metrics["in_flight"] == 0, metrics
+
+
+async def test_cancelled_call():
+    """Test 1: cancelling a running call does not leak the only slot"""
+    print("\n✓ Test 1: Cancelled Call")
+
+    pool = build_pool()
+    await cancel_after(pool.run(hang))
+    assert_slot_free(pool)
+    assert await asyncio.wait_for(pool.run(answer), timeout=1) == "ok"
+    assert pool.get_metrics()["idle_sessions"] == 1
+    await pool.close()
+    print("  ✓ Slot freed, next call ran on a new session")
+
+
+async def test_cancelled_spawn():
+    """Test 2: cancelling while the session starts frees the slot"""
+    print("\n✓ Test 2: Cancelled During Session Start")
+
+    pool = build_pool(start_delay=0.2)
+    await cancel_after(pool.run(answer))
+    assert_slot_free(pool)
+    FakePooledSession.start_delay = 0.0
+    assert await asyncio.wait_for(pool.run(answer), timeout=1) == "ok"
+    await pool.close()
+    print("  ✓ Slot freed, next call ran")
+
+
+async def test_cancelled_health_check():
+    """Test 3: cancelling during the idle-session ping frees the slot"""
+    print("\n✓ Test 3: Cancelled During Health Check")
+
+    pool = build_pool(ping_delay=0.2, health_check_interval=0.01)
+    assert await pool.run(answer) == "ok"
+    await asyncio.sleep(0.02)
+    await cancel_after(pool.run(answer))
+    assert_slot_free(pool)
+    FakePooledSession.ping_delay = 0.0
+    assert await asyncio.wait_for(pool.run(answer), timeout=1) == "ok"
+    assert FakePooledSession.started == 2, FakePooledSession.started
+    await pool.close()
+    print("  ✓ Slot freed, session replaced")
+
+
+async def test_errors_keep_accounting():
+    """Test 4: tool errors release a healthy session; a dead server is respawned once"""
+    print("\n✓ Test 4: Errors Release or Respawn")
+
+    pool = build_pool()
+
+    async def fail(session):
+        raise ValueError("tool failed")
+
+    try:
+        await pool.run(fail)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    assert pool.get_metrics()["idle_sessions"] == 1 and FakePooledSession.started == 1
+
+    async def crash_once(session):
+        if FakePooledSession.started == 1:
+            session.healthy = False
+            raise ConnectionError("server died")
+        return "ok"
+
+    assert await pool.run(crash_once) == "ok"
+    metrics = pool.get_metrics()
+    assert metrics["respawns"] == 1 and metrics["open_sessions"] == 1 and metrics["idle_sessions"] == 1, metrics
+    await pool.close()
+    print("  ✓ Healthy session kept, dead one respawned")
+
+
+async def run_all_tests():
+    """Run all MCP session pool tests"""
+
+    print("\n" + "="*60)
+    print("🧪 MCP Session Pool Tests")
+    print("="*60)
+
+    session_pool.PooledSession = FakePooledSession
+
+    tests = [
+        ("Cancelled Call", test_cancelled_call),
+        ("Cancelled Spawn", test_cancelled_spawn),
+        ("Cancelled Health Check", test_cancelled_health_check),
+        ("Errors", test_errors_keep_accounting),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
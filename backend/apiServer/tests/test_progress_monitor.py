@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Tests for ProgressMonitorService change stream delivery
+
+Tests:
+1. Resume token writes are batched, and the latest token is saved on stop
+2. A due token is saved while the stream is idle
+3. A restarted monitor resumes after the saved token without re-broadcasting
+4. An unusable resume token is cleared and recent events are caught up
+5. Without change stream support the monitor falls back to polling
+
+Uses in-memory fakes for the progress_events collection, its change stream and
+the monitor state collection; no MongoDB needed.
+"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pymongo.errors import OperationFailure
+
+from services.progress_monitor import ProgressMonitorService
+
+
+class FakeChangeStream:
+    def __init__(self, collection: "FakeEventsCollection", position: int):
+        self.collection = collection
+        self.position = position
+        self.alive = True
+        self.resume_token = {"position": position}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def try_next(self):
+        if self.position >= len(self.collection.docs):
+            await asyncio.sleep(0.01)
+            return None
+        doc = self.collection.docs[self.position]
+        self.position += 1
+        self.resume_token = {"position": self.position}
+        return {"operationType": "insert", "fullDocument": doc}
+
+
+class FakeCursor:
+    def __init__(self, docs: List[dict]):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key])
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class FakeEventsCollection:
+    def __init__(self, supports_change_streams: bool = True):
+        self.docs: List[dict] = []
+        self.supports_change_streams = supports_change_streams
+        self.invalid_tokens: List[dict] = []
+
+    def insert(self, count: int) -> None:
+        for _ in range(count):
+            self.docs.append({
+                "_id": len(self.docs), "n": len(self.docs),
+                "session_id": "s1", "timestamp": datetime.utcnow()
+            })
+
+    def watch(self, pipeline, resume_after=None, max_await_time_ms=None):
+        if not self.supports_change_streams:
+            raise OperationFailure("$changeStream is only supported on replica sets", code=40573)
+        if resume_after is not None and resume_after in self.invalid_tokens:
+            raise OperationFailure("resume token was not found", code=286)
+        position = resume_after["position"] if resume_after else len(self.docs)
+        return FakeChangeStream(self, position)
+
+    def find(self, query):
+        after = query["timestamp"]["$gt"]
+        return FakeCursor([d for d in self.docs if d["timestamp"] > after])
+
+
+class FakeStateCollection:
+    def __init__(self):
+        self.states: Dict[str, dict] = {}
+        self.writes = 0
+
+    async def find_one(self, query):
+        return self.states.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        self.writes += 1
+        state = self.states.setdefault(query["_id"], {})
+        state.update(update.get("$set", {}))
+        for key in update.get("$unset", {}):
+            state.pop(key, None)
+
+
+def build_monitor(events: FakeEventsCollection, state: FakeStateCollection,
+                  token_save_interval: float = 60, mode: str = "auto"):
+    monitor = ProgressMonitorService({"progress_events": events, "progress_monitor_state": state})
+    monitor.monitor_id = "test-monitor"
+    monitor.mode = mode
+    monitor.poll_interval = 0.01
+    monitor.token_save_interval = token_save_interval
+    monitor.delivered = []
+
+    async def record(event):
+        monitor.delivered.append(event["n"])
+
+    monitor._process_event = record
+    return monitor
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for condition"
+        await asyncio.sleep(0.01)
+
+
+def saved_token(state: FakeStateCollection) -> Optional[Dict[str, Any]]:
+    return state.states.get("test-monitor", {}).get("resume_token")
+
+
+async def test_token_writes_batched():
+    """Test 1: a burst of events costs one token write, plus one on stop"""
+    print("\n✓ Test 1: Resume Token Writes Are Batched")
+
+    events, state = FakeEventsCollection(), FakeStateCollection()
+    monitor = build_monitor(events, state, token_save_interval=60)
+    await monitor.start()
+    await wait_for(lambda: monitor.active_mode == "change_stream")
+
+    events.insert(200)
+    await wait_for(lambda: len(monitor.delivered) == 200)
+    assert state.writes <= 1, state.writes
+
+    await monitor.stop()
+    assert saved_token(state) == {"position": 200}, saved_token(state)
+    assert state.writes <= 2, state.writes
+    print(f"  ✓ 200 events, {state.writes} token writes")
+
+
+async def test_token_saved_when_idle():
+    """Test 2: the latest token is written once the interval passes, without new events"""
+    print("\n✓ Test 2: Token Saved on a Timer")
+
+    events, state = FakeEventsCollection(), FakeStateCollection()
+    monitor = build_monitor(events, state, token_save_interval=0.2)
+    await monitor.start()
+    await wait_for(lambda: monitor.active_mode == "change_stream")
+
+    events.insert(1)
+    await wait_for(lambda: saved_token(state) == {"position": 1})
+    events.insert(5)
+    await wait_for(lambda: len(monitor.delivered) == 6)
+    await wait_for(lambda: saved_token(state) == {"position": 6})
+    await monitor.stop()
+    print("  ✓ Token persisted while the stream was idle")
+
+
+async def test_resume_after_restart():
+    """Test 3: a new monitor continues after the saved token"""
+    print("\n✓ Test 3: Resume After Restart")
+
+    events, state = FakeEventsCollection(), FakeStateCollection()
+    first = build_monitor(events, state)
+    await first.start()
+    await wait_for(lambda: first.active_mode == "change_stream")
+    events.insert(10)
+    await wait_for(lambda: len(first.delivered) == 10)
+    await first.stop()
+
+    # Inserted while no monitor was running
+    events.insert(3)
+    second = build_monitor(events, state)
+    await second.start()
+    await wait_for(lambda: len(second.delivered) == 3)
+    events.insert(2)
+    await wait_for(lambda: len(second.delivered) == 5)
+    await second.stop()
+
+    assert second.delivered == [10, 11, 12, 13, 14], second.delivered
+    print("  ✓ Missed events delivered once, nothing re-broadcast")
+
+
+async def test_invalid_token_catches_up():
+    """Test 4: an unusable token is cleared and the recent window is replayed"""
+    print("\n✓ Test 4: Unusable Token Falls Back to Catch-up")
+
+    events, state = FakeEventsCollection(), FakeStateCollection()
+    events.insert(4)
+    state.states["test-monitor"] = {"resume_token": {"position": 1}}
+    events.invalid_tokens.append({"position": 1})
+
+    monitor = build_monitor(events, state)
+    await monitor.start()
+    await wait_for(lambda: len(monitor.delivered) == 4)
+    events.insert(1)
+    await wait_for(lambda: len(monitor.delivered) == 5)
+    await monitor.stop()
+
+    assert monitor.delivered == [0, 1, 2, 3, 4], monitor.delivered
+    assert saved_token(state) == {"position": 5}, saved_token(state)
+    print("  ✓ Token cleared, recent events caught up, new token saved")
+
+
+async def test_poll_fallback():
+    """Test 5: standalone MongoDB uses the polling loop"""
+    print("\n✓ Test 5: Polling Fallback")
+
+    events, state = FakeEventsCollection(supports_change_streams=False), FakeStateCollection()
+    monitor = build_monitor(events, state)
+    await monitor.start()
+    events.insert(3)
+    await wait_for(lambda: len(monitor.delivered) == 3)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert monitor.active_mode == "poll", monitor.active_mode
+    assert monitor.delivered == [0, 1, 2], monitor.delivered
+    assert state.writes == 0
+
+    # Forcing change streams surfaces the error instead of polling
+    forced = build_monitor(events, state, mode="change_stream")
+    await forced.start()
+    try:
+        await asyncio.wait_for(forced.monitor_task, timeout=2)
+        raise AssertionError("expected ChangeStreamUnavailable")
+    except Exception as e:
+        assert type(e).__name__ == "ChangeStreamUnavailable", e
+    print("  ✓ Polled events delivered once; forced mode fails loudly")
+
+
+async def run_all_tests():
+    """Run all progress monitor tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Progress Monitor Tests")
+    print("="*60)
+
+    tests = [
+        ("Batched Token Writes", test_token_writes_batched),
+        ("Timed Token Save", test_token_saved_when_idle),
+        ("Resume", test_resume_after_restart),
+        ("Unusable Token", test_invalid_token_catches_up),
+        ("Poll Fallback", test_poll_fallback),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
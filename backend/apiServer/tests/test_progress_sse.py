@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for per-connection SSE progress subscriptions
+
+Tests:
+1. A full queue evicts old plain progress and keeps success/error/knock events
+2. Closing a subscription wakes a pending get() with None, never an error
+3. The SSE stream ends when its session's progress is cleared
+4. A reconnect with Last-Event-ID replays missed events before going live
+
+Drives ProgressStreamManager and the /api/progress stream generator directly
+with fake session and event-queue services; no server or MongoDB needed.
+"""
+
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from api import progress_routes
+from services.sse.progress_sse import ProgressEvent, ProgressLevel, ProgressStreamManager
+
+
+class FakeChatHistoryService:
+    async def get_session(self, session_id):
+        return {"session_id": session_id}
+
+
+class FakeProgressEventQueue:
+    def __init__(self, events):
+        self.events = events
+        self.since = None
+
+    async def get_progress_events(self, session_id, since=None):
+        self.since = since
+        return self.events
+
+
+def fake_request(headers=None):
+    state = SimpleNamespace(chat_history_service=FakeChatHistoryService())
+    return SimpleNamespace(app=SimpleNamespace(state=state), headers=headers or {})
+
+
+def info(message: str, **details) -> ProgressEvent:
+    return ProgressEvent(ProgressLevel.INFO, message, details)
+
+
+async def test_overflow_keeps_important_events():
+    """Test 1: oldest droppable events are evicted first"""
+    print("\n✓ Test 1: Overflow Evicts Plain Progress Only")
+
+    manager = ProgressStreamManager(queue_size=3)
+    subscription = manager.subscribe("s1")
+    subscription.offer(ProgressEvent(ProgressLevel.SUCCESS, "done"))
+    subscription.offer(info("step 1"))
+    subscription.offer(info("knock", type="message_ready"))
+    subscription.offer(info("step 2"))
+    subscription.offer(info("step 3"))
+
+    messages = [(await subscription.get(timeout=0)).message for _ in range(subscription.pending())]
+    assert messages == ["done", "knock", "step 3"], messages
+    assert subscription.dropped == 2 and subscription.delivered == 3
+
+    # Nothing droppable left: the oldest event goes
+    for i in range(4):
+        subscription.offer(ProgressEvent(ProgressLevel.ERROR, f"error {i}"))
+    assert [e.message for e in subscription._events] == ["error 1", "error 2", "error 3"]
+    subscription.close()
+    assert manager.get_stats()["dropped"] == 3 and "s1" not in manager.subscribers
+    print("  ✓ success/error/knock events survived overflow")
+
+
+async def test_close_wakes_pending_get():
+    """Test 2: get() returns None once the subscription is closed"""
+    print("\n✓ Test 2: Close Wakes a Pending get()")
+
+    manager = ProgressStreamManager(queue_size=10)
+    subscription = manager.subscribe("s1")
+    waiter = asyncio.create_task(subscription.get(timeout=5))
+    await asyncio.sleep(0)
+
+    # An event arrives and the session is cleared before the waiter runs
+    subscription.offer(info("late"))
+    manager.clear("s1")
+    assert await asyncio.wait_for(waiter, timeout=1) is None
+
+    assert await subscription.get(timeout=5) is None
+    subscription.offer(info("after close"))
+    assert subscription.pending() == 0
+    print("  ✓ None returned immediately, no IndexError")
+
+
+async def test_stream_stops_when_cleared():
+    """Test 3: the route generator ends instead of heartbeating forever"""
+    print("\n✓ Test 3: Stream Ends After Clear")
+
+    manager = ProgressStreamManager(queue_size=10)
+    with patch.object(progress_routes, "progress_sse_manager", manager):
+        response = await progress_routes.stream_progress("s1", fake_request())
+        stream = response.body_iterator
+        assert "connected" in await stream.__anext__()
+
+        reader = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.01)
+        await manager.emit("s1", ProgressLevel.INFO, "working")
+        assert "working" in await asyncio.wait_for(reader, timeout=1)
+
+        reader = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.01)
+        await progress_routes.clear_progress("s1")
+        try:
+            await asyncio.wait_for(reader, timeout=1)
+            raise AssertionError("stream kept running after clear")
+        except StopAsyncIteration:
+            pass
+    assert manager.subscribers == {}
+    print("  ✓ Generator finished and subscription released")
+
+
+async def test_resume_replays_missed_events():
+    """Test 4: Last-Event-ID replays stored events, then live events follow"""
+    print("\n✓ Test 4: Resume with Last-Event-ID")
+
+    manager = ProgressStreamManager(queue_size=10)
+    missed = [
+        {"event_id": "e1", "timestamp": "2026-01-01T00:00:01", "message": "missed 1"},
+        {"event_id": "e2", "timestamp": "2026-01-01T00:00:02", "message": "missed 2"},
+    ]
+    event_queue = FakeProgressEventQueue(missed)
+    with patch.object(progress_routes, "progress_sse_manager", manager), \
+            patch.object(progress_routes, "get_progress_event_queue", lambda: event_queue):
+        response = await progress_routes.stream_progress("s1", fake_request({"last-event-id": "2026-01-01T00:00:00"}))
+        stream = response.body_iterator
+        frames = [await stream.__anext__() for _ in range(3)]
+
+        assert "connected" in frames[0]
+        assert frames[1].startswith("id: 2026-01-01T00:00:01\n") and "missed 1" in frames[1], frames[1]
+        assert "missed 2" in frames[2] and "event_id" not in frames[2], frames[2]
+        assert event_queue.since.isoformat() == "2026-01-01T00:00:00"
+
+        reader = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.01)
+        await manager.emit("s1", ProgressLevel.INFO, "live", {"_sse_id": "2026-01-01T00:00:03"})
+        live = await asyncio.wait_for(reader, timeout=1)
+        assert live.startswith("id: 2026-01-01T00:00:03\n") and "live" in live, live
+        await stream.aclose()
+    assert manager.subscribers == {}
+    print("  ✓ 2 missed events replayed before live delivery")
+
+
+async def run_all_tests():
+    """Run all progress SSE tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Progress SSE Subscription Tests")
+    print("="*60)
+
+    tests = [
+        ("Overflow", test_overflow_keeps_important_events),
+        ("Close", test_close_wakes_pending_get),
+        ("Stream Ends", test_stream_stops_when_cleared),
+        ("Resume", test_resume_replays_missed_events),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
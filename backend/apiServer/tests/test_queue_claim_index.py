@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Integration Tests for batched queue claiming against MongoDB
+
+Tests:
+1. The analysis claim query is answered by analysis_claim_idx (explain)
+2. The execution claim query is answered by queue_polling_idx (explain)
+3. dequeue_analysis_batch claims each job exactly once across workers
+4. Jobs whose lease expired are reclaimed; heartbeats keep leases alive
+5. Jobs whose lease expires on the last retry are failed, not requeued
+6. A worker that lost its lease cannot ack or nack the job
+
+Requires a running MongoDB (MONGO_URL, default mongodb://localhost:27017).
+Each run uses a throwaway database that is dropped afterwards.
+"""
+
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from shared.queue.analysis_queue import MongoAnalysisQueue
+from shared.queue.execution_queue import MongoDBExecutionQueue
+
+
+def winning_plan_indexes(plan: Dict[str, Any]) -> List[str]:
+    """Collect index names used anywhere in an explain plan tree"""
+    names = []
+    if "indexName" in plan:
+        names.append(plan["indexName"])
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            names.extend(winning_plan_indexes(plan[key]))
+    for stage in plan.get("inputStages", []):
+        names.extend(winning_plan_indexes(stage))
+    return names
+
+
+def has_stage(plan: Dict[str, Any], stage_name: str) -> bool:
+    if plan.get("stage") == stage_name:
+        return True
+    children = [plan[k] for k in ("inputStage", "queryPlan") if k in plan] + plan.get("inputStages", [])
+    return any(has_stage(child, stage_name) for child in children)
+
+
+async def enqueue_jobs(queue: MongoAnalysisQueue, count: int) -> List[str]:
+    return [
+        await queue.enqueue_analysis({
+            "session_id": f"claim-test-session-{i}",
+            "message_id": f"claim-test-message-{i}",
+            "user_question": f"Question {i}"
+        })
+        for i in range(count)
+    ]
+
+
+async def test_analysis_claim_uses_index(db):
+    """Test analysis claim query plan"""
+    print("\n✓ Test 1: Analysis Claim Query Uses analysis_claim_idx")
+
+    queue = MongoAnalysisQueue(db)
+    await queue.ensure_indexes()
+    await enqueue_jobs(queue, 20)
+
+    now = datetime.utcnow()
+    explain = await queue.collection.find(queue._claim_filter(now), {"_id": 1}).sort("created_at", 1).limit(5).explain()
+    plan = explain["queryPlanner"]["winningPlan"]
+
+    assert "analysis_claim_idx" in winning_plan_indexes(plan), f"Claim query not using analysis_claim_idx: {plan}"
+    assert not has_stage(plan, "SORT"), f"Claim query sorts in memory: {plan}"
+    print(f"  ✓ Winning plan uses {winning_plan_indexes(plan)} without in-memory sort")
+
+
+async def test_execution_claim_uses_index(db):
+    """Test execution claim query plan"""
+    print("\n✓ Test 2: Execution Claim Query Uses queue_polling_idx")
+
+    queue = MongoDBExecutionQueue(db, "claim_test_execution_queue")
+    await queue.ensure_indexes()
+    for i in range(20):
+        await queue.enqueue({"execution_id": f"claim-test-exec-{i}", "priority": 1 + i % 3})
+
+    explain = await queue.collection.find({"status": "pending"}, {"_id": 1}).sort(
+        [("priority", 1), ("created_at", 1)]
+    ).limit(5).explain()
+    plan = explain["queryPlanner"]["winningPlan"]
+
+    assert "queue_polling_idx" in winning_plan_indexes(plan), f"Claim query not using queue_polling_idx: {plan}"
+    assert not has_stage(plan, "SORT"), f"Claim query sorts in memory: {plan}"
+    print(f"  ✓ Winning plan uses {winning_plan_indexes(plan)} without in-memory sort")
+
+
+async def test_batch_claims_each_job_once(db):
+    """Test concurrent batch claims never hand out a job twice"""
+    print("\n✓ Test 3: Batch Claims Are Exclusive")
+
+    await db.analysis_queue.delete_many({})
+    queue = MongoAnalysisQueue(db)
+    job_ids = await enqueue_jobs(queue, 10)
+
+    batches = await asyncio.gather(*[
+        queue.dequeue_analysis_batch(f"worker-{w}", 4) for w in range(4)
+    ])
+    claimed = [job["job_id"] for batch in batches for job in batch]
+
+    assert len(claimed) == len(set(claimed)), "A job was claimed twice"
+    assert all(len(batch) <= 4 for batch in batches)
+
+    # Whatever was lost to races is still pending and claimable
+    rest = await queue.dequeue_analysis_batch("worker-final", 10)
+    claimed += [job["job_id"] for job in rest]
+    assert sorted(claimed) == sorted(job_ids), "Not every job was claimed exactly once"
+    print(f"  ✓ {len(job_ids)} jobs claimed exactly once across {len(batches) + 1} batches")
+
+
+async def test_expired_lease_reclaimed(db):
+    """Test expired leases are reclaimed and heartbeats extend them"""
+    print("\n✓ Test 4: Lease Expiry and Heartbeat")
+
+    await db.analysis_queue.delete_many({})
+    queue = MongoAnalysisQueue(db)
+    queue.lease_seconds = 1
+    kept, lost = await enqueue_jobs(queue, 2)
+
+    claimed = await queue.dequeue_analysis_batch("crashed-worker", 2)
+    assert len(claimed) == 2
+
+    # Only one job keeps heartbeating
+    await asyncio.sleep(0.6)
+    assert await queue.extend_leases("crashed-worker", [kept]) == 1
+    await asyncio.sleep(0.6)
+
+    queue._next_lease_sweep = datetime.min
+    reclaimed = await queue.dequeue_analysis_batch("healthy-worker", 2)
+    assert [job["job_id"] for job in reclaimed] == [lost], f"Expected only {lost} reclaimed, got {reclaimed}"
+    assert reclaimed[0]["retry_count"] == 1
+
+    # The original worker can no longer extend the lease it lost
+    assert await queue.extend_leases("crashed-worker", [lost]) == 0
+    print(f"  ✓ Expired job {lost} reclaimed, heartbeating job {kept} kept")
+
+
+async def test_expired_lease_out_of_retries(db):
+    """Test lease expiry on the last attempt fails the job"""
+    print("\n✓ Test 5: Lease Expiry Out of Retries")
+
+    await db.analysis_queue.delete_many({})
+    queue = MongoAnalysisQueue(db)
+    queue.lease_seconds = 1
+    queue.max_retries = 1
+    [job_id] = await enqueue_jobs(queue, 1)
+
+    for attempt in range(2):
+        assert len(await queue.dequeue_analysis_batch(f"hung-worker-{attempt}", 1)) == 1
+        await asyncio.sleep(1.1)
+        queue._next_lease_sweep = datetime.min
+        await queue._release_expired_leases(datetime.utcnow())
+
+    job = await queue.collection.find_one({"job_id": job_id})
+    assert job["status"] == "failed" and job["retry_count"] == 1, job
+    assert await queue.dequeue_analysis_batch("healthy-worker", 1) == []
+
+    executions = MongoDBExecutionQueue(db, "claim_test_retry_execution_queue")
+    executions.lease_seconds = 1
+    await executions.enqueue({"execution_id": "claim-test-retry-exec", "max_retries": 1})
+    assert await executions.dequeue("hung-worker")
+    await asyncio.sleep(1.1)
+    executions._next_lease_sweep = datetime.min
+    assert await executions.dequeue("healthy-worker") is None
+    execution = await executions.collection.find_one({"execution_id": "claim-test-retry-exec"})
+    assert execution["status"] == "failed", execution
+    print("  ✓ Analysis job and execution failed after their last lease expired")
+
+
+async def test_stale_worker_ack_ignored(db):
+    """Test ack/nack only apply for the worker holding the claim"""
+    print("\n✓ Test 6: Stale Worker Ack/Nack Ignored")
+
+    await db.analysis_queue.delete_many({})
+    queue = MongoAnalysisQueue(db)
+    queue.lease_seconds = 1
+    [job_id] = await enqueue_jobs(queue, 1)
+
+    await queue.dequeue_analysis_batch("slow-worker", 1)
+    await asyncio.sleep(1.1)
+    queue._next_lease_sweep = datetime.min
+    assert len(await queue.dequeue_analysis_batch("new-worker", 1)) == 1
+
+    assert not await queue.ack_analysis(job_id, {"stale": True}, worker_id="slow-worker")
+    assert not await queue.nack_analysis(job_id, "stale failure", worker_id="slow-worker")
+    job = await queue.collection.find_one({"job_id": job_id})
+    assert job["status"] == "claimed" and job["worker_id"] == "new-worker", job
+    assert await queue.ack_analysis(job_id, {"ok": True}, worker_id="new-worker")
+    assert not await queue.nack_analysis(job_id, "after completion", worker_id="new-worker")
+    assert (await queue.collection.find_one({"job_id": job_id}))["status"] == "completed"
+
+    executions = MongoDBExecutionQueue(db, "claim_test_ack_execution_queue")
+    executions.lease_seconds = 1
+    await executions.enqueue({"execution_id": "claim-test-ack-exec"})
+    await executions.dequeue("slow-worker")
+    await asyncio.sleep(1.1)
+    executions._next_lease_sweep = datetime.min
+    assert await executions.dequeue("new-worker")
+    assert not await executions.ack("claim-test-ack-exec", {"stale": True}, worker_id="slow-worker")
+    nack = await executions.nack("claim-test-ack-exec", "stale failure", worker_id="slow-worker")
+    assert not nack["success"] and not nack["is_final_attempt"], nack
+    assert await executions.ack("claim-test-ack-exec", {"ok": True}, worker_id="new-worker")
+    print("  ✓ Only the current holder could ack; acks after completion were ignored")
+
+
+async def run_all_tests():
+    """Run all queue claim tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Queue Batch Claim & Index Integration Tests")
+    print("="*60)
+
+    mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=2000)
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"\n⚠️ MongoDB not reachable at {mongo_url}, skipping: {e}")
+        return True
+
+    db_name = f"qna_ai_claim_test_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+
+    tests = [
+        ("Analysis Claim Index", test_analysis_claim_uses_index),
+        ("Execution Claim Index", test_execution_claim_uses_index),
+        ("Batch Claims Exclusive", test_batch_claims_each_job_once),
+        ("Lease Expiry", test_expired_lease_reclaimed),
+        ("Lease Expiry Out of Retries", test_expired_lease_out_of_retries),
+        ("Stale Worker Ack", test_stale_worker_ack_ignored),
+    ]
+
+    passed = 0
+    failed = 0
+
+    try:
+        for test_name, test_func in tests:
+            try:
+                await test_func(db)
+                passed += 1
+            except AssertionError as e:
+                print(f"\n❌ {test_name} FAILED: {e}")
+                failed += 1
+            except Exception as e:
+                print(f"\n❌ {test_name} ERROR: {e}")
+                import traceback
+                traceback.print_exc()
+                failed += 1
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tests for event-driven queue claiming (QueueNotifier + BaseQueueWorker)
+
+Tests:
+1. Each notification wakes one idle waiter, or is kept as a permit
+2. A local enqueue wakes an idle worker long before its back-off expires
+3. A change stream insert from another process wakes an idle worker
+4. A worker never runs more than max_concurrent_items items at once
+
+Uses an in-memory queue and a fake collection/change stream; no MongoDB needed.
+"""
+
+import os
+import sys
+import time
+import uuid
+import asyncio
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pymongo.errors import OperationFailure
+
+from shared.queue.base_worker import BaseQueueWorker
+from shared.queue.notifier import QueueNotifier, notify_enqueued
+
+
+class FakeChangeStream:
+    def __init__(self, events: asyncio.Queue):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.events.get()
+
+
+class FakeCollection:
+    def __init__(self, supports_change_streams: bool):
+        self.name = "queue"
+        self.full_name = f"test.queue_{uuid.uuid4().hex[:8]}"
+        self.supports_change_streams = supports_change_streams
+        self.events: asyncio.Queue = asyncio.Queue()
+
+    def watch(self, pipeline):
+        if not self.supports_change_streams:
+            raise OperationFailure("$changeStream is only supported on replica sets", code=40573)
+        return FakeChangeStream(self.events)
+
+
+class FakeQueue:
+    def __init__(self, supports_change_streams: bool = False):
+        self.collection = FakeCollection(supports_change_streams)
+        self.items: List[Dict[str, Any]] = []
+        self.enqueued = 0
+
+    def enqueue(self, count: int = 1, notify: bool = True) -> None:
+        for _ in range(count):
+            self.items.append({"id": self.enqueued})
+            self.enqueued += 1
+            if notify:
+                notify_enqueued(self.collection)
+
+
+class FakeWorker(BaseQueueWorker):
+    def __init__(self, queue: FakeQueue, max_concurrent_items: int = 3, work_seconds: float = 0.0):
+        super().__init__(queue, poll_interval=30, max_concurrent_items=max_concurrent_items, worker_type="test_worker")
+        # Without a notification an idle worker would sleep 30s
+        self.min_idle_delay = 30
+        self.work_seconds = work_seconds
+        self.processed: List[int] = []
+        self.running_items = 0
+        self.max_running = 0
+        self.claim_overflows = 0
+
+    async def _initialize_services(self):
+        pass
+
+    async def _dequeue_item(self) -> Optional[Dict[str, Any]]:
+        return self.queue.items.pop(0) if self.queue.items else None
+
+    async def _dequeue_items(self, n: int) -> List[Dict[str, Any]]:
+        if n + len(self.active_items) > self.max_concurrent_items:
+            self.claim_overflows += 1
+        claimed, self.queue.items = self.queue.items[:n], self.queue.items[n:]
+        return claimed
+
+    async def _process_item(self, item: Dict[str, Any]):
+        self.running_items += 1
+        self.max_running = max(self.max_running, self.running_items)
+        try:
+            await asyncio.sleep(self.work_seconds)
+            self.processed.append(item["id"])
+        finally:
+            self.running_items -= 1
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        await asyncio.sleep(0.005)
+
+
+async def run_worker(worker: FakeWorker, body) -> None:
+    task = asyncio.create_task(worker.start())
+    try:
+        await body()
+    finally:
+        await worker.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if worker.notifier is not None:
+            await worker.notifier.stop()
+
+
+async def test_notifier_wakeups_and_permits():
+    """Test 1: one wake-up per notification; unclaimed notifications become permits"""
+    print("\n✓ Test 1: Notifier Wake-ups and Permits")
+
+    notifier = QueueNotifier(FakeCollection(supports_change_streams=False))
+    waiters = [asyncio.create_task(notifier.wait(timeout=1)) for _ in range(3)]
+    await wait_for(lambda: notifier.get_stats()["idle_waiters"] == 3)
+    notifier.notify(2)
+    await wait_for(lambda: sum(w.done() for w in waiters) == 2)
+    assert await asyncio.wait_for(waiters[2], timeout=2) is False
+
+    notifier.notify()
+    start = time.monotonic()
+    assert await notifier.wait(timeout=5) is True
+    assert time.monotonic() - start < 0.1
+    assert await notifier.wait(timeout=0.01) is False
+
+    stats = notifier.get_stats()
+    assert stats["wakeups"] == 2 and stats["permits_used"] == 1 and stats["idle_waiters"] == 0, stats
+    print(f"  ✓ {stats}")
+
+
+async def test_local_enqueue_wakes_worker():
+    """Test 2: notify_enqueued wakes an idle worker without change streams"""
+    print("\n✓ Test 2: Local Enqueue Wakes the Worker")
+
+    queue = FakeQueue(supports_change_streams=False)
+    worker = FakeWorker(queue)
+
+    async def body():
+        await wait_for(lambda: worker.notifier is not None and worker.notifier.get_stats()["idle_waiters"] == 1)
+        start = time.monotonic()
+        queue.enqueue()
+        await wait_for(lambda: worker.processed == [0])
+        assert time.monotonic() - start < 0.5
+        assert worker.stats["notified_wakeups"] == 1 and worker.stats["timeout_wakeups"] == 0, worker.stats
+
+    await run_worker(worker, body)
+    print("  ✓ Item processed right after enqueue")
+
+
+async def test_change_stream_wakes_worker():
+    """Test 3: an insert seen on the change stream wakes the worker"""
+    print("\n✓ Test 3: Change Stream Insert Wakes the Worker")
+
+    queue = FakeQueue(supports_change_streams=True)
+    worker = FakeWorker(queue)
+
+    async def body():
+        await wait_for(lambda: worker.notifier is not None and worker.notifier.stream_active
+                       and worker.notifier.get_stats()["idle_waiters"] == 1)
+        # Enqueued by another process: no local notification
+        queue.enqueue(notify=False)
+        queue.collection.events.put_nowait({"operationType": "insert"})
+        await wait_for(lambda: worker.processed == [0])
+        assert worker.notifier.get_stats()["mode"] == "change_stream"
+
+    await run_worker(worker, body)
+    print("  ✓ Item processed after the change event")
+
+
+async def test_capacity_never_exceeded():
+    """Test 4: claims never exceed free slots; concurrency stays at the limit"""
+    print("\n✓ Test 4: Capacity Never Exceeded")
+
+    queue = FakeQueue(supports_change_streams=False)
+    worker = FakeWorker(queue, max_concurrent_items=3, work_seconds=0.02)
+
+    async def body():
+        queue.enqueue(20)
+        await wait_for(lambda: len(worker.processed) == 20)
+        # Burst after going idle again
+        queue.enqueue(10)
+        await wait_for(lambda: len(worker.processed) == 30)
+
+    await run_worker(worker, body)
+    assert worker.max_running == 3, worker.max_running
+    assert worker.claim_overflows == 0, worker.claim_overflows
+    assert sorted(worker.processed) == list(range(30)), worker.processed
+    print(f"  ✓ 30 items, at most {worker.max_running} at once")
+
+
+async def run_all_tests():
+    """Run all queue notifier tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Queue Notifier Tests")
+    print("="*60)
+
+    tests = [
+        ("Wake-ups and Permits", test_notifier_wakeups_and_permits),
+        ("Local Enqueue", test_local_enqueue_wakes_worker),
+        ("Change Stream", test_change_stream_wakes_worker),
+        ("Capacity", test_capacity_never_exceeded),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            await test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"\n❌ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ {test_name} ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm interpreter pool
+
+Tests:
+1. Scripts run like a cold interpreter (stdout, stderr, exit codes, tracebacks)
+2. A crashed worker raises WarmPoolError and is replaced
+3. Workers are recycled after max_jobs_per_worker jobs
+4. Cancelling a running job kills it and the worker runs the next job
+5. A cancel that arrives after its job finished does not disturb later jobs
+6. Timed-out jobs raise TimeoutExpired and the worker stays usable
+7. atexit handlers registered by a script run before the child exits
+
+Starts real warm workers (preloading only the standard library); needs os.fork.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import textwrap
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.execution.warm_pool import WarmInterpreterPool, WarmPoolError
+
+SCRIPTS = {
+    "hello.py": """
+        import sys
+        print("hello", *sys.argv[1:])
+    """,
+    "exit.py": """
+        import sys
+        print("to stderr", file=sys.stderr)
+        sys.exit(3)
+    """,
+    "error.py": """
+        def fail():
+            raise ValueError("bad input")
+        fail()
+    """,
+    "main_guard.py": """
+        if __name__ == "__main__":
+            print("main")
+    """,
+    "kill_worker.py": """
+        import os, signal
+        os.kill(os.getppid(), signal.SIGKILL)
+    """,
+    "sleep.py": """
+        import time
+        time.sleep(30)
+    """,
+    "exit_handler.py": """
+        import atexit, sys
+        def save():
+            with open(sys.argv[1], "w") as f:
+                f.write("saved")
+        atexit.register(save)
+        if len(sys.argv) > 2:
+            sys.exit(int(sys.argv[2]))
+    """,
+}
+
+
+def write_scripts(directory: str) -> dict:
+    paths = {}
+    for name, code in SCRIPTS.items():
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(textwrap.dedent(code))
+        paths[name] = path
+    return paths
+
+
+def run(pool: WarmInterpreterPool, path: str, *args, timeout: float = 10, cancel_event=None):
+    return pool.run(path, [path, *args], timeout=timeout, cancel_event=cancel_event)
+
+
+def wait_for_workers(pool: WarmInterpreterPool, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while pool.get_stats()["idle_workers"] < pool.size:
+        assert time.monotonic() < deadline, pool.get_stats()
+        time.sleep(0.05)
+
+
+def test_normal_runs(pool, scripts):
+    """Test 1: output, exit codes and tracebacks match a cold run"""
+    print("\n✓ Test 1: Normal Runs")
+
+    result = run(pool, scripts["hello.py"], "a", "b")
+    assert result.returncode == 0 and result.stdout == "hello a b\n", result
+
+    result = run(pool, scripts["exit.py"])
+    assert result.returncode == 3 and result.stderr == "to stderr\n", result
+
+    result = run(pool, scripts["error.py"])
+    assert result.returncode == 1 and "ValueError: bad input" in result.stderr, result
+    # Pool frames are dropped from the traceback
+    assert "warm_pool.py" not in result.stderr and "runpy" not in result.stderr, result.stderr
+
+    assert run(pool, scripts["main_guard.py"]).stdout == "main\n"
+    print("  ✓ stdout/stderr/exit codes/tracebacks as expected")
+
+
+def test_worker_crash_replaced(pool, scripts):
+    """Test 2: a worker that dies mid-job is replaced"""
+    print("\n✓ Test 2: Worker Crash and Restart")
+
+    started = pool.get_stats()["workers_started"]
+    try:
+        run(pool, scripts["kill_worker.py"])
+        raise AssertionError("expected WarmPoolError")
+    except WarmPoolError:
+        pass
+
+    wait_for_workers(pool)
+    stats = pool.get_stats()
+    assert stats["workers_crashed"] == 1 and stats["workers_started"] == started + 1, stats
+    assert stats["live_workers"] == pool.size, stats
+    assert run(pool, scripts["hello.py"], "again").stdout.strip() == "hello again"
+    print("  ✓ Replacement worker running jobs")
+
+
+def test_recycling(scripts):
+    """Test 3: a worker is replaced after max_jobs_per_worker jobs"""
+    print("\n✓ Test 3: Worker Recycling")
+
+    pool = WarmInterpreterPool(size=1, max_jobs_per_worker=2, preload_modules=["json"])
+    pool.start()
+    try:
+        for i in range(2):
+            assert run(pool, scripts["hello.py"]).returncode == 0
+        wait_for_workers(pool)
+        assert run(pool, scripts["hello.py"]).returncode == 0
+        stats = pool.get_stats()
+        assert stats["workers_recycled"] == 1 and stats["workers_started"] == 2, stats
+    finally:
+        pool.shutdown()
+    print("  ✓ Worker recycled after 2 jobs")
+
+
+def test_cancel_then_next_job(pool, scripts):
+    """Test 4: a cancelled job is killed; the next job gets its own result"""
+    print("\n✓ Test 4: Cancel, Then Run Another Job")
+
+    cancel_event = threading.Event()
+    threading.Timer(0.3, cancel_event.set).start()
+    start = time.monotonic()
+    result = run(pool, scripts["sleep.py"], cancel_event=cancel_event)
+    assert time.monotonic() - start < 5, "cancel did not stop the job"
+    assert result.returncode != 0, result
+
+    after = run(pool, scripts["hello.py"], "after-cancel")
+    assert after.returncode == 0 and after.stdout.strip() == "hello after-cancel", after
+    assert pool.get_stats()["jobs_cancelled"] == 1
+    print("  ✓ Job cancelled, next job returned its own output")
+
+
+def test_stray_cancel_ignored(pool, scripts):
+    """Test 5: a cancel for a finished job is not read as the next job"""
+    print("\n✓ Test 5: Late Cancel Ignored")
+
+    # Cancel set while the job runs; the job may finish before the worker sees it
+    for _ in range(5):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        run(pool, scripts["hello.py"], cancel_event=cancel_event)
+
+    # A cancel for a job that already finished, sitting in an idle worker's pipe
+    for worker in list(pool._idle.queue):
+        worker.conn.send({"type": "cancel", "id": -1})
+
+    for i in range(pool.size * 2):
+        result = run(pool, scripts["hello.py"], str(i))
+        assert result.returncode == 0 and result.stdout.strip() == f"hello {i}", result
+    print("  ✓ Later jobs unaffected")
+
+
+def test_timeout(pool, scripts):
+    """Test 6: a timeout raises, kills the child and leaves the worker usable"""
+    print("\n✓ Test 6: Timeout")
+
+    try:
+        run(pool, scripts["sleep.py"], timeout=0.5)
+        raise AssertionError("expected TimeoutExpired")
+    except subprocess.TimeoutExpired:
+        pass
+
+    result = run(pool, scripts["hello.py"], "after-timeout")
+    assert result.stdout.strip() == "hello after-timeout", result
+    print("  ✓ TimeoutExpired raised, next job ran")
+
+
+def test_exit_handlers(pool, scripts):
+    """Test 7: the script's atexit handlers run despite os._exit"""
+    print("\n✓ Test 7: atexit Handlers")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for args, returncode in (((), 0), (("4",), 4)):
+            marker = os.path.join(directory, f"marker_{returncode}")
+            result = run(pool, scripts["exit_handler.py"], marker, *args)
+            assert result.returncode == returncode, result
+            with open(marker) as f:
+                assert f.read() == "saved"
+    print("  ✓ Handlers ran on normal exit and sys.exit")
+
+
+def run_all_tests():
+    """Run all warm pool tests"""
+
+    print("\n" + "="*60)
+    print("🧪 Warm Interpreter Pool Tests")
+    print("="*60)
+
+    if not WarmInterpreterPool.is_supported():
+        print("⚠️ os.fork not available, skipping")
+        return True
+
+    tests = [
+        ("Normal Runs", test_normal_runs),
+        ("Worker Crash", test_worker_crash_replaced),
+        ("Recycling", lambda pool, scripts: test_recycling(scripts)),
+        ("Cancel", test_cancel_then_next_job),
+        ("Late Cancel", test_stray_cancel_ignored),
+        ("Timeout", test_timeout),
+        ("Exit Handlers", test_exit_handlers),
+    ]
+
+    passed = 0
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        scripts = write_scripts(directory)
+        pool = WarmInterpreterPool(size=2, max_jobs_per_worker=100, preload_modules=["json"])
+        pool.start()
+        try:
+            for test_name, test_func in tests:
+                try:
+                    test_func(pool, scripts)
+                    passed += 1
+                except AssertionError as e:
+                    print(f"\n❌ {test_name} FAILED: {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"\n❌ {test_name} ERROR: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    failed += 1
+        finally:
+            pool.shutdown()
+
+    print("\n" + "="*60)
+    print(f"📊 Test Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -15,4 +15,7 @@ from .risk import *
 from .signals import *
 from .analysis import *
 
+# Cross-sectional batch API (analytics.batch.apply), kept out of the flat namespace
+from . import batch
+
 __version__ = "2.0.0"
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Batch (Cross-Sectional) Analytics Module
+
+Computes indicators and return statistics for a whole universe of symbols in
+one call, over a time x symbol price matrix, instead of calling the
+single-series analytics functions once per symbol.
+
+Key Functionality:
+    - apply(): run an indicator over every column of a DataFrame / 2-D array
+    - TA-Lib indicators (rsi, sma, ema, roc, macd, bollinger_bands, atr)
+      computed per column on raw float64 arrays
+    - Return statistics (returns_metrics, risk_metrics) reduced over the
+      time axis for all symbols at once
+
+Example Usage:
+    >>> from analytics import batch
+    >>> closes = pd.DataFrame({"AAPL": aapl_close, "MSFT": msft_close})
+    >>> rsi = batch.apply("rsi", closes, period=14)
+    >>> bands = batch.apply("bollinger_bands", closes, period=20, std_dev=2)
+    >>> bands["upper"].iloc[-1]
+
+Note:
+    - Column j of a result equals the single-series function's output for
+      symbol j (NaN rows are skipped per column, as validate_price_data does)
+    - Results are raw frames, not standardize_output dicts
+    - Not part of the auto-discovered function set; use analytics.batch.apply
+"""
+
+from .cross_sectional import apply, INDICATORS
+
+__all__ = ["apply", "INDICATORS"]
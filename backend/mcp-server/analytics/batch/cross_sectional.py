@@ -0,0 +1,259 @@
+"""Cross-sectional indicator kernels over a time x symbol matrix.
+
+Screens and universe-wide scripts used to call calculate_rsi / calculate_atr /
+calculate_returns_metrics once per symbol, paying for input validation, a
+pandas Series round trip and standardize_output on every call. Here the whole
+matrix is converted to one float64 array and each indicator is computed
+directly: TA-Lib runs on each column's raw values, and return statistics are
+reduced over the time axis for all symbols at once.
+
+Columns may have different histories (late listings, delistings, gaps). As in
+the single-series functions, which drop NaN before computing, each column is
+computed on its valid rows and the values are written back to those rows, so
+column j of a batch result equals the single-series result for symbol j.
+
+This module is used by ``analytics.batch.apply`` and is not part of the
+auto-discovered analytics function set.
+"""
+
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import talib
+
+MatrixLike = Union[pd.DataFrame, np.ndarray, Mapping[str, Any]]
+
+
+class BatchIndicator(NamedTuple):
+    """Registry entry for one batch indicator"""
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    kernel: Callable[..., Tuple[np.ndarray, ...]]
+    per_column: bool = True
+
+
+# ---------------------------------------------------------------------------
+# Per-column TA-Lib kernels: 1-D float64 arrays in, tuple of 1-D arrays out
+# ---------------------------------------------------------------------------
+
+def _rsi(close: np.ndarray, period: int = 14) -> Tuple[np.ndarray]:
+    return (talib.RSI(close, timeperiod=period),)
+
+
+def _sma(close: np.ndarray, period: int = 20) -> Tuple[np.ndarray]:
+    return (talib.SMA(close, timeperiod=period),)
+
+
+def _ema(close: np.ndarray, period: int = 20) -> Tuple[np.ndarray]:
+    return (talib.EMA(close, timeperiod=period),)
+
+
+def _roc(close: np.ndarray, period: int = 10) -> Tuple[np.ndarray]:
+    return (talib.ROC(close, timeperiod=period),)
+
+
+def _macd(close: np.ndarray, fast_period: int = 12, slow_period: int = 26,
+          signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return talib.MACD(close, fastperiod=fast_period, slowperiod=slow_period, signalperiod=signal_period)
+
+
+def _bollinger_bands(close: np.ndarray, period: int = 20,
+                     std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return talib.BBANDS(close, timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev)
+
+
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> Tuple[np.ndarray]:
+    return (talib.ATR(high, low, close, timeperiod=period),)
+
+
+# ---------------------------------------------------------------------------
+# Whole-matrix return kernels: 2-D (time x symbol) returns in, 1-D per symbol out
+# ---------------------------------------------------------------------------
+
+def _returns_metrics(returns: np.ndarray, annualization: int = 252) -> Tuple[np.ndarray, ...]:
+    valid = ~np.isnan(returns)
+    n = valid.sum(axis=0)
+    growth = np.prod(np.where(valid, 1 + returns, 1.0), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = np.where(n > 0, growth - 1, np.nan)
+        annual = np.where(n > 0, growth ** (annualization / n) - 1, np.nan)
+    return total, annual, n.astype(np.float64)
+
+
+def _risk_metrics(returns: np.ndarray, risk_free_rate: float = 0.02,
+                  annualization: int = 252) -> Tuple[np.ndarray, ...]:
+    valid = ~np.isnan(returns)
+    n = valid.sum(axis=0)
+    filled = np.where(valid, returns, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=0) / n
+        centered = np.where(valid, returns - mean, 0.0)
+        std = np.sqrt((centered * centered).sum(axis=0) / (n - 1))
+        std = np.where(n >= 2, std, np.nan)
+        volatility = std * np.sqrt(annualization)
+        sharpe = (mean - risk_free_rate) / std * np.sqrt(annualization)
+
+    # Wealth path from 100 with the starting point included (empyrical.max_drawdown);
+    # missing returns leave wealth unchanged so they cannot create a drawdown
+    wealth = np.empty((returns.shape[0] + 1, returns.shape[1]))
+    wealth[0] = 100
+    np.cumprod(np.where(valid, 1 + returns, 1.0), axis=0, out=wealth[1:])
+    wealth[1:] *= 100
+    peaks = np.maximum.accumulate(wealth, axis=0)
+    max_drawdown = ((wealth - peaks) / peaks).min(axis=0)
+    max_drawdown = np.where(n > 0, max_drawdown, np.nan)
+    return volatility, sharpe, max_drawdown
+
+
+INDICATORS: Dict[str, BatchIndicator] = {
+    "rsi": BatchIndicator(("close",), ("rsi",), _rsi),
+    "sma": BatchIndicator(("close",), ("sma",), _sma),
+    "ema": BatchIndicator(("close",), ("ema",), _ema),
+    "roc": BatchIndicator(("close",), ("roc",), _roc),
+    "macd": BatchIndicator(("close",), ("macd", "signal", "histogram"), _macd),
+    "bollinger_bands": BatchIndicator(("close",), ("upper", "middle", "lower"), _bollinger_bands),
+    "atr": BatchIndicator(("high", "low", "close"), ("atr",), _atr),
+    "returns_metrics": BatchIndicator(("returns",), ("total_return", "annual_return", "num_observations"),
+                                      _returns_metrics, per_column=False),
+    "risk_metrics": BatchIndicator(("returns",), ("volatility", "sharpe_ratio", "max_drawdown"),
+                                   _risk_metrics, per_column=False),
+}
+
+# Names of the single-series functions each batch indicator reproduces
+ALIASES = {
+    "calculate_rsi": "rsi",
+    "calculate_sma": "sma",
+    "calculate_ema": "ema",
+    "calculate_roc": "roc",
+    "calculate_macd": "macd",
+    "calculate_bollinger_bands": "bollinger_bands",
+    "calculate_atr": "atr",
+    "calculate_returns_metrics": "returns_metrics",
+    "calculate_risk_metrics": "risk_metrics",
+}
+
+
+def _to_frame(data: Any) -> pd.DataFrame:
+    """One time x symbol matrix as a DataFrame (ndarray columns are numbered)"""
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, np.ndarray):
+        if data.ndim != 2:
+            raise ValueError(f"Price matrix must be 2-D (time x symbol), got {data.ndim}-D")
+        return pd.DataFrame(data)
+    if isinstance(data, Mapping):
+        # symbol -> Series / sequence, aligned on the union of their indexes
+        return pd.DataFrame(dict(data))
+    raise ValueError(f"Unsupported price matrix type: {type(data)}")
+
+
+def _field_frames(price_matrix: MatrixLike, inputs: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Resolve the matrices an indicator needs, aligned on one index and symbol set.
+
+    Single-input indicators take the matrix itself. OHLC indicators take a
+    mapping of field -> matrix or a DataFrame with (field, symbol) MultiIndex
+    columns; fields are matched case-insensitively ('close' or 'Close').
+    """
+    if isinstance(price_matrix, pd.DataFrame) and isinstance(price_matrix.columns, pd.MultiIndex):
+        fields = {str(key).lower(): price_matrix[key] for key in price_matrix.columns.get_level_values(0).unique()}
+    elif isinstance(price_matrix, Mapping) and any(str(key).lower() in inputs for key in price_matrix):
+        fields = {str(key).lower(): _to_frame(value) for key, value in price_matrix.items()}
+    elif len(inputs) == 1:
+        return {inputs[0]: _to_frame(price_matrix)}
+    else:
+        raise ValueError(f"Indicator needs {list(inputs)} matrices, pass a mapping of field -> matrix")
+
+    missing = [field for field in inputs if field not in fields]
+    if missing:
+        raise ValueError(f"Missing {missing} matrices; got {sorted(fields)}")
+
+    frames = [fields[field] for field in inputs]
+    reference = frames[0]
+    for frame in frames[1:]:
+        if not (frame.index.equals(reference.index) and frame.columns.equals(reference.columns)):
+            frames = [f.reindex(index=reference.index, columns=reference.columns) for f in frames]
+            break
+    return dict(zip(inputs, frames))
+
+
+def _compute_columns(spec: BatchIndicator, arrays: Sequence[np.ndarray], params: Dict[str, Any]) -> Tuple[np.ndarray, ...]:
+    """Run a per-column kernel over every symbol, compacting NaN rows per column"""
+    n_rows, n_cols = arrays[0].shape
+    # Column-major so every symbol's column is a contiguous array for TA-Lib
+    outputs = tuple(np.full((n_rows, n_cols), np.nan, order="F") for _ in spec.outputs)
+    valid = np.ones((n_rows, n_cols), dtype=bool)
+    for array in arrays:
+        valid &= ~np.isnan(array)
+
+    for j in range(n_cols):
+        rows = valid[:, j]
+        count = int(rows.sum())
+        if count == 0:
+            continue
+        if count == n_rows:
+            columns = [array[:, j] for array in arrays]
+        else:
+            columns = [array[rows, j] for array in arrays]
+        results = spec.kernel(*columns, **params)
+        for out, values in zip(outputs, results):
+            if count == n_rows:
+                out[:, j] = values
+            else:
+                out[rows, j] = values
+    return outputs
+
+
+def apply(indicator: Union[str, Callable], price_matrix: MatrixLike, **params) -> pd.DataFrame:
+    """Compute an indicator for every symbol of a time x symbol matrix at once.
+
+    Args:
+        indicator: Batch indicator name (see INDICATORS) or the single-series
+            function it mirrors, e.g. calculate_rsi or "calculate_rsi".
+        price_matrix: Time x symbol prices as a DataFrame, 2-D ndarray or a
+            mapping of symbol -> Series. "atr" takes a mapping of
+            "high"/"low"/"close" -> matrix or a DataFrame with (field, symbol)
+            MultiIndex columns. "returns_metrics" and "risk_metrics" take a
+            matrix of periodic returns.
+        **params: Indicator parameters, named as in the single-series
+            functions (period, std_dev, fast_period, risk_free_rate, ...).
+
+    Returns:
+        pd.DataFrame: For time-series indicators, a frame on the input index
+        with one column per symbol; multi-output indicators (macd,
+        bollinger_bands) have (output, symbol) MultiIndex columns so that
+        ``result["upper"]`` is a time x symbol frame. Return statistics give
+        one row per metric and one column per symbol. Rows before an
+        indicator's warm-up and rows with missing input are NaN.
+
+    Raises:
+        ValueError: If the indicator is unknown or the matrix has the wrong shape.
+
+    Example:
+        >>> closes = pd.DataFrame({"AAPL": aapl_close, "MSFT": msft_close, "SPY": spy_close})
+        >>> rsi = apply("rsi", closes, period=14)
+        >>> oversold = rsi.iloc[-1][rsi.iloc[-1] < 30].index.tolist()
+        >>> bands = apply(calculate_bollinger_bands, closes, period=20, std_dev=2)
+        >>> stats = apply("risk_metrics", closes.pct_change())
+    """
+    name = getattr(indicator, "__name__", indicator)
+    name = ALIASES.get(name, name)
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown batch indicator {indicator!r}; supported: {sorted(INDICATORS)}")
+    spec = INDICATORS[name]
+
+    frames = _field_frames(price_matrix, spec.inputs)
+    reference = frames[spec.inputs[0]]
+    arrays = [frames[field].to_numpy(dtype=np.float64, na_value=np.nan) for field in spec.inputs]
+
+    if not spec.per_column:
+        results = spec.kernel(*arrays, **params)
+        return pd.DataFrame(np.vstack(results), index=list(spec.outputs), columns=reference.columns)
+
+    outputs = _compute_columns(spec, [np.asfortranarray(array) for array in arrays], params)
+    if len(outputs) == 1:
+        return pd.DataFrame(outputs[0], index=reference.index, columns=reference.columns)
+    return pd.concat(
+        [pd.DataFrame(values, index=reference.index, columns=reference.columns) for values in outputs],
+        axis=1, keys=list(spec.outputs)
+    )
@@ -0,0 +1 @@
+# Tests for analytics.batch module
@@ -0,0 +1,130 @@
+"""
+Unit tests for the cross-sectional batch API.
+
+Checks that every column of a batch result equals the single-series analytics
+function for that symbol, including ragged histories, OHLC inputs and
+multi-output indicators.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Import functions to test
+from .. import apply, INDICATORS
+from ...indicators.momentum.indicators import calculate_rsi, calculate_macd
+from ...indicators.volatility.indicators import calculate_atr, calculate_bollinger_bands
+from ...performance.metrics import calculate_returns_metrics, calculate_risk_metrics
+
+
+class TestBatchApply(unittest.TestCase):
+    """Test batch results against per-symbol calls"""
+
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(19)
+        self.dates = pd.date_range('2022-01-03', periods=300, freq='B')
+        self.symbols = ["AAPL", "MSFT", "SPY", "QQQ"]
+        returns = rng.normal(0.0004, 0.015, (len(self.dates), len(self.symbols)))
+        self.closes = pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=self.dates, columns=self.symbols)
+        spread = np.abs(rng.normal(0, 0.01, self.closes.shape)) * self.closes.values
+        self.highs = self.closes + spread
+        self.lows = self.closes - spread
+
+    def ragged(self) -> pd.DataFrame:
+        """Late listing, delisting and a gap"""
+        closes = self.closes.copy()
+        closes.iloc[:60, 1] = np.nan
+        closes.iloc[250:, 2] = np.nan
+        closes.iloc[100:103, 3] = np.nan
+        return closes
+
+    def test_rsi_matches_single_series(self):
+        """Each RSI column equals calculate_rsi on that symbol"""
+        for closes in (self.closes, self.ragged()):
+            result = apply("rsi", closes, period=14)
+            self.assertEqual(list(result.columns), self.symbols)
+            self.assertTrue(result.index.equals(self.dates))
+            for symbol in self.symbols:
+                expected = calculate_rsi(closes[symbol], period=14)["rsi"]
+                pd.testing.assert_series_equal(result[symbol].dropna(), expected, check_names=False)
+
+    def test_bollinger_bands_multi_output(self):
+        """Band outputs are (output, symbol) columns"""
+        result = apply("bollinger_bands", self.ragged(), period=20, std_dev=2)
+        self.assertEqual(list(result.columns.get_level_values(0).unique()), ["upper", "middle", "lower"])
+        for symbol in self.symbols:
+            expected = calculate_bollinger_bands(self.ragged()[symbol], period=20, std_dev=2)
+            for output, key in [("upper", "upper_band"), ("middle", "middle_band"), ("lower", "lower_band")]:
+                pd.testing.assert_series_equal(result[output][symbol].dropna(), expected[key], check_names=False)
+
+    def test_macd_by_function(self):
+        """Single-series functions are accepted in place of names"""
+        result = apply(calculate_macd, self.closes, fast_period=12, slow_period=26, signal_period=9)
+        expected = calculate_macd(self.closes["SPY"])
+        self.assertAlmostEqual(result["macd"]["SPY"].iloc[-1], expected["macd_line"].iloc[-1], places=12)
+
+    def test_atr_from_field_mapping(self):
+        """ATR takes high/low/close matrices as a mapping or MultiIndex frame"""
+        fields = {"high": self.highs, "low": self.lows, "close": self.closes}
+        result = apply("atr", fields, period=14)
+        multi = apply("atr", pd.concat(fields, axis=1), period=14)
+        pd.testing.assert_frame_equal(result, multi)
+        for symbol in self.symbols:
+            ohlc = pd.DataFrame({"high": self.highs[symbol], "low": self.lows[symbol], "close": self.closes[symbol]})
+            expected = calculate_atr(ohlc, period=14)["atr"]
+            pd.testing.assert_series_equal(result[symbol].dropna(), expected, check_names=False)
+        with self.assertRaises(ValueError):
+            apply("atr", self.closes)
+
+    def test_return_statistics(self):
+        """Return and risk metrics match the single-series functions per symbol"""
+        returns = self.ragged().pct_change(fill_method=None)
+        performance = apply("returns_metrics", returns)
+        risk = apply("risk_metrics", returns, risk_free_rate=0.0001)
+        self.assertEqual(list(performance.columns), self.symbols)
+        for symbol in self.symbols:
+            series = returns[symbol].dropna()
+            expected = calculate_returns_metrics(series)
+            for metric in ("total_return", "annual_return", "num_observations"):
+                self.assertTrue(np.isclose(performance.loc[metric, symbol], expected[metric], rtol=1e-10), metric)
+            expected = calculate_risk_metrics(series, risk_free_rate=0.0001)
+            for metric in ("volatility", "sharpe_ratio", "max_drawdown"):
+                self.assertTrue(np.isclose(risk.loc[metric, symbol], expected[metric], rtol=1e-10), metric)
+
+    def test_risk_metrics_default_rate(self):
+        """Without a risk_free_rate the batch Sharpe uses the single-series default"""
+        returns = self.closes.pct_change(fill_method=None)
+        risk = apply("risk_metrics", returns)
+        for symbol in self.symbols:
+            expected = calculate_risk_metrics(returns[symbol].dropna())
+            self.assertTrue(np.isclose(risk.loc["sharpe_ratio", symbol], expected["sharpe_ratio"], rtol=1e-10))
+
+    def test_ndarray_and_empty_columns(self):
+        """2-D arrays are accepted and all-NaN columns stay NaN"""
+        values = self.closes.to_numpy().copy()
+        values[:, 0] = np.nan
+        result = apply("sma", values, period=5)
+        self.assertEqual(result.shape, values.shape)
+        self.assertTrue(result[0].isna().all())
+        np.testing.assert_allclose(result[1].iloc[4:], self.closes["MSFT"].rolling(5).mean().iloc[4:], rtol=1e-12)
+
+    def test_unknown_indicator(self):
+        """Unknown indicators and 1-D input are rejected"""
+        with self.assertRaises(ValueError):
+            apply("stochastic", self.closes)
+        with self.assertRaises(ValueError):
+            apply("rsi", self.closes["SPY"].to_numpy())
+        self.assertIn("rsi", INDICATORS)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Batch Analytics Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Batch analytics tests completed!")
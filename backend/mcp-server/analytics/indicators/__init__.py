@@ -9,6 +9,8 @@ Modules:
     momentum: All momentum indicators (RSI, MACD, Stochastic, ADX, etc.)
     volatility: All volatility indicators (ATR, Bollinger Bands, etc.)
     volume: All volume indicators (OBV, MFI, A/D Line, etc.)
+    streaming: Incremental indicator state (SMA, EMA, RSI, MACD, Bollinger, ATR, OBV) for
+        bar-by-bar updates and reruns that only process new bars (imported explicitly)
 
 Available Indicators:
     Trend Indicators (from technical module):
@@ -0,0 +1,485 @@
+"""Incremental (streaming) indicator state.
+
+The calculate_* indicator functions recompute from the full history on every
+call. When a saved analysis is rerun and only today's bar is new, the
+indicator objects here carry their running state forward instead:
+``update(bar)`` consumes one bar and returns the current value, and the state
+round-trips through JSON so it can be stored next to the saved analysis.
+
+Each class reproduces the TA-Lib recurrence (seeding, smoothing and zero
+guards) of the function it mirrors, so feeding a series bar by bar gives the
+same values as the batch function on the whole series:
+
+    IncrementalSMA            calculate_sma             talib.SMA
+    IncrementalEMA            calculate_ema             talib.EMA
+    IncrementalRSI            calculate_rsi             talib.RSI
+    IncrementalMACD           calculate_macd            talib.MACD
+    IncrementalBollingerBands calculate_bollinger_bands talib.BBANDS
+    IncrementalATR            calculate_atr             talib.ATR
+    IncrementalOBV            calculate_obv             talib.OBV
+
+IndicatorStateStore groups named indicators into one JSON document. Inside a
+script run by the execution worker, get_indicator_state_store() returns the
+store for the saved analysis (path in ANALYTICS_INDICATOR_STATE) and saves it
+when the script exits; the worker persists it with the script.
+
+This module is used by analysis scripts and the execution worker and is not
+part of the auto-discovered analytics function set.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding the state file of the analysis being run
+INDICATOR_STATE_ENV = "ANALYTICS_INDICATOR_STATE"
+
+# Bar timestamp fields, in lookup order (StandardBar, EODHD, Alpaca)
+TIMESTAMP_FIELDS = ("timestamp", "date", "t")
+
+# TA-Lib's TA_IS_ZERO / TA_IS_ZERO_OR_NEG tolerance
+_TA_EPSILON = 0.00000001
+
+INDICATOR_TYPES: Dict[str, Type["IncrementalIndicator"]] = {}
+
+
+def _bar_field(bar: Any, field: str) -> float:
+    """Read a price field from a number, bar dict or bar object"""
+    if isinstance(bar, (int, float)):
+        if field != "close":
+            raise ValueError(f"Indicator needs '{field}', got a bare price")
+        return float(bar)
+    if isinstance(bar, dict):
+        if field in bar:
+            return float(bar[field])
+        if field.title() in bar:
+            return float(bar[field.title()])
+        if field[0] in bar:  # Alpaca short keys (o/h/l/c/v)
+            return float(bar[field[0]])
+        raise ValueError(f"Bar has no '{field}' value")
+    return float(getattr(bar, field))
+
+
+def _bar_timestamp(bar: Any) -> Optional[str]:
+    if isinstance(bar, dict):
+        for field in TIMESTAMP_FIELDS:
+            if bar.get(field) is not None:
+                return str(bar[field])
+        return None
+    value = getattr(bar, "timestamp", None)
+    return None if value is None else str(value)
+
+
+class IncrementalIndicator:
+    """Base class: one bar in, current value out, JSON-serializable state.
+
+    Subclasses define ``kind``, ``_update(bar)`` and the names of their state
+    attributes in ``_state_fields``.
+    """
+
+    kind = ""
+    _state_fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            INDICATOR_TYPES[cls.kind] = cls
+
+    def __init__(self, **params):
+        self.params = params
+        self.count = 0
+        self.value: Any = None
+        self.last_timestamp: Optional[str] = None
+
+    def update(self, bar: Any) -> Any:
+        """Consume one bar (price, bar dict or StandardBar) and return the current value.
+
+        Returns None until the indicator's warm-up period is complete.
+        """
+        self.value = self._update(bar)
+        self.count += 1
+        timestamp = _bar_timestamp(bar)
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+        return self.value
+
+    def update_bars(self, bars: Iterable[Any]) -> List[Any]:
+        """Consume only the bars newer than the last one seen.
+
+        Bars must be in ascending time order with ISO-format timestamps (as
+        returned by the financial vendors). Returns the values for the new
+        bars; an empty list if there were none.
+        """
+        values = []
+        for bar in bars:
+            timestamp = _bar_timestamp(bar)
+            if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                continue
+            values.append(self.update(bar))
+        return values
+
+    def _update(self, bar: Any) -> Any:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {}
+        for name in self._state_fields:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, deque) else value
+        return {
+            "kind": self.kind,
+            "params": self.params,
+            "count": self.count,
+            "value": self.value,
+            "last_timestamp": self.last_timestamp,
+            "state": state,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IncrementalIndicator":
+        kind = data.get("kind")
+        if kind not in INDICATOR_TYPES:
+            raise ValueError(f"Unknown indicator kind: {kind}")
+        indicator = INDICATOR_TYPES[kind](**data.get("params", {}))
+        indicator.count = data.get("count", 0)
+        indicator.value = data.get("value")
+        indicator.last_timestamp = data.get("last_timestamp")
+        for name, value in data.get("state", {}).items():
+            current = getattr(indicator, name)
+            setattr(indicator, name, deque(value, maxlen=current.maxlen) if isinstance(current, deque) else value)
+        return indicator
+
+
+class IncrementalSMA(IncrementalIndicator):
+    """Simple moving average (talib.SMA)"""
+
+    kind = "sma"
+    _state_fields = ("window", "total")
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self.period = period
+        self.window: deque = deque()
+        self.total = 0.0
+
+    def _update(self, bar: Any) -> Optional[float]:
+        price = _bar_field(bar, "close")
+        # Same summation order as TA-Lib: add, read, then drop the trailing value
+        self.total += price
+        self.window.append(price)
+        if len(self.window) < self.period:
+            return None
+        value = self.total / self.period
+        self.total -= self.window.popleft()
+        return value
+
+
+class IncrementalEMA(IncrementalIndicator):
+    """Exponential moving average seeded with the first period's SMA (talib.EMA)"""
+
+    kind = "ema"
+    _state_fields = ("seed_total", "ema")
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.seed_total = 0.0
+        self.ema: Optional[float] = None
+
+    def _update(self, bar: Any) -> Optional[float]:
+        price = _bar_field(bar, "close")
+        if self.ema is None:
+            self.seed_total += price
+            if self.count + 1 < self.period:
+                return None
+            self.ema = self.seed_total / self.period
+        else:
+            self.ema = (price - self.ema) * self.k + self.ema
+        return self.ema
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """Relative strength index with Wilder smoothing (talib.RSI)"""
+
+    kind = "rsi"
+    _state_fields = ("previous", "gain", "loss")
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        self.period = period
+        self.previous: Optional[float] = None
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def _update(self, bar: Any) -> Optional[float]:
+        price = _bar_field(bar, "close")
+        if self.previous is None:
+            self.previous = price
+            return None
+        change = price - self.previous
+        self.previous = price
+
+        if self.count <= self.period:
+            # Seed: simple average of the first period changes
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            if self.count < self.period:
+                return None
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= self.period - 1
+            self.gain *= self.period - 1
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.loss /= self.period
+            self.gain /= self.period
+
+        total = self.gain + self.loss
+        return 100 * (self.gain / total) if not -_TA_EPSILON < total < _TA_EPSILON else 0.0
+
+
+class IncrementalMACD(IncrementalIndicator):
+    """MACD line, signal and histogram (talib.MACD).
+
+    As in TA-Lib both EMAs are seeded at bar ``slow_period``: the slow EMA with
+    the SMA of the first slow_period closes, the fast EMA with the SMA of the
+    last fast_period of them. Values are returned once the signal EMA is seeded.
+    """
+
+    kind = "macd"
+    _state_fields = ("seed_prices", "fast_ema", "slow_ema", "signal_seed_total", "signal_count", "signal_ema")
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        super().__init__(fast_period=fast_period, slow_period=slow_period, signal_period=signal_period)
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.k_fast = 2.0 / (fast_period + 1)
+        self.k_slow = 2.0 / (slow_period + 1)
+        self.k_signal = 2.0 / (signal_period + 1)
+        self.seed_prices: deque = deque()
+        self.fast_ema: Optional[float] = None
+        self.slow_ema: Optional[float] = None
+        self.signal_seed_total = 0.0
+        self.signal_count = 0
+        self.signal_ema: Optional[float] = None
+
+    def _update(self, bar: Any) -> Optional[Dict[str, float]]:
+        price = _bar_field(bar, "close")
+        if self.slow_ema is None:
+            self.seed_prices.append(price)
+            if len(self.seed_prices) < self.slow_period:
+                return None
+            prices = list(self.seed_prices)
+            self.slow_ema = sum(prices) / self.slow_period
+            fast_total = 0.0
+            for value in prices[self.slow_period - self.fast_period:]:
+                fast_total += value
+            self.fast_ema = fast_total / self.fast_period
+            self.seed_prices.clear()
+        else:
+            self.fast_ema = (price - self.fast_ema) * self.k_fast + self.fast_ema
+            self.slow_ema = (price - self.slow_ema) * self.k_slow + self.slow_ema
+
+        macd = self.fast_ema - self.slow_ema
+        self.signal_count += 1
+        if self.signal_ema is None:
+            self.signal_seed_total += macd
+            if self.signal_count < self.signal_period:
+                return None
+            self.signal_ema = self.signal_seed_total / self.signal_period
+        else:
+            self.signal_ema = (macd - self.signal_ema) * self.k_signal + self.signal_ema
+        return {"macd": macd, "signal": self.signal_ema, "histogram": macd - self.signal_ema}
+
+
+class IncrementalBollingerBands(IncrementalIndicator):
+    """SMA middle band with population-deviation bands (talib.BBANDS)"""
+
+    kind = "bollinger_bands"
+    _state_fields = ("window", "total", "total_squares")
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        super().__init__(period=period, std_dev=std_dev)
+        self.period = period
+        self.std_dev = std_dev
+        self.window: deque = deque()
+        self.total = 0.0
+        self.total_squares = 0.0
+
+    def _update(self, bar: Any) -> Optional[Dict[str, float]]:
+        price = _bar_field(bar, "close")
+        self.total += price
+        self.total_squares += price * price
+        self.window.append(price)
+        if len(self.window) < self.period:
+            return None
+        middle = self.total / self.period
+        variance = self.total_squares / self.period
+        trailing = self.window.popleft()
+        self.total -= trailing
+        self.total_squares -= trailing * trailing
+        variance -= middle * middle
+        deviation = variance ** 0.5 if not variance < _TA_EPSILON else 0.0
+        if self.std_dev != 1.0:
+            deviation *= self.std_dev
+        return {"upper": middle + deviation, "middle": middle, "lower": middle - deviation}
+
+
+class IncrementalATR(IncrementalIndicator):
+    """Average true range with Wilder smoothing (talib.ATR); bars need high/low/close"""
+
+    kind = "atr"
+    _state_fields = ("previous_close", "seed_total", "atr")
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        self.period = period
+        self.previous_close: Optional[float] = None
+        self.seed_total = 0.0
+        self.atr: Optional[float] = None
+
+    def _update(self, bar: Any) -> Optional[float]:
+        high = _bar_field(bar, "high")
+        low = _bar_field(bar, "low")
+        close = _bar_field(bar, "close")
+        previous_close, self.previous_close = self.previous_close, close
+        if previous_close is None:
+            return None
+
+        true_range = high - low
+        true_range = max(true_range, abs(previous_close - high), abs(previous_close - low))
+        if self.atr is None:
+            self.seed_total += true_range
+            if self.count < self.period:
+                return None
+            self.atr = self.seed_total / self.period
+        else:
+            self.atr = (self.atr * (self.period - 1) + true_range) / self.period
+        return self.atr
+
+
+class IncrementalOBV(IncrementalIndicator):
+    """On balance volume starting from the first bar's volume (talib.OBV); bars need close/volume"""
+
+    kind = "obv"
+    _state_fields = ("previous_close", "obv")
+
+    def __init__(self):
+        super().__init__()
+        self.previous_close: Optional[float] = None
+        self.obv = 0.0
+
+    def _update(self, bar: Any) -> float:
+        close = _bar_field(bar, "close")
+        volume = _bar_field(bar, "volume")
+        if self.previous_close is None:
+            self.obv = volume
+        elif close > self.previous_close:
+            self.obv += volume
+        elif close < self.previous_close:
+            self.obv -= volume
+        self.previous_close = close
+        return self.obv
+
+
+class IndicatorStateStore:
+    """Named incremental indicators persisted together as one JSON document"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.indicators: Dict[str, IncrementalIndicator] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "IndicatorStateStore":
+        """Load a store from path; a missing, empty or unreadable file gives an empty store"""
+        store = cls(path)
+        try:
+            with open(path, "r") as f:
+                content = f.read()
+            if content.strip():
+                store.indicators = {name: IncrementalIndicator.from_dict(data)
+                                    for name, data in json.loads(content).get("indicators", {}).items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"⚠️ Discarding unreadable indicator state {path}: {e}")
+        return store
+
+    def indicator(self, name: str, kind: Union[str, Type[IncrementalIndicator]], **params) -> IncrementalIndicator:
+        """Get the named indicator, creating it if it is new or its parameters changed.
+
+        Example:
+            >>> rsi = store.indicator("AAPL:rsi", "rsi", period=14)
+            >>> latest = rsi.update_bars(bars)[-1:]  # only bars after the last run
+        """
+        indicator_cls = INDICATOR_TYPES[kind] if isinstance(kind, str) else kind
+        existing = self.indicators.get(name)
+        if existing is not None and type(existing) is indicator_cls and existing.params == indicator_cls(**params).params:
+            return existing
+        self.indicators[name] = indicator_cls(**params)
+        return self.indicators[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": 1, "indicators": {name: ind.to_dict() for name, ind in self.indicators.items()}}
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the store atomically to path (defaults to the path it was loaded from)"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save indicator state to")
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".indicator_state_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+_indicator_state_store: Optional[IndicatorStateStore] = None
+
+
+def get_indicator_state_store() -> IndicatorStateStore:
+    """Indicator state for the running analysis.
+
+    Loaded from the file named by ANALYTICS_INDICATOR_STATE (set by the
+    execution worker) and saved automatically when the script exits. Without
+    the variable the store is in-memory only, so scripts behave the same
+    outside the worker, just without reuse between runs.
+    """
+    global _indicator_state_store
+    if _indicator_state_store is None:
+        path = os.getenv(INDICATOR_STATE_ENV)
+        if path:
+            _indicator_state_store = IndicatorStateStore.load(path)
+            atexit.register(_save_on_exit, _indicator_state_store)
+        else:
+            _indicator_state_store = IndicatorStateStore()
+    return _indicator_state_store
+
+
+def _save_on_exit(store: IndicatorStateStore) -> None:
+    try:
+        store.save()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to save indicator state: {e}")
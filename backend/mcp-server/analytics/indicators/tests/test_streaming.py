@@ -0,0 +1,176 @@
+"""
+Unit tests for incremental indicator state.
+
+Feeds bars one at a time and checks the values against the batch indicator
+functions, including state saved mid-stream and resumed, and the state store
+used by the execution worker.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Import functions to test
+from ..streaming import (
+    IncrementalIndicator, IncrementalSMA, IncrementalEMA, IncrementalRSI, IncrementalMACD,
+    IncrementalBollingerBands, IncrementalATR, IncrementalOBV, IndicatorStateStore, INDICATOR_STATE_ENV
+)
+from ..technical import calculate_sma, calculate_ema
+from ..momentum.indicators import calculate_rsi, calculate_macd
+from ..volatility.indicators import calculate_atr, calculate_bollinger_bands
+from ..volume.indicators import calculate_obv
+
+MCP_SERVER_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+class TestIncrementalIndicators(unittest.TestCase):
+    """Test bar-by-bar values against the batch functions"""
+
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(20)
+        n = 400
+        self.dates = pd.date_range('2022-01-03', periods=n, freq='B')
+        close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, n))
+        spread = np.abs(rng.normal(0, 0.01, n)) * close
+        self.ohlcv = pd.DataFrame({
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000_000, 5_000_000, n).astype(float),
+        }, index=self.dates)
+        # Flat stretch exercises the equal-close branches
+        self.ohlcv.iloc[200:205, self.ohlcv.columns.get_loc("close")] = self.ohlcv["close"].iloc[199]
+        self.bars = [{"timestamp": str(d.date()), **row} for d, row in zip(self.dates, self.ohlcv.to_dict("records"))]
+
+    def stream(self, indicator: IncrementalIndicator, bars=None) -> list:
+        return [indicator.update(bar) for bar in (bars if bars is not None else self.bars)]
+
+    def assertStreamMatches(self, values, expected: pd.Series, key=None):
+        """Warm-up values are None; the rest equal the batch series"""
+        warmup = len(values) - len(expected)
+        self.assertTrue(all(v is None for v in values[:warmup]))
+        actual = [v[key] if key else v for v in values[warmup:]]
+        np.testing.assert_allclose(actual, expected.values, rtol=1e-12, atol=1e-9)
+
+    def test_moving_averages(self):
+        """SMA and EMA match calculate_sma / calculate_ema"""
+        close = self.ohlcv["close"]
+        self.assertStreamMatches(self.stream(IncrementalSMA(period=20)), calculate_sma(close, period=20)["sma"])
+        self.assertStreamMatches(self.stream(IncrementalEMA(period=20)), calculate_ema(close, period=20)["ema"])
+
+    def test_rsi(self):
+        """RSI matches calculate_rsi"""
+        close = self.ohlcv["close"]
+        for period in (2, 14):
+            self.assertStreamMatches(self.stream(IncrementalRSI(period=period)), calculate_rsi(close, period=period)["rsi"])
+
+    def test_macd(self):
+        """MACD line, signal and histogram match calculate_macd"""
+        expected = calculate_macd(self.ohlcv["close"], fast_period=12, slow_period=26, signal_period=9)
+        values = self.stream(IncrementalMACD(fast_period=12, slow_period=26, signal_period=9))
+        self.assertStreamMatches(values, expected["macd_line"], "macd")
+        self.assertStreamMatches(values, expected["signal_line"], "signal")
+        self.assertStreamMatches(values, expected["histogram"], "histogram")
+
+    def test_bollinger_bands(self):
+        """Bands match calculate_bollinger_bands"""
+        expected = calculate_bollinger_bands(self.ohlcv["close"], period=20, std_dev=2)
+        values = self.stream(IncrementalBollingerBands(period=20, std_dev=2))
+        for key in ("upper", "middle", "lower"):
+            self.assertStreamMatches(values, expected[f"{key}_band"], key)
+
+    def test_atr_and_obv(self):
+        """OHLCV indicators match calculate_atr / calculate_obv"""
+        self.assertStreamMatches(self.stream(IncrementalATR(period=14)), calculate_atr(self.ohlcv, period=14)["atr"])
+        self.assertStreamMatches(self.stream(IncrementalOBV()), calculate_obv(self.ohlcv)["obv"])
+
+    def test_resume_from_serialized_state(self):
+        """State saved mid-stream and restored from JSON continues identically"""
+        for make in (lambda: IncrementalRSI(period=14), lambda: IncrementalMACD(),
+                     lambda: IncrementalBollingerBands(period=20), lambda: IncrementalATR(period=14),
+                     lambda: IncrementalSMA(period=5), lambda: IncrementalOBV()):
+            # Split inside the warm-up and after it
+            for split in (10, 300):
+                full = self.stream(make())
+                first = make()
+                head = self.stream(first, self.bars[:split])
+                resumed = IncrementalIndicator.from_dict(json.loads(json.dumps(first.to_dict())))
+                self.assertEqual(head + self.stream(resumed, self.bars[split:]), full)
+
+    def test_update_bars_skips_seen_bars(self):
+        """Rerunning on an overlapping bar list only processes new bars"""
+        rsi = IncrementalRSI(period=14)
+        rsi.update_bars(self.bars[:300])
+        new_values = rsi.update_bars(self.bars[250:])
+        self.assertEqual(len(new_values), 100)
+        self.assertEqual(rsi.count, len(self.bars))
+        self.assertEqual(new_values, self.stream(IncrementalRSI(period=14))[300:])
+        self.assertEqual(rsi.update_bars(self.bars), [])
+
+    def test_bare_prices_and_missing_fields(self):
+        """Close-only indicators take bare prices; OHLC ones reject them"""
+        self.assertEqual(self.stream(IncrementalSMA(period=3), [1, 2, 3, 4]), [None, None, 2.0, 3.0])
+        with self.assertRaises(ValueError):
+            IncrementalATR().update(100.0)
+
+
+class TestIndicatorStateStore(unittest.TestCase):
+    """Test persistence of named indicators"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "analysis.py.state")
+        self.bars = [{"date": f"2024-01-{day:02d}", "close": 100.0 + day % 5} for day in range(1, 31)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        """Indicators are restored by name; changed parameters start fresh"""
+        store = IndicatorStateStore.load(self.path)
+        store.indicator("SPY:sma", "sma", period=5).update_bars(self.bars[:20])
+        store.save()
+
+        restored = IndicatorStateStore.load(self.path)
+        sma = restored.indicator("SPY:sma", IncrementalSMA, period=5)
+        self.assertEqual(sma.count, 20)
+        self.assertEqual(len(sma.update_bars(self.bars)), 10)
+        self.assertEqual(restored.indicator("SPY:sma", "sma", period=10).count, 0)
+
+    def test_unreadable_state_discarded(self):
+        """A corrupt state file gives an empty store"""
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(IndicatorStateStore.load(self.path).indicators, {})
+
+    def test_script_saves_on_exit(self):
+        """A script using the store saves it at exit when the worker sets the state path"""
+        code = (
+            "from analytics.indicators.streaming import get_indicator_state_store\n"
+            "store = get_indicator_state_store()\n"
+            "print(store.indicator('rsi', 'rsi', period=2).update_bars([1.0, 2.0, 1.5, 3.0])[-1])\n"
+        )
+        env = {**os.environ, INDICATOR_STATE_ENV: self.path}
+        for expected_count in (4, 8):
+            subprocess.run([sys.executable, "-c", code], cwd=MCP_SERVER_ROOT, env=env, check=True, capture_output=True)
+            with open(self.path) as f:
+                self.assertEqual(json.load(f)["indicators"]["rsi"]["count"], expected_count)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Incremental Indicator Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Incremental indicator tests completed!")
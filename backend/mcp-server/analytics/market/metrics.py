@@ -64,6 +64,10 @@ from scipy.signal import find_peaks
 from sklearn.cluster import KMeans
 
 from ..utils.data_utils import validate_return_data, validate_price_data, align_series, standardize_output
+from ..utils.rolling import (
+    rolling_windows, rolling_linregress, rolling_skew, rolling_max_drawdown,
+    rolling_beta as rolling_beta_values
+)
 from ..risk.metrics import calculate_correlation
 
 
@@ -394,14 +398,13 @@ def calculate_market_stress(returns: Union[pd.Series, Dict[str, Any]],
     drawdown_stress = current_drawdown / max_drawdown if max_drawdown > 0 else 0
         
     # 5. Beta stress (beta instability)
-    rolling_beta = []
     window = 30
-    for i in range(window, len(ret_aligned)):
-        ret_window = ret_aligned.iloc[i-window:i]
-        bench_window = bench_aligned.iloc[i-window:i]
-        if bench_window.var() > 0:
-            beta = ret_window.cov(bench_window) / bench_window.var()
-            rolling_beta.append(beta)
+    if len(ret_aligned) > window:
+        # Trailing windows ending before each observation (the final window is not used)
+        rolling_beta = rolling_beta_values(ret_aligned.values, bench_aligned.values, window)[:-1]
+        rolling_beta = rolling_beta[~np.isnan(rolling_beta)]
+    else:
+        rolling_beta = []
         
     if len(rolling_beta) > 1:
         beta_volatility = np.std(rolling_beta)
@@ -750,17 +753,10 @@ def detect_market_regime(prices: Union[pd.Series, Dict[str, Any]],
         rolling_returns = returns.rolling(window=window).mean()
         rolling_vol = returns.rolling(window=window).std() * np.sqrt(252)
             
-        # Get trend strength for each window
-        trend_strengths = []
-        for i in range(window, len(price_series)):
-            price_window = price_series.iloc[i-window:i]
-            trend_result = calculate_trend_strength(price_window, method="regression")
-            if trend_result.get("success", True):
-                trend_strengths.append(trend_result.get("r_squared", 0))
-            else:
-                trend_strengths.append(0)
-            
-        trend_strength_series = pd.Series(trend_strengths, index=price_series.index[window:])
+        # Regression trend strength (R²) of the trailing window before each date,
+        # same as calculate_trend_strength(method="regression") per window
+        _, trend_r_squared = rolling_linregress(price_series.values, window)
+        trend_strength_series = pd.Series(trend_r_squared[:-1], index=price_series.index[window:])
             
         # Align all series
         min_length = min(len(rolling_returns.dropna()), len(rolling_vol.dropna()), len(trend_strength_series))
@@ -799,28 +795,19 @@ def detect_market_regime(prices: Union[pd.Series, Dict[str, Any]],
     elif method == "returns_clustering":
         # K-means clustering of return characteristics
         window = 30
-        features = []
-        dates = []
             
-        for i in range(window, len(returns)):
-            ret_window = returns.iloc[i-window:i]
-                
-            # Feature vector: mean return, volatility, skewness, max drawdown
-            mean_ret = ret_window.mean()
-            vol = ret_window.std()
-            skew = ret_window.skew()
-                
-            # Max drawdown in window
-            cum_ret = (1 + ret_window).cumprod()
-            rolling_max = cum_ret.expanding().max()
-            drawdown = (cum_ret - rolling_max) / rolling_max
-            max_dd = drawdown.min()
-                
-            features.append([mean_ret, vol, skew, max_dd])
-            dates.append(returns.index[i])
+        # Feature vector per trailing window: mean return, volatility, skewness, max drawdown
+        return_windows = rolling_windows(returns.values, window)[:-1]
+        features_array = np.column_stack([
+            return_windows.mean(axis=1),
+            return_windows.std(axis=1, ddof=1),
+            rolling_skew(returns.values, window)[:-1],
+            rolling_max_drawdown(returns.values, window)[:-1]
+        ])
+        features = features_array.tolist()
+        dates = list(returns.index[window:])
             
         # Perform clustering
-        features_array = np.array(features)
         # Normalize features
         features_normalized = (features_array - features_array.mean(axis=0)) / features_array.std(axis=0)
             
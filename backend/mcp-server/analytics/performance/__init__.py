@@ -14,6 +14,7 @@ Available Performance Analysis Functions:
         - calculate_risk_metrics: Complete risk assessment (volatility, Sharpe, drawdown, VaR)
         - calculate_benchmark_metrics: Relative performance analysis (alpha, beta, tracking error)
         - calculate_drawdown_analysis: Detailed drawdown analysis with time series
+        - compute_metric_bundle: Any set of return/risk statistics in one fused pass
     
     Specialized Return Calculations:
         - calculate_annualized_return: Annualized return from price series
@@ -73,4 +74,5 @@ Note:
     - Functions handle missing data gracefully with appropriate error messages
 """
 
-from .metrics import *
\ No newline at end of file
+from .metrics import *
+from .bundle import compute_metric_bundle
\ No newline at end of file
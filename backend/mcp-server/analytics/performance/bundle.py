@@ -0,0 +1,238 @@
+"""Fused single-pass return statistics.
+
+Backs the return/risk metric functions in ``performance/metrics.py`` and
+``risk/metrics.py``. A report that asks for total return, Sharpe, Sortino,
+drawdown, VaR and moments used to validate the series and walk it once per
+empyrical call; here the series is validated once, converted to a contiguous
+float64 array, and every requested statistic is derived from a few shared
+intermediates that are computed at most once:
+
+    - growth: cumulative product of (1 + r)
+    - drawdown: wealth path from 100 with its running maximum (as empyrical)
+    - moments: mean and central sums of squares / cubes / fourth powers
+    - tail: one partial sort around the VaR cutoff, shared by VaR and CVaR
+
+Formulas follow empyrical 0.5 and scipy.stats (biased skew, excess kurtosis)
+so results match the individual library calls to floating-point rounding.
+"""
+
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from ..utils.data_utils import validate_return_data
+
+# Every metric compute_metric_bundle can return
+METRICS = (
+    "num_observations",
+    "total_return",
+    "annual_return",
+    "cumulative_returns",
+    "volatility",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "downside_deviation",
+    "max_drawdown",
+    "calmar_ratio",
+    "omega_ratio",
+    "var",
+    "cvar",
+    "skewness",
+    "kurtosis",
+    "win_rate",
+)
+
+
+class ReturnsKernel:
+    """Shared intermediates over one contiguous return array, computed lazily."""
+
+    def __init__(self, values: np.ndarray, annualization: int = 252):
+        self.r = np.ascontiguousarray(values, dtype=np.float64)
+        self.n = len(self.r)
+        self.annualization = annualization
+        self._tails: Dict[float, Tuple[float, float]] = {}
+
+    @cached_property
+    def growth(self) -> np.ndarray:
+        return np.cumprod(1 + self.r)
+
+    @cached_property
+    def final_growth(self) -> np.float64:
+        return np.prod(1 + self.r)
+
+    @cached_property
+    def drawdown(self) -> np.ndarray:
+        # Wealth path starting at 100, first point included (empyrical.drawdown_series)
+        wealth = np.empty(self.n + 1)
+        wealth[0] = 100
+        np.multiply(self.growth, 100, out=wealth[1:])
+        peaks = np.maximum.accumulate(wealth)
+        return (wealth - peaks) / peaks
+
+    @cached_property
+    def mean(self) -> np.float64:
+        return self.r.mean()
+
+    @cached_property
+    def centered(self) -> np.ndarray:
+        return self.r - self.mean
+
+    @cached_property
+    def squared_deviation(self) -> np.ndarray:
+        return self.centered * self.centered
+
+    @cached_property
+    def std(self) -> np.float64:
+        return np.sqrt(self.squared_deviation.sum() / (self.n - 1))
+
+    @cached_property
+    def central_moments(self):
+        """Biased (m2, m3, m4) as used by scipy.stats.skew / kurtosis"""
+        m2 = self.squared_deviation.mean()
+        m3 = (self.squared_deviation * self.centered).mean()
+        m4 = (self.squared_deviation * self.squared_deviation).mean()
+        return m2, m3, m4
+
+    @cached_property
+    def moments_degenerate(self) -> bool:
+        # scipy treats numerically constant input as having undefined shape moments
+        return bool(self.central_moments[0] <= (np.finfo(np.float64).resolution * self.mean) ** 2)
+
+    def downside_risk(self, required_return: float) -> np.float64:
+        downside = np.minimum(self.r - required_return, 0)
+        return np.sqrt((downside * downside).mean()) * np.sqrt(self.annualization)
+
+    def tail(self, cutoff: float) -> Tuple[float, float]:
+        """(value_at_risk, conditional_value_at_risk) from one partition"""
+        if cutoff in self._tails:
+            return self._tails[cutoff]
+        position = (self.n - 1) * cutoff
+        low = int(position)
+        kth = [low, low + 1] if low + 1 < self.n else [low]
+        partitioned = np.partition(self.r, kth)
+        lower = partitioned[low]
+        upper = partitioned[low + 1] if low + 1 < self.n else lower
+        # numpy's linear percentile interpolation
+        fraction = position - low
+        if fraction >= 0.5:
+            var = upper - (upper - lower) * (1 - fraction)
+        else:
+            var = lower + (upper - lower) * fraction
+        cvar = partitioned[:low + 1].mean()
+        self._tails[cutoff] = (float(var), float(cvar))
+        return self._tails[cutoff]
+
+
+def compute_metric_bundle(returns: Union[pd.Series, Dict[str, Any]],
+                          metrics: Optional[Iterable[str]] = None,
+                          risk_free_rate: float = 0.0,
+                          target_return: float = 0.0,
+                          omega_threshold: float = 0.0,
+                          cutoff: float = 0.05,
+                          annualization: int = 252) -> Dict[str, Any]:
+    """Compute several return statistics in one fused pass.
+
+    The return series is validated once and every requested metric is derived
+    from shared intermediates (cumulative growth, drawdown path, moments, a
+    single partial sort for the tail), instead of each metric re-walking the
+    series through its own library call.
+
+    Args:
+        returns: Return series as pandas Series or any format accepted by
+            validate_return_data. Values are decimal periodic returns.
+        metrics: Names to compute (see METRICS). Defaults to all of them.
+        risk_free_rate: Per-period rate subtracted for sharpe_ratio and used
+            as the required return for sortino_ratio (empyrical convention).
+        target_return: Threshold for downside_deviation.
+        omega_threshold: Threshold for omega_ratio.
+        cutoff: Tail probability for var and cvar (0.05 = 95%).
+        annualization: Periods per year (252 for daily returns).
+
+    Returns:
+        Dict[str, Any]: Requested metrics. Scalars are floats (NaN where a
+        metric is undefined, e.g. volatility of a single observation);
+        num_observations is an int and cumulative_returns a pd.Series on the
+        input index.
+
+    Raises:
+        ValueError: If returns cannot be validated or a metric name is unknown.
+
+    Example:
+        >>> returns = pd.Series(np.random.normal(0.0008, 0.015, 252))
+        >>> stats = compute_metric_bundle(returns, ["sharpe_ratio", "max_drawdown", "var", "cvar"])
+        >>> print(f"Sharpe {stats['sharpe_ratio']:.2f}, VaR {stats['var']:.2%}")
+
+    Note:
+        - Matches empyrical cum_returns_final, annual_return, cum_returns,
+          annual_volatility, sharpe_ratio, sortino_ratio, downside_risk,
+          max_drawdown, calmar_ratio, omega_ratio, value_at_risk and
+          conditional_value_at_risk, and scipy.stats skew/kurtosis, up to
+          floating-point rounding
+        - win_rate is the share of strictly positive returns
+    """
+    requested = list(METRICS) if metrics is None else list(metrics)
+    unknown = [name for name in requested if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics {unknown}; supported: {list(METRICS)}")
+
+    series = validate_return_data(returns)
+    kernel = ReturnsKernel(series.to_numpy(dtype=np.float64), annualization)
+    n = kernel.n
+    results: Dict[str, Any] = {}
+
+    def annual_return() -> np.float64:
+        return kernel.final_growth ** (1 / (n / annualization)) - 1
+
+    def max_drawdown() -> float:
+        return float(kernel.drawdown.min())
+
+    for name in requested:
+        if name == "num_observations":
+            value = n
+        elif name == "total_return":
+            value = kernel.final_growth - 1
+        elif name == "annual_return":
+            value = annual_return()
+        elif name == "cumulative_returns":
+            value = pd.Series(kernel.growth - 1, index=series.index)
+        elif name == "volatility":
+            value = kernel.std * annualization ** 0.5 if n >= 2 else np.nan
+        elif name == "sharpe_ratio":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value = (kernel.mean - risk_free_rate) / kernel.std * np.sqrt(annualization) if n >= 2 else np.nan
+        elif name == "sortino_ratio":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value = ((kernel.mean - risk_free_rate) * annualization / kernel.downside_risk(risk_free_rate)
+                         if n >= 2 else np.nan)
+        elif name == "downside_deviation":
+            value = kernel.downside_risk(target_return)
+        elif name == "max_drawdown":
+            value = max_drawdown()
+        elif name == "calmar_ratio":
+            drawdown = max_drawdown()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value = annual_return() / abs(drawdown) if drawdown < 0 else np.nan
+            if np.isinf(value):
+                value = np.nan
+        elif name == "omega_ratio":
+            excess = kernel.r - omega_threshold
+            gains = excess[excess > 0.0].sum()
+            losses = -excess[excess < 0.0].sum()
+            value = gains / losses if n >= 2 and losses > 0.0 else np.nan
+        elif name == "var":
+            value = kernel.tail(cutoff)[0]
+        elif name == "cvar":
+            value = kernel.tail(cutoff)[1]
+        elif name == "skewness":
+            m2, m3, _ = kernel.central_moments
+            value = np.nan if kernel.moments_degenerate else m3 / m2 ** 1.5
+        elif name == "kurtosis":
+            m2, _, m4 = kernel.central_moments
+            value = np.nan if kernel.moments_degenerate else m4 / m2 ** 2 - 3
+        else:  # win_rate
+            value = (kernel.r > 0).sum() / n
+
+        results[name] = value if isinstance(value, (int, pd.Series)) else float(value)
+
+    return results
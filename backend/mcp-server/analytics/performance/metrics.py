@@ -58,6 +58,7 @@ warnings.filterwarnings('ignore')
 import empyrical
 
 from ..utils.data_utils import validate_return_data, validate_price_data, standardize_output
+from .bundle import compute_metric_bundle
 
 
 def calculate_returns_metrics(returns: Union[pd.Series, Dict[str, Any]]) -> Dict[str, Any]:
@@ -123,27 +124,25 @@ def calculate_returns_metrics(returns: Union[pd.Series, Dict[str, Any]]) -> Dict
     }
         
     Note:
-        - Uses empyrical.cum_returns_final() for total return calculation
-        - Uses empyrical.annual_return() for annualized return with automatic period detection
+        - Total return matches empyrical.cum_returns_final(), computed by compute_metric_bundle
+        - Annualized return matches empyrical.annual_return() (252 periods per year)
         - Cumulative returns series shows portfolio growth over time (starting from 0)
         - Annualized return calculation accounts for compounding effects
         - Function handles both daily and other frequency data automatically
         - Returns are calculated using time-weighted methodology for accurate performance measurement
     """
-    returns_series = validate_return_data(returns)
-    
-    # Use empyrical library - leveraging requirements.txt
-    total_return = empyrical.cum_returns_final(returns_series)
-    annual_return = empyrical.annual_return(returns_series)
-    cumulative_returns = empyrical.cum_returns(returns_series)
+    # Fused pass matching empyrical cum_returns_final / annual_return / cum_returns
+    bundle = compute_metric_bundle(returns, ["total_return", "annual_return", "cumulative_returns", "num_observations"])
+    total_return = bundle["total_return"]
+    annual_return = bundle["annual_return"]
     
     result = {
-        "total_return": float(total_return),
+        "total_return": total_return,
         "total_return_pct": f"{total_return * 100:.2f}%",
-        "annual_return": float(annual_return),
+        "annual_return": annual_return,
         "annual_return_pct": f"{annual_return * 100:.2f}%",
-        "cumulative_returns": cumulative_returns,
-        "num_observations": len(returns_series)
+        "cumulative_returns": bundle["cumulative_returns"],
+        "num_observations": bundle["num_observations"]
     }
     
     return standardize_output(result, "calculate_returns_metrics")
@@ -253,35 +252,33 @@ def calculate_risk_metrics(returns: Union[pd.Series, Dict[str, Any]],
         - All ratios use the specified risk-free rate for excess return calculations
         - Maximum drawdown represents the worst peak-to-trough decline experienced
     """
-    returns_series = validate_return_data(returns)
-        
-    # Use empyrical library - leveraging requirements.txt
-    volatility = empyrical.annual_volatility(returns_series)
-    sharpe_ratio = empyrical.sharpe_ratio(returns_series, risk_free=risk_free_rate)
-    sortino_ratio = empyrical.sortino_ratio(returns_series, required_return=risk_free_rate)
-    max_drawdown = empyrical.max_drawdown(returns_series)
-    calmar_ratio = empyrical.calmar_ratio(returns_series)
-    var_95 = empyrical.value_at_risk(returns_series, cutoff=0.05)
-    cvar_95 = empyrical.conditional_value_at_risk(returns_series, cutoff=0.05)
-    # Use scipy.stats for skew and kurtosis since empyrical.stats may not have them
-    from scipy import stats
-    skewness = stats.skew(returns_series)
-    kurtosis = stats.kurtosis(returns_series)
+    # Fused pass matching the empyrical ratios and scipy.stats skew/kurtosis
+    bundle = compute_metric_bundle(
+        returns,
+        ["volatility", "sharpe_ratio", "sortino_ratio", "max_drawdown", "calmar_ratio",
+         "var", "cvar", "skewness", "kurtosis"],
+        risk_free_rate=risk_free_rate,
+        cutoff=0.05
+    )
+    volatility = bundle["volatility"]
+    max_drawdown = bundle["max_drawdown"]
+    var_95 = bundle["var"]
+    cvar_95 = bundle["cvar"]
         
     result = {
-        "volatility": float(volatility),
+        "volatility": volatility,
         "volatility_pct": f"{volatility * 100:.2f}%",
-        "sharpe_ratio": float(sharpe_ratio),
-        "max_drawdown": float(max_drawdown),
+        "sharpe_ratio": bundle["sharpe_ratio"],
+        "max_drawdown": max_drawdown,
         "max_drawdown_pct": f"{max_drawdown * 100:.2f}%",
-        "sortino_ratio": float(sortino_ratio),
-        "calmar_ratio": float(calmar_ratio),
-        "var_95": float(var_95),
+        "sortino_ratio": bundle["sortino_ratio"],
+        "calmar_ratio": bundle["calmar_ratio"],
+        "var_95": var_95,
         "var_95_pct": f"{var_95 * 100:.2f}%",
-        "cvar_95": float(cvar_95),
+        "cvar_95": cvar_95,
         "cvar_95_pct": f"{cvar_95 * 100:.2f}%",
-        "skewness": float(skewness),
-        "kurtosis": float(kurtosis)
+        "skewness": bundle["skewness"],
+        "kurtosis": bundle["kurtosis"]
     }
         
     return standardize_output(result, "calculate_risk_metrics")
@@ -481,28 +478,19 @@ def calculate_drawdown_analysis(returns: Union[pd.Series, Dict[str, Any]]) -> Di
         >>> print(f"Periods in Drawdown: {(drawdown_series < 0).sum()} out of {len(drawdown_series)}")
         
     Note:
-        - Uses empyrical.max_drawdown() for maximum drawdown calculation
+        - Maximum drawdown matches empyrical.max_drawdown(), computed by compute_metric_bundle
         - Drawdown series shows portfolio decline from previous peak at each point
         - Negative values indicate portfolio is below previous high-water mark
         - Zero values indicate portfolio is at new high-water mark
         - Drawdown calculation accounts for compounding effects of returns
         - Essential metric for risk management and capital preservation strategies
     """
-    returns_series = validate_return_data(returns)
-        
-    if empyrical is None:
-        # Basic calculations
-        cumulative = (1 + returns_series).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown_series = (cumulative - running_max) / running_max
-        max_drawdown = drawdown_series.min()
-    else:
-        # Use empyrical library - leveraging requirements.txt
-        max_drawdown = empyrical.max_drawdown(returns_series)
-        # Calculate drawdown series manually since drawdown_details may not exist
-        cumulative = empyrical.cum_returns(returns_series)
-        running_max = cumulative.expanding().max()
-        drawdown_series = (cumulative - running_max) / running_max
+    bundle = compute_metric_bundle(returns, ["max_drawdown", "cumulative_returns"])
+    max_drawdown = bundle["max_drawdown"]
+    # Drawdown series relative to the running maximum of cumulative returns
+    cumulative = bundle["cumulative_returns"]
+    running_max = np.maximum.accumulate(cumulative.values)
+    drawdown_series = pd.Series((cumulative.values - running_max) / running_max, index=cumulative.index)
         
     result = {
         "max_drawdown": float(max_drawdown),
@@ -861,7 +849,7 @@ def calculate_downside_deviation(returns: Union[pd.Series, Dict[str, Any]], targ
         >>> print(f"Downside Deviation (5% target): {downside_dev_5pct:.3f}")
         
     Note:
-        - Uses empyrical.downside_risk() with specified required_return parameter
+        - Matches empyrical.downside_risk() with target_return as required_return
         - Only considers returns below the target threshold in calculation
         - Square root of mean squared deviations below target
         - Lower values indicate better downside protection
@@ -869,15 +857,11 @@ def calculate_downside_deviation(returns: Union[pd.Series, Dict[str, Any]], targ
         - More relevant than standard deviation for asymmetric return distributions
         - Commonly used target thresholds: 0% (zero), risk-free rate, or minimum acceptable return
     """
-    returns_series = validate_return_data(returns)
-        
     if target_return is None:
         target_return = 0.0
         
-    # Use empyrical for downside deviation
-    downside_dev = empyrical.downside_risk(returns_series, required_return=target_return)
-        
-    return float(downside_dev)
+    # Matches empyrical.downside_risk
+    return compute_metric_bundle(returns, ["downside_deviation"], target_return=target_return)["downside_deviation"]
 
 
 def calculate_upside_capture(returns: Union[pd.Series, Dict[str, Any]], 
@@ -1078,7 +1062,7 @@ def calculate_calmar_ratio(returns: Union[pd.Series, Dict[str, Any]]) -> float:
         ...     print("Low risk-adjusted returns or high drawdown")
         
     Note:
-        - Uses empyrical.calmar_ratio() for proven calculation accuracy
+        - Matches empyrical.calmar_ratio(), computed by compute_metric_bundle
         - Formula: Calmar = Annual Return / |Maximum Drawdown|
         - Higher values indicate better risk-adjusted performance
         - More conservative than Sharpe ratio as it focuses on worst-case losses
@@ -1092,12 +1076,8 @@ def calculate_calmar_ratio(returns: Union[pd.Series, Dict[str, Any]]) -> float:
         Input: returns with 15% max drawdown, 8% annual return → 0.53 (moderate risk-adjusted return)
         Input: returns with 25% max drawdown, 12% annual return → 0.48 (lower risk efficiency)
     """
-    returns_series = validate_return_data(returns)
-        
-    # Use empyrical for Calmar ratio
-    calmar = empyrical.calmar_ratio(returns_series)
-        
-    return float(calmar)
+    # Matches empyrical.calmar_ratio
+    return compute_metric_bundle(returns, ["calmar_ratio"])["calmar_ratio"]
 
 
 def calculate_omega_ratio(returns: Union[pd.Series, Dict[str, Any]], threshold: Optional[float] = None) -> float:
@@ -1148,7 +1128,7 @@ def calculate_omega_ratio(returns: Union[pd.Series, Dict[str, Any]], threshold:
         >>> print(f"Omega Ratio (2% threshold): {omega_rf:.3f}")
         
     Note:
-        - Uses empyrical.omega_ratio() with specified risk_free parameter as threshold
+        - Matches empyrical.omega_ratio() with the threshold as risk_free
         - Formula: Omega = [Integral of (1-F(x))dx from threshold to +∞] / [Integral of F(x)dx from -∞ to threshold]
         - Values > 1.0 indicate more gains than losses above/below threshold
         - Values < 1.0 indicate more losses than gains above/below threshold
@@ -1157,15 +1137,11 @@ def calculate_omega_ratio(returns: Union[pd.Series, Dict[str, Any]], threshold:
         - Commonly used thresholds: 0% (zero), risk-free rate, or target return
         - Higher values indicate better risk-adjusted performance
     """
-    returns_series = validate_return_data(returns)
-        
     if threshold is None:
         threshold = 0.0
         
-    # Use empyrical for Omega ratio
-    omega = empyrical.omega_ratio(returns_series, risk_free=threshold)
-        
-    return float(omega)
+    # Matches empyrical.omega_ratio with the threshold as risk_free
+    return compute_metric_bundle(returns, ["omega_ratio"], omega_threshold=threshold)["omega_ratio"]
 
 
 def calculate_win_rate(returns: Union[pd.Series, Dict[str, Any]]) -> float:
@@ -1223,18 +1199,7 @@ def calculate_win_rate(returns: Union[pd.Series, Dict[str, Any]]) -> float:
         - Particularly relevant for evaluating trading strategies and market timing
         - Should be analyzed alongside average win/loss sizes for complete picture
     """
-    returns_series = validate_return_data(returns)
-        
-    # Count positive returns
-    positive_returns = (returns_series > 0).sum()
-    total_returns = len(returns_series)
-        
-    if total_returns == 0:
-        return 0.0
-        
-    win_rate = positive_returns / total_returns
-        
-    return float(win_rate)
+    return compute_metric_bundle(returns, ["win_rate"])["win_rate"]
 
 
 def calculate_best_worst_periods(returns: Union[pd.Series, Dict[str, Any]], window_size: int) -> Dict[str, Any]:
@@ -0,0 +1,131 @@
+"""
+Unit tests for the fused metric bundle.
+
+Checks compute_metric_bundle against the individual empyrical / scipy calls
+it replaces, including edge cases where metrics are undefined.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+import empyrical
+from scipy import stats
+
+# Import functions to test
+from ..bundle import compute_metric_bundle, METRICS
+from ..metrics import calculate_risk_metrics, calculate_returns_metrics, calculate_drawdown_analysis
+from ...risk.metrics import calculate_cvar, calculate_var
+
+
+def reference_metrics(returns: pd.Series, risk_free_rate=0.0, target_return=0.0, omega_threshold=0.0, cutoff=0.05):
+    """The library calls each metric used before the bundle"""
+    return {
+        "num_observations": len(returns),
+        "total_return": empyrical.cum_returns_final(returns),
+        "annual_return": empyrical.annual_return(returns),
+        "volatility": empyrical.annual_volatility(returns),
+        "sharpe_ratio": empyrical.sharpe_ratio(returns, risk_free=risk_free_rate),
+        "sortino_ratio": empyrical.sortino_ratio(returns, required_return=risk_free_rate),
+        "downside_deviation": empyrical.downside_risk(returns, required_return=target_return),
+        "max_drawdown": empyrical.max_drawdown(returns),
+        "calmar_ratio": empyrical.calmar_ratio(returns),
+        "omega_ratio": empyrical.omega_ratio(returns, risk_free=omega_threshold),
+        "var": empyrical.value_at_risk(returns, cutoff=cutoff),
+        "cvar": empyrical.conditional_value_at_risk(returns, cutoff=cutoff),
+        "skewness": stats.skew(returns),
+        "kurtosis": stats.kurtosis(returns),
+        "win_rate": (returns > 0).sum() / len(returns),
+    }
+
+
+class TestMetricBundle(unittest.TestCase):
+    """Test fused metrics against empyrical and scipy"""
+
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(11)
+        dates = pd.date_range('2020-01-01', periods=756, freq='B')
+        self.returns = pd.Series(rng.standard_t(4, len(dates)) * 0.01 + 0.0004, index=dates)
+
+    def assertMatches(self, bundle, reference):
+        for name, expected in reference.items():
+            actual = bundle[name]
+            if np.isnan(expected):
+                self.assertTrue(np.isnan(actual), f"{name}: expected NaN, got {actual}")
+            else:
+                self.assertTrue(np.isclose(actual, expected, rtol=1e-10, atol=1e-14),
+                                f"{name}: {actual} != {expected}")
+
+    def test_matches_library_calls(self):
+        """All metrics match the per-metric library calls"""
+        for params in [{}, {"risk_free_rate": 0.02, "target_return": 0.001, "omega_threshold": 0.0005, "cutoff": 0.01}]:
+            bundle = compute_metric_bundle(self.returns, **params)
+            self.assertMatches(bundle, reference_metrics(self.returns, **params))
+
+        cumulative = compute_metric_bundle(self.returns, ["cumulative_returns"])["cumulative_returns"]
+        pd.testing.assert_series_equal(cumulative, empyrical.cum_returns(self.returns), rtol=1e-12)
+
+    def test_var_cutoffs(self):
+        """Tail partition reproduces numpy percentile interpolation at any cutoff"""
+        for n in (7, 20, 253):
+            values = self.returns.iloc[:n]
+            for cutoff in (0.01, 0.05, 0.1, 0.25, 0.5, 0.99):
+                bundle = compute_metric_bundle(values, ["var", "cvar"], cutoff=cutoff)
+                self.assertAlmostEqual(bundle["var"], empyrical.value_at_risk(values, cutoff=cutoff), places=14)
+                self.assertAlmostEqual(bundle["cvar"], empyrical.conditional_value_at_risk(values, cutoff=cutoff), places=14)
+
+    def test_edge_cases(self):
+        """Undefined metrics are NaN as in the libraries"""
+        cases = {
+            "single observation": pd.Series([0.01]),
+            "all gains": pd.Series([0.01, 0.02, 0.005, 0.03]),
+            # Exactly representable, so the deviation is exactly zero in both implementations
+            "flat": pd.Series([0.0] * 30),
+            "constant": pd.Series([0.25] * 30),
+        }
+        for label, values in cases.items():
+            with self.subTest(label):
+                self.assertMatches(compute_metric_bundle(values), reference_metrics(values))
+
+    def test_requested_subset(self):
+        """Only requested metrics are returned; unknown names are rejected"""
+        bundle = compute_metric_bundle(self.returns, ["sharpe_ratio", "var"])
+        self.assertEqual(set(bundle), {"sharpe_ratio", "var"})
+        self.assertEqual(set(compute_metric_bundle(self.returns)), set(METRICS))
+        with self.assertRaises(ValueError):
+            compute_metric_bundle(self.returns, ["sharpe"])
+
+    def test_delegating_functions_unchanged(self):
+        """Report functions give the same values as their previous empyrical implementations"""
+        risk = calculate_risk_metrics(self.returns, risk_free_rate=0.02)
+        reference = reference_metrics(self.returns, risk_free_rate=0.02)
+        for key, name in [("volatility", "volatility"), ("sharpe_ratio", "sharpe_ratio"),
+                          ("sortino_ratio", "sortino_ratio"), ("max_drawdown", "max_drawdown"),
+                          ("calmar_ratio", "calmar_ratio"), ("var_95", "var"), ("cvar_95", "cvar"),
+                          ("skewness", "skewness"), ("kurtosis", "kurtosis")]:
+            self.assertTrue(np.isclose(risk[key], reference[name], rtol=1e-10), key)
+
+        performance = calculate_returns_metrics(self.returns)
+        self.assertTrue(np.isclose(performance["annual_return"], reference["annual_return"], rtol=1e-10))
+
+        drawdown = calculate_drawdown_analysis(self.returns)
+        cumulative = empyrical.cum_returns(self.returns)
+        running_max = cumulative.expanding().max()
+        pd.testing.assert_series_equal(drawdown["drawdown_series"], (cumulative - running_max) / running_max,
+                                       rtol=1e-10, check_names=False)
+
+        cvar = calculate_cvar(self.returns, confidence_level=0.05)
+        self.assertAlmostEqual(cvar["cvar_daily"], reference["cvar"], places=14)
+        var = calculate_var(self.returns, confidence_level=0.05)
+        self.assertAlmostEqual(var["var_daily"], reference["var"], places=14)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Metric Bundle Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Metric bundle tests completed!")
@@ -0,0 +1,178 @@
+"""Chunked Monte Carlo engine for portfolio simulation.
+
+Simulates portfolio paths in fixed-size chunks so memory stays bounded by the
+chunk size rather than ``n_simulations x time_horizon``. Only one final value
+per path is kept (8 bytes per path) for exact quantiles and tail statistics;
+moments, extremes and loss counts are accumulated online.
+
+Randomness comes from a local ``numpy.random.Generator`` per chunk, seeded
+from independent ``SeedSequence`` child streams. Results therefore do not
+depend on chunk execution order, and chunks can be spread across a process
+pool with identical output.
+
+Two simulation modes:
+    - Portfolio normal: daily portfolio returns drawn from a single normal
+      distribution with the portfolio's mean and volatility.
+    - Correlated assets: daily asset returns drawn jointly via the Cholesky
+      factor of the covariance matrix, with buy-and-hold weights.
+
+This module is used by ``monte_carlo_simulation`` in ``simulation.py`` and is
+not part of the auto-discovered analytics function set.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+TRADING_DAYS = 252
+
+# Upper bound on the random-return block generated per chunk
+CHUNK_MEMORY_BYTES = 64 * 1024 * 1024
+
+
+def covariance_factor(cov: np.ndarray) -> np.ndarray:
+    """Lower-triangular factor L with L @ L.T == cov.
+
+    Falls back to an eigenvalue square root (negative eigenvalues clipped) for
+    covariance matrices that are only positive semi-definite.
+    """
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def chunk_sizes(n_simulations: int, time_horizon: int, n_factors: int = 1,
+                chunk_size: Optional[int] = None) -> List[int]:
+    """Split n_simulations into chunks whose return block fits CHUNK_MEMORY_BYTES."""
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_MEMORY_BYTES // (8 * time_horizon * n_factors))
+    chunk_size = max(1, min(chunk_size, n_simulations))
+    full, remainder = divmod(n_simulations, chunk_size)
+    return [chunk_size] * full + ([remainder] if remainder else [])
+
+
+def simulate_chunk(task: Tuple) -> np.ndarray:
+    """Simulate one chunk of paths and return their final values.
+
+    Top-level so it can be pickled for a process pool.
+
+    Args:
+        task: (seed_sequence, n_paths, time_horizon, initial_value, daily_mean,
+            factor, weights). For the portfolio-normal mode ``daily_mean`` and
+            ``factor`` are scalars (mean, volatility) and ``weights`` is None;
+            for correlated assets they are the per-asset daily mean vector and
+            the daily covariance factor.
+    """
+    seed_sequence, n_paths, time_horizon, initial_value, daily_mean, factor, weights = task
+    rng = np.random.default_rng(seed_sequence)
+
+    if weights is None:
+        returns = rng.normal(daily_mean, factor, size=(n_paths, time_horizon))
+        return initial_value * np.prod(1 + returns, axis=1)
+
+    n_assets = len(weights)
+    shocks = rng.standard_normal(size=(n_paths, time_horizon, n_assets))
+    asset_returns = daily_mean + shocks @ factor.T
+    asset_growth = np.prod(1 + asset_returns, axis=1)
+    return initial_value * (asset_growth @ weights)
+
+
+class FinalValueAccumulator:
+    """Online summary of simulated final values, merged chunk by chunk."""
+
+    def __init__(self, initial_value: float):
+        self.initial_value = initial_value
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.losses = 0
+        self._finals: List[np.ndarray] = []
+
+    def add(self, finals: np.ndarray) -> None:
+        # Chan et al. parallel merge of mean / sum of squared deviations
+        n = len(finals)
+        if n == 0:
+            return
+        chunk_mean = finals.mean()
+        chunk_m2 = ((finals - chunk_mean) ** 2).sum()
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, finals.min())
+        self.maximum = max(self.maximum, finals.max())
+        self.losses += int((finals < self.initial_value).sum())
+        self._finals.append(finals)
+
+    def summary(self, percentiles: List[int]) -> Dict[str, Any]:
+        finals = np.concatenate(self._finals)
+        values = np.percentile(finals, percentiles)
+        var_5 = np.percentile(finals, 5)
+        prob_loss = self.losses / self.count
+        return {
+            "mean_final_value": float(self.mean),
+            "std_final_value": float(np.sqrt(self.m2 / self.count)),
+            "min_final_value": float(self.minimum),
+            "max_final_value": float(self.maximum),
+            "probability_of_loss": float(prob_loss),
+            "probability_of_loss_pct": f"{prob_loss * 100:.2f}%",
+            # Average loss in the worst 5% of scenarios
+            "expected_shortfall": float(finals[finals <= var_5].mean() - self.initial_value),
+            **{f"percentile_{p}": float(v) for p, v in zip(percentiles, values)}
+        }
+
+
+def run_simulation(mu: np.ndarray, cov: np.ndarray, weights: np.ndarray, time_horizon: int,
+                   n_simulations: int, initial_value: float, seed: Optional[int] = 42,
+                   simulate_assets: bool = False, n_jobs: int = 1,
+                   chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Run a chunked simulation and return final-value statistics.
+
+    Args:
+        mu: Expected annual returns per asset
+        cov: Annual covariance matrix
+        weights: Portfolio weights
+        time_horizon: Trading days to simulate
+        n_simulations: Number of paths
+        initial_value: Starting portfolio value
+        seed: Seed for the root SeedSequence (None for fresh entropy)
+        simulate_assets: Simulate correlated asset paths instead of one portfolio normal
+        n_jobs: Worker processes for chunks (1 runs in-process)
+        chunk_size: Paths per chunk (default sized from CHUNK_MEMORY_BYTES)
+
+    Returns:
+        Dict with final-value statistics plus chunk count.
+    """
+    if simulate_assets:
+        daily_mean = mu / TRADING_DAYS
+        factor = covariance_factor(cov / TRADING_DAYS)
+        task_weights = weights
+        sizes = chunk_sizes(n_simulations, time_horizon, len(weights), chunk_size)
+    else:
+        portfolio_mu = float(np.dot(weights, mu))
+        portfolio_std = float(np.sqrt(np.dot(weights.T, np.dot(cov, weights))))
+        daily_mean = portfolio_mu / TRADING_DAYS
+        factor = portfolio_std / np.sqrt(TRADING_DAYS)
+        task_weights = None
+        sizes = chunk_sizes(n_simulations, time_horizon, 1, chunk_size)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, n, time_horizon, initial_value, daily_mean, factor, task_weights) for s, n in zip(seeds, sizes)]
+
+    accumulator = FinalValueAccumulator(initial_value)
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            for finals in executor.map(simulate_chunk, tasks):
+                accumulator.add(finals)
+    else:
+        for task in tasks:
+            accumulator.add(simulate_chunk(task))
+
+    result = accumulator.summary([5, 10, 25, 50, 75, 90, 95])
+    result["n_chunks"] = len(tasks)
+    return result
@@ -36,6 +36,7 @@ import empyrical
 
 from ..utils.data_utils import validate_price_data, prices_to_returns, standardize_output
 from ..performance.metrics import calculate_returns_metrics, calculate_risk_metrics
+from .monte_carlo import run_simulation
 
 
 def simulate_dca_strategy(prices: Union[pd.Series, Dict[str, Any]], 
@@ -336,7 +337,10 @@ def monte_carlo_simulation(expected_returns: Union[List[float], np.ndarray],
                           weights: Union[List[float], Dict[str, float]],
                           time_horizon: int = 252,
                           n_simulations: int = 1000,
-                          initial_value: float = 10000) -> Dict[str, Any]:
+                          initial_value: float = 10000,
+                          seed: Optional[int] = 42,
+                          simulate_assets: bool = False,
+                          n_jobs: int = 1) -> Dict[str, Any]:
     """Perform Monte Carlo simulation of portfolio performance.
     
     Monte Carlo simulation generates thousands of possible future portfolio
@@ -359,6 +363,12 @@ def monte_carlo_simulation(expected_returns: Union[List[float], np.ndarray],
             provide more stable statistics but increase computation time.
             Defaults to 1000.
         initial_value: Starting portfolio value in dollars. Defaults to $10,000.
+        seed: Seed for reproducible results. Defaults to 42; None draws fresh entropy.
+        simulate_assets: If True, simulate correlated daily returns for each asset
+            (Cholesky factor of the covariance matrix) with buy-and-hold weights,
+            instead of a single normal distribution for the portfolio.
+        n_jobs: Number of worker processes used for simulation chunks. Results are
+            identical for any value. Defaults to 1 (in-process).
             
     Returns:
         Dict[str, Any]: Monte Carlo simulation results including:
@@ -387,7 +397,9 @@ def monte_carlo_simulation(expected_returns: Union[List[float], np.ndarray],
     Note:
         - Assumes normal distribution of returns (log-normal for prices)
         - Uses daily return simulation with sqrt(252) volatility scaling
-        - Random seed set to 42 for reproducible results
+        - Uses a local random generator (seed 42 by default); global numpy state is untouched
+        - Paths are simulated in chunks, so memory does not grow with
+          n_simulations x time_horizon
         - Expected shortfall calculated as average of worst 5% outcomes
         - Portfolio statistics calculated from individual asset characteristics
     """
@@ -412,48 +424,20 @@ def monte_carlo_simulation(expected_returns: Union[List[float], np.ndarray],
     portfolio_var = np.dot(w.T, np.dot(cov, w))
     portfolio_std = np.sqrt(portfolio_var)
         
-    # Generate random returns
-    np.random.seed(42)  # For reproducibility
-    random_returns = np.random.normal(
-        portfolio_mu / 252,  # Daily return
-        portfolio_std / np.sqrt(252),  # Daily volatility
-        size=(n_simulations, time_horizon)
+    # Simulate in memory-bounded chunks; only final values are kept per path
+    simulation_stats = run_simulation(
+        mu, cov, w, time_horizon, n_simulations, initial_value,
+        seed=seed, simulate_assets=simulate_assets, n_jobs=n_jobs
     )
         
-    # Calculate cumulative portfolio values
-    portfolio_paths = initial_value * np.cumprod(1 + random_returns, axis=1)
-        
-    # Calculate final values
-    final_values = portfolio_paths[:, -1]
-        
-    # Calculate statistics
-    percentiles = [5, 10, 25, 50, 75, 90, 95]
-    value_percentiles = {
-        f"percentile_{p}": float(np.percentile(final_values, p))
-        for p in percentiles
-    }
-        
-    # Calculate probability of loss
-    prob_loss = (final_values < initial_value).mean()
-        
-    # Calculate expected shortfall (average loss in worst 5% scenarios)
-    worst_5_percent = final_values[final_values <= np.percentile(final_values, 5)]
-    expected_shortfall = worst_5_percent.mean() - initial_value
-        
     result = {
         "initial_value": initial_value,
-        "mean_final_value": float(final_values.mean()),
-        "std_final_value": float(final_values.std()),
-        "min_final_value": float(final_values.min()),
-        "max_final_value": float(final_values.max()),
-        "probability_of_loss": float(prob_loss),
-        "probability_of_loss_pct": f"{prob_loss * 100:.2f}%",
-        "expected_shortfall": float(expected_shortfall),
+        **simulation_stats,
         "time_horizon_days": time_horizon,
         "n_simulations": n_simulations,
+        "simulation_method": "correlated_assets" if simulate_assets else "portfolio_normal",
         "portfolio_expected_return": float(portfolio_mu),
-        "portfolio_volatility": float(portfolio_std),
-        **value_percentiles
+        "portfolio_volatility": float(portfolio_std)
     }
         
     return standardize_output(result, "monte_carlo_simulation")
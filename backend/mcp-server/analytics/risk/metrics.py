@@ -43,6 +43,7 @@ import empyrical
 from scipy import stats
 
 from ..utils.data_utils import validate_return_data, align_series, standardize_output
+from ..performance.bundle import compute_metric_bundle
 
 
 def calculate_var(returns: Union[pd.Series, Dict[str, Any]], 
@@ -112,8 +113,8 @@ def calculate_var(returns: Union[pd.Series, Dict[str, Any]],
     returns_series = validate_return_data(returns)
         
     if method == "historical":
-        # Use empyrical - leveraging requirements.txt
-        var = empyrical.value_at_risk(returns_series, cutoff=confidence_level)
+        # Matches empyrical.value_at_risk
+        var = compute_metric_bundle(returns_series, ["var"], cutoff=confidence_level)["var"]
         
     elif method == "parametric":
         # Use scipy for parametric VaR
@@ -140,7 +141,7 @@ def calculate_var(returns: Union[pd.Series, Dict[str, Any]],
         
     else:
         # Default to historical method
-        var = empyrical.value_at_risk(returns_series, cutoff=confidence_level)
+        var = compute_metric_bundle(returns_series, ["var"], cutoff=confidence_level)["var"]
         
     # Calculate daily and annual VaR
     daily_var = float(var)
@@ -222,11 +223,10 @@ def calculate_cvar(returns: Union[pd.Series, Dict[str, Any]],
         - Uses empyrical library for consistent calculation with industry standards
         - Annual CVaR calculated using √252 scaling factor
     """
-    returns_series = validate_return_data(returns)
-        
-    # Use empyrical - leveraging requirements.txt
-    cvar = empyrical.conditional_value_at_risk(returns_series, cutoff=confidence_level)
-    var = empyrical.value_at_risk(returns_series, cutoff=confidence_level)
+    # VaR and CVaR from one partial sort (matches empyrical value_at_risk / conditional_value_at_risk)
+    tail = compute_metric_bundle(returns, ["var", "cvar"], cutoff=confidence_level)
+    cvar = tail["cvar"]
+    var = tail["var"]
         
     # Calculate daily and annual CVaR
     daily_cvar = float(cvar)
@@ -1044,16 +1044,10 @@ def calculate_skewness(returns: Union[pd.Series, Dict[str, Any]]) -> float:
     Note:
         - Negative skewness often observed in equity returns (crash risk)
         - Positive skewness may indicate momentum or bubble patterns
-        - Uses scipy.stats.skew for robust calculation
+        - Same value as scipy.stats.skew (biased), computed by compute_metric_bundle
     """
-    from ..utils.data_utils import validate_return_data
-        
-    returns_series = validate_return_data(returns)
-        
-    # Use scipy for skewness calculation
-    skewness = stats.skew(returns_series.dropna())
-        
-    return float(skewness)
+    # Matches scipy.stats.skew (biased)
+    return compute_metric_bundle(returns, ["skewness"])["skewness"]
         
 def calculate_kurtosis(returns: Union[pd.Series, Dict[str, Any]]) -> float:
     """Calculate excess kurtosis measuring tail thickness of return distribution.
@@ -1092,16 +1086,10 @@ def calculate_kurtosis(returns: Union[pd.Series, Dict[str, Any]]) -> float:
     Note:
         - Financial returns typically exhibit positive excess kurtosis
         - High kurtosis suggests higher crash/boom probability than normal distribution
-        - Uses scipy.stats.kurtosis with Fisher=True (excess kurtosis)
+        - Same value as scipy.stats.kurtosis with Fisher=True (excess kurtosis)
     """
-    from ..utils.data_utils import validate_return_data
-        
-    returns_series = validate_return_data(returns)
-        
-    # Use scipy for kurtosis calculation (excess kurtosis)
-    kurtosis = stats.kurtosis(returns_series.dropna())
-        
-    return float(kurtosis)
+    # Matches scipy.stats.kurtosis (excess kurtosis)
+    return compute_metric_bundle(returns, ["kurtosis"])["kurtosis"]
         
 def calculate_percentile(data: Union[pd.Series, Dict[str, Any], List[float]], percentile: float) -> float:
     """Calculate specified percentile for risk and performance analysis.
@@ -1764,12 +1752,8 @@ def calculate_expected_shortfall(returns: Union[pd.Series, Dict[str, Any]], conf
         - Coherent risk measure (satisfies all mathematical risk axioms)
         - Essential for comprehensive tail risk assessment
     """
-    returns_series = validate_return_data(returns)
-        
-    # Use empyrical for Expected Shortfall (same as CVaR)
-    expected_shortfall = empyrical.conditional_value_at_risk(returns_series, cutoff=confidence)
-        
-    return float(expected_shortfall)
+    # Expected Shortfall is CVaR (matches empyrical.conditional_value_at_risk)
+    return compute_metric_bundle(returns, ["cvar"], cutoff=confidence)["cvar"]
         
 def calculate_diversification_ratio(portfolio_vol: float, weighted_avg_vol: float) -> float:
     """Calculate diversification ratio measuring portfolio diversification benefits.
@@ -38,11 +38,10 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from scipy import optimize
-from itertools import product
 import empyrical
 
 from ..utils.data_utils import validate_return_data, validate_price_data, standardize_output
-from .generators import generate_signals
+from .sweep import run_parameter_sweep
 
 
 def analyze_signal_quality(signals: List[Dict[str, Any]], 
@@ -574,7 +573,8 @@ def identify_false_signals(signals: List[Dict[str, Any]],
         
 def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]], 
                               strategy: str = "rsi", 
-                              parameter_ranges: Optional[Dict[str, List]] = None) -> Dict[str, Any]:
+                              parameter_ranges: Optional[Dict[str, List]] = None,
+                              n_jobs: int = 1) -> Dict[str, Any]:
     """Optimize trading signal parameters using systematic grid search and backtesting.
     
     This function performs comprehensive parameter optimization for technical analysis
@@ -596,7 +596,10 @@ def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]],
             If not provided, uses default ranges for the selected strategy:
             - RSI: period (10-30), upper_threshold (65-80), lower_threshold (20-35)
             - MACD: fast_period (8-16), slow_period (21-31), signal_period (6-12)
+            - Bollinger: period (15-25), std_dev (1.5-3.0)
             - Momentum: lookback (3-15), momentum_threshold (0.01-0.05)
+        n_jobs: Worker processes used to evaluate independent indicator parameter
+            sets in parallel. Defaults to 1 (in-process).
             
     Returns:
         Dict[str, Any]: Optimization results including:
@@ -638,6 +641,8 @@ def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]],
         
     Note:
         - Grid search tests all combinations of provided parameter ranges
+        - Each indicator series is computed once per indicator parameter set; threshold
+          combinations are evaluated in batch (see signals/sweep.py for signal rules)
         - Signals generated using 5-day forward returns for backtesting
         - Composite score weights: Sharpe ratio (40%), total return (30%), win rate (20%), max drawdown (-10%)
         - Parameter importance calculated using correlation with performance scores
@@ -679,146 +684,13 @@ def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]],
     if not parameter_ranges:
         raise ValueError(f"No parameter ranges provided for strategy: {strategy}")
         
-    # Generate all parameter combinations
+    # Evaluate the full grid: one indicator series per indicator parameter set,
+    # all threshold combinations scored together as a signal matrix
     param_names = list(parameter_ranges.keys())
-    param_values = list(parameter_ranges.values())
-    param_combinations = list(product(*param_values))
+    optimization_results, combinations_tested = run_parameter_sweep(
+        price_series, strategy, parameter_ranges, n_jobs=n_jobs
+    )
         
-    optimization_results = []
-        
-    for i, param_combo in enumerate(param_combinations):
-        
-        # Create parameter dictionary
-        params = dict(zip(param_names, param_combo))
-            
-        # Generate signals based on strategy
-        if strategy == "rsi":
-            from indicators.momentum import calculate_rsi
-            rsi_result = calculate_rsi(price_series, period=params['period'])
-            if not rsi_result.get("success", True):
-                continue
-                
-            # Generate threshold-based signals
-            signals_result = generate_signals(
-                rsi_result['rsi'],
-                method="threshold",
-                parameters={
-                    "upper_threshold": params['upper_threshold'],
-                    "lower_threshold": params['lower_threshold']
-                }
-            )
-            
-        elif strategy == "macd":
-            from indicators.momentum import calculate_macd
-            macd_result = calculate_macd(
-                price_series, 
-                fast_period=params['fast_period'],
-                slow_period=params['slow_period'],
-                signal_period=params['signal_period']
-            )
-            if not macd_result.get("success", True):
-                continue
-                
-            # Generate crossover signals
-            macd_line = macd_result['macd_line']
-            signal_line = macd_result['signal_line']
-                
-            # Simple crossover detection
-            signals = []
-            for j in range(1, len(macd_line)):
-                if pd.notna(macd_line.iloc[j]) and pd.notna(signal_line.iloc[j]):
-                    if macd_line.iloc[j-1] <= signal_line.iloc[j-1] and macd_line.iloc[j] > signal_line.iloc[j]:
-                        signals.append({
-                            "timestamp": macd_line.index[j],
-                            "signal": "buy",
-                            "strength": 0.8
-                        })
-                    elif macd_line.iloc[j-1] >= signal_line.iloc[j-1] and macd_line.iloc[j] < signal_line.iloc[j]:
-                        signals.append({
-                            "timestamp": macd_line.index[j],
-                            "signal": "sell",
-                            "strength": 0.8
-                        })
-                
-            signals_result = {"signals": signals, "success": True}
-            
-        elif strategy == "momentum":
-            # Generate momentum signals
-            signals_result = generate_signals(
-                price_series,
-                method="momentum",
-                parameters={
-                    "lookback": params['lookback'],
-                    "momentum_threshold": params['momentum_threshold']
-                }
-            )
-            
-        else:
-            continue
-            
-        if not signals_result.get("success", True) or not signals_result.get("signals"):
-            continue
-            
-        # Backtest the signals
-        signals = signals_result["signals"]
-            
-        # Calculate performance metrics
-        signal_returns = []
-        for signal in signals:
-            signal_time = pd.to_datetime(signal['timestamp'])
-            price_idx = price_series.index.get_indexer([signal_time], method='nearest')[0]
-                
-            if price_idx >= 0 and price_idx < len(price_series) - 5:
-                entry_price = price_series.iloc[price_idx]
-                exit_price = price_series.iloc[min(price_idx + 5, len(price_series) - 1)]
-                    
-                if signal['signal'] == "buy":
-                    ret = (exit_price - entry_price) / entry_price
-                elif signal['signal'] == "sell":
-                    ret = (entry_price - exit_price) / entry_price
-                else:
-                    ret = 0
-                    
-                signal_returns.append(ret)
-            
-        if len(signal_returns) >= 5:  # Need minimum signals for reliable metrics
-            returns_array = np.array(signal_returns)
-                
-            # Calculate key performance metrics
-            total_return = np.prod(1 + returns_array) - 1
-            avg_return = np.mean(returns_array)
-            volatility = np.std(returns_array)
-            sharpe_ratio = avg_return / volatility if volatility > 0 else 0
-            win_rate = np.mean(returns_array > 0)
-                
-            # Max drawdown
-            cumulative = np.cumprod(1 + returns_array)
-            running_max = np.maximum.accumulate(cumulative)
-            drawdowns = (cumulative - running_max) / running_max
-            max_drawdown = np.min(drawdowns)
-                
-            # Composite score (weighted combination of metrics)
-            score = (
-                sharpe_ratio * 0.4 +
-                total_return * 0.3 +
-                win_rate * 0.2 +
-                abs(max_drawdown) * -0.1
-            )
-                
-            optimization_results.append({
-                "parameters": params,
-                "performance": {
-                    "total_return": float(total_return),
-                    "average_return": float(avg_return),
-                    "volatility": float(volatility),
-                    "sharpe_ratio": float(sharpe_ratio),
-                    "win_rate": float(win_rate),
-                    "max_drawdown": float(max_drawdown),
-                    "signal_count": len(signal_returns),
-                    "composite_score": float(score)
-                }
-            })
-            
     if not optimization_results:
         return standardize_output({
             "strategy": strategy,
@@ -826,9 +698,6 @@ def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]],
             "error": "No valid parameter combinations found"
         }, "optimize_signal_parameters")
         
-    # Sort by composite score (best first)
-    optimization_results.sort(key=lambda x: x["performance"]["composite_score"], reverse=True)
-        
     best_params = optimization_results[0]["parameters"]
     best_performance = optimization_results[0]["performance"]
         
@@ -865,9 +734,9 @@ def optimize_signal_parameters(prices: Union[pd.Series, Dict[str, Any]],
     result = {
         "optimization_summary": {
             "strategy": strategy,
-            "combinations_tested": len(param_combinations),
+            "combinations_tested": combinations_tested,
             "valid_results": len(optimization_results),
-            "success_rate": len(optimization_results) / len(param_combinations)
+            "success_rate": len(optimization_results) / combinations_tested
         },
         "best_parameters": best_params,
         "best_performance": best_performance,
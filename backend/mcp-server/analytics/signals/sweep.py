@@ -0,0 +1,245 @@
+"""Vectorized parameter sweep for signal strategy optimization.
+
+Backs ``optimize_signal_parameters``. Parameters are split into indicator
+parameters (e.g. RSI period), which require recomputing the indicator, and
+threshold parameters (e.g. RSI overbought/oversold levels), which only change
+how the indicator is read. Each distinct indicator series is computed once and
+all threshold combinations for it are evaluated together as a 2-D signal
+matrix (one row per combination, +1 buy / -1 sell / 0 none) that is scored in
+a single batch.
+
+Independent indicator parameter groups can be distributed over a process pool.
+
+Signal rules:
+    - rsi: buy when RSI crosses below lower_threshold, sell when it crosses above upper_threshold
+    - macd: buy/sell when the MACD line crosses above/below its signal line
+    - bollinger: buy when price crosses below the lower band, sell when it crosses above the upper band
+    - momentum: buy when the lookback return crosses above +momentum_threshold,
+      sell when it crosses below -momentum_threshold
+
+Each signal is scored by its forward return over HOLDING_PERIOD bars
+(short for sell signals).
+
+This module is used by ``optimize_signal_parameters`` in ``analysis.py`` and is
+not part of the auto-discovered analytics function set.
+"""
+
+import numpy as np
+import pandas as pd
+import talib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Any, Dict, List, Tuple
+
+HOLDING_PERIOD = 5
+MIN_SIGNALS = 5
+
+# Parameters that change the indicator series, per strategy
+INDICATOR_PARAMETERS = {
+    "rsi": ["period"],
+    "macd": ["fast_period", "slow_period", "signal_period"],
+    "bollinger": ["period"],
+    "momentum": ["lookback"],
+}
+
+# Used when a parameter is not part of the sweep
+PARAMETER_DEFAULTS = {
+    "rsi": {"period": 14, "upper_threshold": 70, "lower_threshold": 30},
+    "macd": {"fast_period": 12, "slow_period": 26, "signal_period": 9},
+    "bollinger": {"period": 20, "std_dev": 2.0},
+    "momentum": {"lookback": 10, "momentum_threshold": 0.02},
+}
+
+
+def _crosses_below(values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """values (T,) against levels (k, 1) or (k, T): True where values move from >= level to < level."""
+    levels = np.broadcast_to(levels, (levels.shape[0], len(values)))
+    crossed = np.zeros(levels.shape, dtype=bool)
+    crossed[:, 1:] = (values[None, :-1] >= levels[:, :-1]) & (values[None, 1:] < levels[:, 1:])
+    return crossed
+
+
+def _crosses_above(values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """values (T,) against levels (k, 1) or (k, T): True where values move from <= level to > level."""
+    levels = np.broadcast_to(levels, (levels.shape[0], len(values)))
+    crossed = np.zeros(levels.shape, dtype=bool)
+    crossed[:, 1:] = (values[None, :-1] <= levels[:, :-1]) & (values[None, 1:] > levels[:, 1:])
+    return crossed
+
+
+def build_signal_matrix(strategy: str, prices: np.ndarray, indicator_params: Dict[str, Any],
+                        threshold_grid: List[Dict[str, Any]]) -> np.ndarray:
+    """Compute the indicator once and return signals for every threshold combination.
+
+    Args:
+        strategy: Strategy name (see INDICATOR_PARAMETERS)
+        prices: Price array
+        indicator_params: Indicator parameter values for this group
+        threshold_grid: One dict of threshold parameter values per row
+
+    Returns:
+        int8 array of shape (len(threshold_grid), len(prices)) with +1 buy, -1 sell, 0 none.
+    """
+    params = {**PARAMETER_DEFAULTS[strategy], **indicator_params}
+
+    def column(name: str) -> np.ndarray:
+        return np.array([float(t.get(name, params[name])) for t in threshold_grid])[:, None]
+
+    if strategy == "rsi":
+        rsi = talib.RSI(prices, timeperiod=int(params["period"]))
+        buy = _crosses_below(rsi, column("lower_threshold"))
+        sell = _crosses_above(rsi, column("upper_threshold"))
+
+    elif strategy == "macd":
+        macd_line, signal_line, _ = talib.MACD(
+            prices,
+            fastperiod=int(params["fast_period"]),
+            slowperiod=int(params["slow_period"]),
+            signalperiod=int(params["signal_period"])
+        )
+        levels = np.broadcast_to(signal_line, (len(threshold_grid), len(prices)))
+        buy = _crosses_above(macd_line, levels)
+        sell = _crosses_below(macd_line, levels)
+
+    elif strategy == "bollinger":
+        rolling = pd.Series(prices).rolling(window=int(params["period"]))
+        middle = rolling.mean().values[None, :]
+        deviation = rolling.std().values[None, :]
+        width = column("std_dev") * deviation
+        buy = _crosses_below(prices, middle - width)
+        sell = _crosses_above(prices, middle + width)
+
+    elif strategy == "momentum":
+        lookback = int(params["lookback"])
+        momentum = np.full(len(prices), np.nan)
+        momentum[lookback:] = prices[lookback:] / prices[:-lookback] - 1
+        threshold = column("momentum_threshold")
+        buy = _crosses_above(momentum, threshold)
+        sell = _crosses_below(momentum, -threshold)
+
+    else:
+        raise ValueError(f"Unsupported strategy: {strategy}")
+
+    return buy.astype(np.int8) - sell.astype(np.int8)
+
+
+def score_signal_matrix(signals: np.ndarray, prices: np.ndarray,
+                        holding_period: int = HOLDING_PERIOD) -> Dict[str, np.ndarray]:
+    """Score every row of a signal matrix at once.
+
+    Each signal earns the forward return over ``holding_period`` bars (negated for
+    sells); signals too close to the end of the series are ignored.
+
+    Returns:
+        Dict of per-row arrays: signal_count, total_return, average_return,
+        volatility, sharpe_ratio, win_rate, max_drawdown, composite_score.
+    """
+    forward = np.full(len(prices), np.nan)
+    forward[:-holding_period] = (prices[holding_period:] - prices[:-holding_period]) / prices[:-holding_period]
+
+    active = (signals != 0) & ~np.isnan(forward)[None, :]
+    returns = np.where(active, signals * np.nan_to_num(forward), 0.0)
+    count = active.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = returns.sum(axis=1) / count
+        variance = (np.where(active, returns - average[:, None], 0.0) ** 2).sum(axis=1) / count
+        volatility = np.sqrt(variance)
+        sharpe = np.where(volatility > 0, average / volatility, 0.0)
+        win_rate = (active & (returns > 0)).sum(axis=1) / count
+
+        # Equity curve over the signal sequence; drawdown measured from the first signal on
+        growth = np.cumprod(1 + returns, axis=1)
+        started = np.cumsum(active, axis=1) > 0
+        peaks = np.maximum.accumulate(np.where(started, growth, 0.0), axis=1)
+        drawdown = np.where(started, (growth - peaks) / peaks, 0.0).min(axis=1)
+
+    total_return = growth[:, -1] - 1
+    score = sharpe * 0.4 + total_return * 0.3 + win_rate * 0.2 + np.abs(drawdown) * -0.1
+
+    return {
+        "signal_count": count,
+        "total_return": total_return,
+        "average_return": average,
+        "volatility": volatility,
+        "sharpe_ratio": sharpe,
+        "win_rate": win_rate,
+        "max_drawdown": drawdown,
+        "composite_score": score,
+    }
+
+
+def evaluate_indicator_group(task: Tuple) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    """Evaluate all threshold combinations for one indicator parameter set.
+
+    Top-level so it can be pickled for a process pool.
+
+    Args:
+        task: (strategy, prices, indicator_params, combinations) where combinations
+            is a list of (combination_index, full_parameter_dict).
+
+    Returns:
+        List of (combination_index, parameters, performance) for combinations with
+        at least MIN_SIGNALS scored signals.
+    """
+    strategy, prices, indicator_params, combinations = task
+    try:
+        signals = build_signal_matrix(strategy, prices, indicator_params, [params for _, params in combinations])
+    except Exception:
+        # Invalid indicator parameters (e.g. rejected by TA-Lib) are skipped
+        return []
+
+    scores = score_signal_matrix(signals, prices)
+    results = []
+    for row, (index, params) in enumerate(combinations):
+        count = int(scores["signal_count"][row])
+        if count < MIN_SIGNALS:
+            continue
+        performance = {name: float(values[row]) for name, values in scores.items()}
+        performance["signal_count"] = count
+        results.append((index, params, performance))
+    return results
+
+
+def run_parameter_sweep(prices: pd.Series, strategy: str, parameter_ranges: Dict[str, List],
+                        n_jobs: int = 1) -> Tuple[List[Dict[str, Any]], int]:
+    """Evaluate the full parameter grid for a strategy.
+
+    Args:
+        prices: Validated price series
+        strategy: Strategy name
+        parameter_ranges: Parameter name -> list of values to test
+        n_jobs: Worker processes for indicator groups (1 runs in-process)
+
+    Returns:
+        Tuple of (results sorted by composite score, best first, with ties in grid
+        order; number of combinations in the grid).
+    """
+    param_names = list(parameter_ranges.keys())
+    combinations = [dict(zip(param_names, combo)) for combo in product(*parameter_ranges.values())]
+    if strategy not in INDICATOR_PARAMETERS:
+        return [], len(combinations)
+
+    # Group combinations that share the same indicator series
+    indicator_names = [name for name in INDICATOR_PARAMETERS[strategy] if name in parameter_ranges]
+    groups: Dict[Tuple, List[Tuple[int, Dict[str, Any]]]] = {}
+    for index, params in enumerate(combinations):
+        key = tuple(params[name] for name in indicator_names)
+        groups.setdefault(key, []).append((index, params))
+
+    price_values = prices.values.astype(np.float64)
+    tasks = [
+        (strategy, price_values, dict(zip(indicator_names, key)), members)
+        for key, members in groups.items()
+    ]
+
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            group_results = list(executor.map(evaluate_indicator_group, tasks))
+    else:
+        group_results = [evaluate_indicator_group(task) for task in tasks]
+
+    scored = sorted((item for group in group_results for item in group), key=lambda item: item[0])
+    results = [{"parameters": params, "performance": performance} for _, params, performance in scored]
+    results.sort(key=lambda x: x["performance"]["composite_score"], reverse=True)
+    return results, len(combinations)
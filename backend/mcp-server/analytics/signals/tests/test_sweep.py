@@ -0,0 +1,127 @@
+"""
+Unit tests for the vectorized parameter sweep.
+
+Checks the batch signal matrix scoring against a per-combination loop that
+backtests each signal individually, and the parallel path against the
+in-process one.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+import talib
+
+# Import functions to test
+from ..sweep import (
+    build_signal_matrix,
+    score_signal_matrix,
+    run_parameter_sweep,
+    MIN_SIGNALS
+)
+
+
+def reference_performance(prices: np.ndarray, signals: np.ndarray, holding_period: int = 5):
+    """Backtest one signal row signal by signal, as the original grid search did"""
+    signal_returns = []
+    for idx in np.flatnonzero(signals):
+        if idx < len(prices) - holding_period:
+            entry, exit_ = prices[idx], prices[idx + holding_period]
+            ret = (exit_ - entry) / entry
+            signal_returns.append(ret if signals[idx] > 0 else -ret)
+    if len(signal_returns) < MIN_SIGNALS:
+        return None
+    returns_array = np.array(signal_returns)
+    volatility = np.std(returns_array)
+    cumulative = np.cumprod(1 + returns_array)
+    running_max = np.maximum.accumulate(cumulative)
+    return {
+        "total_return": np.prod(1 + returns_array) - 1,
+        "average_return": np.mean(returns_array),
+        "volatility": volatility,
+        "sharpe_ratio": np.mean(returns_array) / volatility if volatility > 0 else 0,
+        "win_rate": np.mean(returns_array > 0),
+        "max_drawdown": np.min((cumulative - running_max) / running_max),
+        "signal_count": len(signal_returns),
+    }
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Test batch sweep results against per-combination reference calculations"""
+
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(7)
+        dates = pd.date_range('2020-01-01', periods=600, freq='D')
+        self.prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(dates)))), index=dates)
+        self.values = self.prices.values
+
+    def test_rsi_signal_matrix_matches_crossings(self):
+        """Test each RSI signal row marks threshold crossings"""
+        grid = [{"upper_threshold": 70, "lower_threshold": 30}, {"upper_threshold": 65, "lower_threshold": 35}]
+        signals = build_signal_matrix("rsi", self.values, {"period": 14}, grid)
+        rsi = talib.RSI(self.values, timeperiod=14)
+
+        self.assertEqual(signals.shape, (2, len(self.values)))
+        for row, thresholds in enumerate(grid):
+            for t in range(1, len(rsi)):
+                expected = 0
+                if rsi[t - 1] >= thresholds["lower_threshold"] > rsi[t]:
+                    expected = 1
+                elif rsi[t - 1] <= thresholds["upper_threshold"] < rsi[t]:
+                    expected = -1
+                self.assertEqual(signals[row, t], expected)
+
+    def test_scores_match_reference(self):
+        """Test batch scoring against per-signal backtest for every strategy"""
+        cases = [
+            ("rsi", {"period": 10}, [{"upper_threshold": u, "lower_threshold": l} for u in (65, 70) for l in (30, 35)]),
+            ("macd", {"fast_period": 8, "slow_period": 21, "signal_period": 6}, [{}]),
+            ("bollinger", {"period": 20}, [{"std_dev": s} for s in (1.5, 2.0)]),
+            ("momentum", {"lookback": 5}, [{"momentum_threshold": m} for m in (0.01, 0.03)]),
+        ]
+        for strategy, indicator_params, grid in cases:
+            signals = build_signal_matrix(strategy, self.values, indicator_params, grid)
+            scores = score_signal_matrix(signals, self.values)
+            for row in range(len(grid)):
+                expected = reference_performance(self.values, signals[row])
+                if expected is None:
+                    continue
+                for name, value in expected.items():
+                    self.assertAlmostEqual(scores[name][row], value, places=10, msg=f"{strategy} {name}")
+
+    def test_sweep_results_ranked(self):
+        """Test full sweep returns ranked results with grid bookkeeping"""
+        ranges = {"period": [10, 14, 20], "upper_threshold": [65, 70, 75], "lower_threshold": [25, 30, 35]}
+        results, tested = run_parameter_sweep(self.prices, "rsi", ranges)
+
+        self.assertEqual(tested, 27)
+        self.assertGreater(len(results), 0)
+        scores = [r["performance"]["composite_score"] for r in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for result in results:
+            self.assertEqual(set(result["parameters"]), set(ranges))
+            self.assertGreaterEqual(result["performance"]["signal_count"], MIN_SIGNALS)
+
+    def test_parallel_matches_serial(self):
+        """Test process pool evaluation gives identical results"""
+        ranges = {"lookback": [3, 5, 10, 15], "momentum_threshold": [0.01, 0.02, 0.03]}
+        serial, _ = run_parameter_sweep(self.prices, "momentum", ranges)
+        parallel, _ = run_parameter_sweep(self.prices, "momentum", ranges, n_jobs=2)
+        self.assertEqual(serial, parallel)
+
+    def test_unsupported_strategy(self):
+        """Test unknown strategies yield no results"""
+        results, tested = run_parameter_sweep(self.prices, "unknown", {"a": [1, 2]})
+        self.assertEqual(results, [])
+        self.assertEqual(tested, 2)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Parameter Sweep Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Parameter sweep tests completed!")
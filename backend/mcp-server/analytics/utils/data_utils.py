@@ -32,6 +32,8 @@ Note:
 
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
 from typing import Dict, List, Any, Union, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -40,6 +42,131 @@ warnings.filterwarnings('ignore')
 from scipy import stats
 import empyrical
 
+# Validated results for recent list inputs, keyed on (kind, id(input)).
+# Scripts typically pass the same list of bars to several metrics; the entry
+# holds a reference to the input so its id cannot be reused while cached, and
+# the raw extracted values so in-place edits of the list or its bars miss.
+_COERCION_CACHE_SIZE = 32
+_coercion_cache: "OrderedDict[Tuple[str, int], Tuple[Any, np.ndarray, pd.Series]]" = OrderedDict()
+
+
+def _same_values(cached: np.ndarray, values: np.ndarray) -> bool:
+    """True if the values extracted now match those extracted when cached"""
+    if cached.dtype != values.dtype or cached.shape != values.shape:
+        return False
+    try:
+        return bool(np.array_equal(cached, values, equal_nan=cached.dtype.kind == "f"))
+    except (TypeError, ValueError):
+        return False
+
+
+def _cached_validation(kind: str, data: list, raw: pd.Series) -> Optional[pd.Series]:
+    entry = _coercion_cache.get((kind, id(data)))
+    if entry is None or entry[0] is not data or not _same_values(entry[1], raw.to_numpy()):
+        return None
+    _coercion_cache.move_to_end((kind, id(data)))
+    return entry[2]
+
+
+def _cache_validation(kind: str, data: list, raw: pd.Series, series: pd.Series) -> None:
+    _coercion_cache[(kind, id(data))] = (data, raw.to_numpy(), series)
+    if len(_coercion_cache) > _COERCION_CACHE_SIZE:
+        _coercion_cache.popitem(last=False)
+
+
+def _is_clean_numeric(series: pd.Series) -> bool:
+    """True for int/float Series without NaN (nothing to coerce or drop)"""
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype):
+        return False
+    return dtype.kind in "iu" or (dtype.kind == "f" and not np.isnan(series.values).any())
+
+
+def _extract_record_values(records: list, fields: Tuple[str, ...]) -> pd.Series:
+    """Pull one numeric field out of a list of bar dicts or StandardBar objects.
+    
+    Uses the first of ``fields`` present on the first record, read from every
+    record in one np.fromiter pass; falls back to the first numeric value of
+    each dict when none of the fields is present.
+    """
+    first = records[0]
+    if isinstance(first, dict):
+        field = next((f for f in fields if f in first), None)
+        getter = itemgetter(field) if field else None
+    else:
+        # Dataclass bars (financial.schemas.StandardBar), matched without an import dependency
+        field = next((f for f in fields if f in getattr(first, "__dataclass_fields__", ())), None)
+        getter = attrgetter(field) if field else None
+        if getter is None:
+            return pd.Series(records)
+    
+    if getter is None:
+        # Use first numeric value from each dict
+        values = []
+        for item in records:
+            for key, value in item.items():
+                if isinstance(value, (int, float)):
+                    values.append(value)
+                    break
+        return pd.Series(values)
+    
+    try:
+        return pd.Series(np.fromiter(map(getter, records), dtype=np.float64, count=len(records)))
+    except (TypeError, ValueError):
+        # None or non-numeric values: left to pd.to_numeric coercion
+        return pd.Series(list(map(getter, records)))
+
+
+def _coerce_numeric_series(data: Any, kind: str, dict_keys: Tuple[str, ...],
+                           column_keys: Tuple[str, ...], record_fields: Tuple[str, ...]) -> pd.Series:
+    """Shared coercion for validate_price_data / validate_return_data.
+    
+    Clean numeric input is not re-converted, and list results are cached while
+    the values read from the list are unchanged (extraction still runs on every
+    call; numeric conversion and cleaning do not). The result is always a
+    shallow copy (values shared, no data copied), so callers
+    may rename or re-index it without touching the input or the cached Series;
+    they must not modify its values in place.
+    """
+    if isinstance(data, pd.Series):
+        if _is_clean_numeric(data):
+            return data.copy(deep=False)
+        series = data
+    elif isinstance(data, list):
+        if data and (isinstance(data[0], dict) or hasattr(data[0], "__dataclass_fields__")):
+            series = _extract_record_values(data, record_fields)
+        else:
+            series = pd.Series(data)
+        cached = _cached_validation(kind, data, series)
+        if cached is not None:
+            return cached.copy(deep=False)
+        raw = series
+    elif isinstance(data, dict):
+        key = next((k for k in dict_keys if k in data), None)
+        series = data[key] if key else pd.Series(list(data.values()))
+    elif isinstance(data, np.ndarray):
+        series = pd.Series(data)
+    elif isinstance(data, pd.DataFrame):
+        column = next((c for c in column_keys if c in data.columns), None)
+        series = data[column] if column else data.iloc[:, 0]
+    else:
+        raise ValueError(f"Unsupported data type: {type(data)}")
+    
+    if not (isinstance(series, pd.Series) and _is_clean_numeric(series)):
+        # Convert to numeric and drop NaN
+        series = pd.to_numeric(series, errors='coerce')
+        if not isinstance(series, pd.Series):
+            series = pd.Series(series)
+        series = series.dropna()
+    
+    if len(series) == 0:
+        raise ValueError(f"No valid {kind} data after cleaning")
+    
+    if isinstance(data, list):
+        _cache_validation(kind, data, raw, series)
+    return series.copy(deep=False)
+
+
 def validate_price_data(data: Union[pd.Series, pd.DataFrame, List, Dict]) -> pd.Series:
     """Validate and standardize price data from various input formats.
     
@@ -55,6 +182,9 @@ def validate_price_data(data: Union[pd.Series, pd.DataFrame, List, Dict]) -> pd.
             - Dictionary: Looks for 'prices', 'close', 'data' keys or uses values directly
             - List: Simple numeric list or list of dictionaries with price fields
             - List of dicts: Extracts 'close'/'Close' or first numeric value
+            - List of StandardBar: Extracts the close field
+            - BarFrame: Columnar bars from get_historical_data(as_frame=True);
+              the close column is wrapped without copying
             
     Returns:
         pd.Series: Validated price series with numeric values and NaN values removed.
@@ -98,56 +228,25 @@ def validate_price_data(data: Union[pd.Series, pd.DataFrame, List, Dict]) -> pd.
         - For dictionaries, prioritizes 'prices' > 'close' > 'data' > direct values
         - List of dictionaries extracts first numeric value if no price fields found
         - Returns empty series if no valid data points remain after cleaning
+        - Numeric Series without NaN are returned as-is (not copied), and the
+          result for a list input is reused while the same, unmodified list
+          is passed again, so chained metrics validate once; do not modify the
+          result in place
     """
-    if isinstance(data, dict):
-        if "prices" in data:
-            series = data["prices"]
-        elif "close" in data:
-            series = data["close"]
-        elif "data" in data:
-            series = data["data"]
-        else:
-            # Try to convert dict values to series
-            series = pd.Series(list(data.values()))
-    elif isinstance(data, (list, np.ndarray)):
-        # Check if it's a list of dictionaries (common MCP format)
-        if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-            # Extract 'close' values from list of dictionaries
-            if "close" in data[0]:
-                series = pd.Series([item["close"] for item in data])
-            elif "Close" in data[0]:
-                series = pd.Series([item["Close"] for item in data])
-            else:
-                # Use first numeric value from each dict
-                values = []
-                for item in data:
-                    for key, value in item.items():
-                        if isinstance(value, (int, float)):
-                            values.append(value)
-                            break
-                series = pd.Series(values)
-        else:
-            series = pd.Series(data)
-    elif isinstance(data, pd.Series):
-        series = data.copy()
-    elif isinstance(data, pd.DataFrame):
-        # If DataFrame, try to get close column or first column
-        if "close" in data.columns:
-            series = data["close"]
-        elif "Close" in data.columns:
-            series = data["Close"]
-        else:
-            series = data.iloc[:, 0]
-    else:
-        raise ValueError(f"Unsupported data type: {type(data)}")
-        
-    # Convert to numeric and drop NaN
-    series = pd.to_numeric(series, errors='coerce').dropna()
-        
-    if len(series) == 0:
-        raise ValueError("No valid price data after cleaning")
-        
-    return series
+    if getattr(data, "__bar_frame__", False):
+        # Columnar bars (financial.schemas.BarFrame): use the close array as-is
+        series = data.to_series("close")
+        if len(series) == 0:
+            raise ValueError("No valid price data after cleaning")
+        if not np.isnan(data.close).any():
+            return series
+        return series.dropna()
+    return _coerce_numeric_series(
+        data, "price",
+        dict_keys=("prices", "close", "data"),
+        column_keys=("close", "Close"),
+        record_fields=("close", "Close")
+    )
         
 def validate_return_data(data: Union[pd.Series, pd.DataFrame, List, Dict]) -> pd.Series:
     """Validate and standardize return data from various input formats.
@@ -205,52 +304,15 @@ def validate_return_data(data: Union[pd.Series, pd.DataFrame, List, Dict]) -> pd
         - For dictionaries, prioritizes 'returns' > 'return' > 'data' > direct values
         - Preserves original datetime index when available for time series analysis
         - Return data validation is similar to price validation but with return-specific field names
+        - Numeric Series without NaN are returned as-is (not copied); do not
+          modify the result in place
     """
-    if isinstance(data, dict):
-        if "returns" in data:
-            series = data["returns"]
-        elif "return" in data:
-            series = data["return"]
-        elif "data" in data:
-            series = data["data"]
-        else:
-            series = pd.Series(list(data.values()))
-    elif isinstance(data, (list, np.ndarray)):
-        # Check if it's a list of dictionaries (common MCP format)
-        if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-            # Extract 'returns' values from list of dictionaries
-            if "returns" in data[0]:
-                series = pd.Series([item["returns"] for item in data])
-            elif "return" in data[0]:
-                series = pd.Series([item["return"] for item in data])
-            else:
-                # Use first numeric value from each dict
-                values = []
-                for item in data:
-                    for key, value in item.items():
-                        if isinstance(value, (int, float)):
-                            values.append(value)
-                            break
-                series = pd.Series(values)
-        else:
-            series = pd.Series(data)
-    elif isinstance(data, pd.Series):
-        series = data.copy()
-    elif isinstance(data, pd.DataFrame):
-        if "returns" in data.columns:
-            series = data["returns"]
-        else:
-            series = data.iloc[:, 0]
-    else:
-        raise ValueError(f"Unsupported data type: {type(data)}")
-        
-    # Convert to numeric and drop NaN
-    series = pd.to_numeric(series, errors='coerce').dropna()
-        
-    if len(series) == 0:
-        raise ValueError("No valid return data after cleaning")
-        
-    return series
+    return _coerce_numeric_series(
+        data, "return",
+        dict_keys=("returns", "return", "data"),
+        column_keys=("returns",),
+        record_fields=("returns", "return")
+    )
         
 def prices_to_returns(prices: pd.Series, method: str = "simple") -> pd.Series:
     """Convert price series to returns using standard financial calculations.
@@ -0,0 +1,109 @@
+"""Vectorized rolling-window statistics.
+
+Shared engine for analytics functions that need per-window statistics over a
+fixed-length trailing window. Every window is a row of a strided numpy view
+(no data copied), so statistics are computed for all windows in one array
+operation instead of a Python loop that slices a pandas object per window.
+
+All functions take 1-D arrays and return one value per full window: for ``n``
+observations and window ``w`` the result has ``n - w + 1`` entries (none when
+``n < w``), where entry ``k`` covers observations ``[k, k + w)``. Statistics follow the pandas
+conventions used elsewhere in analytics (sample variance, bias-adjusted skew).
+
+Example:
+    >>> import numpy as np
+    >>> from analytics.utils.rolling import rolling_beta
+    >>> asset = np.random.normal(0, 0.01, 250)
+    >>> market = np.random.normal(0, 0.01, 250)
+    >>> betas = rolling_beta(asset, market, window=30)
+    >>> len(betas)
+    221
+"""
+
+import numpy as np
+from typing import Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Read-only 2-D view of all full windows, shape ``(n - window + 1, window)``.
+
+    A series shorter than the window has no full windows and gives shape ``(0, window)``.
+
+    Raises:
+        ValueError: If window is not positive.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1:
+        raise ValueError(f"Window {window} invalid for {len(values)} observations")
+    if window > len(values):
+        return np.empty((0, window))
+    return sliding_window_view(values, window)
+
+
+def _demeaned(values: np.ndarray, window: int) -> np.ndarray:
+    windows = rolling_windows(values, window)
+    return windows - windows.mean(axis=1, keepdims=True)
+
+
+def rolling_beta(returns: np.ndarray, benchmark_returns: np.ndarray, window: int) -> np.ndarray:
+    """Rolling beta, cov(returns, benchmark) / var(benchmark), per window.
+
+    Windows where the benchmark variance is zero yield NaN.
+    """
+    dy = _demeaned(returns, window)
+    dx = _demeaned(benchmark_returns, window)
+    cov = (dy * dx).sum(axis=1)
+    var = (dx * dx).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(var > 0, cov / var, np.nan)
+
+
+def rolling_linregress(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling least-squares fit of values against time (0..window-1).
+
+    Equivalent to ``scipy.stats.linregress(np.arange(window), values[k:k+window])``
+    for every window.
+
+    Returns:
+        Tuple of (slope, r_squared) arrays. R² is 0 for constant windows, where
+        linregress leaves the correlation undefined: a flat window has no trend.
+    """
+    dy = _demeaned(values, window)
+    dx = np.arange(window, dtype=np.float64) - (window - 1) / 2.0
+    ssx = (dx * dx).sum()
+    sxy = dy @ dx
+    ssy = (dy * dy).sum(axis=1)
+    slope = sxy / ssx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(ssy > 0, sxy / np.sqrt(ssx * ssy), 0.0)
+    r = np.clip(r, -1.0, 1.0)
+    return slope, r * r
+
+
+def rolling_skew(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling bias-adjusted sample skewness (same as ``pandas.Series.skew``)."""
+    if window < 3:
+        return np.full(max(len(values) - window + 1, 0), np.nan)
+    d = _demeaned(values, window)
+    d2 = d * d
+    m2 = d2.sum(axis=1)
+    m3 = (d2 * d).sum(axis=1)
+    # pandas zeroes out floating point noise before dividing
+    m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+    m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+    n = float(window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+    return np.where(m2 == 0, 0.0, skew)
+
+
+def rolling_max_drawdown(returns: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum drawdown (most negative peak-to-trough, as a fraction) per window.
+
+    The equity curve within each window starts at the first compounded return,
+    matching ``(1 + returns).cumprod()`` over the window slice.
+    """
+    growth = np.cumprod(1.0 + rolling_windows(returns, window), axis=1)
+    peaks = np.maximum.accumulate(growth, axis=1)
+    return ((growth - peaks) / peaks).min(axis=1)
@@ -0,0 +1,130 @@
+"""
+Micro-benchmarks for validate_price_data / validate_return_data input coercion.
+
+Compares the current coercion layer with the previous implementation (kept
+below as ``legacy_validate``) on the input shapes analytics scripts pass in.
+Not collected by the test runner; run directly:
+
+    python -m analytics.utils.tests.benchmark_coercion [n_bars]
+"""
+
+import sys
+import timeit
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ..data_utils import validate_price_data, _coercion_cache
+
+
+@dataclass
+class Bar:
+    """Stand-in for financial.schemas.StandardBar"""
+    timestamp: str
+    close: float
+
+
+def legacy_validate(data) -> pd.Series:
+    """validate_price_data before the coercion fast paths"""
+    if isinstance(data, dict):
+        if "prices" in data:
+            series = data["prices"]
+        elif "close" in data:
+            series = data["close"]
+        elif "data" in data:
+            series = data["data"]
+        else:
+            series = pd.Series(list(data.values()))
+    elif isinstance(data, (list, np.ndarray)):
+        if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
+            if "close" in data[0]:
+                series = pd.Series([item["close"] for item in data])
+            elif "Close" in data[0]:
+                series = pd.Series([item["Close"] for item in data])
+            else:
+                values = []
+                for item in data:
+                    for key, value in item.items():
+                        if isinstance(value, (int, float)):
+                            values.append(value)
+                            break
+                series = pd.Series(values)
+        else:
+            series = pd.Series(data)
+    elif isinstance(data, pd.Series):
+        series = data.copy()
+    elif isinstance(data, pd.DataFrame):
+        if "close" in data.columns:
+            series = data["close"]
+        elif "Close" in data.columns:
+            series = data["Close"]
+        else:
+            series = data.iloc[:, 0]
+    else:
+        raise ValueError(f"Unsupported data type: {type(data)}")
+    series = pd.to_numeric(series, errors='coerce').dropna()
+    if len(series) == 0:
+        raise ValueError("No valid price data after cleaning")
+    return series
+
+
+def build_inputs(n_bars: int):
+    rng = np.random.default_rng(0)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    dates = pd.date_range("2000-01-03", periods=n_bars, freq="B")
+    records = [{"timestamp": str(d.date()), "open": c, "high": c, "low": c, "close": float(c), "volume": 1000}
+               for d, c in zip(dates, closes)]
+    return {
+        "clean float Series": pd.Series(closes, index=dates),
+        "Series with NaN": pd.Series(np.where(rng.random(n_bars) < 0.01, np.nan, closes), index=dates),
+        "DataFrame": pd.DataFrame({"open": closes, "close": closes}, index=dates),
+        "list of floats": closes.tolist(),
+        "list of bar dicts": records,
+    }
+
+
+def time_call(func, data, number: int) -> float:
+    """Best-of-5 microseconds per call"""
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=5)) / number * 1e6
+
+
+def run_benchmarks(n_bars: int = 2520, number: int = 200):
+    inputs = build_inputs(n_bars)
+    # StandardBar lists are only timed for the current path: the legacy path rejects them
+    bars = [Bar(r["timestamp"], r["close"]) for r in inputs["list of bar dicts"]]
+
+    print(f"\n📊 Coercion benchmark ({n_bars} bars, µs per call)")
+    print(f"{'input':<34}{'legacy':>10}{'current':>10}{'speedup':>10}")
+    print("-" * 64)
+    for name, data in inputs.items():
+        legacy = time_call(legacy_validate, data, number)
+        # First call on a list pays for extraction; later calls hit the identity cache
+        _coercion_cache.clear()
+        cold = time_call(lambda d: (_coercion_cache.clear(), validate_price_data(d)), data, number)
+        print(f"{name:<34}{legacy:>10.1f}{cold:>10.1f}{legacy / cold:>9.1f}x")
+        if isinstance(data, list):
+            warm = time_call(validate_price_data, data, number)
+            print(f"{name + ' (repeat call)':<34}{legacy:>10.1f}{warm:>10.1f}{legacy / warm:>9.1f}x")
+
+    _coercion_cache.clear()
+    current = time_call(lambda d: (_coercion_cache.clear(), validate_price_data(d)), bars, number)
+    print(f"{'list of StandardBar':<34}{'n/a':>10}{current:>10.1f}{'':>10}")
+
+    # Ten chained metrics over the same raw bars, as generated scripts do
+    records = inputs["list of bar dicts"]
+    legacy_chain = time_call(lambda d: [legacy_validate(d) for _ in range(10)], records, number // 10)
+    _coercion_cache.clear()
+    current_chain = time_call(lambda d: [validate_price_data(d) for _ in range(10)], records, number // 10)
+    print(f"{'10 chained validations (dicts)':<34}{legacy_chain:>10.1f}{current_chain:>10.1f}"
+          f"{legacy_chain / current_chain:>9.1f}x")
+
+
+if __name__ == '__main__':
+    print("🧪 Running Coercion Micro-benchmarks")
+    print("=" * 64)
+
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 2520)
+
+    print("\n" + "=" * 64)
+    print("✅ Coercion benchmarks completed!")
@@ -0,0 +1,174 @@
+"""
+Unit tests for the input coercion fast paths in validate_price_data /
+validate_return_data.
+
+Checks that clean inputs pass through without copying their values, bar
+records are extracted correctly, list results are reused only while the list
+is unchanged, results can be renamed or re-indexed without touching the input
+or the cache, and messy inputs are still coerced as before.
+"""
+
+import unittest
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Import functions to test
+from ..data_utils import validate_price_data, validate_return_data, _coercion_cache
+from ...risk.metrics import calculate_correlation_matrix
+
+
+@dataclass
+class Bar:
+    """Stand-in for financial.schemas.StandardBar"""
+    timestamp: str
+    close: float
+
+
+class TestCoercionFastPath(unittest.TestCase):
+    """Test pass-through, record extraction and identity caching"""
+
+    def setUp(self):
+        """Set up test data"""
+        _coercion_cache.clear()
+        rng = np.random.default_rng(3)
+        self.closes = 100 + np.cumsum(rng.normal(0, 1, 250))
+        self.dates = pd.date_range('2023-01-01', periods=250, freq='B')
+        self.records = [{"timestamp": str(d.date()), "close": float(c), "volume": 1000}
+                        for d, c in zip(self.dates, self.closes)]
+
+    def test_clean_series_passes_through(self):
+        """Clean float and int Series are returned without copying their values"""
+        prices = pd.Series(self.closes, index=self.dates)
+        returns = prices.pct_change().dropna()
+        volumes = pd.Series(np.arange(1, 11))
+        for data, validate in ((prices, validate_price_data), (returns, validate_return_data),
+                               (volumes, validate_price_data)):
+            result = validate(data)
+            self.assertIsNot(result, data)
+            self.assertTrue(np.shares_memory(result.to_numpy(), data.to_numpy()))
+            self.assertTrue(result.index.equals(data.index))
+
+    def test_series_with_nan_cleaned(self):
+        """NaN values are still dropped, keeping the original index"""
+        prices = pd.Series([100.0, np.nan, 102.0, np.nan], index=list("abcd"))
+        result = validate_price_data(prices)
+        self.assertEqual(list(result.index), ["a", "c"])
+        self.assertEqual(list(prices.index), list("abcd"))
+
+    def test_object_series_coerced(self):
+        """Non-numeric dtypes are coerced as before"""
+        result = validate_price_data(pd.Series(["100.5", "bad", 101]))
+        self.assertEqual(result.tolist(), [100.5, 101.0])
+
+    def test_list_of_dicts(self):
+        """Close values are extracted from bar dicts"""
+        result = validate_price_data(self.records)
+        np.testing.assert_array_equal(result.values, self.closes)
+        self.assertEqual(result.dtype, np.float64)
+
+    def test_list_of_dicts_with_missing_values(self):
+        """None values fall back to coercion and are dropped"""
+        records = [{"close": 100.0}, {"close": None}, {"close": "101.5"}]
+        result = validate_price_data(records)
+        self.assertEqual(result.tolist(), [100.0, 101.5])
+        self.assertEqual(list(result.index), [0, 2])
+
+    def test_list_of_dataclass_bars(self):
+        """Close values are extracted from StandardBar-like objects"""
+        bars = [Bar(r["timestamp"], r["close"]) for r in self.records]
+        result = validate_price_data(bars)
+        np.testing.assert_array_equal(result.values, self.closes)
+
+    def test_return_records(self):
+        """Return records use the 'returns'/'return' fields"""
+        result = validate_return_data([{"date": "2023-01-01", "return": 0.01}, {"date": "2023-01-02", "return": -0.02}])
+        self.assertEqual(result.tolist(), [0.01, -0.02])
+
+    def test_dict_of_list(self):
+        """Dict values given as plain lists become a Series"""
+        result = validate_price_data({"close": [100, 102, 98]})
+        self.assertEqual(result.tolist(), [100, 102, 98])
+
+    def test_list_result_reused(self):
+        """The same list validated twice reuses the cached Series values"""
+        first = validate_price_data(self.records)
+        second = validate_price_data(self.records)
+        self.assertIsNot(second, first)
+        self.assertTrue(np.shares_memory(second.to_numpy(), first.to_numpy()))
+        # Price and return validation are cached separately
+        self.assertFalse(np.shares_memory(validate_return_data(self.records).to_numpy(), first.to_numpy()))
+
+    def test_result_metadata_changes_stay_local(self):
+        """Renaming or re-indexing a result leaves the input and cache alone"""
+        prices = pd.Series(self.closes, index=self.dates, name="close")
+        result = validate_price_data(prices)
+        result.name = "AAPL"
+        result.index = pd.RangeIndex(len(result))
+        self.assertEqual(prices.name, "close")
+        self.assertTrue(prices.index.equals(self.dates))
+
+        cached = validate_return_data(self.records)
+        original_index = cached.index.copy()
+        cached.name = "AAPL"
+        cached.index = pd.RangeIndex(100, 100 + len(cached))
+        again = validate_return_data(self.records)
+        self.assertIsNone(again.name)
+        self.assertTrue(again.index.equals(original_index))
+
+    def test_correlation_matrix_keeps_caller_names(self):
+        """calculate_correlation_matrix does not name the caller's unnamed Series"""
+        first = pd.Series(self.closes, index=self.dates).pct_change().dropna()
+        second = first.rolling(5).mean().dropna()
+        matrix = calculate_correlation_matrix([first, second])
+        self.assertEqual(list(matrix.columns), ["series_0", "series_1"])
+        self.assertIsNone(first.name)
+        self.assertIsNone(second.name)
+
+    def test_modified_list_revalidated(self):
+        """Appending to or replacing the ends of a list invalidates the cache"""
+        records = list(self.records)
+        first = validate_price_data(records)
+        records.append({"close": 1.0})
+        second = validate_price_data(records)
+        self.assertEqual(len(second), len(first) + 1)
+        records[0] = {"close": 2.0}
+        self.assertEqual(validate_price_data(records).iloc[0], 2.0)
+
+    def test_in_place_edits_revalidated(self):
+        """Editing a bar or a value inside a cached list invalidates the cache"""
+        records = [dict(record) for record in self.records]
+        validate_price_data(records)
+        records[100]["close"] = 1.0
+        self.assertEqual(validate_price_data(records).iloc[100], 1.0)
+        records[50] = {"close": None}
+        self.assertEqual(len(validate_price_data(records)), len(records) - 1)
+
+        bars = [Bar(r["timestamp"], r["close"]) for r in self.records]
+        validate_price_data(bars)
+        bars[10].close = 3.0
+        self.assertEqual(validate_price_data(bars).iloc[10], 3.0)
+
+        values = list(self.closes)
+        validate_return_data(values)
+        values[5] = "bad"
+        self.assertEqual(len(validate_return_data(values)), len(values) - 1)
+
+    def test_empty_input_rejected(self):
+        """Empty inputs still raise"""
+        with self.assertRaises(ValueError):
+            validate_price_data([])
+        with self.assertRaises(ValueError):
+            validate_return_data(pd.Series([np.nan, np.nan]))
+
+
+if __name__ == '__main__':
+    print("🧪 Running Coercion Fast Path Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Coercion fast path tests completed!")
@@ -0,0 +1,114 @@
+"""
+Unit tests for the vectorized rolling-window engine.
+
+Checks each rolling statistic against the per-window pandas/scipy calculation
+it replaces.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+# Import functions to test
+from ..rolling import (
+    rolling_windows,
+    rolling_beta,
+    rolling_linregress,
+    rolling_skew,
+    rolling_max_drawdown
+)
+from ...market.metrics import detect_market_regime
+
+
+class TestRollingEngine(unittest.TestCase):
+    """Test rolling statistics against per-window reference calculations"""
+    
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(42)
+        self.window = 30
+        self.returns = pd.Series(rng.normal(0.0005, 0.015, 200))
+        self.benchmark = pd.Series(0.8 * self.returns.values + rng.normal(0, 0.01, 200))
+        self.prices = 100 * (1 + self.returns).cumprod()
+    
+    def _windows(self, series):
+        return [series.iloc[k:k + self.window] for k in range(len(series) - self.window + 1)]
+    
+    def test_window_shape(self):
+        """One row per full window"""
+        windows = rolling_windows(self.returns.values, self.window)
+        self.assertEqual(windows.shape, (171, 30))
+        np.testing.assert_array_equal(windows[5], self.returns.values[5:35])
+        
+        with self.assertRaises(ValueError):
+            rolling_windows(self.returns.values, 0)
+    
+    def test_series_shorter_than_window(self):
+        """Fewer observations than the window give empty results instead of raising"""
+        short = self.returns.values[:10]
+        self.assertEqual(rolling_windows(short, self.window).shape, (0, self.window))
+        self.assertEqual(len(rolling_beta(short, short, self.window)), 0)
+        slope, r_squared = rolling_linregress(short, self.window)
+        self.assertEqual((len(slope), len(r_squared)), (0, 0))
+        self.assertEqual(len(rolling_skew(short, self.window)), 0)
+        self.assertEqual(len(rolling_skew(short[:1], 2)), 0)
+        self.assertEqual(len(rolling_max_drawdown(short, self.window)), 0)
+    
+    def test_rolling_beta(self):
+        """Beta matches cov / var per window"""
+        expected = [r.cov(b) / b.var() for r, b in zip(self._windows(self.returns), self._windows(self.benchmark))]
+        np.testing.assert_allclose(rolling_beta(self.returns.values, self.benchmark.values, self.window), expected)
+    
+    def test_rolling_beta_flat_benchmark(self):
+        """Zero benchmark variance gives NaN"""
+        betas = rolling_beta(self.returns.values, np.zeros(200), self.window)
+        self.assertTrue(np.isnan(betas).all())
+    
+    def test_rolling_linregress(self):
+        """Slope and R² match scipy linregress per window"""
+        slope, r_squared = rolling_linregress(self.prices.values, self.window)
+        x = np.arange(self.window)
+        fits = [stats.linregress(x, w.values) for w in self._windows(self.prices)]
+        np.testing.assert_allclose(slope, [f.slope for f in fits])
+        np.testing.assert_allclose(r_squared, [f.rvalue ** 2 for f in fits])
+    
+    def test_rolling_linregress_constant_window(self):
+        """Constant windows have zero slope and zero R² (no trend)"""
+        slope, r_squared = rolling_linregress(np.full(40, 100.0), self.window)
+        np.testing.assert_array_equal(slope, 0.0)
+        np.testing.assert_array_equal(r_squared, 0.0)
+    
+    def test_regime_trend_strength_on_flat_prices(self):
+        """Flat stretches report zero trend strength in detect_market_regime"""
+        prices = self.prices.copy()
+        prices.iloc[-50:] = prices.iloc[-50]
+        prices.index = pd.date_range('2023-01-02', periods=len(prices), freq='B')
+        timeline = detect_market_regime(prices, method="volatility_trend")["regime_timeline"]
+        self.assertEqual([period["trend_strength"] for period in timeline], [0.0] * len(timeline))
+    
+    def test_rolling_skew(self):
+        """Skew matches pandas Series.skew per window"""
+        expected = [w.skew() for w in self._windows(self.returns)]
+        np.testing.assert_allclose(rolling_skew(self.returns.values, self.window), expected)
+        np.testing.assert_array_equal(rolling_skew(np.zeros(40), self.window), 0.0)
+    
+    def test_rolling_max_drawdown(self):
+        """Max drawdown matches the cumprod/expanding-max calculation per window"""
+        expected = []
+        for w in self._windows(self.returns):
+            cum = (1 + w).cumprod()
+            peak = cum.expanding().max()
+            expected.append(((cum - peak) / peak).min())
+        np.testing.assert_allclose(rolling_max_drawdown(self.returns.values, self.window), expected)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Rolling Engine Tests...")
+    print("=" * 60)
+    
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+    
+    print("\n" + "=" * 60)
+    print("✅ Rolling engine tests completed!")
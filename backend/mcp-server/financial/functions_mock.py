@@ -77,7 +77,7 @@ def _get_vendor(data_type: str, data_source: Optional[str] = None) -> str:
 
 
 # Generic Historical Data Functions
-def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str] = None, end_date: Optional[str] = None, timeframe: str = "1Day", data_source: Optional[str] = None) -> Dict[str, Any]:
+def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str] = None, end_date: Optional[str] = None, timeframe: str = "1Day", data_source: Optional[str] = None, as_frame: bool = False) -> Dict[str, Any]:
     """Retrieve historical OHLC price data with dividend and split adjustments.
     
     Fetches time-series price data including open, high, low, close, and volume
@@ -100,6 +100,10 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
             - "1Week": Weekly bars
             - "1Month": Monthly bars
             Note: Higher frequency data may be limited to recent periods.
+        as_frame: If True, each symbol maps to a columnar BarFrame (numpy arrays
+            per field) instead of a list of StandardBar. BarFrame still supports
+            row access (bars[-1]["close"], iteration) and can be passed directly
+            to analytics functions without per-row conversion.
             
     Returns:
         Dict[str, Any]: Standardized response containing:
@@ -162,7 +166,7 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
                 if isinstance(response, dict) and "error" in response:
                     return ensure_standard_response(None, False, response["error"])
                 
-                bars = EODHDTransformer.transform_eod_data(response, symbol)
+                bars = EODHDTransformer.transform_eod_data(response, symbol, as_frame=as_frame)
                 # Merge symbol-organized bars into result dictionary
                 bars_by_symbol.update(bars)
             
@@ -175,7 +179,7 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
             if isinstance(response, dict) and "error" in response:
                 return ensure_standard_response(None, False, response["error"])
             
-            bars = AlpacaTransformer.transform_bars(response, symbol_list)
+            bars = AlpacaTransformer.transform_bars(response, symbol_list, as_frame=as_frame)
             return ensure_standard_response(bars)
             
     except Exception as e:
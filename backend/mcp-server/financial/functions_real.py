@@ -16,10 +16,13 @@ Key Features:
 - Data transformation between vendor formats
 """
 
+import functools
 import os
 from typing import Dict, List, Any, Optional, Union
 from .vendors import alpaca, eodhd
-from .schemas import SymbolFormatter
+from .vendors.transport import fan_out
+from .schemas import SymbolFormatter, BarFrame
+from .price_cache import get_price_cache, is_price_cache_enabled
 from .transformers import (
     AlpacaTransformer, EODHDTransformer, 
     handle_vendor_error, ensure_standard_response
@@ -77,8 +80,38 @@ def _get_vendor(data_type: str, data_source: Optional[str] = None) -> str:
     raise ValueError("No financial data vendors configured")
 
 
+# Price adjustment applied by each vendor's bars endpoint (part of the price cache key)
+VENDOR_ADJUSTMENT = {
+    'eodhd': 'split',   # EODHD 'close' is split-adjusted only
+    'alpaca': 'raw',    # Alpaca bars default to unadjusted prices
+}
+
+
+def _fetch_bar_frame(vendor: str, symbol: str, timeframe: str, start_date: Optional[str], end_date: Optional[str]) -> BarFrame:
+    """Fetch bars for one symbol from a vendor as a BarFrame.
+    
+    Raises:
+        ValueError: If the vendor returns an error
+    """
+    if vendor == 'eodhd':
+        period_map = {"1Day": "d", "1Week": "w", "1Month": "m"}
+        vendor_symbol = SymbolFormatter.from_standard(symbol, "eodhd")
+        response = eodhd.get_eod_data(vendor_symbol, start_date, end_date, period_map.get(timeframe, "d"), "a")
+        if isinstance(response, dict) and "error" in response:
+            raise ValueError(response["error"])
+        bars = EODHDTransformer.transform_eod_data(response, symbol, as_frame=True)
+    else:
+        vendor_symbol = SymbolFormatter.from_standard(symbol, "alpaca")
+        response = alpaca.get_bars([vendor_symbol], timeframe, start_date, end_date)
+        if isinstance(response, dict) and "error" in response:
+            raise ValueError(response["error"])
+        bars = AlpacaTransformer.transform_bars(response, [symbol], as_frame=True)
+    
+    return next(iter(bars.values()), None) or BarFrame.empty(symbol)
+
+
 # Generic Historical Data Functions
-def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str] = None, end_date: Optional[str] = None, timeframe: str = "1Day", data_source: Optional[str] = None) -> Dict[str, Any]:
+def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str] = None, end_date: Optional[str] = None, timeframe: str = "1Day", data_source: Optional[str] = None, as_frame: bool = False) -> Dict[str, Any]:
     """Retrieve historical OHLC price data with dividend and split adjustments.
     
     Fetches time-series price data including open, high, low, close, and volume
@@ -101,6 +134,10 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
             - "1Week": Weekly bars
             - "1Month": Monthly bars
             Note: Higher frequency data may be limited to recent periods.
+        as_frame: If True, each symbol maps to a columnar BarFrame (numpy arrays
+            per field) instead of a list of StandardBar. BarFrame still supports
+            row access (bars[-1]["close"], iteration) and can be passed directly
+            to analytics functions without per-row conversion.
             
     Returns:
         Dict[str, Any]: Standardized response containing:
@@ -146,25 +183,45 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
         - Adjusted close prices account for dividends and stock splits
         - EODHD preferred for historical data due to longer history availability
         - Alpaca provides more granular intraday data but with shorter history
+        - With PRICE_CACHE_ENABLED=true, daily bars are cached on disk (PRICE_CACHE_DIR);
+          repeated requests only fetch dates missing from the cache
     """
     try:
         vendor = _get_vendor('historical', data_source)
         symbol_list = [symbols] if isinstance(symbols, str) else symbols
         
+        if is_price_cache_enabled():
+            # Serve cached ranges from disk and fetch only missing head/tail dates
+            cache = get_price_cache()
+            
+            def load_symbol(symbol: str) -> BarFrame:
+                fetch = functools.partial(_fetch_bar_frame, vendor, symbol, timeframe)
+                return cache.get_bars(symbol, vendor, timeframe, VENDOR_ADJUSTMENT[vendor], start_date, end_date, fetch)
+            
+            frames = fan_out(load_symbol, symbol_list)
+            bars_by_symbol = {
+                symbol: frame if as_frame else frame.to_bars()
+                for symbol, frame in zip(symbol_list, frames)
+            }
+            return ensure_standard_response(bars_by_symbol)
+        
         if vendor == 'eodhd':
             # Convert timeframe to EODHD period
             period_map = {"1Day": "d", "1Week": "w", "1Month": "m"}
             period = period_map.get(timeframe, "d")
             
+            # EODHD has no multi-symbol endpoint; fetch symbols concurrently
+            responses = fan_out(
+                lambda symbol: eodhd.get_eod_data(SymbolFormatter.from_standard(symbol, "eodhd"), start_date, end_date, period, "a"),
+                symbol_list
+            )
+            
             bars_by_symbol = {}
-            for symbol in symbol_list:
-                vendor_symbol = SymbolFormatter.from_standard(symbol, "eodhd")
-                response = eodhd.get_eod_data(vendor_symbol, start_date, end_date, period, "a")
-                
+            for symbol, response in zip(symbol_list, responses):
                 if isinstance(response, dict) and "error" in response:
                     return ensure_standard_response(None, False, response["error"])
                 
-                bars = EODHDTransformer.transform_eod_data(response, symbol)
+                bars = EODHDTransformer.transform_eod_data(response, symbol, as_frame=as_frame)
                 # Merge symbol-organized bars into result dictionary
                 bars_by_symbol.update(bars)
             
@@ -177,7 +234,7 @@ def get_historical_data(symbols: Union[str, List[str]], start_date: Optional[str
             if isinstance(response, dict) and "error" in response:
                 return ensure_standard_response(None, False, response["error"])
             
-            bars = AlpacaTransformer.transform_bars(response, symbol_list)
+            bars = AlpacaTransformer.transform_bars(response, symbol_list, as_frame=as_frame)
             return ensure_standard_response(bars)
             
     except Exception as e:
@@ -255,11 +312,13 @@ def get_real_time_data(symbols: Union[str, List[str]], data_source: Optional[str
             return ensure_standard_response(snapshots)
             
         elif vendor == 'eodhd':
+            responses = fan_out(
+                lambda symbol: eodhd.get_real_time(SymbolFormatter.from_standard(symbol, "eodhd")),
+                symbol_list
+            )
+            
             snapshots = []
-            for symbol in symbol_list:
-                vendor_symbol = SymbolFormatter.from_standard(symbol, "eodhd")
-                response = eodhd.get_real_time(vendor_symbol)
-                
+            for symbol, response in zip(symbol_list, responses):
                 if isinstance(response, dict) and "error" in response:
                     return ensure_standard_response(None, False, response["error"])
                 
@@ -0,0 +1,286 @@
+"""
+On-disk Historical Price Cache
+
+Persistent per-symbol bar store used by get_historical_data so repeated
+requests do not refetch the full range from the vendor. Each entry is keyed by
+vendor/timeframe/adjustment/symbol and stored as:
+    <key>.npy        Structured numpy array (memory-mapped on read)
+    <key>.json       Metadata: covered date range, vendor, versions
+
+Only the missing head/tail of a requested range is fetched. The tail fetch
+overlaps the last cached bar; if the vendor now reports a different value for
+it (split or dividend restatement) the entry is discarded and refetched.
+
+Only daily bars are cached. A daily bar is final once its day has passed,
+while weekly/monthly bars keep changing until their period closes and would
+be reported as restatements on every refresh.
+
+Configuration:
+    PRICE_CACHE_ENABLED       Enable the cache (default: false)
+    PRICE_CACHE_DIR           Cache directory (default: ~/.cache/qna-ai/price_cache)
+    PRICE_CACHE_DATA_VERSION  Bump to invalidate every cached entry
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from .schemas import BarFrame
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT_VERSION = 1
+
+BAR_DTYPE = np.dtype([
+    ("timestamp", "datetime64[ns]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "i8"),
+    ("vwap", "f8"),
+    ("trade_count", "f8"),
+])
+
+# Timeframes whose bars are cached; other timeframes always go to the vendor
+CACHED_TIMEFRAMES = ("1Day",)
+
+# fetch(start_date, end_date) -> BarFrame for one symbol
+FetchFunction = Callable[[str, str], BarFrame]
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def _bar_dates(frame: BarFrame) -> np.ndarray:
+    return frame.timestamp.astype("datetime64[D]")
+
+
+class PriceCache:
+    """Persistent bar store with incremental gap filling"""
+
+    def __init__(self, cache_dir: Optional[str] = None, data_version: Optional[str] = None):
+        self.cache_dir = cache_dir or os.path.expanduser(
+            os.getenv("PRICE_CACHE_DIR", "~/.cache/qna-ai/price_cache")
+        )
+        self.data_version = data_version or os.getenv("PRICE_CACHE_DATA_VERSION", "1")
+        self.stats = {"hits": 0, "partial_hits": 0, "misses": 0, "bypassed": 0, "restatements": 0, "write_errors": 0}
+
+    def _paths(self, vendor: str, timeframe: str, adjustment: str, symbol: str):
+        directory = os.path.join(self.cache_dir, vendor, timeframe, adjustment)
+        safe_symbol = symbol.replace("/", "_")
+        base = os.path.join(directory, safe_symbol)
+        return directory, base + ".npy", base + ".json"
+
+    def _load(self, vendor: str, timeframe: str, adjustment: str, symbol: str):
+        """Return (metadata, BarFrame) or None if the entry is missing, stale or unreadable"""
+        _, data_path, meta_path = self._paths(vendor, timeframe, adjustment, symbol)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("format_version") != CACHE_FORMAT_VERSION or meta.get("data_version") != self.data_version:
+                return None
+            records = np.load(data_path, mmap_mode="r")
+            if records.dtype != BAR_DTYPE or len(records) != meta.get("rows"):
+                return None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable price cache entry for {symbol}: {e}")
+            return None
+
+        frame = BarFrame(
+            symbol,
+            **{name: records[name] for name in BAR_DTYPE.names if name not in ("vwap", "trade_count")},
+            vwap=records["vwap"] if meta.get("has_vwap") else None,
+            trade_count=records["trade_count"] if meta.get("has_trade_count") else None
+        )
+        return meta, frame
+
+    def _store(self, vendor: str, timeframe: str, adjustment: str, symbol: str,
+               frame: BarFrame, covered_start: date, covered_end: date) -> None:
+        directory, data_path, meta_path = self._paths(vendor, timeframe, adjustment, symbol)
+        # Never persist bars past the covered range (e.g. today's partial bar)
+        frame = frame[: int(np.searchsorted(_bar_dates(frame), np.datetime64(covered_end), side="right"))]
+
+        records = np.empty(len(frame), dtype=BAR_DTYPE)
+        for name in BAR_DTYPE.names:
+            column = getattr(frame, name)
+            records[name] = np.nan if column is None else column
+
+        meta = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "data_version": self.data_version,
+            "vendor": vendor,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "adjustment": adjustment,
+            "covered_start": covered_start.isoformat(),
+            "covered_end": covered_end.isoformat(),
+            "rows": len(records),
+            "has_vwap": frame.vwap is not None,
+            "has_trade_count": frame.trade_count is not None,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write to temp files and rename so concurrent readers never see partial data
+            with tempfile.NamedTemporaryFile(dir=directory, suffix=".npy", delete=False) as f:
+                np.save(f, records)
+                tmp_data = f.name
+            with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".json", delete=False) as f:
+                json.dump(meta, f)
+                tmp_meta = f.name
+            os.replace(tmp_data, data_path)
+            os.replace(tmp_meta, meta_path)
+        except OSError as e:
+            self.stats["write_errors"] += 1
+            logger.warning(f"Failed to write price cache entry for {symbol}: {e}")
+
+    def get_bars(self, symbol: str, vendor: str, timeframe: str, adjustment: str,
+                 start_date: Optional[str], end_date: Optional[str], fetch: FetchFunction) -> BarFrame:
+        """
+        Get bars for [start_date, end_date], fetching only what the cache lacks
+
+        Args:
+            symbol: Standard symbol format
+            vendor: Vendor the bars come from (part of the cache key)
+            timeframe: Bar timeframe, e.g. "1Day" (part of the cache key)
+            adjustment: Price adjustment applied by the vendor (part of the cache key)
+            start_date: 'YYYY-MM-DD'; open-ended requests bypass the cache
+                (as do timeframes not in CACHED_TIMEFRAMES)
+            end_date: 'YYYY-MM-DD'; defaults to today
+            fetch: Called as fetch(start_date, end_date) for missing ranges
+
+        Returns:
+            BarFrame covering the requested range
+        """
+        if (timeframe not in CACHED_TIMEFRAMES or not start_date
+                or "T" in start_date or (end_date and "T" in end_date)):
+            # Unfinished periods, vendor-default or intraday-precise ranges are not cacheable by date
+            self.stats["bypassed"] += 1
+            return fetch(start_date, end_date)
+
+        today = datetime.now(timezone.utc).date()
+        start = _parse_date(start_date)
+        end = min(_parse_date(end_date), today) if end_date else today
+        # Bars up to yesterday are final; today's bar may still change
+        stable_end = min(end, today - timedelta(days=1))
+
+        entry = self._load(vendor, timeframe, adjustment, symbol)
+        if entry is None:
+            self.stats["misses"] += 1
+            frame = fetch(start.isoformat(), end.isoformat())
+            if stable_end >= start:
+                self._store(vendor, timeframe, adjustment, symbol, frame, start, stable_end)
+            return frame
+
+        meta, cached = entry
+        covered_start = _parse_date(meta["covered_start"])
+        covered_end = _parse_date(meta["covered_end"])
+        pieces = [cached]
+
+        if start < covered_start:
+            pieces.insert(0, fetch(start.isoformat(), (covered_start - timedelta(days=1)).isoformat()))
+
+        if end > covered_end:
+            # Overlap the last cached bar to detect restated history
+            last_cached = cached.timestamp[-1].astype("datetime64[D]").item() if len(cached) else covered_end
+            tail = fetch(min(last_cached, covered_end).isoformat(), end.isoformat())
+            if self._is_restated(cached, tail):
+                self.stats["restatements"] += 1
+                logger.info(f"🔄 Vendor restated history for {symbol}, refetching cached range")
+                refetch_start = min(start, covered_start)
+                frame = fetch(refetch_start.isoformat(), end.isoformat())
+                self._store(vendor, timeframe, adjustment, symbol, frame, refetch_start, max(stable_end, covered_end))
+                return self._slice(frame, start, end)
+            pieces.append(tail)
+
+        if len(pieces) == 1:
+            self.stats["hits"] += 1
+            return self._slice(cached, start, end)
+
+        self.stats["partial_hits"] += 1
+        merged = BarFrame.concat(pieces)
+        merged.symbol = symbol
+        self._store(vendor, timeframe, adjustment, symbol, merged,
+                    min(start, covered_start), max(stable_end, covered_end))
+        return self._slice(merged, start, end)
+
+    @staticmethod
+    def _is_restated(cached: BarFrame, fresh: BarFrame) -> bool:
+        """True if bars present in both frames disagree"""
+        if not len(cached) or not len(fresh):
+            return False
+        common, cached_idx, fresh_idx = np.intersect1d(cached.timestamp, fresh.timestamp, return_indices=True)
+        if not len(common):
+            return False
+        return not np.allclose(cached.close[cached_idx], fresh.close[fresh_idx], rtol=1e-9, atol=0)
+
+    @staticmethod
+    def _slice(frame: BarFrame, start: date, end: date) -> BarFrame:
+        """Rows within [start, end], copied out of the memory map"""
+        dates = _bar_dates(frame)
+        lo = int(np.searchsorted(dates, np.datetime64(start), side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(end), side="right"))
+        view = frame[lo:hi]
+        return BarFrame(
+            frame.symbol,
+            **{name: (None if getattr(view, name) is None else np.array(getattr(view, name))) for name in BarFrame.COLUMNS}
+        )
+
+    def invalidate(self, symbol: Optional[str] = None, vendor: Optional[str] = None) -> int:
+        """
+        Remove cached entries
+
+        Args:
+            symbol: Only entries for this symbol (all symbols if None)
+            vendor: Only entries from this vendor (all vendors if None)
+
+        Returns:
+            Number of entries removed
+        """
+        if symbol is None and vendor is None:
+            removed = sum(1 for _, _, files in os.walk(self.cache_dir) for f in files if f.endswith(".json"))
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            return removed
+
+        root = os.path.join(self.cache_dir, vendor) if vendor else self.cache_dir
+        removed = 0
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                if symbol is not None and os.path.splitext(filename)[0] != symbol.replace("/", "_"):
+                    continue
+                os.remove(os.path.join(directory, filename))
+                if filename.endswith(".json"):
+                    removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        return {**self.stats, "cache_dir": self.cache_dir, "data_version": self.data_version}
+
+
+_price_cache: Optional[PriceCache] = None
+
+
+def is_price_cache_enabled() -> bool:
+    """Check if the on-disk price cache is enabled"""
+    return os.getenv("PRICE_CACHE_ENABLED", "false").lower() == "true"
+
+
+def get_price_cache() -> PriceCache:
+    """Get the process-wide price cache (singleton)"""
+    global _price_cache
+    if _price_cache is None:
+        _price_cache = PriceCache()
+    return _price_cache
@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
 
+import numpy as np
+
 
 @dataclass
 class StandardBar:
@@ -56,6 +58,182 @@ class StandardBar:
         """Return (key, value) pairs like dict.items()"""
         return [(k, getattr(self, k)) for k in self.__dataclass_fields__.keys()]
 
+class BarFrame:
+    """Columnar OHLCV bars for one symbol.
+    
+    Holds one numpy array per field instead of one StandardBar object per row,
+    so multi-year pulls stay cheap to build and analytics can read the columns
+    without copying. Row access still behaves like a list of StandardBar:
+        frame[-1].close or frame[-1]["close"]
+        [bar["close"] for bar in frame]
+    Column access returns the underlying array:
+        frame["close"] or frame.close
+    """
+    
+    __bar_frame__ = True  # Marker checked by analytics.utils.data_utils (no import dependency)
+    
+    COLUMNS = ("timestamp", "open", "high", "low", "close", "volume", "vwap", "trade_count")
+    
+    def __init__(self, symbol: str, timestamp: Any, open: Any, high: Any, low: Any,
+                 close: Any, volume: Any, vwap: Any = None, trade_count: Any = None):
+        self.symbol = symbol
+        # Timestamps are stored as naive UTC datetime64[ns]
+        self.timestamp = np.asarray(timestamp, dtype="datetime64[ns]")
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+        # Optional columns use NaN for missing values
+        self.vwap = None if vwap is None else np.asarray(vwap, dtype=np.float64)
+        self.trade_count = None if trade_count is None else np.asarray(trade_count, dtype=np.float64)
+        
+        n = len(self.timestamp)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            if column is not None and len(column) != n:
+                raise ValueError(f"BarFrame column '{name}' has {len(column)} rows, expected {n}")
+    
+    @classmethod
+    def from_records(cls, symbol: str, records: List[Dict[str, Any]], field_map: Dict[str, str]) -> "BarFrame":
+        """Build from vendor row dicts without creating per-row objects.
+        
+        Args:
+            symbol: Standard symbol format
+            records: Vendor rows, e.g. [{"t": ..., "o": ..., ...}]
+            field_map: Maps BarFrame column name to vendor key, e.g. {"open": "o"}.
+                Optional columns (vwap, trade_count) may be omitted.
+        """
+        columns = {}
+        for name, key in field_map.items():
+            if name == "timestamp":
+                columns[name] = _parse_timestamps([row[key] for row in records])
+            elif name in ("vwap", "trade_count"):
+                columns[name] = np.array([np.nan if row.get(key) is None else row[key] for row in records], dtype=np.float64)
+            else:
+                columns[name] = np.array([row[key] for row in records], dtype=np.float64)
+        return cls(symbol, **columns)
+    
+    @classmethod
+    def empty(cls, symbol: str) -> "BarFrame":
+        """Frame with no rows"""
+        return cls(symbol, timestamp=[], open=[], high=[], low=[], close=[], volume=[])
+    
+    @classmethod
+    def concat(cls, frames: List["BarFrame"]) -> "BarFrame":
+        """Join frames for one symbol, sorted by timestamp with duplicate timestamps dropped (last wins)"""
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return cls.empty("")
+        if len(frames) == 1:
+            return frames[0]
+        
+        columns = {}
+        for name in cls.COLUMNS:
+            parts = [getattr(frame, name) for frame in frames]
+            if all(part is None for part in parts):
+                columns[name] = None
+                continue
+            parts = [np.full(len(frame), np.nan) if part is None else part for frame, part in zip(frames, parts)]
+            columns[name] = np.concatenate(parts)
+        
+        # Reverse before a stable sort so later frames win on duplicate timestamps
+        order = np.argsort(columns["timestamp"][::-1], kind="stable")
+        order = len(columns["timestamp"]) - 1 - order
+        ts = columns["timestamp"][order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = ts[1:] != ts[:-1]
+        order = order[keep]
+        return cls(frames[0].symbol, **{name: (None if col is None else col[order]) for name, col in columns.items()})
+    
+    @classmethod
+    def from_bars(cls, bars: List[StandardBar]) -> "BarFrame":
+        """Build from a list of StandardBar objects"""
+        symbol = bars[0].symbol if bars else ""
+        has_vwap = any(bar.vwap is not None for bar in bars)
+        has_trade_count = any(bar.trade_count is not None for bar in bars)
+        return cls(
+            symbol,
+            timestamp=_parse_timestamps([bar.timestamp for bar in bars]),
+            open=[bar.open for bar in bars],
+            high=[bar.high for bar in bars],
+            low=[bar.low for bar in bars],
+            close=[bar.close for bar in bars],
+            volume=[bar.volume for bar in bars],
+            vwap=[np.nan if bar.vwap is None else bar.vwap for bar in bars] if has_vwap else None,
+            trade_count=[np.nan if bar.trade_count is None else bar.trade_count for bar in bars] if has_trade_count else None
+        )
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    def __getitem__(self, key: Union[int, slice, str]) -> Any:
+        """frame[i] -> StandardBar, frame[i:j] -> BarFrame view, frame['close'] -> column array"""
+        if isinstance(key, str):
+            if key == "symbol":
+                return self.symbol
+            if key not in self.COLUMNS:
+                raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, slice):
+            return BarFrame(
+                self.symbol,
+                **{name: (None if getattr(self, name) is None else getattr(self, name)[key]) for name in self.COLUMNS}
+            )
+        return self._row(key)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._row(i)
+    
+    def __contains__(self, key: str) -> bool:
+        """Support 'in' operator for column names: 'close' in frame"""
+        return key == "symbol" or (key in self.COLUMNS and getattr(self, key) is not None)
+    
+    def __repr__(self) -> str:
+        return f"BarFrame(symbol={self.symbol!r}, rows={len(self)})"
+    
+    def _row(self, i: int) -> StandardBar:
+        vwap = None if self.vwap is None or np.isnan(self.vwap[i]) else float(self.vwap[i])
+        trade_count = None if self.trade_count is None or np.isnan(self.trade_count[i]) else int(self.trade_count[i])
+        return StandardBar(
+            timestamp=str(np.datetime_as_string(self.timestamp[i], unit="s")) + "Z",
+            symbol=self.symbol,
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+            vwap=vwap,
+            trade_count=trade_count
+        )
+    
+    def to_bars(self) -> List[StandardBar]:
+        """Materialize as a list of StandardBar objects"""
+        return list(self)
+    
+    def to_series(self, field: str = "close"):
+        """One column as a pandas Series indexed by timestamp (no copy of the values)"""
+        import pandas as pd
+        return pd.Series(getattr(self, field), index=pd.DatetimeIndex(self.timestamp), name=field, copy=False)
+    
+    def to_pandas(self):
+        """All columns as a pandas DataFrame indexed by timestamp"""
+        import pandas as pd
+        columns = {name: getattr(self, name) for name in self.COLUMNS[1:] if getattr(self, name) is not None}
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(self.timestamp, name="timestamp"), copy=False)
+
+
+def _parse_timestamps(values: List[str]) -> np.ndarray:
+    """Parse ISO 8601 strings ('2024-01-01T09:30:00Z' or '2024-01-01') to naive UTC datetime64[ns]"""
+    # numpy rejects timezone designators, so strip the UTC 'Z' suffix
+    try:
+        return np.array([v[:-1] if v.endswith("Z") else v for v in values], dtype="datetime64[ns]")
+    except ValueError:
+        # Explicit offsets such as '+00:00' need a timezone-aware parser
+        import pandas as pd
+        return pd.to_datetime(values, utc=True).tz_localize(None).values
+
 
 @dataclass
 class StandardQuote:
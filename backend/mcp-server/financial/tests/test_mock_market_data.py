@@ -0,0 +1,125 @@
+"""
+Unit tests for the vectorized mock market-data engine.
+
+Checks that mock bars are identical across processes (hash randomization),
+agree across overlapping date ranges, keep valid OHLC relationships, are
+memoized, and are correlated across symbols.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from ..vendors.mocks import alpaca, eodhd
+from ..vendors.mocks.market_data import BarProfile, generate_series, generate_universe, trading_days
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def eod_closes_in_subprocess(hash_seed: str):
+    """Closes for AAPL generated in a fresh interpreter with the given PYTHONHASHSEED"""
+    code = (
+        "from financial.vendors.mocks import eodhd\n"
+        "print([bar['close'] for bar in eodhd.get_eod_data('AAPL', '2024-01-01', '2024-02-01')])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONHASHSEED": hash_seed}
+    ).stdout
+    return output.strip()
+
+
+class TestMockMarketData(unittest.TestCase):
+    """Test determinism, range consistency, bar validity, memoization and correlation"""
+
+    def test_identical_across_processes(self):
+        """Bars do not depend on the per-process hash seed"""
+        self.assertEqual(eod_closes_in_subprocess("1"), eod_closes_in_subprocess("2"))
+
+    def test_overlapping_ranges_agree(self):
+        """A date has the same bar whichever range it is requested in"""
+        short = eodhd.get_eod_data("AAPL", "2024-01-01", "2024-03-01")
+        longer = eodhd.get_eod_data("AAPL", "2024-01-01", "2024-03-04")
+        self.assertEqual(longer[:len(short)], short)
+
+        # Ranges starting later, spanning years, and before the epoch are slices of one path
+        full = {bar["date"]: bar for bar in eodhd.get_eod_data("AAPL", "2021-06-01", "2025-06-30")}
+        for start, end in [("2024-02-15", "2024-03-01"), ("2022-12-20", "2023-01-10"), ("2021-06-01", "2021-06-30")]:
+            for bar in eodhd.get_eod_data("AAPL", start, end):
+                self.assertEqual(bar, full[bar["date"]])
+
+        alone = alpaca.get_bars(["MSFT"], "1Day", "2024-02-01", "2024-02-29")["bars"]["MSFT"]
+        wider = alpaca.get_bars(["MSFT"], "1Day", "2023-11-01", "2024-05-31")["bars"]["MSFT"]
+        by_time = {bar["t"]: bar for bar in wider}
+        self.assertEqual(alone, [by_time[bar["t"]] for bar in alone])
+
+    def test_weekdays_and_ohlc_relationships(self):
+        """Only weekdays are generated and high/low bound open/close"""
+        data = eodhd.get_eod_data("TSLA", "2023-07-01", "2024-06-30")
+        self.assertEqual(len(data), len(trading_days("2023-07-01", "2024-06-30")))
+        # The base price is the close before the epoch year
+        first_2024 = next(bar for bar in data if bar["date"].startswith("2024"))
+        self.assertEqual(first_2024["open"], 250.0)
+        for previous, bar in zip(data, data[1:]):
+            self.assertEqual(bar["open"], previous["close"])
+        for bar in data:
+            self.assertGreaterEqual(bar["high"], max(bar["open"], bar["close"]))
+            self.assertLessEqual(bar["low"], min(bar["open"], bar["close"]))
+            self.assertGreaterEqual(bar["volume"], 1_000_000)
+
+    def test_descending_order(self):
+        """order='d' returns the same bars newest first"""
+        ascending = eodhd.get_eod_data("SPY", "2024-01-01", "2024-02-01")
+        descending = eodhd.get_eod_data("SPY", "2024-01-01", "2024-02-01", order="d")
+        self.assertEqual(descending, ascending[::-1])
+
+    def test_series_memoized(self):
+        """Repeated requests reuse the generated series"""
+        generate_series.cache_clear()
+        alpaca.get_bars(["AAPL", "MSFT"], "1Day", "2023-01-01", "2023-12-31")
+        alpaca.get_bars(["AAPL"], "1Day", "2023-01-01", "2023-12-31")
+        info = generate_series.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 1)
+
+    def test_symbol_independent_of_request_set(self):
+        """A symbol's bars are the same whichever symbols are requested with it"""
+        alone = alpaca.get_bars(["AAPL"], "1Day", "2024-01-01", "2024-03-01")["bars"]["AAPL"]
+        together = alpaca.get_bars(["MSFT", "AAPL", "QQQ"], "1Day", "2024-01-01", "2024-03-01")["bars"]["AAPL"]
+        self.assertEqual(alone, together)
+
+    def test_cross_sectional_correlation(self):
+        """Returns are correlated by the market factor, uncorrelated without it"""
+        symbols = ["S1", "S2", "S3", "S4"]
+
+        def mean_correlation(rho):
+            profile = BarProfile("test", drift=0.0, volatility=0.02, range_volatility=0.01,
+                                 volume_dispersion=0.4, market_correlation=rho)
+            universe = generate_universe(profile, symbols, "2015-01-01", "2024-12-31", {}, {})
+            returns = np.array([np.diff(np.log(universe[s].close)) for s in symbols])
+            corr = np.corrcoef(returns)
+            return corr[np.triu_indices(len(symbols), 1)].mean()
+
+        self.assertAlmostEqual(mean_correlation(0.5), 0.5, delta=0.05)
+        self.assertAlmostEqual(mean_correlation(0.0), 0.0, delta=0.05)
+
+    def test_cached_arrays_read_only(self):
+        """Cached series cannot be mutated by callers"""
+        profile = BarProfile("test", drift=0.0, volatility=0.02, range_volatility=0.01, volume_dispersion=0.4)
+        series = generate_series(profile, "AAPL", "2024-01-01", "2024-01-31", 100.0, 1e6)
+        with self.assertRaises(ValueError):
+            series.close[0] = 0.0
+
+
+if __name__ == '__main__':
+    print("🧪 Running Mock Market Data Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ Mock market data tests completed!")
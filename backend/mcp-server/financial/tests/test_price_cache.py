@@ -0,0 +1,115 @@
+"""
+Unit tests for the on-disk price cache.
+
+Runs PriceCache against a fake vendor fetch in a temp directory to check full
+hits, partial-range gap filling, restatement refetches and timeframe bypass.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+
+from ..price_cache import PriceCache, is_price_cache_enabled
+from ..schemas import BarFrame
+
+
+class FakeVendor:
+    """Daily bars for every weekday, with a close price that can be restated"""
+
+    def __init__(self):
+        self.calls = []
+        self.close_scale = 1.0
+
+    def fetch(self, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        days = [d for d in days if d.weekday() < 5]
+        close = np.array([100.0 + d.toordinal() % 50 for d in days]) * self.close_scale
+        return BarFrame(
+            "AAPL",
+            timestamp=np.array(days, dtype="datetime64[D]"),
+            open=close, high=close + 1, low=close - 1, close=close,
+            volume=np.full(len(days), 1000)
+        )
+
+
+class TestPriceCache(unittest.TestCase):
+    """Test hits, gap filling and restatements"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = PriceCache(cache_dir=self.directory.name, data_version="test")
+        self.vendor = FakeVendor()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_bars(self, start_date, end_date, timeframe="1Day"):
+        return self.cache.get_bars("AAPL", "eodhd", timeframe, "a", start_date, end_date, self.vendor.fetch)
+
+    def test_repeat_request_is_a_hit(self):
+        """A cached range is served without calling the vendor"""
+        first = self.get_bars("2024-01-01", "2024-01-31")
+        second = self.get_bars("2024-01-08", "2024-01-19")
+
+        self.assertEqual(self.vendor.calls, [("2024-01-01", "2024-01-31")])
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(len(second), 10)
+        np.testing.assert_array_equal(second.close, first.close[5:15])
+
+    def test_partial_range_fetches_only_missing_dates(self):
+        """Head and tail gaps are fetched; the cached middle is not"""
+        self.get_bars("2024-02-01", "2024-02-29")
+        frame = self.get_bars("2024-01-15", "2024-03-15")
+
+        self.assertEqual(self.vendor.calls[1:], [("2024-01-15", "2024-01-31"), ("2024-02-29", "2024-03-15")])
+        self.assertEqual(self.cache.stats["partial_hits"], 1)
+        expected = self.vendor.fetch("2024-01-15", "2024-03-15")
+        np.testing.assert_array_equal(frame.timestamp, expected.timestamp)
+        np.testing.assert_array_equal(frame.close, expected.close)
+
+        # The merged range is now cached
+        self.vendor.calls.clear()
+        self.get_bars("2024-01-20", "2024-03-10")
+        self.assertEqual(self.vendor.calls, [])
+
+    def test_restated_history_is_refetched(self):
+        """A changed overlapping bar discards the entry and refetches the whole range"""
+        self.get_bars("2024-01-01", "2024-01-31")
+        self.vendor.close_scale = 0.5  # e.g. a 2:1 split adjustment
+        frame = self.get_bars("2024-01-10", "2024-02-15")
+
+        self.assertEqual(self.cache.stats["restatements"], 1)
+        self.assertEqual(self.vendor.calls[-1], ("2024-01-01", "2024-02-15"))
+        np.testing.assert_array_equal(frame.close, self.vendor.fetch("2024-01-10", "2024-02-15").close)
+
+        # Later requests see the restated prices without refetching
+        self.vendor.calls.clear()
+        old_range = self.get_bars("2024-01-02", "2024-01-05")
+        self.assertEqual(self.vendor.calls, [])
+        np.testing.assert_array_equal(old_range.close, self.vendor.fetch("2024-01-02", "2024-01-05").close)
+
+    def test_non_daily_timeframes_bypass(self):
+        """Weekly/monthly bars change until their period closes and are never cached"""
+        for _ in range(2):
+            self.get_bars("2024-01-01", "2024-03-31", timeframe="1Week")
+
+        self.assertEqual(len(self.vendor.calls), 2)
+        self.assertEqual(self.cache.stats["bypassed"], 2)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_disabled_by_default(self):
+        """The cache is opt-in"""
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(is_price_cache_enabled())
+        with patch.dict(os.environ, {"PRICE_CACHE_ENABLED": "true"}):
+            self.assertTrue(is_price_cache_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
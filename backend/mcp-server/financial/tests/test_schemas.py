@@ -0,0 +1,161 @@
+"""
+Unit tests for the columnar BarFrame schema.
+
+Checks building frames from vendor rows, concatenating partial pulls, row and
+column access, pandas views, and the BarFrame path of validate_price_data.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from analytics.utils.data_utils import validate_price_data
+
+from ..schemas import BarFrame, StandardBar
+
+ALPACA_FIELDS = {"timestamp": "t", "open": "o", "high": "h", "low": "l", "close": "c",
+                 "volume": "v", "vwap": "vw", "trade_count": "n"}
+
+
+def frame(days, close, symbol="AAPL", **optional):
+    """Daily frame with the given ISO dates and closes"""
+    close = np.asarray(close, dtype=np.float64)
+    return BarFrame(symbol, timestamp=np.array(days, dtype="datetime64[D]"), open=close, high=close + 1,
+                    low=close - 1, close=close, volume=np.full(len(close), 1000), **optional)
+
+
+class TestBarFrame(unittest.TestCase):
+    """Test construction, concatenation, access and conversion"""
+
+    def test_from_records_keeps_zero_values(self):
+        """Zero vwap/trade_count are kept; only missing values become NaN"""
+        records = [
+            {"t": "2024-01-02T05:00:00Z", "o": 10, "h": 11, "l": 9, "c": 10.5, "v": 100, "vw": 0.0, "n": 0},
+            {"t": "2024-01-03T05:00:00Z", "o": 10.5, "h": 12, "l": 10, "c": 11.5, "v": 0, "vw": None},
+            {"t": "2024-01-04T05:00:00Z", "o": 11.5, "h": 12, "l": 11, "c": 11.0, "v": 300, "vw": 11.2, "n": 7},
+        ]
+        result = BarFrame.from_records("AAPL", records, ALPACA_FIELDS)
+
+        np.testing.assert_array_equal(result.close, [10.5, 11.5, 11.0])
+        np.testing.assert_array_equal(result.volume, [100, 0, 300])
+        np.testing.assert_array_equal(result.vwap, [0.0, np.nan, 11.2])
+        np.testing.assert_array_equal(result.trade_count, [0, np.nan, 7])
+        self.assertEqual(result[0].vwap, 0.0)
+        self.assertEqual(result[0].trade_count, 0)
+        self.assertIsNone(result[1].vwap)
+        self.assertIsNone(result[1].trade_count)
+        self.assertEqual(result.timestamp[0], np.datetime64("2024-01-02T05:00:00"))
+
+    def test_from_records_optional_columns_and_offsets(self):
+        """Omitted optional columns stay None and explicit UTC offsets are parsed"""
+        records = [{"date": "2024-01-02T09:30:00+00:00", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}]
+        fields = {"timestamp": "date", "open": "open", "high": "high", "low": "low", "close": "close", "volume": "volume"}
+        result = BarFrame.from_records("SPY", records, fields)
+        self.assertIsNone(result.vwap)
+        self.assertNotIn("vwap", result)
+        self.assertEqual(result.timestamp[0], np.datetime64("2024-01-02T09:30:00"))
+        self.assertEqual(len(BarFrame.from_records("SPY", [], fields)), 0)
+
+    def test_column_lengths_checked(self):
+        """Columns of different lengths are rejected"""
+        with self.assertRaises(ValueError):
+            BarFrame("AAPL", timestamp=["2024-01-02"], open=[1, 2], high=[1], low=[1], close=[1], volume=[1])
+
+    def test_concat_sorts_and_drops_duplicates(self):
+        """Frames are merged in timestamp order and the later frame wins on duplicates"""
+        later = frame(["2024-01-04", "2024-01-05"], [104.0, 105.0])
+        earlier = frame(["2024-01-02", "2024-01-03", "2024-01-04"], [102.0, 103.0, 1.0])
+        restated = frame(["2024-01-03"], [203.0], vwap=[200.0])
+
+        result = BarFrame.concat([later, earlier, BarFrame.empty("AAPL"), restated])
+
+        self.assertEqual(result.symbol, "AAPL")
+        np.testing.assert_array_equal(result.timestamp, np.array(
+            ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"], dtype="datetime64[ns]"))
+        np.testing.assert_array_equal(result.close, [102.0, 203.0, 1.0, 105.0])
+        # vwap was only present on one frame; the others are filled with NaN
+        np.testing.assert_array_equal(result.vwap, [np.nan, 200.0, np.nan, np.nan])
+        self.assertIsNone(result.trade_count)
+
+    def test_concat_trivial_inputs(self):
+        """A single non-empty frame is returned as-is and no rows gives an empty frame"""
+        only = frame(["2024-01-02"], [1.0])
+        self.assertIs(BarFrame.concat([BarFrame.empty("AAPL"), only]), only)
+        self.assertEqual(len(BarFrame.concat([])), 0)
+        self.assertEqual(len(BarFrame.concat([BarFrame.empty("AAPL")])), 0)
+
+    def test_empty(self):
+        """Empty frames have no rows but keep their symbol and convert to pandas"""
+        empty = BarFrame.empty("MSFT")
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.symbol, "MSFT")
+        self.assertEqual(list(empty), [])
+        self.assertTrue(empty.to_pandas().empty)
+
+    def test_row_and_column_access(self):
+        """Rows behave like StandardBar, slices are frames and strings select columns"""
+        bars = frame(["2024-01-02", "2024-01-03", "2024-01-04"], [10.0, 11.0, 12.0])
+
+        last = bars[-1]
+        self.assertIsInstance(last, StandardBar)
+        self.assertEqual(last.close, 12.0)
+        self.assertEqual(last["close"], 12.0)
+        self.assertEqual(last.timestamp, "2024-01-04T00:00:00Z")
+        self.assertEqual(last.symbol, "AAPL")
+        self.assertEqual([bar["close"] for bar in bars], [10.0, 11.0, 12.0])
+        self.assertEqual(bars.to_bars(), list(bars))
+
+        window = bars[1:]
+        self.assertIsInstance(window, BarFrame)
+        np.testing.assert_array_equal(window.close, [11.0, 12.0])
+
+        self.assertIs(bars["close"], bars.close)
+        self.assertEqual(bars["symbol"], "AAPL")
+        self.assertIn("close", bars)
+        with self.assertRaises(KeyError):
+            bars["adjusted_close"]
+
+    def test_from_bars_round_trip(self):
+        """StandardBar lists convert to a frame and back"""
+        bars = frame(["2024-01-02", "2024-01-03"], [10.0, 11.0], vwap=[10.2, np.nan]).to_bars()
+        self.assertEqual(BarFrame.from_bars(bars).to_bars(), bars)
+
+    def test_to_series_shares_values(self):
+        """to_series wraps a column without copying, indexed by timestamp"""
+        bars = frame(["2024-01-02", "2024-01-03"], [10.0, 11.0])
+        series = bars.to_series("close")
+        self.assertIsInstance(series.index, pd.DatetimeIndex)
+        self.assertEqual(series.name, "close")
+        self.assertTrue(np.shares_memory(series.values, bars.close))
+        pd.testing.assert_series_equal(bars.to_series("volume"), bars.to_pandas()["volume"],
+                                       check_names=False, check_index=False)
+
+
+class TestValidatePriceDataBarFrame(unittest.TestCase):
+    """Test the BarFrame path of analytics validate_price_data"""
+
+    def test_clean_close_wrapped_without_copy(self):
+        """A frame without missing closes yields a view of the close column"""
+        bars = frame(["2024-01-02", "2024-01-03"], [10.0, 11.0])
+        prices = validate_price_data(bars)
+        self.assertTrue(np.shares_memory(prices.values, bars.close))
+        self.assertEqual(list(prices.index), list(pd.DatetimeIndex(bars.timestamp)))
+
+    def test_missing_closes_dropped(self):
+        """NaN closes are dropped and an empty frame is rejected"""
+        bars = frame(["2024-01-02", "2024-01-03", "2024-01-04"], [10.0, np.nan, 12.0])
+        self.assertEqual(validate_price_data(bars).tolist(), [10.0, 12.0])
+        with self.assertRaises(ValueError):
+            validate_price_data(BarFrame.empty("AAPL"))
+
+
+if __name__ == '__main__':
+    print("🧪 Running BarFrame Schema Tests")
+    print("=" * 60)
+
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+
+    print("\n" + "=" * 60)
+    print("✅ BarFrame schema tests completed!")
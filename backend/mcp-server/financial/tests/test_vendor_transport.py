@@ -0,0 +1,118 @@
+"""
+Unit tests for the vendor transport layer.
+
+Runs the EODHD/Alpaca vendor code against the local stub server to check
+pooled, rate-limited, retrying requests and concurrent multi-symbol fetches.
+"""
+
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from ..vendors import alpaca, eodhd
+from ..vendors.stub_server import VendorStubServer
+from ..vendors.transport import TokenBucket, VendorTransport, fan_out
+from .. import functions_real
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token bucket rate limiting"""
+    
+    def test_burst_then_throttle(self):
+        """Burst capacity is immediate, further tokens arrive at the configured rate"""
+        bucket = TokenBucket(rate=50.0, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        
+        for _ in range(10):
+            bucket.acquire()
+        # 10 extra tokens at 50/s need ~0.2s
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+
+class TestVendorTransport(unittest.TestCase):
+    """Test retries and connection reuse against the stub server"""
+    
+    def test_retries_rate_limited_requests(self):
+        """429 responses are retried, honoring Retry-After"""
+        with VendorStubServer(rate_limited_requests=2, retry_after=0.01) as stub:
+            transport = VendorTransport("stub", rate_limit=100, burst=10, max_retries=3)
+            response = transport.get(f"{stub.eodhd_base_url}/eod/AAPL.US", params={"from": "2024-01-01", "to": "2024-01-05"})
+            
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()), 5)
+            self.assertEqual(stub.request_count, 3)
+            self.assertEqual(transport.get_metrics()["retries"], 2)
+    
+    def test_gives_up_after_max_retries(self):
+        """The last error response is returned once retries are exhausted"""
+        with VendorStubServer(rate_limited_requests=10, retry_after=0.01) as stub:
+            transport = VendorTransport("stub", rate_limit=100, burst=10, max_retries=1)
+            response = transport.get(f"{stub.eodhd_base_url}/eod/AAPL.US")
+            
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(stub.request_count, 2)
+    
+    def test_fan_out_preserves_order(self):
+        """fan_out returns results in input order"""
+        results = fan_out(lambda x: (time.sleep(0.01 * (5 - x)), x * 2)[1], range(5), max_workers=5)
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+
+
+class TestConcurrentHistoricalFetch(unittest.TestCase):
+    """Test multi-symbol get_historical_data against the stub server"""
+    
+    def setUp(self):
+        self.stub = VendorStubServer(latency=0.05).start()
+        self.patches = [
+            patch.dict(os.environ, {"PRICE_CACHE_ENABLED": "false", "VENDOR_MAX_CONCURRENCY": "8"}),
+            patch.object(eodhd, "EODHD_API_KEY", "test"),
+            patch.object(eodhd, "EODHD_BASE_URL", self.stub.eodhd_base_url),
+            patch.object(alpaca, "ALPACA_API_KEY", "test"),
+            patch.object(alpaca, "ALPACA_SECRET_KEY", "test"),
+            patch.object(alpaca, "ALPACA_DATA_URL", self.stub.alpaca_data_url),
+            patch.object(functions_real, "EODHD_AVAILABLE", True),
+            patch.object(functions_real, "ALPACA_AVAILABLE", True),
+        ]
+        for p in self.patches:
+            p.start()
+    
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.stub.stop()
+    
+    def test_eodhd_symbols_fetched_concurrently(self):
+        """30 EODHD symbols overlap instead of costing 30 serial round trips"""
+        symbols = [f"SYM{i}" for i in range(30)]
+        start = time.monotonic()
+        response = functions_real.get_historical_data(symbols, "2024-01-01", "2024-01-31", data_source="eodhd")
+        elapsed = time.monotonic() - start
+        
+        self.assertTrue(response["success"], response["error"])
+        self.assertEqual(list(response["data"].keys()), symbols)
+        self.assertEqual(len(response["data"]["SYM0"]), 23)
+        self.assertGreater(self.stub.max_concurrent, 1)
+        self.assertLess(elapsed, 30 * 0.05)
+    
+    def test_alpaca_bars_through_transport(self):
+        """Alpaca multi-symbol bars request goes through the shared transport"""
+        response = functions_real.get_historical_data(["AAPL", "MSFT"], "2024-01-01", "2024-01-05", data_source="alpaca")
+        
+        self.assertTrue(response["success"], response["error"])
+        self.assertEqual(len(response["data"]["AAPL"]), 5)
+        self.assertEqual(self.stub.request_count, 1)
+
+
+if __name__ == '__main__':
+    print("🧪 Running Vendor Transport Tests...")
+    print("=" * 60)
+    
+    # Run tests
+    unittest.main(verbosity=2, exit=False)
+    
+    print("\n" + "=" * 60)
+    print("✅ Vendor transport tests completed!")
@@ -6,13 +6,13 @@ and the standardized schemas. Each vendor has its own transformer class that
 handles mapping to/from the standard format.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from .schemas import (
     StandardBar, StandardQuote, StandardTrade, StandardSnapshot, 
     StandardScreenerResult, StandardNewsArticle, StandardFundamentals,
     StandardDividend, StandardSplit, StandardPosition, StandardAccount,
-    StandardOrder, SymbolFormatter
+    StandardOrder, SymbolFormatter, BarFrame
 )
 
 
@@ -20,11 +20,14 @@ class AlpacaTransformer:
     """Transform data between Alpaca format and standard format."""
     
     @staticmethod
-    def transform_bars(alpaca_data: Dict[str, Any], symbols: List[str]) -> Dict[str, List[StandardBar]]:
+    def transform_bars(alpaca_data: Dict[str, Any], symbols: List[str], as_frame: bool = False) -> Dict[str, Union[List[StandardBar], BarFrame]]:
         """Transform Alpaca bars response to standard format, organized by symbol.
         
+        Args:
+            as_frame: Return a columnar BarFrame per symbol instead of a list of StandardBar
+        
         Returns:
-            Dict mapping symbol to list of StandardBar objects for that symbol
+            Dict mapping symbol to list of StandardBar objects (or a BarFrame) for that symbol
         """
         if "bars" not in alpaca_data:
             return {}
@@ -32,6 +35,12 @@ class AlpacaTransformer:
         standard_bars_by_symbol = {}
         for symbol, bars in alpaca_data["bars"].items():
             std_symbol = SymbolFormatter.to_standard(symbol, "alpaca")
+            if as_frame:
+                standard_bars_by_symbol[std_symbol] = BarFrame.from_records(std_symbol, bars, {
+                    "timestamp": "t", "open": "o", "high": "h", "low": "l",
+                    "close": "c", "volume": "v", "vwap": "vw", "trade_count": "n"
+                })
+                continue
             standard_bars_by_symbol[std_symbol] = []
             
             for bar in bars:
@@ -247,16 +256,25 @@ class EODHDTransformer:
     """Transform data between EODHD format and standard format."""
     
     @staticmethod
-    def transform_eod_data(eodhd_data: List[Dict[str, Any]], symbol: str) -> Dict[str, List[StandardBar]]:
+    def transform_eod_data(eodhd_data: List[Dict[str, Any]], symbol: str, as_frame: bool = False) -> Dict[str, Union[List[StandardBar], BarFrame]]:
         """Transform EODHD EOD data to standard format, organized by symbol.
         
+        Args:
+            as_frame: Return a columnar BarFrame instead of a list of StandardBar
+        
         Returns:
-            Dict mapping symbol to list of StandardBar objects for that symbol
+            Dict mapping symbol to list of StandardBar objects (or a BarFrame) for that symbol
         """
         if not eodhd_data or isinstance(eodhd_data, dict):
             return {}
         
         std_symbol = SymbolFormatter.to_standard(symbol, "eodhd")
+        if as_frame:
+            return {std_symbol: BarFrame.from_records(std_symbol, eodhd_data, {
+                "timestamp": "date", "open": "open", "high": "high", "low": "low",
+                "close": "close", "volume": "volume"
+            })}
+        
         bars = []
         for bar in eodhd_data:
             # Convert date to ISO timestamp
@@ -7,10 +7,11 @@ layer in functions_real.py.
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 
+from .transport import get_transport
+
 
 # API Configuration
 ALPACA_API_KEY = os.getenv('ALPACA_API_KEY')
@@ -18,6 +19,9 @@ ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY')
 ALPACA_BASE_URL = os.getenv('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')
 ALPACA_DATA_URL = os.getenv('ALPACA_DATA_URL', 'https://data.alpaca.markets')
 
+# Pooled, rate-limited session shared by all Alpaca calls
+_transport = get_transport('alpaca')
+
 
 def get_headers() -> Dict[str, str]:
     """Generate HTTP headers for Alpaca API authentication."""
@@ -36,7 +40,7 @@ def get_account() -> Dict[str, Any]:
             raise ValueError("Alpaca API credentials not configured")
         
         url = f"{ALPACA_BASE_URL}/v2/account"
-        response = requests.get(url, headers=get_headers())
+        response = _transport.get(url, headers=get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -52,7 +56,7 @@ def get_positions() -> List[Dict[str, Any]]:
             raise ValueError("Alpaca API credentials not configured")
         
         url = f"{ALPACA_BASE_URL}/v2/positions"
-        response = requests.get(url, headers=get_headers())
+        response = _transport.get(url, headers=get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -68,7 +72,7 @@ def get_position(symbol: str) -> Dict[str, Any]:
             raise ValueError("Alpaca API credentials not configured")
         
         url = f"{ALPACA_BASE_URL}/v2/positions/{symbol}"
-        response = requests.get(url, headers=get_headers())
+        response = _transport.get(url, headers=get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -96,7 +100,7 @@ def get_orders(status: str = "open", limit: int = 100, after: Optional[str] = No
             params['until'] = until
             
         url = f"{ALPACA_BASE_URL}/v2/orders"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -121,7 +125,7 @@ def get_portfolio_history(period: str = "1D", timeframe: str = "15Min", end_date
             params['end_date'] = end_date
             
         url = f"{ALPACA_BASE_URL}/v2/portfolio/history"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -137,7 +141,7 @@ def get_clock() -> Dict[str, Any]:
             raise ValueError("Alpaca API credentials not configured")
         
         url = f"{ALPACA_BASE_URL}/v2/clock"
-        response = requests.get(url, headers=get_headers())
+        response = _transport.get(url, headers=get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -164,7 +168,7 @@ def get_bars(symbols: List[str], timeframe: str = "1Day", start: Optional[str] =
             params['end'] = end
             
         url = f"{ALPACA_DATA_URL}/v2/stocks/bars"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -182,7 +186,7 @@ def get_snapshots(symbols: List[str]) -> Dict[str, Any]:
         params = {'symbols': ",".join(symbols)}
         
         url = f"{ALPACA_DATA_URL}/v2/stocks/snapshots"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -200,7 +204,7 @@ def get_quotes_latest(symbols: List[str]) -> Dict[str, Any]:
         params = {'symbols': ",".join(symbols)}
         
         url = f"{ALPACA_DATA_URL}/v2/stocks/quotes/latest"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -218,7 +222,7 @@ def get_trades_latest(symbols: List[str]) -> Dict[str, Any]:
         params = {'symbols': ",".join(symbols)}
         
         url = f"{ALPACA_DATA_URL}/v2/stocks/trades/latest"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -236,7 +240,7 @@ def get_most_actives(top: int = 10) -> Dict[str, Any]:
         params = {'top': top}
         
         url = f"{ALPACA_DATA_URL}/v1beta1/screener/stocks/most-actives"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -254,7 +258,7 @@ def get_top_gainers(top: int = 10) -> Dict[str, Any]:
         params = {'top': top}
         
         url = f"{ALPACA_DATA_URL}/v1beta1/screener/stocks/top-gainers"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -272,7 +276,7 @@ def get_top_losers(top: int = 10) -> Dict[str, Any]:
         params = {'top': top}
         
         url = f"{ALPACA_DATA_URL}/v1beta1/screener/stocks/top-losers"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -300,7 +304,7 @@ def get_news(symbols: List[str] = [], start: Optional[str] = None, end: Optional
             params['end'] = end
             
         url = f"{ALPACA_DATA_URL}/v1beta1/news"
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = _transport.get(url, headers=get_headers(), params=params)
         response.raise_for_status()
         
         return response.json()
@@ -7,15 +7,19 @@ by the generic vendor-independent layer in functions_real.py.
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 
+from .transport import get_transport
+
 
 # API Configuration
 EODHD_API_KEY = os.getenv('EODHD_API_KEY')
 EODHD_BASE_URL = os.getenv('EODHD_BASE_URL', 'https://eodhistoricaldata.com/api')
 
+# Pooled, rate-limited session shared by all EODHD calls
+_transport = get_transport('eodhd')
+
 
 def get_eod_data(symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None, period: str = "d", order: str = "a") -> Dict[str, Any]:
     """Retrieve end-of-day historical OHLC prices with dividend and split adjustments."""
@@ -35,7 +39,7 @@ def get_eod_data(symbol: str, from_date: Optional[str] = None, to_date: Optional
             params['to'] = to_date
             
         url = f"{EODHD_BASE_URL}/eod/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -56,7 +60,7 @@ def get_real_time(symbol: str, fmt: str = "json") -> Dict[str, Any]:
         }
         
         url = f"{EODHD_BASE_URL}/real-time/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -74,7 +78,7 @@ def get_fundamentals(symbol: str) -> Dict[str, Any]:
         params = {'api_token': EODHD_API_KEY}
         
         url = f"{EODHD_BASE_URL}/fundamentals/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -97,7 +101,7 @@ def get_dividends(symbol: str, from_date: Optional[str] = None, to_date: Optiona
             params['to'] = to_date
             
         url = f"{EODHD_BASE_URL}/div/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -120,7 +124,7 @@ def get_splits(symbol: str, from_date: Optional[str] = None, to_date: Optional[s
             params['to'] = to_date
             
         url = f"{EODHD_BASE_URL}/splits/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -147,7 +151,7 @@ def get_technical(symbol: str, function: str, period: int = 14, from_date: Optio
             params['to'] = to_date
             
         url = f"{EODHD_BASE_URL}/technical/{symbol}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -174,7 +178,7 @@ def get_screener(filters: str = "", limit: int = 50, offset: int = 0, signals: s
             params['signals'] = signals
             
         url = f"{EODHD_BASE_URL}/screener"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -192,7 +196,7 @@ def search_symbols(query: str) -> List[Dict[str, Any]]:
         params = {'api_token': EODHD_API_KEY}
         
         url = f"{EODHD_BASE_URL}/search/{query}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -210,7 +214,7 @@ def get_exchanges_list() -> List[Dict[str, Any]]:
         params = {'api_token': EODHD_API_KEY}
         
         url = f"{EODHD_BASE_URL}/exchanges-list"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -228,7 +232,7 @@ def get_exchange_symbols(exchange: str) -> List[Dict[str, Any]]:
         params = {'api_token': EODHD_API_KEY}
         
         url = f"{EODHD_BASE_URL}/exchange-symbol-list/{exchange}"
-        response = requests.get(url, params=params)
+        response = _transport.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
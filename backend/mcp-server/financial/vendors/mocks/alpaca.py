@@ -10,8 +10,23 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 import warnings
+from .market_data import BarProfile, generate_universe
 warnings.filterwarnings('ignore')
 
+BASE_PRICES = {"AAPL": 185.64, "TSLA": 250.0, "SPY": 450.0, "QQQ": 400.0, "MSFT": 350.0}
+AVERAGE_VOLUMES = {"AAPL": 55_000_000, "TSLA": 85_000_000, "SPY": 75_000_000}
+
+# Slightly positive bias, ~1.8% daily volatility, lognormal volume
+BARS_PROFILE = BarProfile(
+    namespace="alpaca",
+    drift=0.0008,
+    volatility=0.018,
+    range_volatility=0.015,
+    volume_dispersion=0.4,
+    shared_range=True,
+    volume_model="lognormal"
+)
+
 
 # Alpaca Trading API Mock Functions
 def get_account() -> Dict[str, Any]:
@@ -408,9 +423,12 @@ def get_bars(symbols: List[str], timeframe: str = "1Day", start: Optional[str] =
         ...         print(f"  Latest: ${latest['c']:.2f} (Vol: {latest['v']:,})")
         
     Note:
-        - Uses symbol-based seeding for consistent mock data per symbol
-        - Base prices: AAPL=$185.64, TSLA=$250.00, SPY=$450.00, others=$100.00
-        - Realistic daily returns (~1.8% volatility) and volume patterns
+        - Generated by the vectorized mock engine (market_data.py): identical
+          across processes and runs, memoized per symbol and date range
+        - Base prices: AAPL=$185.64, TSLA=$250.00, SPY=$450.00, QQQ=$400.00,
+          MSFT=$350.00, others=$100.00
+        - Realistic daily returns (~1.8% volatility) and volume patterns;
+          symbols move together through a shared market factor
         - Excludes weekends, includes only trading days
         - Volume based on lognormal distribution for realism
     """
@@ -427,49 +445,25 @@ def get_bars(symbols: List[str], timeframe: str = "1Day", start: Optional[str] =
     else:
         end_date = datetime.now()
     
+    universe = generate_universe(
+        BARS_PROFILE, list(symbol_list),
+        start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"),
+        BASE_PRICES, AVERAGE_VOLUMES
+    )
+    
     bars = {}
-    for symbol in symbol_list:
-        # Set seed for consistent data per symbol
-        np.random.seed(hash(symbol) % 2**32)
-        
-        base_price = {"AAPL": 185.64, "TSLA": 250.0, "SPY": 450.0, "QQQ": 400.0, "MSFT": 350.0}.get(symbol, 100.0)
-        
-        symbol_bars = []
-        current_price = base_price
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # Only weekdays (skip weekends)
-            if current_date.weekday() < 5:
-                # Generate realistic daily movement
-                daily_return = np.random.normal(0.0008, 0.018)  # Slightly positive bias with realistic volatility
-                
-                open_price = current_price
-                close_price = open_price * (1 + daily_return)
-                
-                # High and low with realistic spreads
-                daily_range = abs(np.random.normal(0, 0.015))
-                high_price = max(open_price, close_price) * (1 + daily_range)
-                low_price = min(open_price, close_price) * (1 - daily_range)
-                
-                # Volume with realistic patterns
-                avg_volume = {"AAPL": 55_000_000, "TSLA": 85_000_000, "SPY": 75_000_000}.get(symbol, 25_000_000)
-                volume = int(avg_volume * np.random.lognormal(0, 0.4))
-                
-                symbol_bars.append({
-                    "t": current_date.strftime("%Y-%m-%dT05:00:00Z"),
-                    "o": round(open_price, 2),
-                    "h": round(high_price, 2),
-                    "l": round(low_price, 2),
-                    "c": round(close_price, 2),
-                    "v": volume
-                })
-                
-                current_price = close_price
-            
-            current_date += timedelta(days=1)
-        
-        bars[symbol] = symbol_bars
+    for symbol, series in universe.items():
+        bars[symbol] = [
+            {"t": t, "o": o, "h": h, "l": l, "c": c, "v": v}
+            for t, o, h, l, c, v in zip(
+                series.date_strings("%Y-%m-%dT05:00:00Z"),
+                np.round(series.open, 2).tolist(),
+                np.round(series.high, 2).tolist(),
+                np.round(series.low, 2).tolist(),
+                np.round(series.close, 2).tolist(),
+                series.volume.tolist()
+            )
+        ]
     
     return {"bars": bars}
 
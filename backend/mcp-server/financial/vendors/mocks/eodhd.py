@@ -10,8 +10,21 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 import warnings
+from .market_data import BarProfile, generate_series, symbol_rng, trading_days
 warnings.filterwarnings('ignore')
 
+BASE_PRICES = {"AAPL": 185.64, "TSLA": 250.0, "SPY": 450.0}
+
+# ~2% daily volatility, volume around 50M shares (floored at 1M)
+EOD_PROFILE = BarProfile(
+    namespace="eodhd",
+    drift=0.001,
+    volatility=0.02,
+    range_volatility=0.01,
+    volume_dispersion=0.4,
+    min_volume=1_000_000
+)
+
 
 # EODHD API Mock Functions
 def get_eod_data(symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None, period: str = "d", order: str = "a") -> Dict[str, Any]:
@@ -60,9 +73,11 @@ def get_eod_data(symbol: str, from_date: Optional[str] = None, to_date: Optional
         >>> print(f"Mock return: {return_pct:.2f}%")
         
     Note:
-        - Uses numpy random with symbol-based seeding for reproducible results
+        - Generated by the vectorized mock engine (market_data.py): identical
+          across processes and runs, memoized per symbol and date range
         - Base prices: AAPL=$185.64, TSLA=$250.00, SPY=$450.00, others=$100.00
-        - Generates realistic daily returns with ~2% volatility
+        - Generates realistic daily returns with ~2% volatility, correlated
+          across symbols through a shared market factor
         - Excludes weekends (only weekday trading)
         - Volume patterns based on normal distribution around 50M shares
         - High/low prices maintain proper OHLC relationships
@@ -83,34 +98,32 @@ def get_eod_data(symbol: str, from_date: Optional[str] = None, to_date: Optional
         else:
             start_date = datetime.strptime(from_date, "%Y-%m-%d")
         
-        # Generate mock data
-        np.random.seed(hash(base_symbol) % 2**32)
-        base_price = {"AAPL": 185.64, "TSLA": 250.0, "SPY": 450.0}.get(base_symbol, 100.0)
-        
-        days = (end_date - start_date).days
-        data = []
-        
-        current_price = base_price
-        for i in range(days + 1):
-            date = start_date + timedelta(days=i)
-            if date.weekday() < 5:  # Weekdays only
-                daily_return = np.random.normal(0.001, 0.02)
-                open_price = current_price
-                close_price = open_price * (1 + daily_return)
-                high_price = max(open_price, close_price) * (1 + abs(np.random.normal(0, 0.01)))
-                low_price = min(open_price, close_price) * (1 - abs(np.random.normal(0, 0.01)))
-                volume = int(np.random.normal(50_000_000, 20_000_000))
-                
-                data.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "open": round(open_price, 2),
-                    "high": round(high_price, 2),
-                    "low": round(low_price, 2),
-                    "close": round(close_price, 2),
-                    "adjusted_close": round(close_price, 2),
-                    "volume": max(volume, 1_000_000)
-                })
-                current_price = close_price
+        series = generate_series(
+            EOD_PROFILE, base_symbol,
+            start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"),
+            BASE_PRICES.get(base_symbol, 100.0), 50_000_000
+        )
+        
+        closes = np.round(series.close, 2).tolist()
+        data = [
+            {
+                "date": date,
+                "open": open_price,
+                "high": high_price,
+                "low": low_price,
+                "close": close_price,
+                "adjusted_close": close_price,
+                "volume": volume
+            }
+            for date, open_price, high_price, low_price, close_price, volume in zip(
+                series.date_strings(),
+                np.round(series.open, 2).tolist(),
+                np.round(series.high, 2).tolist(),
+                np.round(series.low, 2).tolist(),
+                closes,
+                series.volume.tolist()
+            )
+        ]
         
         if order == "d":
             data.reverse()
@@ -179,10 +192,10 @@ def get_real_time(symbol: str, fmt: str = "json") -> Dict[str, Any]:
             symbol = f"{symbol.upper()}.US"
         
         base_symbol = symbol.split('.')[0]
-        base_price = {"AAPL": 185.64, "TSLA": 250.0, "SPY": 450.0}.get(base_symbol, 100.0)
+        base_price = BASE_PRICES.get(base_symbol, 100.0)
         
-        np.random.seed(hash(base_symbol) % 2**32)
-        change = np.random.normal(0, 0.02) * base_price
+        rng = symbol_rng("eodhd-real-time", base_symbol)
+        change = rng.normal(0, 0.02) * base_price
         current_price = base_price + change
         
         return {
@@ -193,7 +206,7 @@ def get_real_time(symbol: str, fmt: str = "json") -> Dict[str, Any]:
             "high": round(current_price * 1.02, 2),
             "low": round(current_price * 0.98, 2),
             "close": round(current_price, 2),
-            "volume": int(np.random.normal(50_000_000, 20_000_000)),
+            "volume": int(rng.normal(50_000_000, 20_000_000)),
             "previousClose": round(base_price, 2),
             "change": round(change, 2),
             "change_p": round((change / base_price) * 100, 2)
@@ -473,7 +486,7 @@ def get_technical(symbol: str, function: str, period: int = 14, from_date: Optio
     with appropriate value ranges and characteristics.
     
     Args:
-        symbol: Stock symbol (not used in mock calculation but maintained for compatibility).
+        symbol: Stock symbol (seeds the mock values).
         function: Technical indicator to calculate. Examples:
             - 'rsi': Relative Strength Index (0-100 range)
             - 'sma': Simple Moving Average (price-based)
@@ -507,7 +520,8 @@ def get_technical(symbol: str, function: str, period: int = 14, from_date: Optio
         
     Note:
         - Base values: RSI around 50, price indicators around $185
-        - Values fluctuate with normal distribution for realism
+        - Values fluctuate with normal distribution for realism, deterministic
+          per symbol, function and period
         - Only includes weekday dates (excludes weekends)
         - Useful for testing technical analysis algorithms
     """
@@ -521,21 +535,16 @@ def get_technical(symbol: str, function: str, period: int = 14, from_date: Optio
         else:
             start_date = datetime.strptime(from_date, "%Y-%m-%d")
         
-        data = []
-        current_date = start_date
+        dates = trading_days(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
         base_value = 50 if function == 'rsi' else 185.42
         
-        while current_date <= end_date:
-            if current_date.weekday() < 5:
-                variation = np.random.normal(0, 0.1)
-                value = base_value + variation
-                data.append({
-                    "date": current_date.strftime("%Y-%m-%d"),
-                    function: round(value, 2)
-                })
-            current_date += timedelta(days=1)
+        rng = symbol_rng("eodhd-technical", f"{symbol}:{function}:{period}")
+        values = np.round(base_value + rng.normal(0, 0.1, len(dates)), 2).tolist()
         
-        return data
+        return [
+            {"date": date, function: value}
+            for date, value in zip(np.datetime_as_string(dates, unit="D").tolist(), values)
+        ]
         
     except Exception as e:
         return {"error": f"Technical analysis request failed: {str(e)}"}
@@ -0,0 +1,201 @@
+"""
+Mock Market Data Engine
+
+Vectorized OHLCV generation shared by the mock EODHD and Alpaca vendors.
+
+Each symbol has one price path per vendor namespace, anchored at the start of
+``EPOCH_YEAR``: ``base_price`` is the close on the last trading day before it.
+Shocks are drawn one calendar year at a time from a ``numpy.random.Generator``
+seeded by a stable digest of the namespace, symbol and year (not ``hash()``,
+which is salted per process). Any requested range is therefore a slice of the
+same path: a date has the same bar whatever the range around it, in every
+process and run. Year blocks and generated series are memoized in-process.
+
+Paths are correlated across symbols through a market factor shared by all
+symbols of a vendor on the same date:
+
+    shock = sqrt(rho) * market + sqrt(1 - rho) * idiosyncratic
+
+The market factor depends only on (namespace, year), so a symbol's bars do
+not depend on which other symbols are requested alongside it.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Generated series kept per process (one entry per symbol/range/profile)
+SERIES_CACHE_SIZE = 512
+# Year blocks kept per process (one entry per symbol/year/profile)
+YEAR_CACHE_SIZE = 4096
+# base_price is the close on the last trading day before this year
+EPOCH_YEAR = 2024
+
+
+@dataclass(frozen=True)
+class BarProfile:
+    """Statistical shape of a mock vendor's daily bars"""
+    namespace: str
+    drift: float
+    volatility: float
+    range_volatility: float
+    volume_dispersion: float
+    # Same range draw for high and low (Alpaca) or independent draws (EODHD)
+    shared_range: bool = False
+    # "normal": volume ~ N(mean, dispersion * mean); "lognormal": mean * LogN(0, dispersion)
+    volume_model: str = "normal"
+    min_volume: int = 0
+    market_correlation: float = 0.5
+
+
+@dataclass(frozen=True)
+class MockSeries:
+    """Columnar OHLCV bars for one symbol (arrays are read-only, shared by the cache)"""
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def date_strings(self, fmt: str = "%Y-%m-%d") -> List[str]:
+        return [d.strftime(fmt) for d in self.dates.astype(datetime)]
+
+
+def stable_seed(*parts: str) -> int:
+    """64-bit seed derived from the given strings, identical across processes"""
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def symbol_rng(namespace: str, symbol: str) -> np.random.Generator:
+    """Generator for one symbol's mock data within a vendor namespace"""
+    return np.random.default_rng(stable_seed(namespace, symbol))
+
+
+def trading_days(start: str, end: str) -> np.ndarray:
+    """Weekdays between start and end (inclusive) as datetime64[D]"""
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    return days[np.is_busday(days)]
+
+
+def _market_shocks(namespace: str, year: int, n: int) -> np.ndarray:
+    return np.random.default_rng(stable_seed(namespace, "__market__", str(year))).standard_normal(n)
+
+
+def _read_only(*arrays: np.ndarray):
+    for array in arrays:
+        array.setflags(write=False)
+
+
+@lru_cache(maxsize=YEAR_CACHE_SIZE)
+def _year_block(profile: BarProfile, symbol: str, year: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Trading days of one calendar year, the symbol's (4, n) shocks for them
+    (row 0 includes the market factor) and the cumulative log return over the year"""
+    dates = trading_days(f"{year}-01-01", f"{year}-12-31")
+    n = len(dates)
+
+    noise = np.random.default_rng(stable_seed(profile.namespace, symbol, str(year))).standard_normal((4, n))
+    rho = profile.market_correlation
+    noise[0] = np.sqrt(rho) * _market_shocks(profile.namespace, year, n) + np.sqrt(1 - rho) * noise[0]
+    log_path = np.cumsum(np.log1p(profile.drift + profile.volatility * noise[0]))
+
+    _read_only(dates, noise, log_path)
+    return dates, noise, log_path
+
+
+def _year_level(profile: BarProfile, symbol: str, year: int) -> float:
+    """Log close on the last trading day before ``year``, relative to base_price"""
+    level = 0.0
+    for y in range(EPOCH_YEAR, year):
+        level += _year_block(profile, symbol, y)[2][-1]
+    for y in range(EPOCH_YEAR - 1, year - 1, -1):
+        level -= _year_block(profile, symbol, y)[2][-1]
+    return level
+
+
+@lru_cache(maxsize=SERIES_CACHE_SIZE)
+def generate_series(profile: BarProfile, symbol: str, start: str, end: str,
+                    base_price: float, average_volume: float) -> MockSeries:
+    """Daily bars for one symbol over [start, end], sliced from its path.
+
+    Args:
+        profile: Vendor bar profile
+        symbol: Symbol (seeds the idiosyncratic shocks)
+        start: First date, 'YYYY-MM-DD'
+        end: Last date, 'YYYY-MM-DD'
+        base_price: Close on the last trading day before EPOCH_YEAR
+        average_volume: Mean daily volume
+
+    Returns:
+        MockSeries with one row per weekday; open is the previous close.
+    """
+    first_year = int(start[:4])
+    last_year = max(int(end[:4]), first_year)
+
+    # The year before start supplies the close preceding the first bar
+    level = _year_level(profile, symbol, first_year - 1)
+    blocks, closes = [], []
+    for year in range(first_year - 1, last_year + 1):
+        block = _year_block(profile, symbol, year)
+        blocks.append(block)
+        closes.append(base_price * np.exp(level + block[2]))
+        level += block[2][-1]
+
+    all_dates = np.concatenate([block[0] for block in blocks])
+    window = (all_dates >= np.datetime64(start, "D")) & (all_dates <= np.datetime64(end, "D"))
+    index = np.flatnonzero(window)
+    noise = np.concatenate([block[1] for block in blocks], axis=1)[:, index]
+
+    all_closes = np.concatenate(closes)
+    dates = all_dates[index]
+    close = all_closes[index]
+    open_ = all_closes[index - 1]
+
+    high_range = np.abs(profile.range_volatility * noise[1])
+    low_range = high_range if profile.shared_range else np.abs(profile.range_volatility * noise[2])
+    high = np.maximum(open_, close) * (1 + high_range)
+    low = np.minimum(open_, close) * (1 - low_range)
+
+    if profile.volume_model == "lognormal":
+        volume = average_volume * np.exp(profile.volume_dispersion * noise[3])
+    else:
+        volume = average_volume * (1 + profile.volume_dispersion * noise[3])
+    volume = np.maximum(volume.astype(np.int64), profile.min_volume)
+
+    _read_only(dates, open_, high, low, close, volume)
+    return MockSeries(dates, open_, high, low, close, volume)
+
+
+def generate_universe(profile: BarProfile, symbols: List[str], start: str, end: str,
+                      base_prices: Dict[str, float], average_volumes: Dict[str, float],
+                      default_price: float = 100.0,
+                      default_volume: float = 25_000_000) -> Dict[str, MockSeries]:
+    """Correlated bars for several symbols over the same date range.
+
+    Args:
+        profile: Vendor bar profile
+        symbols: Symbols to generate
+        start: First date, 'YYYY-MM-DD'
+        end: Last date, 'YYYY-MM-DD'
+        base_prices: Close before EPOCH_YEAR per symbol (default_price otherwise)
+        average_volumes: Mean daily volume per symbol (default_volume otherwise)
+
+    Returns:
+        Dict of symbol -> MockSeries
+    """
+    return {
+        symbol: generate_series(
+            profile, symbol, start, end,
+            base_prices.get(symbol, default_price),
+            average_volumes.get(symbol, default_volume)
+        )
+        for symbol in symbols
+    }
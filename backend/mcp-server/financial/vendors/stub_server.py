@@ -0,0 +1,159 @@
+"""
+Local Vendor Stub Server
+
+Minimal in-process HTTP server that mimics the EODHD and Alpaca endpoints used
+by get_historical_data / get_real_time_data. Prices are deterministic per
+symbol and date so repeated or partial fetches agree. Latency and rate-limit
+(429) responses can be injected to exercise the transport layer.
+
+Example:
+    >>> with VendorStubServer(latency=0.05) as stub:
+    ...     eodhd.EODHD_BASE_URL = stub.eodhd_base_url
+    ...     alpaca.ALPACA_DATA_URL = stub.alpaca_data_url
+    ...     ...
+    ...     print(stub.request_count, stub.max_concurrent)
+"""
+
+import json
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _stub_bars(symbol: str, start: Optional[str], end: Optional[str]) -> List[Dict[str, Any]]:
+    """Deterministic weekday bars for a symbol between two dates"""
+    end_day = date.fromisoformat(end[:10]) if end else date.today()
+    day = date.fromisoformat(start[:10]) if start else end_day - timedelta(days=30)
+    seed = zlib.crc32(symbol.encode()) % 100
+    bars = []
+    while day <= end_day:
+        if day.weekday() < 5:
+            close = 50.0 + seed + (day.toordinal() % 37)
+            bars.append({
+                "date": day.isoformat(),
+                "open": close - 0.5,
+                "high": close + 1.0,
+                "low": close - 1.0,
+                "close": close,
+                "volume": 1_000_000 + day.toordinal() % 1000,
+            })
+        day += timedelta(days=1)
+    return bars
+
+
+class VendorStubServer:
+    """Threaded HTTP stub for EODHD and Alpaca market data endpoints"""
+
+    def __init__(self, latency: float = 0.0, rate_limited_requests: int = 0, retry_after: float = 0.05):
+        """
+        Args:
+            latency: Seconds to sleep before answering each request
+            rate_limited_requests: Answer the first N requests with HTTP 429
+            retry_after: Retry-After header value sent with 429 responses
+        """
+        self.latency = latency
+        self.rate_limited_requests = rate_limited_requests
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_concurrent = 0
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def eodhd_base_url(self) -> str:
+        return f"{self.url}/api"
+
+    @property
+    def alpaca_data_url(self) -> str:
+        return self.url
+
+    def start(self) -> "VendorStubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.in_flight += 1
+                    stub.max_concurrent = max(stub.max_concurrent, stub.in_flight)
+                    stub.paths.append(self.path)
+                    throttled = stub.request_count <= stub.rate_limited_requests
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    if throttled:
+                        self._send(429, {"error": "rate limited"}, {"Retry-After": str(stub.retry_after)})
+                    else:
+                        self._route()
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _route(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                parts = parsed.path.strip("/").split("/")
+
+                if parts[:2] == ["api", "eod"] and len(parts) == 3:
+                    symbol = parts[2].split(".")[0]
+                    self._send(200, _stub_bars(symbol, params.get("from"), params.get("to")))
+                elif parts[:2] == ["api", "real-time"] and len(parts) == 3:
+                    symbol = parts[2].split(".")[0]
+                    bar = _stub_bars(symbol, None, None)[-1]
+                    self._send(200, {"code": parts[2], **bar, "previousClose": bar["open"]})
+                elif parsed.path == "/v2/stocks/bars":
+                    bars = {
+                        symbol: [
+                            {"t": f"{bar['date']}T04:00:00Z", "o": bar["open"], "h": bar["high"],
+                             "l": bar["low"], "c": bar["close"], "v": bar["volume"]}
+                            for bar in _stub_bars(symbol, params.get("start"), params.get("end"))
+                        ]
+                        for symbol in params.get("symbols", "").split(",") if symbol
+                    }
+                    self._send(200, {"bars": bars, "next_page_token": None})
+                else:
+                    self._send(404, {"error": f"Unknown stub endpoint {parsed.path}"})
+
+            def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "VendorStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
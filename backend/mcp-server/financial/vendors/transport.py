@@ -0,0 +1,181 @@
+"""
+Vendor HTTP Transport - Pooled Sessions, Rate Limiting and Retries
+
+Shared transport used by the vendor modules instead of bare requests.get:
+- One requests.Session per vendor with a keep-alive connection pool
+- Token bucket per vendor so fan-out stays under the vendor's rate limit
+- Retries with exponential backoff and jitter on 429/5xx and connection errors
+- fan_out() for bounded concurrent multi-symbol requests
+
+Configuration (per vendor, e.g. EODHD_RATE_LIMIT / ALPACA_RATE_LIMIT):
+    <VENDOR>_RATE_LIMIT      Sustained requests per second
+    <VENDOR>_RATE_BURST      Requests allowed back to back before throttling
+    VENDOR_MAX_CONCURRENCY   Worker threads for multi-symbol fan-out (default: 8)
+    VENDOR_MAX_RETRIES       Retries per request (default: 3)
+    VENDOR_REQUEST_TIMEOUT   Per-request timeout in seconds (default: 30)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Published vendor limits: EODHD 1000 req/min, Alpaca 200 req/min (free plan)
+DEFAULT_RATE_LIMITS = {
+    "eodhd": (16.0, 20),
+    "alpaca": (3.3, 10),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class VendorTransport:
+    """Pooled, rate-limited, retrying HTTP transport for one vendor"""
+
+    def __init__(
+        self,
+        vendor: str,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        timeout: Optional[float] = None,
+        pool_size: Optional[int] = None
+    ):
+        default_rate, default_burst = DEFAULT_RATE_LIMITS.get(vendor, (10.0, 10))
+        prefix = vendor.upper()
+        self.vendor = vendor
+        self.rate_limit = rate_limit or float(os.getenv(f"{prefix}_RATE_LIMIT", default_rate))
+        self.burst = burst or int(os.getenv(f"{prefix}_RATE_BURST", default_burst))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("VENDOR_MAX_RETRIES", "3"))
+        self.backoff_base = backoff_base
+        self.timeout = timeout or float(os.getenv("VENDOR_REQUEST_TIMEOUT", "30"))
+        pool_size = pool_size or get_max_concurrency()
+
+        self.bucket = TokenBucket(self.rate_limit, self.burst)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._metrics_lock = threading.Lock()
+        self.metrics = {"requests": 0, "retries": 0, "errors": 0, "throttled_seconds": 0.0}
+
+    def _record(self, **increments) -> None:
+        with self._metrics_lock:
+            for key, value in increments.items():
+                self.metrics[key] += value
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 60.0)
+                except ValueError:
+                    pass
+        return self.backoff_base * (2 ** attempt) * (0.5 + random.random())
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET through the pooled session with rate limiting and retries
+
+        Accepts the same keyword arguments as requests.get. The final response is
+        returned even if it is still an error status, so callers keep using
+        raise_for_status().
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self._record(throttled_seconds=self.bucket.acquire(), requests=1)
+            response = None
+            try:
+                response = self.session.get(url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    self._record(errors=1)
+                    raise
+                reason = type(e).__name__
+
+            delay = self._retry_delay(attempt, response)
+            self._record(retries=1)
+            logger.warning(f"{self.vendor} request failed ({reason}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request/retry/throttle counters"""
+        with self._metrics_lock:
+            return {**self.metrics, "rate_limit": self.rate_limit, "burst": self.burst}
+
+
+def get_max_concurrency() -> int:
+    """Worker threads used for multi-symbol fan-out"""
+    return int(os.getenv("VENDOR_MAX_CONCURRENCY", "8"))
+
+
+def fan_out(func: Callable[[T], R], items: Iterable[T], max_workers: Optional[int] = None) -> List[R]:
+    """
+    Apply func to each item concurrently with a bounded thread pool
+
+    Results are returned in input order; the first exception raised by any call
+    is re-raised. The per-vendor token bucket keeps the request rate in check.
+    """
+    items = list(items)
+    workers = min(max_workers or get_max_concurrency(), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vendor-fetch") as executor:
+        return list(executor.map(func, items))
+
+
+_transports: Dict[str, VendorTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(vendor: str) -> VendorTransport:
+    """Get the shared transport for a vendor (singleton per vendor)"""
+    with _transports_lock:
+        transport = _transports.get(vendor)
+        if transport is None:
+            transport = VendorTransport(vendor)
+            _transports[vendor] = transport
+        return transport
@@ -27,6 +27,7 @@ from mcp.types import (
 # Import shared execution logic
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from shared.execution import execute_script, check_forbidden_imports, check_defensive_programming
+from shared.execution import get_warm_pool, shutdown_warm_pool, is_warm_pool_enabled
 from shared.storage import get_storage
 
 # Configure logging
@@ -738,19 +739,29 @@ async def main():
     """Run the MCP script validation server"""
     logger.info("🚀 MCP Script Validation Server starting...")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="mcp-script-validation-server",
-                server_version="1.0.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={}
+    # Warm the interpreter pool up front so the first validation skips import cost
+    if is_warm_pool_enabled():
+        try:
+            await asyncio.to_thread(get_warm_pool)
+        except Exception as e:
+            logger.warning(f"⚠️ Warm interpreter pool unavailable, using subprocess execution: {e}")
+    
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="mcp-script-validation-server",
+                    server_version="1.0.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={}
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        shutdown_warm_pool()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -120,7 +120,8 @@ Confidence should reflect how certain you are that:
                 messages=messages,
                 max_tokens=200,
                 temperature=0.1,
-                system_prompt=contextual_prompt
+                system_prompt=contextual_prompt,
+                response_cache="context-classifier"
             )
             duration = time.time() - start_time
             
@@ -134,11 +135,13 @@ Confidence should reflect how certain you are that:
             # Parse response
             content = response.get("content", "").upper().strip()
             
-            # Simple mapping
+            # Simple mapping; only recognised labels are replayed from the response cache
             if content in ["CONTEXTUAL", "C"]:
                 query_type = "contextual"
+                await self.llm_service.cache_response(response)
             elif content in ["STANDALONE", "COMPLETE", "S", "A"]:
                 query_type = "standalone"
+                await self.llm_service.cache_response(response)
             else:
                 logger.warning(f"⚠️ Unexpected classification response: '{content}', defaulting to standalone")
                 query_type = "standalone"
@@ -175,7 +178,8 @@ Confidence should reflect how certain you are that:
                 messages=messages,
                 max_tokens=500,
                 temperature=0.2,
-                system_prompt=expansion_prompt
+                system_prompt=expansion_prompt,
+                response_cache="context-expander"
             )
             duration = time.time() - start_time
             
@@ -188,14 +192,23 @@ Confidence should reflect how certain you are that:
             
             # Parse expansion result (same pattern as intent classification)
             content = response.get("content", "")
-            return self._parse_expansion_response(content, contextual_query)
+            result = self._parse_expansion_response(content, contextual_query)
+            if result is None:
+                # Plain-text answers are used as-is but not replayed from the response cache
+                return self._plain_text_expansion(content)
+            if result["success"]:
+                await self.llm_service.cache_response(response)
+            return result
             
         except Exception as e:
             logger.error(f"❌ Context expansion error: {e}")
             return {"success": False, "error": str(e)}
     
-    def _parse_expansion_response(self, content: str, original_query: str) -> Dict[str, Any]:
-        """Parse expansion response (same pattern as intent classification and context expander)"""
+    def _parse_expansion_response(self, content: str, original_query: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON expansion response (same pattern as intent classification and context expander)
+
+        Returns None if the content is not a JSON expansion.
+        """
         
         try:
             # Try to parse JSON response
@@ -209,21 +222,7 @@ Confidence should reflect how certain you are that:
                     "confidence": float(parsed.get("confidence", 0.8)),
                     "llm_response": content
                 }
-            else:
-                # Fallback: treat whole content as expanded query
-                logger.debug(f"Could not parse JSON, using content as expanded query")
-                expanded_query = content.strip()
-                
-                # Clean up common artifacts
-                if "?" in expanded_query:
-                    expanded_query = expanded_query.split("?")[0] + "?"
-                
-                return {
-                    "success": True,
-                    "expanded_query": expanded_query,
-                    "confidence": 0.7,
-                    "llm_response": content
-                }
+            return None
                 
         except Exception as e:
             logger.warning(f"Error parsing expansion response: {e}")
@@ -234,6 +233,22 @@ Confidence should reflect how certain you are that:
                 "confidence": 0.0
             }
     
+    def _plain_text_expansion(self, content: str) -> Dict[str, Any]:
+        """Fallback: treat whole content as expanded query"""
+        logger.debug(f"Could not parse JSON, using content as expanded query")
+        expanded_query = content.strip()
+        
+        # Clean up common artifacts
+        if "?" in expanded_query:
+            expanded_query = expanded_query.split("?")[0] + "?"
+        
+        return {
+            "success": True,
+            "expanded_query": expanded_query,
+            "confidence": 0.7,
+            "llm_response": content
+        }
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check if context service is available"""
         try:
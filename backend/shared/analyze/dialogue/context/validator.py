@@ -145,7 +145,8 @@ Respond ONLY with a JSON object:
             response = await self.llm_service.simple_completion(
                 prompt=user_message,
                 system_prompt=system_prompt,
-                max_tokens=1500
+                max_tokens=1500,
+                response_cache="completeness-validator"
             )
             
             # Handle both dict and object response formats
@@ -167,6 +168,9 @@ Respond ONLY with a JSON object:
                     
                     # Validate the response structure
                     if "complete" in result and "missing" in result and "reason" in result:
+                        # Only well-formed validations are replayed from the response cache
+                        if isinstance(response, dict):
+                            await self.llm_service.cache_response(response)
                         # Extract enhanced query if provided and query was terse
                         enhanced_query = result.get("enhanced_query", None)
                         is_terse = result.get("is_terse", False)
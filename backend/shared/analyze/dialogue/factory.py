@@ -9,7 +9,7 @@ import os
 shared_path = os.path.join(os.path.dirname(__file__), '..', '..', '..')
 sys.path.insert(0, shared_path)
 from shared.llm.service import LLMService
-from ..search.library import AnalysisLibrary
+from ..search.library import AnalysisLibrary, get_async_analysis_library
 from .context.service import create_context_service
 from ...services.session_manager import SessionManager
 from .context.classifier import create_query_classifier
@@ -22,7 +22,9 @@ class DialogueFactory:
     
     def __init__(self, llm_service: LLMService = None, analysis_library: AnalysisLibrary = None, 
                  chat_history_service = None, session_manager: SessionManager = None):
-        self.analysis_library = analysis_library or AnalysisLibrary()
+        # Without an injected library, use the shared one and its async facade
+        self.async_library = None if analysis_library else get_async_analysis_library()
+        self.analysis_library = analysis_library or self.async_library.library
         self.chat_history_service = chat_history_service
         
         # Use provided session manager or create new one
@@ -54,7 +56,8 @@ class DialogueFactory:
             session_manager=self.session_manager,
             classifier=self.classifier,
             expander=self.expander,
-            llm_service=context_llm
+            llm_service=context_llm,
+            async_library=self.async_library
         )
     
     def get_context_aware_search(self):
@@ -6,11 +6,21 @@ Flow:
 1. Classify: Is query CONTEXTUAL or STANDALONE?
 2. If CONTEXTUAL: Expand using history → validate → search
 3. If STANDALONE: Validate → search
+
+Speculative mode (CONTEXT_SEARCH_SPECULATIVE, on by default): most queries are
+standalone, so the standalone stages (meaningless check, validation, vector
+search) are started on the raw query while classification runs. If the query
+turns out to be contextual, or validation rewrites it, the speculative work is
+cancelled or discarded and the serial flow runs as before. Per-stage timings
+are returned in ``stage_timings``.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from shared.analyze.search.library import AnalysisLibrary
+import os
+import time
+from typing import Optional, Dict, Any, List, Awaitable
+from shared.analyze.search.library import AnalysisLibrary, AsyncAnalysisLibrary, get_async_analysis_library
 from ..conversation.store import ConversationStore, UserMessage, AssistantMessage
 from ....services.session_manager import SessionManager
 from ..context.classifier import QueryClassifier
@@ -20,6 +30,101 @@ from shared.services.progress_service import send_progress_info
 
 logger = logging.getLogger(__name__)
 
+
+def is_speculative_search_enabled() -> bool:
+    """Whether standalone stages run speculatively during classification (CONTEXT_SEARCH_SPECULATIVE)"""
+    return os.getenv("CONTEXT_SEARCH_SPECULATIVE", "true").lower() in ("1", "true", "yes")
+
+
+class StageTimings:
+    """Wall-clock timing of each search stage, relative to the start of the search"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def key(name: str, speculative: bool = False) -> str:
+        # A stage can run both speculatively and on the serial path
+        return f"{name}:speculative" if speculative else name
+
+    async def track(self, name: str, awaitable: Awaitable, speculative: bool = False,
+                    cancelled_status: str = "cancelled"):
+        """Await a stage and record when it started and how long it took
+
+        cancelled_status is recorded if the stage is cancelled; stages whose
+        underlying work cannot be stopped use "discarded".
+        """
+        stage = self.stages[self.key(name, speculative)] = {
+            "stage": name,
+            "start_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "speculative": speculative,
+            "status": "running",
+        }
+        try:
+            result = await awaitable
+            stage["status"] = "done"
+            return result
+        except asyncio.CancelledError:
+            stage["status"] = cancelled_status
+            raise
+        except Exception:
+            stage["status"] = "failed"
+            raise
+        finally:
+            stage["duration_ms"] = round((time.perf_counter() - self.started) * 1000 - stage["start_ms"], 1)
+
+    def mark(self, key: str, status: str):
+        if key in self.stages and self.stages[key]["status"] in ("running", "done"):
+            self.stages[key]["status"] = status
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "stages": self.stages,
+        }
+
+
+def format_stage_timings(stage_timings: Dict[str, Any]) -> str:
+    """One-line summary for logs, e.g. 'classify 0-812ms | validate* 2-1130ms (used)'
+
+    Stages are ordered by start time; '*' marks speculative stages.
+    """
+    parts = []
+    stages = stage_timings.get("stages", {})
+    for stage in sorted(stages.values(), key=lambda stage: stage["start_ms"]):
+        end = stage["start_ms"] + stage.get("duration_ms", 0)
+        marker = "*" if stage.get("speculative") else ""
+        status = "" if stage.get("status") == "done" else f" ({stage.get('status')})"
+        parts.append(f"{stage['stage']}{marker} {stage['start_ms']:.0f}-{end:.0f}ms{status}")
+    return f"{stage_timings.get('total_ms', 0):.0f}ms total: " + " | ".join(parts)
+
+
+class SpeculativeStages:
+    """Standalone-path stages launched on the raw query before classification finishes"""
+
+    def __init__(self, tasks: Dict[str, asyncio.Task], timings: StageTimings):
+        self.tasks = tasks
+        self.timings = timings
+
+    async def take(self, name: str):
+        """Result of a speculative stage; it becomes part of the critical path"""
+        result = await self.tasks.pop(name)
+        self.timings.mark(StageTimings.key(name, speculative=True), "used")
+        return result
+
+    async def discard(self, *names: str):
+        """Cancel speculative stages whose results will not be used (all remaining by default)"""
+        names = [name for name in (names or list(self.tasks)) if name in self.tasks]
+        tasks = [self.tasks.pop(name) for name in names]
+        for task in tasks:
+            task.cancel()
+        # Retrieve outcomes so cancelled/failed tasks do not log "exception was never retrieved"
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for name in names:
+            self.timings.mark(StageTimings.key(name, speculative=True), "discarded")
+
+
 class ContextAwareSearch:
     """Enhanced search that handles conversation context"""
     
@@ -29,12 +134,20 @@ class ContextAwareSearch:
                  classifier: QueryClassifier = None,
                  expander: ContextExpander = None,
                  validator: CompletenessValidator = None,
-                 llm_service = None):
-        self.analysis_library = analysis_library or AnalysisLibrary()
+                 llm_service = None,
+                 speculative: Optional[bool] = None,
+                 async_library: AsyncAnalysisLibrary = None):
+        # Share the process-wide facade (one search thread pool, coalesced
+        # searches) unless a library or facade is injected
+        if async_library is None:
+            async_library = AsyncAnalysisLibrary(analysis_library) if analysis_library else get_async_analysis_library()
+        self.async_library = async_library
+        self.analysis_library = analysis_library or async_library.library
         self.session_manager = session_manager
         self.classifier = classifier
         self.expander = expander
         self.validator = validator or CompletenessValidator(llm_service=llm_service)
+        self.speculative = is_speculative_search_enabled() if speculative is None else speculative
         
         self.default_similarity_threshold = 0.3
     
@@ -50,6 +163,9 @@ class ContextAwareSearch:
         2. If CONTEXTUAL: EXPAND → VALIDATE → SEARCH
         3. If STANDALONE: VALIDATE → SEARCH
 
+        In speculative mode the STANDALONE stages start together with CLASSIFY
+        and are discarded if the query is CONTEXTUAL.
+
         Args:
             query: User's question/query
             session_id: Optional session ID
@@ -64,17 +180,67 @@ class ContextAwareSearch:
             - query_type: str ("contextual" or "standalone", if applicable)
             - original_query: str (always present except errors)
             - expanded_query: str (always present for non-errors)
+            - stage_timings: dict with total_ms and per-stage start_ms / duration_ms / status
             - Additional fields based on type
         """
 
         similarity_threshold = similarity_threshold or self.default_similarity_threshold
+        timings = StageTimings()
+        speculation = None
 
-        # Verify session_id is provided (REQUIRED)
-        if not session_id:
-            return self._error_response(
-                message="Session ID is required for context-aware search",
-                original_query=query
-            )
+        try:
+            # Verify session_id is provided (REQUIRED)
+            if not session_id:
+                return self._error_response(
+                    message="Session ID is required for context-aware search",
+                    original_query=query
+                )
+
+            if self.speculative:
+                speculation = self._start_speculation(query, similarity_threshold, timings)
+
+            result = await self._run_stages(query, session_id, similarity_threshold, timings, speculation)
+        finally:
+            if speculation:
+                await speculation.discard()
+
+        result["stage_timings"] = timings.as_dict()
+        logger.debug(f"⏱️ Context search stages: {format_stage_timings(result['stage_timings'])}")
+        return result
+
+    def _start_speculation(self, query: str, similarity_threshold: float, timings: StageTimings) -> SpeculativeStages:
+        """Launch the standalone stages on the raw query"""
+        coroutines = {
+            "meaningless_check": self._is_meaningless_query(query),
+            "validate": self.validator.validate(query),
+            "search": self._search(query, similarity_threshold),
+        }
+        # A cancelled search keeps running on its executor thread; only its result is dropped
+        cancelled_status = {"search": "discarded"}
+        tasks = {
+            name: asyncio.create_task(timings.track(
+                name, coroutine, speculative=True,
+                cancelled_status=cancelled_status.get(name, "cancelled")
+            ))
+            for name, coroutine in coroutines.items()
+        }
+        return SpeculativeStages(tasks, timings)
+
+    async def _search(self, query: str, similarity_threshold: float) -> Dict[str, Any]:
+        """Vector search off the event loop; identical concurrent queries share one search"""
+        return await self.async_library.search_similar(
+            query=query,
+            top_k=5,
+            similarity_threshold=similarity_threshold
+        )
+
+    async def _run_stages(self,
+                          query: str,
+                          session_id: str,
+                          similarity_threshold: float,
+                          timings: StageTimings,
+                          speculation: Optional[SpeculativeStages]) -> Dict[str, Any]:
+        """Classification → (expansion) → validation → search, using speculative results where valid"""
 
         # Get conversation from session
         if self.session_manager:
@@ -90,7 +256,7 @@ class ContextAwareSearch:
             conversation = ConversationStore(session_id)
 
         # Step 1: CLASSIFY - Is this query CONTEXTUAL or STANDALONE?
-        classification = await self._classify_contextual(query, conversation)
+        classification = await timings.track("classify", self._classify_contextual(query, conversation))
 
         if not classification["success"]:
             return self._error_response(
@@ -107,8 +273,13 @@ class ContextAwareSearch:
         expansion_confidence = 0.9  # Default high confidence for standalone
 
         if is_contextual:
+            # Speculative work was done on the raw query, which is not what gets searched
+            if speculation:
+                await speculation.discard()
+                speculation = None
+
             logger.info(f"Query is contextual, expanding with context...")
-            expansion = await self._expand_query(query, conversation)
+            expansion = await timings.track("expand", self._expand_query(query, conversation))
 
             if not expansion["success"]:
                 return self._error_response(
@@ -135,7 +306,7 @@ class ContextAwareSearch:
                 )
 
             # Step 2.5: Check if expansion is meaningless (e.g., "Why?" → "Why?")
-            if await self._is_meaningless_query(expanded_query):
+            if await timings.track("meaningless_check", self._is_meaningless_query(expanded_query)):
                 logger.info(f"Expansion is meaningless ('{query}' → '{expanded_query}'), skipping clarification")
                 return {
                     "success": True,
@@ -150,7 +321,10 @@ class ContextAwareSearch:
         else:
             # For standalone queries, also check if they're meaningless
             logger.info(f"🔹 Query is STANDALONE, checking if meaningless...")
-            is_meaningless = await self._is_meaningless_query(query)
+            if speculation:
+                is_meaningless = await speculation.take("meaningless_check")
+            else:
+                is_meaningless = await timings.track("meaningless_check", self._is_meaningless_query(query))
             logger.info(f"🔹 Meaningless check result: {is_meaningless}")
             if is_meaningless:
                 logger.info(f"✅ Standalone query is meaningless: '{query}'")
@@ -168,7 +342,10 @@ class ContextAwareSearch:
 
         # Step 3: VALIDATE - Check if query is complete (and enhance standalone queries)
         await send_progress_info(session_id, "Checking question for completeness...")
-        validation = await self.validator.validate(expanded_query)
+        if speculation:
+            validation = await speculation.take("validate")
+        else:
+            validation = await timings.track("validate", self.validator.validate(expanded_query))
         
         # 🎯 Initialize enhancement metadata early (available for all paths)
         enhancement_metadata = {
@@ -205,12 +382,13 @@ class ContextAwareSearch:
         # Step 4: SEARCH - Query is ready
         # logger.info(f"Query validated, proceeding with search: {expanded_query[:100]}...")
 
-        # Search for similar analyses
-        search_result = self.analysis_library.search_similar(
-            query=expanded_query,
-            top_k=5,
-            similarity_threshold=similarity_threshold
-        )
+        # Search for similar analyses; the speculative search is valid only for the unchanged raw query
+        if speculation and expanded_query == query:
+            search_result = await speculation.take("search")
+        else:
+            if speculation:
+                await speculation.discard("search")
+            search_result = await timings.track("search", self._search(expanded_query, similarity_threshold))
 
         if not search_result["success"]:
             return self._error_response(
@@ -466,7 +644,7 @@ Is this a meaningless or non-financial query that shouldn't be analyzed?"""
             logger.info(f"User confirmed expansion, proceeding to search with: {expanded_query[:100]}...")
 
             # Proceed directly to SEARCH (VALIDATE already passed before asking)
-            search_result = self.analysis_library.search_similar(
+            search_result = await self.async_library.search_similar(
                 query=expanded_query,
                 top_k=5,
                 similarity_threshold=similarity_threshold
@@ -560,6 +738,8 @@ def create_context_aware_search(analysis_library: AnalysisLibrary = None,
                                session_manager: SessionManager = None,
                                classifier: QueryClassifier = None,
                                expander: ContextExpander = None,
-                               llm_service = None) -> ContextAwareSearch:
+                               llm_service = None,
+                               async_library: AsyncAnalysisLibrary = None) -> ContextAwareSearch:
     """Create context-aware search with all dependencies"""
-    return ContextAwareSearch(analysis_library, session_manager, classifier, expander, llm_service=llm_service)
\ No newline at end of file
+    return ContextAwareSearch(analysis_library, session_manager, classifier, expander,
+                              llm_service=llm_service, async_library=async_library)
\ No newline at end of file
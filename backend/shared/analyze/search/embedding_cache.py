@@ -0,0 +1,186 @@
+"""
+Query Embedding Cache
+
+Caches the vectors AnalysisLibrary.search_similar computes for query text, so
+re-asked questions skip the Ollama embedding round trip. Entries are keyed by
+embedding model + SHA-256 of the normalized text (NFKC, whitespace collapsed);
+the normalized text is also what gets embedded, so a cached vector is exactly
+what a fresh call would return.
+
+    Front:    in-process LRU (EMBEDDING_CACHE_MAX_ENTRIES)
+    Backing:  SQLite file shared by every process on the host
+
+Entries for other models are dropped when the cache is opened, so changing
+OLLAMA_EMBEDDING_MODEL invalidates the cache; migrate_to_ollama_embeddings
+clears it explicitly.
+
+Configuration:
+    EMBEDDING_CACHE_ENABLED       Enable the cache (default: true)
+    EMBEDDING_CACHE_PATH          SQLite file (default: ~/.cache/qna-ai/embedding_cache.sqlite3,
+                                  empty for memory only)
+    EMBEDDING_CACHE_MAX_ENTRIES   In-process LRU size (default: 10000)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("analysis-library")
+
+# embed(texts) -> one vector per text
+EmbedFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def is_embedding_cache_enabled() -> bool:
+    return os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a query for keying and embedding"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class EmbeddingCache:
+    """Two-level (LRU + SQLite) cache of query embeddings for one model"""
+
+    def __init__(self, model_name: str, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.model_name = model_name
+        if path is None:
+            path = os.path.expanduser(os.getenv("EMBEDDING_CACHE_PATH", "~/.cache/qna-ai/embedding_cache.sqlite3"))
+        self.path = path or None
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000"))
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "write_errors": 0}
+        if self.path:
+            self._open()
+
+    def _open(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Library calls run on a thread pool; access is serialized by self._lock
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, key))"
+            )
+            deleted = self._db.execute("DELETE FROM embeddings WHERE model != ?", (self.model_name,)).rowcount
+            if deleted:
+                logger.info(f"🗑️ Dropped {deleted} cached embeddings from other models")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Embedding cache file unavailable ({self.path}): {e}; using memory only")
+            self._db = None
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Cached vector for already-normalized text, or None"""
+        key = self._key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return vector
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT vector FROM embeddings WHERE model = ? AND key = ?", (self.model_name, key)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Embedding cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember(key, vector)
+                    self.stats["persistent_hits"] += 1
+                    return vector
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, text: str, vector: Sequence[float]) -> np.ndarray:
+        """Store the vector for already-normalized text"""
+        key = self._key(text)
+        # ChromaDB stores and compares float32 vectors
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                        (self.model_name, key, vector.tobytes())
+                    )
+                except sqlite3.Error as e:
+                    self.stats["write_errors"] += 1
+                    logger.warning(f"⚠️ Embedding cache write failed: {e}")
+        return vector
+
+    def embed(self, texts: Sequence[str], embed_function: EmbedFunction) -> List[np.ndarray]:
+        """Vectors for texts, embedding only the cache misses (in one call)"""
+        normalized = [normalize_text(text) for text in texts]
+        vectors = [self.get(text) for text in normalized]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = embed_function([normalized[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = self.put(normalized[i], vector)
+        return vectors
+
+    def clear(self) -> None:
+        """Drop every entry for this model (memory and file)"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM embeddings WHERE model = ?", (self.model_name,))
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Embedding cache clear failed: {e}")
+        logger.info(f"🗑️ Cleared embedding cache for {self.model_name}")
+
+    def get_stats(self) -> Dict[str, float]:
+        hits = self.stats["memory_hits"] + self.stats["persistent_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "model": self.model_name,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# One cache per embedding model per process
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Get or create the shared cache for an embedding model"""
+    with _embedding_caches_lock:
+        cache = _embedding_caches.get(model_name)
+        if cache is None:
+            cache = _embedding_caches[model_name] = EmbeddingCache(model_name)
+        return cache
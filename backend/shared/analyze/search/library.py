@@ -2,17 +2,28 @@
 """
 ChromaDB Analysis Library - Pure Python Implementation
 Simple storage and search for financial analysis questions and descriptions
+
+AnalysisLibrary wraps the synchronous chromadb HttpClient (and the Ollama
+embedding call made inside it). Async code should go through
+AsyncAnalysisLibrary / get_async_analysis_library(), which runs those calls on
+a bounded thread pool and coalesces identical concurrent searches.
 """
 
+import asyncio
+import functools
 import json
 import hashlib
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 import chromadb
 from chromadb.config import Settings
+from .embedding_cache import EmbeddingCache, get_embedding_cache, is_embedding_cache_enabled
+from .local_index import LocalVectorIndex, is_local_index_enabled
 from chromadb.utils.embedding_functions.ollama_embedding_function import (
     OllamaEmbeddingFunction,
 )
@@ -21,6 +32,12 @@ from chromadb.utils.embedding_functions.ollama_embedding_function import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("analysis-library")
 
+# Records per collection.add call in save_analyses (one embedding request each)
+SAVE_BATCH_SIZE = 100
+
+# Records per collection.get call when loading the local vector index
+INDEX_LOAD_PAGE_SIZE = 1000
+
 
 class AnalysisLibrary:
     """Pure Python Analysis Library using ChromaDB for vector search"""
@@ -52,6 +69,7 @@ class AnalysisLibrary:
         
         # Setup Ollama embedding function for better similarity
         self.embedding_function = None
+        self.embedding_model = None
         try:
             # Check if Ollama is available
             ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -61,6 +79,7 @@ class AnalysisLibrary:
                 url=ollama_url,
                 model_name=embedding_model,
             )
+            self.embedding_model = embedding_model
             logger.info(f"✅ Using Ollama embeddings: {embedding_model} at {ollama_url}")
         except Exception as e:
             logger.warning(f"⚠️ Failed to setup Ollama embeddings: {e}")
@@ -97,7 +116,90 @@ class AnalysisLibrary:
                 
             self.collection = self.client.create_collection(**collection_kwargs)
         
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self._setup_embedding_cache()
+        self.local_index: Optional[LocalVectorIndex] = None
+        self._setup_local_index()
+
         logger.info(f"✅ ChromaDB Analysis Library initialized with HTTP client")
+
+    def _collection_uses_embedding_model(self) -> bool:
+        """Whether the collection embeds with our Ollama model (so we can embed queries ourselves)"""
+        if not self.embedding_function:
+            return False
+        try:
+            collection_ef = self.collection.configuration.get("embedding_function")
+            return (collection_ef is not None and collection_ef.name() == "ollama"
+                    and collection_ef.get_config().get("model_name") == self.embedding_model)
+        except Exception:
+            return False
+
+    def _setup_embedding_cache(self):
+        """Cache query embeddings when the collection embeds with our Ollama model"""
+        self.embedding_cache = None
+        if not self.embedding_function or not is_embedding_cache_enabled():
+            return
+
+        # Query vectors must come from the model the collection was built with
+        if not self._collection_uses_embedding_model():
+            logger.info("💡 Collection does not use Ollama embeddings - query embedding cache disabled")
+            return
+
+        self.embedding_cache = get_embedding_cache(self.embedding_model)
+        logger.info(f"✅ Query embedding cache enabled for {self.embedding_model}")
+
+    def _setup_local_index(self):
+        """Warm-load the in-process vector index from the collection"""
+        self.local_index = None
+        if not is_local_index_enabled():
+            return
+        if not self._collection_uses_embedding_model():
+            logger.info("💡 Collection does not use Ollama embeddings - local vector index disabled")
+            return
+
+        try:
+            configuration = self.collection.configuration
+            space = (configuration.get("hnsw") or configuration.get("spann") or {}).get("space") or "l2"
+            self.local_index = LocalVectorIndex(space)
+            self.local_index_refresh_seconds = float(os.getenv("LOCAL_VECTOR_INDEX_REFRESH_SECONDS", "30"))
+            self._load_local_index()
+            logger.info(f"✅ Local vector index loaded: {len(self.local_index)} analyses ({space})")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load local vector index, searching ChromaDB: {e}")
+            self.local_index = None
+
+    def _load_local_index(self):
+        """Replace the local index with the collection's current contents"""
+        ids, embeddings, metadatas = [], [], []
+        offset = 0
+        while True:
+            page = self.collection.get(include=["embeddings", "metadatas"], limit=INDEX_LOAD_PAGE_SIZE, offset=offset)
+            ids.extend(page["ids"])
+            embeddings.extend(page["embeddings"])
+            metadatas.extend(self._unflatten_metadata(meta.copy()) for meta in page["metadatas"])
+            if len(page["ids"]) < INDEX_LOAD_PAGE_SIZE:
+                break
+            offset += INDEX_LOAD_PAGE_SIZE
+        self.local_index.load(ids, embeddings, metadatas)
+        self._local_index_checked_at = time.monotonic()
+
+    def _refresh_local_index(self):
+        """Reload the local index if another process changed the collection"""
+        if time.monotonic() - self._local_index_checked_at < self.local_index_refresh_seconds:
+            return
+        self._local_index_checked_at = time.monotonic()
+        try:
+            if self.collection.count() != len(self.local_index):
+                self._load_local_index()
+                logger.info(f"🔄 Reloaded local vector index: {len(self.local_index)} analyses")
+        except Exception as e:
+            # Keep serving reads from the last loaded index
+            logger.warning(f"⚠️ ChromaDB unavailable, serving {len(self.local_index)} analyses from local index: {e}")
+
+    def _embed_query(self, query: str):
+        if self.embedding_cache is not None:
+            return self.embedding_cache.embed([query], self.embedding_function)[0]
+        return self.embedding_function([query])[0]
     
     def migrate_to_ollama_embeddings(self) -> dict:
         """Migrate existing collection to use Ollama embeddings"""
@@ -124,6 +226,9 @@ class AnalysisLibrary:
                 metadata={"description": "Financial analysis questions with Ollama embeddings"}
             )
             logger.info(f"🔧 Created new collection with Ollama embeddings")
+            self._setup_embedding_cache()
+            if self.embedding_cache:
+                self.embedding_cache.clear()
             
             # Re-add all data (will use new embeddings)
             self.collection.add(
@@ -131,6 +236,7 @@ class AnalysisLibrary:
                 metadatas=existing_data['metadatas'],
                 ids=existing_data['ids']
             )
+            self._setup_local_index()
             
             logger.info(f"✅ Migrated {len(existing_data['ids'])} documents to Ollama embeddings")
             return {
@@ -226,56 +332,132 @@ class AnalysisLibrary:
 
         return nested_dict
     
+    def _build_record(self, analysis_id: str, question: str, metadata: dict = None) -> Tuple[str, dict]:
+        """Build the (document, metadata) pair stored for one analysis"""
+        now = datetime.now().isoformat()
+        if metadata is None:
+            metadata = {}
+
+        # Build analysis dict directly (no need for AnalysisData class)
+        analysis_dict = {
+            "id": analysis_id,
+            "question": question,
+            "created_date": now,
+            "usage_count": 0
+        }
+
+        # Flatten the nested metadata dict for ChromaDB compatibility
+        # ChromaDB only supports simple types (str, int, float, bool) in metadata
+        if metadata:
+            flattened_metadata = self._flatten_metadata(metadata)    
+            # Add flattened metadata with 'meta_' prefix to avoid conflicts
+            for key, value in flattened_metadata.items():
+                analysis_dict[key] = value
+        
+        description = analysis_dict["description"]
+        document = f"Question: {question}\nDescription: {description}"
+        return document, analysis_dict
+
     def save_analysis(self,  analysis_id: str, question: str, metadata: dict = None) -> dict:
         """Save analysis to the library"""
+        result = self.save_analyses([{"analysis_id": analysis_id, "question": question, "metadata": metadata}])
+        if not result["success"]:
+            return {"success": False, "error": result["error"]}
+        if result["failed"]:
+            return {"success": False, "error": result["failed"][0]["error"]}
+        return {
+            "success": True,
+            "message": f"Analysis saved successfully with ID: {analysis_id}"
+        }
+
+    def save_analyses(self, analyses: List[Dict[str, Any]]) -> dict:
+        """Save many analyses with one embedding batch and one add per SAVE_BATCH_SIZE records
+
+        Args:
+            analyses: Items with analysis_id, question and optional metadata
+                (same arguments as save_analysis)
+
+        Returns:
+            {"success": bool, "saved": [ids], "failed": [{"analysis_id", "error"}], "error": str if success is False}
+            Records that cannot be built (e.g. missing description) are listed in
+            failed; the rest are still saved.
+        """
+        documents, metadatas, ids, failed = [], [], [], []
+        for item in analyses:
+            try:
+                document, analysis_dict = self._build_record(item["analysis_id"], item["question"], item.get("metadata"))
+            except Exception as e:
+                failed.append({"analysis_id": item.get("analysis_id"), "error": f"Invalid analysis record: {e}"})
+                continue
+            documents.append(document)
+            metadatas.append(analysis_dict)
+            ids.append(item["analysis_id"])
+
+        saved = []
         try:
-            now = datetime.now().isoformat()
-            if metadata is None:
-                metadata = {}
-
-            # Build analysis dict directly (no need for AnalysisData class)
-            analysis_dict = {
-                "id": analysis_id,
-                "question": question,
-                "created_date": now,
-                "usage_count": 0
-            }
-
-            # Flatten the nested metadata dict for ChromaDB compatibility
-            # ChromaDB only supports simple types (str, int, float, bool) in metadata
-            if metadata:
-                flattened_metadata = self._flatten_metadata(metadata)    
-                # Add flattened metadata with 'meta_' prefix to avoid conflicts
-                for key, value in flattened_metadata.items():
-                    analysis_dict[key] = value
-            
-            document = f"Question: {question}\nDescription: {analysis_dict["description"]}"
-            self.collection.add(
-                documents=[document],
-                metadatas=[analysis_dict],
-                ids=[analysis_id]
-            )
-
-            logger.info(f"✅ Saved analysis {analysis_id} for question: {question[:50]}...")
-
-            return {
-                "success": True,
-                "message": f"Analysis saved successfully with ID: {analysis_id}"
-            }
-            
+            for start in range(0, len(ids), SAVE_BATCH_SIZE):
+                end = start + SAVE_BATCH_SIZE
+                add_kwargs = {}
+                if self.local_index is not None:
+                    # Embed here so the same vectors go to ChromaDB and the local index
+                    add_kwargs["embeddings"] = self.embedding_function(documents[start:end])
+                self.collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
+                    **add_kwargs
+                )
+                saved.extend(ids[start:end])
+                if add_kwargs:
+                    self._add_to_local_index(ids[start:end], add_kwargs["embeddings"], metadatas[start:end])
         except Exception as e:
-            logger.error(f"❌ Failed to save analysis: {e}")
+            logger.error(f"❌ Failed to save analyses: {e}")
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "saved": saved,
+                "failed": failed + [{"analysis_id": analysis_id, "error": str(e)} for analysis_id in ids[len(saved):]]
             }
+
+        for analysis_id, analysis_dict in zip(saved, metadatas):
+            logger.info(f"✅ Saved analysis {analysis_id} for question: {analysis_dict['question'][:50]}...")
+        for item in failed:
+            logger.error(f"❌ Failed to save analysis {item['analysis_id']}: {item['error']}")
+
+        return {"success": True, "saved": saved, "failed": failed}
     
+    def _add_to_local_index(self, ids: List[str], embeddings, metadatas: List[dict]):
+        try:
+            self.local_index.add(ids, embeddings, [self._unflatten_metadata(meta.copy()) for meta in metadatas])
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update local vector index, reloading on next search: {e}")
+            self._local_index_checked_at = float("-inf")
+
     def search_similar(self, query: str, top_k: int = 5, similarity_threshold: float = 0.3) -> dict:
         """Search for similar analyses"""
+        if self.local_index is not None:
+            try:
+                self._refresh_local_index()
+                similar_analyses = self.local_index.search(self._embed_query(query), top_k, similarity_threshold)
+                logger.info(f"⚡ Found {len(similar_analyses)} similar analyses in local index for: {query[:50]}...")
+                return {
+                    "success": True,
+                    "found_similar": len(similar_analyses) > 0,
+                    "analyses": similar_analyses,
+                    "query": query,
+                    "threshold": similarity_threshold
+                }
+            except Exception as e:
+                logger.warning(f"⚠️ Local vector index search failed, querying ChromaDB: {e}")
+
         try:
             # Search using ChromaDB vector similarity
+            if self.embedding_cache is not None:
+                query_input = {"query_embeddings": [self._embed_query(query)]}
+            else:
+                query_input = {"query_texts": [query]}
             results = self.collection.query(
-                query_texts=[query],
+                **query_input,
                 n_results=top_k * 2,  # Get more to filter by threshold
                 include=["documents", "metadatas", "distances"]
             )
@@ -322,11 +504,16 @@ class AnalysisLibrary:
         """Get library statistics"""
         try:
             count = self.collection.count()
-            return {
+            stats = {
                 "success": True,
                 "total_analyses": count,
                 "status": "operational"
             }
+            if self.embedding_cache is not None:
+                stats["embedding_cache"] = self.embedding_cache.get_stats()
+            if self.local_index is not None:
+                stats["local_index"] = self.local_index.get_stats()
+            return stats
         except Exception as e:
             logger.error(f"❌ Failed to get stats: {e}")
             return {
@@ -375,6 +562,71 @@ def get_analysis_library(chroma_host: str = None, chroma_port: int = None) -> An
         _analysis_library = AnalysisLibrary(chroma_host, chroma_port)
     return _analysis_library
 
+class AsyncAnalysisLibrary:
+    """Non-blocking facade over AnalysisLibrary for async code paths
+
+    Library calls (embedding + ChromaDB round trip) run on a dedicated thread
+    pool of CHROMA_MAX_CONCURRENCY workers, so they neither block the event
+    loop nor crowd out the default executor. Concurrent searches with the
+    same arguments share one in-flight call (one embedding, one query).
+    """
+
+    def __init__(self, library: AnalysisLibrary, max_concurrency: Optional[int] = None):
+        self.library = library
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("CHROMA_MAX_CONCURRENCY", "4"))
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="chroma")
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.coalesced_searches = 0
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def search_similar(self, query: str, top_k: int = 5, similarity_threshold: float = 0.3) -> dict:
+        """Search for similar analyses, joining an identical search already in flight"""
+        # Futures belong to one event loop
+        key = (id(asyncio.get_running_loop()), query, top_k, similarity_threshold)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(self.library.search_similar, query, top_k, similarity_threshold))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced_searches += 1
+            logger.debug(f"🔗 Joined in-flight search for: {query[:50]}...")
+
+        # Shield so one caller's cancellation does not cancel the search for the others
+        result = await asyncio.shield(future)
+        # Each caller gets its own result containers
+        return {**result, "analyses": [dict(analysis) for analysis in result.get("analyses", [])]}
+
+    async def save_analysis(self, analysis_id: str, question: str, metadata: dict = None) -> dict:
+        return await self._run(self.library.save_analysis, analysis_id, question, metadata)
+
+    async def save_analyses(self, analyses: List[Dict[str, Any]]) -> dict:
+        return await self._run(self.library.save_analyses, analyses)
+
+    async def get_stats(self) -> dict:
+        return await self._run(self.library.get_stats)
+
+    async def list_analyses(self, limit: int = 10) -> dict:
+        return await self._run(self.library.list_analyses, limit)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+# Module-level async facade (created lazily over the shared library)
+_async_analysis_library = None
+def get_async_analysis_library(chroma_host: str = None, chroma_port: int = None) -> AsyncAnalysisLibrary:
+    """Get or create the async facade over the shared analysis library"""
+    global _async_analysis_library
+    if _async_analysis_library is None:
+        _async_analysis_library = AsyncAnalysisLibrary(get_analysis_library(chroma_host, chroma_port))
+    return _async_analysis_library
+
 # Convenience functions for direct import
 def save_analysis(question: str, analysis_id: str, metadata: Dict) -> dict:
     """Save analysis - convenience function"""
@@ -0,0 +1,130 @@
+"""
+In-process Vector Index
+
+Exact nearest-neighbour index over the financial_analyses collection, held as
+one float32 matrix so AnalysisLibrary.search_similar can answer from memory
+instead of an HTTP round trip to ChromaDB. Distances follow the collection's
+HNSW space (cosine, l2 or ip) so similarity = 1 - distance matches what the
+ChromaDB query path returns; threshold filtering and top-k selection are
+vectorized.
+
+The library warm-loads the index from ChromaDB at startup, adds records it
+saves itself, and reloads when the collection count changes (checked every
+LOCAL_VECTOR_INDEX_REFRESH_SECONDS, for analyses saved by other processes).
+If ChromaDB is unreachable the last loaded index keeps serving reads.
+
+Configuration:
+    LOCAL_VECTOR_INDEX_ENABLED            Enable the index (default: true)
+    LOCAL_VECTOR_INDEX_REFRESH_SECONDS    Collection count check interval (default: 30)
+"""
+
+import copy
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+SUPPORTED_SPACES = ("cosine", "l2", "ip")
+
+
+def is_local_index_enabled() -> bool:
+    return os.getenv("LOCAL_VECTOR_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+class _Snapshot(NamedTuple):
+    """Immutable index contents; replaced wholesale on every write"""
+    ids: Tuple[str, ...]
+    vectors: np.ndarray
+    squared_norms: np.ndarray
+    metadatas: Tuple[Dict[str, Any], ...]
+
+
+class LocalVectorIndex:
+    """Exact in-memory vector index with ChromaDB distance semantics"""
+
+    def __init__(self, space: str = "cosine"):
+        if space not in SUPPORTED_SPACES:
+            raise ValueError(f"Unsupported vector space {space!r}; supported: {SUPPORTED_SPACES}")
+        self.space = space
+        self._write_lock = threading.Lock()
+        self._snapshot = self._build([], np.empty((0, 0), dtype=np.float32), [])
+        self.stats = {"searches": 0, "loads": 0, "adds": 0}
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    def _prepare(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        vectors = np.array(embeddings, dtype=np.float32, ndmin=2)
+        if self.space == "cosine" and len(vectors):
+            # ChromaDB normalizes vectors for cosine space; dot product is then cosine similarity
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+        return vectors
+
+    @staticmethod
+    def _build(ids: Sequence[str], vectors: np.ndarray, metadatas: Sequence[Dict[str, Any]]) -> _Snapshot:
+        return _Snapshot(tuple(ids), vectors, np.einsum("ij,ij->i", vectors, vectors), tuple(metadatas))
+
+    def load(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]) -> None:
+        """Replace the index contents"""
+        vectors = self._prepare(embeddings) if len(ids) else np.empty((0, 0), dtype=np.float32)
+        with self._write_lock:
+            self._snapshot = self._build(ids, vectors, metadatas)
+            self.stats["loads"] += 1
+
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], metadatas: Sequence[Dict[str, Any]]) -> None:
+        """Insert records, replacing any with the same id"""
+        if not ids:
+            return
+        vectors = self._prepare(embeddings)
+        with self._write_lock:
+            current = self._snapshot
+            replaced = set(ids)
+            keep = [i for i, existing in enumerate(current.ids) if existing not in replaced]
+            if len(current.ids) and current.vectors.shape[1] != vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index ({current.vectors.shape[1]})")
+            merged = np.vstack([current.vectors[keep], vectors]) if keep else vectors
+            self._snapshot = self._build(
+                [current.ids[i] for i in keep] + list(ids),
+                merged,
+                [current.metadatas[i] for i in keep] + list(metadatas)
+            )
+            self.stats["adds"] += len(ids)
+
+    def search(self, embedding: Sequence[float], top_k: int, similarity_threshold: float) -> List[Dict[str, Any]]:
+        """Up to top_k records with similarity >= threshold, most similar first
+
+        Returns copies of the stored metadata with a "similarity" key added,
+        the same shape as AnalysisLibrary.search_similar analyses.
+        """
+        snapshot = self._snapshot
+        self.stats["searches"] += 1
+        if not snapshot.ids or top_k <= 0:
+            return []
+
+        query = self._prepare([embedding])[0]
+        if query.shape[0] != snapshot.vectors.shape[1]:
+            raise ValueError(f"Query dimension {query.shape[0]} does not match index ({snapshot.vectors.shape[1]})")
+
+        dots = snapshot.vectors @ query
+        if self.space == "l2":
+            distances = snapshot.squared_norms - 2 * dots + float(query @ query)
+        else:
+            distances = 1 - dots
+        similarities = 1 - distances
+
+        candidates = np.flatnonzero(similarities >= similarity_threshold)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-similarities[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+
+        results = []
+        for i in candidates:
+            analysis = copy.deepcopy(snapshot.metadatas[i])
+            analysis["similarity"] = float(similarities[i])
+            results.append(analysis)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self), "space": self.space}
@@ -24,6 +24,7 @@ from shared.services.progress_service import send_progress_info, send_analysis_p
 from shared.services.execution_queue_service import execution_queue_service
 from shared.queue.worker_context import set_context, get_message_id, get_session_id, get_user_id
 from ..dialogue import search_with_context
+from ..dialogue.search.context_aware import format_stage_timings
 from shared.constants import MessageStatus, MetadataConstants
 from shared.storage import get_storage
 
@@ -387,6 +388,8 @@ class AnalysisPipelineService:
             )
             step_duration = time.time() - step_start
             self.logger.info(f"⏱️ TIMING - Step 2 (Context Search): {step_duration:.3f}s")
+            if context_result.get("stage_timings"):
+                self.logger.info(f"⏱️ TIMING - Step 2 stages: {format_stage_timings(context_result['stage_timings'])}")
         except Exception as e:
             self.logger.error(f"Context search failed: {e}")
             context_result = {
@@ -662,7 +665,7 @@ class AnalysisPipelineService:
             # Save to ChromaDB using the MongoDB analysisId (NON-CRITICAL)
             if analysis_id and script_name and should_save:
                 try:
-                    save_result = self.search_service.save_completed_analysis(
+                    save_result = await self.search_service.save_completed_analysis_async(
                         analysis_id=analysis_id,
                         original_question=request.question,
                         addn_meta={
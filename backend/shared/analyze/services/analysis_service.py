@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List
 
 # Import shared services (we're in shared/analyze/services now)
 from ...llm import create_analysis_llm, LLMService
+from ...llm.http_client import close_provider_http_clients
 from ...services.base_service import BaseService
 
 # Import utilities (now local to analyze/)
@@ -1025,4 +1026,5 @@ class AnalysisService(BaseService):
         """Cleanup method for server shutdown"""
         self.logger.info("Closing analysis service sessions...")
         # Note: MCP client cleanup is handled by the mcp_client module
+        await close_provider_http_clients()
         self.logger.info("Cleaned up analysis service")
@@ -155,7 +155,8 @@ class CodePromptBuilderService(BaseService):
                     "role": "user", 
                     "content": analysis_prompt
                 }],
-                system_prompt=self.system_prompt
+                system_prompt=self.system_prompt,
+                response_cache="function-selector"
             )
             
             # Check if LLM request was successful
@@ -183,6 +184,9 @@ class CodePromptBuilderService(BaseService):
             if len(function_selection["selected_functions"]) == 0:
                 raise Exception("LLM returned empty function selection - no functions selected for query")
             
+            # Only selections that passed the checks above are replayed from the response cache
+            await self.llm_service.cache_response(response)
+            
             # Fix function names that LLM might have modified
             corrected_functions = self._correct_function_names(function_selection["selected_functions"])
             function_selection["selected_functions"] = corrected_functions
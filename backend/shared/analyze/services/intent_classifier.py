@@ -221,7 +221,8 @@ Be precise with follow_up classifications and strict with safety validation. Cat
                 messages=messages,
                 max_tokens=1000,
                 temperature=0.1,
-                system_prompt=self.system_prompt
+                system_prompt=self.system_prompt,
+                response_cache="intent-classifier"
             )
             duration = time.time() - start_time
             
@@ -235,6 +236,11 @@ Be precise with follow_up classifications and strict with safety validation. Cat
             # Parse classification result
             content = response.get("content", "")
             intent_result = self._parse_classification_response(content, user_message)
+            if intent_result is None:
+                intent_result = self._non_json_fallback(content)
+            else:
+                # Only JSON classifications are replayed from the response cache
+                await self.llm_service.cache_response(response)
             
             
             logger.info(f"✅ Intent classified: {intent_result.intent.value} (confidence: {intent_result.confidence:.2f})")
@@ -244,30 +250,34 @@ Be precise with follow_up classifications and strict with safety validation. Cat
             logger.error(f"❌ Intent classification error: {e}")
             raise
     
-    def _parse_classification_response(self, content: str, original_message: str) -> IntentResult:
-        """Parse LLM classification response"""
+    def _non_json_fallback(self, content: str) -> IntentResult:
+        """Result for a response that is not JSON"""
+        # Ollama (and some local models) occasionally return plain narrative text
+        # instead of JSON.  Treat as a low-confidence pure_chat so the
+        # conversation can continue rather than crashing with an error.
+        logger.warning(
+            "Intent classifier: LLM returned non-JSON response — "
+            "falling back to pure_chat. Content preview: %s",
+            content[:120] if content else "<empty>"
+        )
+        return IntentResult(
+            intent=MessageIntent.PURE_CHAT,
+            confidence=0.4,
+            reasoning="LLM returned non-JSON; defaulting to chat",
+            requires_analysis=False,
+            is_safe=True,
+            safety_reason="Default safe",
+            detected_risks=[]
+        )
+    
+    def _parse_classification_response(self, content: str, original_message: str) -> Optional[IntentResult]:
+        """Parse LLM classification response; None if it is not JSON"""
         try:
             # Parse JSON response (safe_json_loads handles all cleaning internally)
             parsed = safe_json_loads(content, default={})
             
             if not parsed:
-                # Ollama (and some local models) occasionally return plain narrative text
-                # instead of JSON.  Treat as a low-confidence pure_chat so the
-                # conversation can continue rather than crashing with an error.
-                logger.warning(
-                    "Intent classifier: LLM returned non-JSON response — "
-                    "falling back to pure_chat. Content preview: %s",
-                    content[:120] if content else "<empty>"
-                )
-                return IntentResult(
-                    intent=MessageIntent.PURE_CHAT,
-                    confidence=0.4,
-                    reasoning="LLM returned non-JSON; defaulting to chat",
-                    requires_analysis=False,
-                    is_safe=True,
-                    safety_reason="Default safe",
-                    detected_risks=[]
-                )
+                return None
             
             # Extract classification data
             intent_str = parsed.get("intent", "pure_chat")
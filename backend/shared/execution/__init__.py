@@ -2,13 +2,19 @@
 Script execution utilities shared between MCP server and API server
 """
 
-from .script_executor import execute_script, classify_error, check_forbidden_imports, check_defensive_programming
+from .script_executor import execute_script, execute_script_async, classify_error, check_forbidden_imports, check_defensive_programming
 from .mcp_injection import create_mcp_injection_wrapper
+from .warm_pool import WarmInterpreterPool, get_warm_pool, shutdown_warm_pool, is_warm_pool_enabled
 
 __all__ = [
     'execute_script',
+    'execute_script_async',
     'classify_error', 
     'check_forbidden_imports',
     'check_defensive_programming',
-    'create_mcp_injection_wrapper'
+    'create_mcp_injection_wrapper',
+    'WarmInterpreterPool',
+    'get_warm_pool',
+    'shutdown_warm_pool',
+    'is_warm_pool_enabled'
 ]
\ No newline at end of file
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Incremental indicator state for saved analyses
+
+Scripts that use analytics.indicators.streaming keep their indicator state in
+a JSON document. The execution worker stores it next to the saved script, one
+document per parameter set (``<script_name>.<params_hash>.state`` in script
+storage), hands a local copy to the script through the
+ANALYTICS_INDICATOR_STATE environment variable, and writes the updated copy
+back after a successful run, so reruns with the same parameters only process
+new bars.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from ..storage import StorageInterface
+
+logger = logging.getLogger(__name__)
+
+# Must match analytics.indicators.streaming.INDICATOR_STATE_ENV
+INDICATOR_STATE_ENV = "ANALYTICS_INDICATOR_STATE"
+
+STATE_SUFFIX = ".state"
+
+
+def is_indicator_state_enabled() -> bool:
+    """Whether saved analyses persist indicator state between runs (INDICATOR_STATE_ENABLED)"""
+    return os.getenv("INDICATOR_STATE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def parameters_hash(parameters: Optional[Dict[str, Any]]) -> str:
+    """Stable short hash of a run's parameters (None and {} hash the same)"""
+    encoded = json.dumps(parameters or {}, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def indicator_state_name(script_name: str, parameters: Optional[Dict[str, Any]] = None) -> str:
+    """Storage name of the indicator state saved with a script for one parameter set.
+
+    Runs with different parameters (e.g. another symbol or lookback) must not
+    share state, or one run would continue from the other's bars.
+    """
+    return f"{script_name}.{parameters_hash(parameters)}{STATE_SUFFIX}"
+
+
+class IndicatorStateFile:
+    """Local copy of one script's indicator state for the duration of a run"""
+
+    def __init__(self, script_name: str, state_name: str, path: str, original: str):
+        self.script_name = script_name
+        self.state_name = state_name
+        self.path = path
+        self.original = original
+
+    async def persist(self, storage: StorageInterface) -> bool:
+        """Write the state back to storage if the script changed it; returns True if written"""
+        try:
+            with open(self.path, "r") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return False
+
+        if not content or content == self.original:
+            return False
+
+        written = await storage.write_script(self.state_name, content)
+        if written:
+            logger.debug(f"💾 Saved indicator state for {self.script_name} ({len(content)} bytes)")
+        return written
+
+    def cleanup(self) -> None:
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+async def load_indicator_state(storage: StorageInterface, script_name: str,
+                               parameters: Optional[Dict[str, Any]] = None) -> IndicatorStateFile:
+    """Copy the indicator state saved for a script and parameter set (if any) to a local temp file"""
+    state_name = indicator_state_name(script_name, parameters)
+    original = ""
+    try:
+        original = await storage.read_script(state_name)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Missing state only costs a full recompute
+        logger.warning(f"⚠️ Could not read indicator state for {script_name}: {e}")
+
+    fd, path = tempfile.mkstemp(suffix=STATE_SUFFIX, prefix="indicator_state_")
+    with os.fdopen(fd, "w") as f:
+        f.write(original)
+    return IndicatorStateFile(script_name, state_name, path, original)
@@ -8,23 +8,29 @@ MCP function calling capabilities in both production and validation modes.
 
 import os
 import logging
+from typing import Optional
+
+from .indicator_state import INDICATOR_STATE_ENV
 
 logger = logging.getLogger(__name__)
 
-def create_mcp_injection_wrapper(production_mode: bool = False):
+def create_mcp_injection_wrapper(production_mode: bool = False, indicator_state_path: Optional[str] = None):
     """Create MCP function injection wrapper for script execution"""
     
     # Determine which library to use based on mode
     financial_lib = 'financial.functions_real' if production_mode else 'financial.functions_mock'
     mode_desc = 'production' if production_mode else 'validation'
     
+    # Saved analyses get their incremental indicator state file (see analytics.indicators.streaming)
+    indicator_state = f'os.environ[{INDICATOR_STATE_ENV!r}] = {indicator_state_path!r}\n' if indicator_state_path else ''
+    
     return f'''
 import sys
 import os
 import json
 import logging
 from typing import Any
-
+{indicator_state}
 def convert_for_json(obj):
     """
     Convert nested objects with pandas/numpy types to JSON-serializable format
@@ -6,36 +6,40 @@ Used by both MCP validation server and HTTP execution server.
 Handles script execution with proper MCP function injection.
 """
 
+import asyncio
 import json
 import logging
 import os
 import sys
 import subprocess
 import tempfile
+import threading
 import uuid
     
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 
 from .mcp_injection import create_mcp_injection_wrapper
+from .warm_pool import WarmPoolError, get_warm_pool, is_warm_pool_enabled
 
 logger = logging.getLogger("shared-script-executor")
 
 
-def create_enhanced_script(script_content: str, mock_mode: bool = True) -> str:
+def create_enhanced_script(script_content: str, mock_mode: bool = True, indicator_state_path: Optional[str] = None) -> str:
     """
     Create enhanced script with MCP injection wrapper for verification purposes
     
     Args:
         script_content: Raw script content to enhance
         mock_mode: Whether to use mock mode (True) or production mode (False)
+        indicator_state_path: Optional local file holding the script's incremental indicator state
         
     Returns:
         Enhanced script with MCP injection wrapper
     """
     try:
         # Create MCP injection wrapper
-        mcp_wrapper = create_mcp_injection_wrapper(production_mode=not mock_mode)
+        mcp_wrapper = create_mcp_injection_wrapper(production_mode=not mock_mode, indicator_state_path=indicator_state_path)
         
         # Create enhanced script
         enhanced_script = mcp_wrapper + script_content
@@ -48,7 +52,14 @@ def create_enhanced_script(script_content: str, mock_mode: bool = True) -> str:
         # Return original script if enhancement fails
         return script_content
 
-def execute_script(script_content: str, mock_mode: bool = True, timeout: int = 30, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def execute_script(
+    script_content: str,
+    mock_mode: bool = True,
+    timeout: int = 30,
+    parameters: Optional[Dict[str, Any]] = None,
+    use_warm_pool: Optional[bool] = None,
+    indicator_state_path: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Execute Python script with MCP function injection
     
@@ -57,51 +68,119 @@ def execute_script(script_content: str, mock_mode: bool = True, timeout: int = 3
         mock_mode: If True, runs in validation mode; if False, production mode
         timeout: Execution timeout in seconds
         parameters: Optional dictionary of parameters to inject into script
+        use_warm_pool: Run in the warm interpreter pool instead of a cold subprocess.
+            If None, reads SCRIPT_WARM_POOL_ENABLED env var
+        indicator_state_path: Optional local file the script loads and saves its
+            incremental indicator state from (see shared.execution.indicator_state)
         
     Returns:
         Dict with execution results
     """
 
-    logger.info(f"🚀 Executing script (mock={mock_mode}, timeout={timeout}s)")
+    if use_warm_pool is None:
+        use_warm_pool = is_warm_pool_enabled()
+
+    logger.info(f"🚀 Executing script (mock={mock_mode}, timeout={timeout}s, warm_pool={use_warm_pool})")
     
     try:
-        # Create enhanced script with MCP injection wrapper
-        enhanced_script = create_enhanced_script(script_content, mock_mode)
-        
-        # Write temporary script for subprocess execution
-        script_path = _write_temp_script_local(enhanced_script)
-        
-        # Execute script with parameters as command line arguments
-        cmd = [sys.executable, script_path]
-        
-        # Add parameters as individual arguments
-        if parameters:
-            for key, value in parameters.items():
-                if value is not None:
-                    cmd.extend([f'--{key}', str(value)])
+        script_path, script_args, cwd = _prepare_script(script_content, mock_mode, parameters, indicator_state_path)
         
         start_time = datetime.now()
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=os.path.dirname(script_path) if os.path.isabs(script_path) else None
-        )
+        result = None
+        if use_warm_pool:
+            try:
+                result = get_warm_pool().run(script_path, [script_path] + script_args, timeout=timeout, cwd=cwd)
+            except WarmPoolError as e:
+                logger.warning(f"⚠️ Warm pool unavailable, falling back to subprocess: {e}")
+        
+        if result is None:
+            result = subprocess.run(
+                [sys.executable, script_path] + script_args,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=cwd
+            )
 
         execution_time = (datetime.now() - start_time).total_seconds()
         
         return _process_execution_result(result, execution_time, mock_mode)
                 
     except subprocess.TimeoutExpired:
-        logger.error(f"❌ Script execution timed out after {timeout}s")
+        return _timeout_result(timeout, mock_mode)
+    except Exception as e:
+        logger.error(f"❌ Execution error: {e}")
         return {
             "success": False,
-            "error": f"Script execution timed out after {timeout} seconds",
-            "error_type": "TimeoutError",
+            "error": str(e),
+            "error_type": "ExecutionError",
             "mock_mode": mock_mode
         }
+
+
+async def execute_script_async(
+    script_content: str,
+    mock_mode: bool = True,
+    timeout: int = 30,
+    parameters: Optional[Dict[str, Any]] = None,
+    on_output: Optional[Callable[[str, str], Awaitable[None]]] = None,
+    use_warm_pool: Optional[bool] = None,
+    indicator_state_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute Python script without blocking the event loop
+    
+    Same contract as execute_script. The script is killed when the timeout expires
+    or when the awaiting task is cancelled (CancelledError is re-raised).
+    
+    Args:
+        script_content: Complete Python script content
+        mock_mode: If True, runs in validation mode; if False, production mode
+        timeout: Execution timeout in seconds
+        parameters: Optional dictionary of parameters to inject into script
+        on_output: Optional async callback called with ("stdout" | "stderr", line) for each
+            output line. Lines arrive as they are produced for subprocess execution and
+            once the job finishes for warm pool execution
+        use_warm_pool: Run in the warm interpreter pool instead of a cold subprocess.
+            If None, reads SCRIPT_WARM_POOL_ENABLED env var
+        indicator_state_path: Optional local file the script loads and saves its
+            incremental indicator state from (see shared.execution.indicator_state)
+        
+    Returns:
+        Dict with execution results
+    """
+    
+    if use_warm_pool is None:
+        use_warm_pool = is_warm_pool_enabled()
+    
+    logger.info(f"🚀 Executing script async (mock={mock_mode}, timeout={timeout}s, warm_pool={use_warm_pool})")
+    
+    try:
+        script_path, script_args, cwd = _prepare_script(script_content, mock_mode, parameters, indicator_state_path)
+        
+        start_time = datetime.now()
+        
+        result = None
+        if use_warm_pool:
+            result = await _run_in_warm_pool_async(script_path, script_args, timeout, cwd)
+            if result is not None and on_output:
+                for stream_name, text in (("stdout", result.stdout), ("stderr", result.stderr)):
+                    for line in text.splitlines():
+                        await on_output(stream_name, line)
+        
+        if result is None:
+            result = await _run_subprocess_async(script_path, script_args, timeout, cwd, on_output)
+        
+        execution_time = (datetime.now() - start_time).total_seconds()
+        
+        return _process_execution_result(result, execution_time, mock_mode)
+    
+    except subprocess.TimeoutExpired:
+        return _timeout_result(timeout, mock_mode)
+    except asyncio.CancelledError:
+        logger.warning("🛑 Script execution cancelled")
+        raise
     except Exception as e:
         logger.error(f"❌ Execution error: {e}")
         return {
@@ -112,6 +191,140 @@ def execute_script(script_content: str, mock_mode: bool = True, timeout: int = 3
         }
 
 
+async def _run_in_warm_pool_async(
+    script_path: str,
+    script_args: List[str],
+    timeout: int,
+    cwd: Optional[str]
+) -> Optional[subprocess.CompletedProcess]:
+    """Run a job in the warm pool from a thread; returns None if the pool is unavailable"""
+    cancel_event = threading.Event()
+    
+    def _run() -> subprocess.CompletedProcess:
+        return get_warm_pool().run(
+            script_path, [script_path] + script_args, timeout=timeout, cwd=cwd, cancel_event=cancel_event
+        )
+    
+    try:
+        return await asyncio.to_thread(_run)
+    except asyncio.CancelledError:
+        # The pool thread cannot be interrupted, ask the worker to kill the child instead
+        cancel_event.set()
+        raise
+    except WarmPoolError as e:
+        logger.warning(f"⚠️ Warm pool unavailable, falling back to subprocess: {e}")
+        return None
+
+
+async def _run_subprocess_async(
+    script_path: str,
+    script_args: List[str],
+    timeout: int,
+    cwd: Optional[str],
+    on_output: Optional[Callable[[str, str], Awaitable[None]]]
+) -> subprocess.CompletedProcess:
+    """Run the script as an asyncio subprocess, streaming output lines to on_output"""
+    cmd = [sys.executable, script_path] + script_args
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    
+    stdout_chunks: List[bytes] = []
+    stderr_chunks: List[bytes] = []
+    readers = [
+        asyncio.create_task(_read_stream(process.stdout, "stdout", stdout_chunks, on_output)),
+        asyncio.create_task(_read_stream(process.stderr, "stderr", stderr_chunks, on_output)),
+    ]
+    
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+        await asyncio.gather(*readers)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        raise
+    
+    return subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        b"".join(stdout_chunks).decode("utf-8", errors="replace"),
+        b"".join(stderr_chunks).decode("utf-8", errors="replace")
+    )
+
+
+async def _read_stream(
+    stream: asyncio.StreamReader,
+    stream_name: str,
+    chunks: List[bytes],
+    on_output: Optional[Callable[[str, str], Awaitable[None]]]
+) -> None:
+    """Collect a subprocess stream, passing complete lines to on_output as they arrive"""
+    # Read in chunks rather than readline() - the JSON result is one arbitrarily long line
+    pending = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if on_output:
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                await on_output(stream_name, line.decode("utf-8", errors="replace"))
+    if on_output and pending:
+        await on_output(stream_name, pending.decode("utf-8", errors="replace"))
+
+
+def _prepare_script(
+    script_content: str,
+    mock_mode: bool,
+    parameters: Optional[Dict[str, Any]],
+    indicator_state_path: Optional[str] = None
+) -> Tuple[str, List[str], Optional[str]]:
+    """Write the enhanced script to a temp file; returns (script_path, script_args, cwd)"""
+    # Create enhanced script with MCP injection wrapper
+    enhanced_script = create_enhanced_script(script_content, mock_mode, indicator_state_path)
+    
+    # Write temporary script for subprocess execution
+    script_path = _write_temp_script_local(enhanced_script)
+    
+    # Parameters are passed as command line arguments
+    script_args = _build_script_args(parameters)
+    cwd = os.path.dirname(script_path) if os.path.isabs(script_path) else None
+    
+    return script_path, script_args, cwd
+
+
+def _timeout_result(timeout: int, mock_mode: bool) -> Dict[str, Any]:
+    logger.error(f"❌ Script execution timed out after {timeout}s")
+    return {
+        "success": False,
+        "error": f"Script execution timed out after {timeout} seconds",
+        "error_type": "TimeoutError",
+        "mock_mode": mock_mode
+    }
+
+
+def _build_script_args(parameters: Optional[Dict[str, Any]]) -> List[str]:
+    """Convert parameters to individual --key value command line arguments"""
+    args = []
+    if parameters:
+        for key, value in parameters.items():
+            if value is not None:
+                args.extend([f'--{key}', str(value)])
+    return args
+
+
 def _process_execution_result(result, execution_time: float, mock_mode: bool) -> Dict[str, Any]:
     """Process subprocess execution result"""
     if result.returncode == 0:
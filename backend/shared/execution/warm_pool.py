@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Warm Interpreter Pool
+
+Pre-started worker interpreters that already have pandas, numpy, analytics and
+the financial function libraries imported. Each job is run in a child forked
+from a warm worker, so scripts skip the import cost of a cold interpreter while
+staying isolated from each other.
+
+This module only uses the standard library so a worker can be launched by
+running this file directly, without importing the ``shared`` package.
+"""
+
+import atexit
+import importlib
+import itertools
+import logging
+import os
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import queue as queue_module
+from multiprocessing.connection import Connection
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger("shared-warm-pool")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MCP_SERVER_DIR = os.path.join(BACKEND_DIR, "mcp-server")
+
+DEFAULT_PRELOAD_MODULES = [
+    "numpy",
+    "pandas",
+    "scipy",
+    "empyrical",
+    "talib",
+    "analytics",
+    "financial.functions_mock",
+    "financial.functions_real",
+]
+
+# Seconds allowed on top of the job timeout before the pool gives up on a worker
+WORKER_RESPONSE_GRACE = 5
+
+
+class WarmPoolError(Exception):
+    """Raised when the pool cannot run a job (worker crashed, pool closed)"""
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside the warm interpreter)
+# ---------------------------------------------------------------------------
+
+def _preload(modules: List[str]) -> List[str]:
+    """Import modules into the warm interpreter, skipping any that fail"""
+    for path in (MCP_SERVER_DIR, BACKEND_DIR):
+        if os.path.exists(path) and path not in sys.path:
+            sys.path.insert(0, path)
+
+    loaded = []
+    for module_name in modules:
+        try:
+            importlib.import_module(module_name)
+            loaded.append(module_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Warm worker could not preload {module_name}: {e}")
+    return loaded
+
+
+def _run_forked_job(job: Dict[str, Any], conn: Connection) -> Dict[str, Any]:
+    """
+    Run one script in a child forked from the warm interpreter
+
+    Args:
+        job: Dict with id, script_path, argv, timeout and cwd
+        conn: Connection to the pool, checked for cancel requests while the job runs
+
+    Returns:
+        Dict with id, returncode, stdout, stderr, timed_out and cancelled
+    """
+    deadline = time.monotonic() + job["timeout"]
+    stdout_file = tempfile.TemporaryFile()
+    stderr_file = tempfile.TemporaryFile()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(stdout_file.fileno(), 1)
+            os.dup2(stderr_file.fileno(), 2)
+
+            # Behave like a freshly started interpreter running the script
+            logging.root.handlers = []
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if job.get("cwd"):
+                os.chdir(job["cwd"])
+            sys.argv = list(job["argv"])
+            sys.path.insert(0, os.path.dirname(job["script_path"]))
+            # Exit handlers inherited from the warm worker are not the script's
+            atexit._clear()
+
+            try:
+                runpy.run_path(job["script_path"], run_name="__main__")
+                exit_code = 0
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except BaseException as e:
+                # Drop the runpy/pool frames so the traceback matches a cold run
+                tb = e.__traceback__
+                while tb is not None and tb.tb_frame.f_code.co_filename != job["script_path"]:
+                    tb = tb.tb_next
+                traceback.print_exception(type(e), e, tb or e.__traceback__)
+                exit_code = 1
+            # os._exit skips interpreter shutdown; run the script's atexit
+            # handlers (e.g. indicator state saves) as a cold run would
+            atexit._run_exitfuncs()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(exit_code)
+
+    timed_out = False
+    cancelled = False
+    while True:
+        waited_pid, status = os.waitpid(pid, os.WNOHANG)
+        if waited_pid:
+            break
+        if conn.poll(0):
+            message = conn.recv()
+            # Only a cancel for this job stops it
+            cancelled = (isinstance(message, dict) and message.get("type") == "cancel"
+                         and message.get("id") == job["id"])
+        if cancelled or time.monotonic() >= deadline:
+            timed_out = not cancelled
+            os.kill(pid, signal.SIGKILL)
+            _, status = os.waitpid(pid, 0)
+            break
+        time.sleep(0.01)
+
+    def _read(f) -> str:
+        f.seek(0)
+        data = f.read().decode("utf-8", errors="replace")
+        f.close()
+        return data
+
+    return {
+        "id": job["id"],
+        "returncode": os.waitstatus_to_exitcode(status),
+        "stdout": _read(stdout_file),
+        "stderr": _read(stderr_file),
+        "timed_out": timed_out,
+        "cancelled": cancelled,
+    }
+
+
+def _worker_main(fd: int, preload_modules: List[str]) -> None:
+    """Warm worker loop: preload modules, then run jobs received over the connection"""
+    conn = Connection(fd)
+    loaded = _preload(preload_modules)
+    conn.send({"type": "ready", "pid": os.getpid(), "preloaded": loaded})
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        if not isinstance(job, dict) or job.get("type") != "job":
+            # e.g. a cancel that arrived after its job had already finished
+            continue
+        try:
+            conn.send(_run_forked_job(job, conn))
+        except Exception as e:
+            conn.send({
+                "id": job.get("id"),
+                "returncode": 1,
+                "stdout": "",
+                "stderr": f"Warm worker failed to run job: {e}\n{traceback.format_exc()}",
+                "timed_out": False,
+                "cancelled": False,
+            })
+
+
+# ---------------------------------------------------------------------------
+# Pool side (runs in the caller process)
+# ---------------------------------------------------------------------------
+
+class _WarmWorker:
+    """Handle to one warm interpreter process"""
+
+    def __init__(self, preload_modules: List[str]):
+        parent_sock, child_sock = socket.socketpair()
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            [BACKEND_DIR, MCP_SERVER_DIR] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        try:
+            # stdout is discarded so a worker never writes into an MCP stdio stream
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--fd", str(child_sock.fileno()),
+                 "--preload", ",".join(preload_modules)],
+                pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                cwd=BACKEND_DIR,
+                env=env,
+            )
+        finally:
+            child_sock.close()
+        self.conn = Connection(parent_sock.detach())
+        self.jobs_completed = 0
+        self.preloaded: List[str] = []
+
+    def wait_ready(self, timeout: float) -> None:
+        if not self.conn.poll(timeout):
+            raise WarmPoolError(f"Warm worker {self.process.pid} did not become ready in {timeout}s")
+        message = self.conn.recv()
+        self.preloaded = message.get("preloaded", [])
+
+    def run(self, job: Dict[str, Any], cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        self.conn.send(job)
+        deadline = time.monotonic() + job["timeout"] + WORKER_RESPONSE_GRACE
+        cancel_sent = False
+        while True:
+            while not self.conn.poll(0.05):
+                if cancel_event is not None and cancel_event.is_set() and not cancel_sent:
+                    self.conn.send({"type": "cancel", "id": job["id"]})
+                    cancel_sent = True
+                if time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(job["argv"], job["timeout"])
+            result = self.conn.recv()
+            if result.get("id") == job["id"]:
+                break
+            logger.warning(f"⚠️ Warm worker {self.process.pid} sent a response for job {result.get('id')}, expected {job['id']}")
+        self.jobs_completed += 1
+        return result
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self.conn.close()
+
+
+class WarmInterpreterPool:
+    """
+    Pool of warm interpreters for script execution
+
+    Jobs are dispatched to idle workers; every job runs in a fresh child forked
+    from the worker, and workers are replaced after ``max_jobs_per_worker`` jobs
+    or when they crash or time out.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 50,
+        preload_modules: Optional[List[str]] = None,
+        start_timeout: float = 120.0
+    ):
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.preload_modules = list(preload_modules or DEFAULT_PRELOAD_MODULES)
+        self.start_timeout = start_timeout
+
+        self._idle: "queue_module.Queue[_WarmWorker]" = queue_module.Queue()
+        self._lock = threading.Lock()
+        self._workers: List[_WarmWorker] = []
+        self._started = False
+        self._closed = False
+        self._job_ids = itertools.count(1)
+        self._stats = {
+            "jobs_completed": 0,
+            "jobs_timed_out": 0,
+            "jobs_cancelled": 0,
+            "workers_started": 0,
+            "workers_recycled": 0,
+            "workers_crashed": 0,
+        }
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Fork-from-warm-parent needs os.fork (not available on Windows)"""
+        return hasattr(os, "fork")
+
+    def start(self) -> None:
+        """Start all workers and wait until they have preloaded their modules"""
+        with self._lock:
+            if self._started:
+                return
+            if not self.is_supported():
+                raise WarmPoolError("Warm interpreter pool requires os.fork")
+
+            logger.info(f"🔥 Starting warm interpreter pool (size={self.size}, max_jobs={self.max_jobs_per_worker})")
+            start_time = time.monotonic()
+            workers = [_WarmWorker(self.preload_modules) for _ in range(self.size)]
+            for worker in workers:
+                worker.wait_ready(self.start_timeout)
+                self._register(worker)
+
+            self._started = True
+            logger.info(f"✅ Warm pool ready in {time.monotonic() - start_time:.2f}s (preloaded: {workers[0].preloaded})")
+
+    def _register(self, worker: _WarmWorker) -> None:
+        self._workers.append(worker)
+        self._stats["workers_started"] += 1
+        self._idle.put(worker)
+
+    def _replace_in_background(self, worker: _WarmWorker, reason: str) -> None:
+        """Replace a worker without holding up the job that triggered it"""
+        threading.Thread(target=self._replace, args=(worker, reason), daemon=True).start()
+
+    def _replace(self, worker: _WarmWorker, reason: str) -> None:
+        """Stop a worker and put a fresh one in its place"""
+        logger.info(f"♻️ Replacing warm worker {worker.process.pid} ({reason})")
+        worker.stop()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if self._closed:
+                return
+        try:
+            new_worker = _WarmWorker(self.preload_modules)
+            new_worker.wait_ready(self.start_timeout)
+        except Exception as e:
+            logger.error(f"❌ Failed to start replacement warm worker: {e}")
+            return
+        with self._lock:
+            if self._closed:
+                new_worker.stop()
+                return
+            self._register(new_worker)
+
+    def run(
+        self,
+        script_path: str,
+        argv: List[str],
+        timeout: float,
+        cwd: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a script file in a forked child of a warm worker
+
+        Args:
+            script_path: Path of the script to run
+            argv: Value for sys.argv inside the script (argv[0] is the script path)
+            timeout: Per-job timeout in seconds
+            cwd: Working directory for the script
+            cancel_event: When set, the running child is killed and the call returns early
+
+        Returns:
+            subprocess.CompletedProcess with returncode, stdout and stderr
+
+        Raises:
+            subprocess.TimeoutExpired: If the job exceeded its timeout
+            WarmPoolError: If the pool is closed or the worker crashed
+        """
+        if self._closed:
+            raise WarmPoolError("Warm interpreter pool is closed")
+        if not self._started:
+            self.start()
+
+        job = {"type": "job", "id": next(self._job_ids), "script_path": script_path,
+               "argv": argv, "timeout": timeout, "cwd": cwd}
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue_module.Empty:
+            raise WarmPoolError(f"No idle warm worker available within {timeout}s")
+
+        try:
+            result = worker.run(job, cancel_event)
+        except subprocess.TimeoutExpired:
+            self._stats["jobs_timed_out"] += 1
+            self._replace_in_background(worker, "unresponsive")
+            raise
+        except (EOFError, OSError) as e:
+            self._stats["workers_crashed"] += 1
+            self._replace_in_background(worker, f"crashed: {e}")
+            raise WarmPoolError(f"Warm worker crashed: {e}")
+
+        self._stats["jobs_completed"] += 1
+        if worker.jobs_completed >= self.max_jobs_per_worker:
+            self._stats["workers_recycled"] += 1
+            self._replace_in_background(worker, f"recycled after {worker.jobs_completed} jobs")
+        else:
+            self._idle.put(worker)
+
+        if result["timed_out"]:
+            self._stats["jobs_timed_out"] += 1
+            raise subprocess.TimeoutExpired(argv, timeout)
+        if result.get("cancelled"):
+            self._stats["jobs_cancelled"] += 1
+
+        return subprocess.CompletedProcess(argv, result["returncode"], result["stdout"], result["stderr"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            **self._stats,
+            "size": self.size,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "live_workers": len(self._workers),
+            "idle_workers": self._idle.qsize(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop all workers"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+        logger.info("🛑 Warm interpreter pool shut down")
+
+
+# Global pool instance (lazy-loaded)
+_pool_instance: Optional[WarmInterpreterPool] = None
+_pool_lock = threading.Lock()
+
+
+def is_warm_pool_enabled() -> bool:
+    """Whether script execution should use the warm pool (SCRIPT_WARM_POOL_ENABLED)"""
+    enabled = os.getenv("SCRIPT_WARM_POOL_ENABLED", "false").lower() in ("1", "true", "yes")
+    return enabled and WarmInterpreterPool.is_supported()
+
+
+def create_warm_pool() -> WarmInterpreterPool:
+    """Create a pool configured from SCRIPT_WARM_POOL_* environment variables"""
+    preload_env = os.getenv("SCRIPT_WARM_POOL_PRELOAD")
+    preload_modules = [m.strip() for m in preload_env.split(",") if m.strip()] if preload_env else None
+    return WarmInterpreterPool(
+        size=int(os.getenv("SCRIPT_WARM_POOL_SIZE", "2")),
+        max_jobs_per_worker=int(os.getenv("SCRIPT_WARM_POOL_MAX_JOBS", "50")),
+        preload_modules=preload_modules,
+    )
+
+
+def get_warm_pool() -> WarmInterpreterPool:
+    """Get global warm pool instance (singleton pattern), starting it on first use"""
+    global _pool_instance
+
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = create_warm_pool()
+    _pool_instance.start()
+    return _pool_instance
+
+
+def shutdown_warm_pool() -> None:
+    """Shut down the global warm pool if it was started"""
+    global _pool_instance
+
+    with _pool_lock:
+        pool, _pool_instance = _pool_instance, None
+    if pool is not None:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm interpreter pool worker")
+    parser.add_argument("--fd", type=int, required=True)
+    parser.add_argument("--preload", default="")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - warm-worker - %(levelname)s - %(message)s')
+    _worker_main(args.fd, [m for m in args.preload.split(",") if m])
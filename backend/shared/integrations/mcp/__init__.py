@@ -2,5 +2,6 @@
 
 from .mcp_integration import MCPIntegration
 from .mcp_client import mcp_client, initialize_mcp_client
+from .session_pool import MCPSessionPool
 
-__all__ = ["MCPIntegration", "mcp_client", "initialize_mcp_client"]
\ No newline at end of file
+__all__ = ["MCPIntegration", "mcp_client", "initialize_mcp_client", "MCPSessionPool"]
\ No newline at end of file
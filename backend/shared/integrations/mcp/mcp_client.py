@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """
 MCP Client based on official Python SDK example
+
+Tool calls and discovery go through persistent per-server session pools
+(see session_pool.py) instead of starting a server process per call.
 """
 
 import asyncio
 import json
 import logging
 from typing import Dict, List, Any, Optional
-from contextlib import AsyncExitStack
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from .session_pool import MCPSessionPool
 
 logger = logging.getLogger(__name__)
 
@@ -18,51 +19,50 @@ class MCPClient:
     def __init__(self):
         self.server_configs: Dict[str, Dict[str, Any]] = {}
         self.available_tools: Dict[str, Dict[str, Any]] = {}
+        self.session_pools: Dict[str, MCPSessionPool] = {}
+    
+    def _get_session_pool(self, server_name: str, server_config: Dict[str, Any]) -> MCPSessionPool:
+        """Get the persistent session pool for a server, creating it on first use"""
+        pool = self.session_pools.get(server_name)
+        if pool is None:
+            pool = MCPSessionPool(server_name, server_config)
+            self.session_pools[server_name] = pool
+        return pool
+    
+    async def configure_servers(self, server_configs: Dict[str, Dict[str, Any]]):
+        """Set server configurations, closing pools for servers that were removed or changed"""
+        for server_name, pool in list(self.session_pools.items()):
+            if server_configs.get(server_name) != pool.server_config:
+                await pool.close()
+                del self.session_pools[server_name]
+        self.server_configs = server_configs
         
     async def discover_tools_from_server(self, server_name: str, server_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Discover tools from a single MCP server using official pattern"""
+        """Discover tools from a single MCP server using a pooled session"""
         tools = {}
         
         try:
-            # Create server parameters
-            server_params = StdioServerParameters(
-                command=server_config["command"],
-                args=server_config.get("args", []),
-                env=server_config.get("env", {})
-            )
+            pool = self._get_session_pool(server_name, server_config)
             
-            # Use the official pattern with AsyncExitStack
-            async with AsyncExitStack() as exit_stack:
-                # Start the server process and create streams
-                streams = await exit_stack.enter_async_context(stdio_client(server_params))
-                read_stream, write_stream = streams
-                
-                # Create and initialize the session
-                session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-                
-                # Initialize the session
-                init_result = await session.initialize()
-                logger.info(f"Connected to MCP server {server_name}: {init_result}")
+            # List tools
+            logger.info(f"Attempting to list tools from {server_name}")
+            tools_result = await pool.list_tools()
+            logger.info(f"Successfully got tools result from {server_name}: {type(tools_result)}")
+            
+            for tool in tools_result.tools:
+                # Create unique tool name by prefixing with server name
+                original_name = tool.name
+                prefixed_name = f"{server_name}__{original_name}"
                 
-                # List tools
-                logger.info(f"Attempting to list tools from {server_name}")
-                tools_result = await session.list_tools()
-                logger.info(f"Successfully got tools result from {server_name}: {type(tools_result)}")
+                tools[prefixed_name] = {
+                    "name": prefixed_name,
+                    "original_name": original_name,  # Store original for routing
+                    "description": tool.description,
+                    "inputSchema": tool.inputSchema,
+                    "server": server_name
+                }
                 
-                for tool in tools_result.tools:
-                    # Create unique tool name by prefixing with server name
-                    original_name = tool.name
-                    prefixed_name = f"{server_name}__{original_name}"
-                    
-                    tools[prefixed_name] = {
-                        "name": prefixed_name,
-                        "original_name": original_name,  # Store original for routing
-                        "description": tool.description,
-                        "inputSchema": tool.inputSchema,
-                        "server": server_name
-                    }
-                    
-                logger.info(f"Discovered {len(tools_result.tools)} tools from {server_name}")
+            logger.info(f"Discovered {len(tools_result.tools)} tools from {server_name}")
                 
         except Exception as e:
             logger.error(f"Failed to discover tools from {server_name}: {e}")
@@ -73,12 +73,15 @@ class MCPClient:
         return tools
     
     async def discover_all_tools(self) -> Dict[str, Any]:
-        """Discover available tools from all configured MCP servers"""
+        """Discover available tools from all configured MCP servers concurrently"""
         all_tools = {}
         
-        for server_name, server_config in self.server_configs.items():
-            logger.info(f"Discovering tools from {server_name}")
-            server_tools = await self.discover_tools_from_server(server_name, server_config)
+        logger.info(f"Discovering tools from {list(self.server_configs.keys())}")
+        results = await asyncio.gather(*(
+            self.discover_tools_from_server(server_name, server_config)
+            for server_name, server_config in self.server_configs.items()
+        ))
+        for server_tools in results:
             all_tools.update(server_tools)
         
         self.available_tools = all_tools
@@ -86,7 +89,7 @@ class MCPClient:
         return all_tools
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Call a specific MCP tool using official pattern"""
+        """Call a specific MCP tool over a persistent pooled session"""
         # Find which server has this tool
         tool_info = self.available_tools.get(tool_name)
         if not tool_info:
@@ -101,29 +104,18 @@ class MCPClient:
             raise ValueError(f"No config found for server {server_name}")
         
         try:
-            # Create server parameters
-            server_params = StdioServerParameters(
-                command=server_config["command"],
-                args=server_config.get("args", []),
-                env=server_config.get("env", {})
-            )
-            
-            # Use the official pattern
-            async with AsyncExitStack() as exit_stack:
-                streams = await exit_stack.enter_async_context(stdio_client(server_params))
-                read_stream, write_stream = streams
-                
-                session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-                await session.initialize()
-                
-                # Call with original name that the server recognizes
-                result = await session.call_tool(original_name, arguments)
-                return result
+            pool = self._get_session_pool(server_name, server_config)
+            # Call with original name that the server recognizes
+            return await pool.call_tool(original_name, arguments)
                 
         except Exception as e:
             logger.error(f"Failed to call tool {tool_name} (original: {original_name}): {e}")
             raise
     
+    def get_session_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-server call latency and session setup metrics"""
+        return {server_name: pool.get_metrics() for server_name, pool in self.session_pools.items()}
+    
     def validate_function_exists(self, function_name: str) -> bool:
         """Validate that a function exists in available MCP tools"""
         return function_name in self.available_tools
@@ -176,10 +168,12 @@ class MCPClient:
         }
     
     async def close_all_sessions(self):
-        """Clear cached tools and configurations"""
+        """Close persistent sessions and clear cached tools and configurations"""
+        await asyncio.gather(*(pool.close() for pool in self.session_pools.values()), return_exceptions=True)
+        self.session_pools.clear()
         self.available_tools.clear()
         self.server_configs.clear()
-        logger.info("Cleared MCP client cache")
+        logger.info("Closed MCP sessions and cleared MCP client cache")
 
 # Singleton instance
 mcp_client = MCPClient()
@@ -189,7 +183,7 @@ async def initialize_mcp_client(config: Dict[str, Any]) -> MCPClient:
     client = mcp_client
     
     # Store server configurations
-    client.server_configs = config.get("mcpServers", {})
+    await client.configure_servers(config.get("mcpServers", {}))
     logger.info(f"Configured {len(client.server_configs)} MCP servers")
     
     # Discover all available tools
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Persistent MCP stdio session pool
+
+Keeps long-lived ClientSessions per MCP server instead of starting a new server
+process for every call. Each server gets a bounded pool of sessions (one server
+process each); sessions are health-checked with pings and respawned when the
+server process dies.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PooledSession:
+    """
+    One MCP server process with an initialized ClientSession
+
+    The stdio/session context managers are entered and exited by a dedicated
+    owner task, because anyio cancel scopes must be closed by the task that
+    opened them. Callers from any task can use ``session`` while it is alive.
+    """
+
+    def __init__(self, server_name: str, server_params: StdioServerParameters):
+        self.server_name = server_name
+        self.server_params = server_params
+        self.session: Optional[ClientSession] = None
+        self.last_used = time.monotonic()
+        self.calls = 0
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        """Start the server process and initialize the session"""
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.server_name}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise TimeoutError(f"MCP server {self.server_name} did not initialize within {timeout}s")
+        except BaseException:
+            # Cancelled while starting: stop the server process without blocking the cancel
+            asyncio.create_task(self.close())
+            raise
+        if self.session is None:
+            raise ConnectionError(f"Failed to start MCP server {self.server_name}: {self._error}")
+
+    async def _run(self) -> None:
+        try:
+            async with AsyncExitStack() as exit_stack:
+                read_stream, write_stream = await exit_stack.enter_async_context(stdio_client(self.server_params))
+                session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"⚠️ MCP session for {self.server_name} ended: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        """Check the server still answers"""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ MCP session health check failed for {self.server_name}: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Stop the owner task, which terminates the server process"""
+        self._stop.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+        except Exception:
+            pass
+
+
+class MCPSessionPool:
+    """
+    Bounded pool of persistent sessions for one MCP server
+
+    Each session serves one call at a time; the pool grows on demand up to
+    ``max_sessions`` so that many calls can be in flight concurrently.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        max_sessions: Optional[int] = None,
+        setup_timeout: Optional[float] = None,
+        call_timeout: Optional[float] = None,
+        health_check_interval: Optional[float] = None
+    ):
+        self.server_name = server_name
+        self.server_config = server_config
+        self.max_sessions = max_sessions or int(os.getenv("MCP_POOL_MAX_SESSIONS", "2"))
+        self.setup_timeout = setup_timeout or float(os.getenv("MCP_SESSION_SETUP_TIMEOUT", "60"))
+        self.call_timeout = call_timeout or float(os.getenv("MCP_CALL_TIMEOUT", "120"))
+        self.health_check_interval = health_check_interval or float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30"))
+
+        self.server_params = StdioServerParameters(
+            command=server_config["command"],
+            args=server_config.get("args", []),
+            env=server_config.get("env", {})
+        )
+
+        # Holds idle sessions, or None as a wake-up marker when a slot frees up
+        self._idle: "asyncio.Queue[Optional[PooledSession]]" = asyncio.Queue()
+        self._size = 0
+        self._in_flight = 0
+        self._closed = False
+        self._metrics = {
+            "sessions_started": 0,
+            "session_setup_failures": 0,
+            "session_setup_seconds_total": 0.0,
+            "session_setup_seconds_max": 0.0,
+            "respawns": 0,
+            "health_check_failures": 0,
+            "calls": 0,
+            "call_errors": 0,
+            "call_timeouts": 0,
+            "call_seconds_total": 0.0,
+            "call_seconds_max": 0.0,
+        }
+
+    async def _spawn(self) -> PooledSession:
+        start_time = time.monotonic()
+        pooled = PooledSession(self.server_name, self.server_params)
+        try:
+            await pooled.start(self.setup_timeout)
+        except Exception:
+            self._metrics["session_setup_failures"] += 1
+            raise
+        elapsed = time.monotonic() - start_time
+        self._metrics["sessions_started"] += 1
+        self._metrics["session_setup_seconds_total"] += elapsed
+        self._metrics["session_setup_seconds_max"] = max(self._metrics["session_setup_seconds_max"], elapsed)
+        logger.info(f"🔌 Started MCP session for {self.server_name} in {elapsed:.2f}s")
+        return pooled
+
+    def _free_slot(self) -> None:
+        """Give up a pool slot and wake one waiter so it can spawn a replacement"""
+        self._size -= 1
+        self._idle.put_nowait(None)
+
+    async def _discard(self, pooled: PooledSession) -> None:
+        self._free_slot()
+        await pooled.close()
+
+    def _drop(self, pooled: PooledSession) -> None:
+        """Give up a session's slot now and close it in the background"""
+        self._free_slot()
+        asyncio.create_task(pooled.close())
+
+    async def _check_health(self, pooled: PooledSession) -> bool:
+        """Ping a session held by the caller; its slot is freed if the ping is cancelled"""
+        try:
+            return await pooled.ping(timeout=5)
+        except BaseException:
+            self._drop(pooled)
+            raise
+
+    async def acquire(self) -> PooledSession:
+        """Get an idle healthy session, starting a new one if the pool is not full"""
+        if self._closed:
+            raise RuntimeError(f"MCP session pool for {self.server_name} is closed")
+
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._size < self.max_sessions:
+                    self._size += 1
+                    try:
+                        return await self._spawn()
+                    except BaseException:
+                        # Includes cancellation, so the slot is never lost
+                        self._free_slot()
+                        raise
+                pooled = await self._idle.get()
+
+            if pooled is None:
+                continue
+
+            if not pooled.alive:
+                self._metrics["respawns"] += 1
+                await self._discard(pooled)
+                continue
+
+            if time.monotonic() - pooled.last_used > self.health_check_interval:
+                if not await self._check_health(pooled):
+                    self._metrics["health_check_failures"] += 1
+                    self._metrics["respawns"] += 1
+                    await self._discard(pooled)
+                    continue
+            return pooled
+
+    def release(self, pooled: PooledSession) -> None:
+        """Return a session to the pool"""
+        pooled.last_used = time.monotonic()
+        if self._closed or not pooled.alive:
+            self._drop(pooled)
+        else:
+            self._idle.put_nowait(pooled)
+
+    async def run(self, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """
+        Run an operation on a pooled session
+
+        If the server process turns out to be dead, the session is respawned and
+        the operation retried once. Errors from a healthy server are re-raised.
+
+        Args:
+            operation: Coroutine function taking the ClientSession
+
+        Returns:
+            The operation's result
+        """
+        for attempt in range(2):
+            pooled = await self.acquire()
+            self._in_flight += 1
+            start_time = time.monotonic()
+            try:
+                result = await asyncio.wait_for(operation(pooled.session), timeout=self.call_timeout)
+            except asyncio.TimeoutError:
+                self._metrics["call_timeouts"] += 1
+                # A stuck server may never answer again; replace it
+                self._drop(pooled)
+                raise TimeoutError(f"MCP call to {self.server_name} timed out after {self.call_timeout}s")
+            except Exception:
+                self._metrics["call_errors"] += 1
+                if await self._check_health(pooled):
+                    self.release(pooled)
+                    raise
+                self._metrics["respawns"] += 1
+                await self._discard(pooled)
+                if attempt > 0:
+                    raise
+                logger.warning(f"⚠️ MCP server {self.server_name} crashed, respawning and retrying")
+                continue
+            except BaseException:
+                # Cancelled mid-call: the reply may still arrive on this session, so replace it
+                self._drop(pooled)
+                raise
+            finally:
+                self._in_flight -= 1
+
+            elapsed = time.monotonic() - start_time
+            self._metrics["calls"] += 1
+            self._metrics["call_seconds_total"] += elapsed
+            self._metrics["call_seconds_max"] = max(self._metrics["call_seconds_max"], elapsed)
+            pooled.calls += 1
+            self.release(pooled)
+            return result
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool using its server-side name"""
+        return await self.run(lambda session: session.call_tool(tool_name, arguments))
+
+    async def list_tools(self) -> Any:
+        """List tools exposed by the server"""
+        return await self.run(lambda session: session.list_tools())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get call latency versus session setup latency for this server"""
+        metrics = dict(self._metrics)
+        metrics["open_sessions"] = self._size
+        metrics["idle_sessions"] = sum(1 for pooled in self._idle._queue if pooled is not None)
+        metrics["in_flight"] = self._in_flight
+        metrics["max_sessions"] = self.max_sessions
+        metrics["avg_call_seconds"] = (
+            metrics["call_seconds_total"] / metrics["calls"] if metrics["calls"] else 0.0
+        )
+        metrics["avg_session_setup_seconds"] = (
+            metrics["session_setup_seconds_total"] / metrics["sessions_started"] if metrics["sessions_started"] else 0.0
+        )
+        return metrics
+
+    async def close(self) -> None:
+        """Close all sessions and terminate server processes"""
+        self._closed = True
+        sessions = []
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            if pooled is not None:
+                sessions.append(pooled)
+        self._size -= len(sessions)
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+        logger.info(f"🔌 Closed MCP session pool for {self.server_name}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP clients for LLM providers
+
+One process-wide httpx.AsyncClient per provider so LLM round trips reuse
+pooled keep-alive (and HTTP/2 where available) connections instead of paying
+a TCP + TLS handshake per request. Requests are retried with exponential
+backoff on 429/5xx and transport errors, and per-provider latency counters
+are kept for diagnostics.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger("llm-http-client")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+
+class ProviderHttpClient:
+    """Pooled async HTTP client with retry/backoff and latency counters for one provider"""
+
+    def __init__(
+        self,
+        provider_name: str,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        self.provider_name = provider_name
+        self.max_connections = max_connections or int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+        self.max_keepalive_connections = max_keepalive_connections or int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_HTTP_MAX_RETRIES", "2"))
+        self.backoff_base = backoff_base or float(os.getenv("LLM_HTTP_BACKOFF_BASE", "0.5"))
+        if http2 is None:
+            http2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "latency_seconds_total": 0.0,
+            "latency_seconds_max": 0.0,
+            "last_latency_seconds": 0.0,
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled client, recreating it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client's connections belong to the loop that opened them
+            if self._client is not None and not self._client.is_closed:
+                self._close_stale_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+            self._loop = loop
+            logger.debug(f"🔌 Created pooled HTTP client for {self.provider_name} (http2={self.http2})")
+        return self._client
+
+    @staticmethod
+    def _close_stale_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a client left behind by another event loop"""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: release its connections on that loop
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            asyncio.create_task(ProviderHttpClient._aclose_quietly(client))
+
+    @staticmethod
+    async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Connections opened on a closed loop can fail to shut down cleanly
+            logger.debug(f"Error closing stale HTTP client: {e}")
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Exponential backoff with jitter, honoring Retry-After when the server sends it"""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 60.0)
+                except ValueError:
+                    pass
+        return self.backoff_base * (2 ** attempt) * (0.5 + random.random())
+
+    async def post(
+        self,
+        url: str,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 120.0
+    ) -> httpx.Response:
+        """
+        POST with retry on 429/5xx and transport errors
+
+        Args:
+            url: Request URL
+            json: JSON request body
+            headers: Request headers
+            timeout: Per-attempt timeout in seconds
+
+        Returns:
+            The final httpx.Response (may still be an error status after retries)
+        """
+        client = self._get_client()
+        start_time = time.monotonic()
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    response = await client.post(url, json=json, headers=headers, timeout=timeout)
+                    if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                        if response.status_code >= 400:
+                            self._metrics["errors"] += 1
+                        return response
+                    reason = f"HTTP {response.status_code}"
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries:
+                        self._metrics["errors"] += 1
+                        raise
+                    reason = f"{type(e).__name__}: {e}"
+
+                delay = self._retry_delay(attempt, response)
+                self._metrics["retries"] += 1
+                logger.warning(
+                    f"⚠️ {self.provider_name} request failed ({reason}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+        finally:
+            elapsed = time.monotonic() - start_time
+            self._metrics["requests"] += 1
+            self._metrics["latency_seconds_total"] += elapsed
+            self._metrics["latency_seconds_max"] = max(self._metrics["latency_seconds_max"], elapsed)
+            self._metrics["last_latency_seconds"] = elapsed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request count and latency counters"""
+        metrics = dict(self._metrics)
+        metrics["avg_latency_seconds"] = (
+            metrics["latency_seconds_total"] / metrics["requests"] if metrics["requests"] else 0.0
+        )
+        metrics["http2"] = self.http2
+        metrics["max_connections"] = self.max_connections
+        return metrics
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None and not self._client.is_closed:
+            try:
+                await self._client.aclose()
+            except RuntimeError:
+                # Loop that owned the connections is gone; nothing left to release
+                pass
+        self._client = None
+        self._loop = None
+
+
+# Process-wide clients, one per provider
+_provider_clients: Dict[str, ProviderHttpClient] = {}
+
+
+def get_provider_http_client(provider_name: str) -> ProviderHttpClient:
+    """Get the shared HTTP client for a provider (singleton per provider)"""
+    client = _provider_clients.get(provider_name)
+    if client is None:
+        client = ProviderHttpClient(provider_name)
+        _provider_clients[provider_name] = client
+    return client
+
+
+def get_provider_http_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get latency counters for every provider client"""
+    return {name: client.get_metrics() for name, client in _provider_clients.items()}
+
+
+async def close_provider_http_clients():
+    """Close all shared provider HTTP clients"""
+    for client in _provider_clients.values():
+        await client.close()
+    logger.info("🔌 Closed shared LLM HTTP clients")
@@ -4,7 +4,6 @@ Anthropic Claude API provider implementation
 
 import json
 import logging
-import httpx
 import subprocess
 import tempfile
 import os
@@ -13,6 +12,7 @@ import shlex
 from typing import Dict, Any, List, Tuple, Optional
 
 from .base import LLMProvider
+from ..http_client import get_provider_http_client
 
 logger = logging.getLogger("anthropic-provider")
 
@@ -29,6 +29,10 @@ class AnthropicProvider(LLMProvider):
     def supports_caching(self) -> bool:
         return True
     
+    def retries_http_errors(self, force_api: bool = False) -> bool:
+        # The Claude Code CLI path has no HTTP retries of its own
+        return force_api or not self.use_cli
+    
     def _should_use_claude_code_cli(self, messages: List[Dict[str, Any]], force_api: bool = False) -> bool:
         """Determine if request should use Claude Code CLI"""
         # Force API usage for specific use cases (like context search)
@@ -366,26 +370,26 @@ class AnthropicProvider(LLMProvider):
             request_data["tools"] = processed_tools
             headers["anthropic-beta"] = "tools-2024-05-16"
         
-        # Make API call
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/messages",
-                json=request_data,
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                return {
-                    "success": True,
-                    "data": response.json(),
-                    "provider": "anthropic"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Anthropic API error: {response.status_code} - {response.text}",
-                    "provider": "anthropic"
-                }
+        # Make API call over the pooled client
+        response = await get_provider_http_client("anthropic").post(
+            f"{self.base_url}/messages",
+            json=request_data,
+            headers=headers,
+            timeout=120.0
+        )
+        
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "data": response.json(),
+                "provider": "anthropic"
+            }
+        else:
+            return {
+                "success": False,
+                "error": f"Anthropic API error: {response.status_code} - {response.text}",
+                "provider": "anthropic"
+            }
     
     def parse_response(self, response_data: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
         """Parse Anthropic response format (both API and CLI)"""
@@ -81,6 +81,10 @@ class LLMProvider(ABC):
         """Whether this provider supports prompt caching"""
         pass
     
+    def retries_http_errors(self, force_api: bool = False) -> bool:
+        """Whether call_api goes through the pooled HTTP client, which already retries 429/5xx"""
+        return False
+    
     @abstractmethod
     def create_simulated_tool_call(self, function_name: str, arguments: Dict[str, Any], call_id: str = None) -> Dict[str, Any]:
         """Create a simulated tool call in this provider's format"""
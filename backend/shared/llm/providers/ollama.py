@@ -8,10 +8,11 @@ import json
 import logging
 import os
 from typing import Dict, Any, List, Tuple, Optional
+import httpx
 import ollama
-import requests
 
 from .base import LLMProvider
+from ..http_client import get_provider_http_client
 
 logger = logging.getLogger("ollama-provider")
 
@@ -46,6 +47,10 @@ class OllamaProvider(LLMProvider):
     def supports_caching(self) -> bool:
         return False  # Ollama doesn't support explicit caching like Anthropic
     
+    def retries_http_errors(self, force_api: bool = False) -> bool:
+        # Only Ollama Cloud uses the pooled client; local Ollama uses the ollama library
+        return self.is_cloud
+    
     async def call_api(self, model: str, messages: List[Dict[str, Any]], 
                       max_tokens: int = 10000, enable_caching: bool = False,
                       override_system_prompt: Optional[str] = None,
@@ -157,12 +162,9 @@ class OllamaProvider(LLMProvider):
             logger.debug(f"🔑 Headers: {headers}")
             logger.debug(f"📦 Request data: {request_data}")
 
-            # requests.post() is synchronous — run it in a thread so it
-            # doesn't block the asyncio event loop for other requests.
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                functools.partial(requests.post, url, headers=headers, json=request_data, timeout=self.request_timeout)
+            # Pooled async client keeps the TLS connection to Ollama Cloud alive
+            response = await get_provider_http_client("ollama-cloud").post(
+                url, json=request_data, headers=headers, timeout=self.request_timeout
             )
             response.raise_for_status()
             
@@ -174,7 +176,7 @@ class OllamaProvider(LLMProvider):
                 "provider": "ollama-cloud"
             }
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Ollama Cloud API error: {e}")
             return {
                 "success": False,
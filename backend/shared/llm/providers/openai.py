@@ -4,10 +4,10 @@ OpenAI API provider implementation
 
 import json
 import logging
-import httpx
 from typing import Dict, Any, List, Tuple, Optional
 
 from .base import LLMProvider
+from ..http_client import get_provider_http_client
 
 logger = logging.getLogger("openai-provider")
 
@@ -23,6 +23,9 @@ class OpenAIProvider(LLMProvider):
     def supports_caching(self) -> bool:
         return False  # OpenAI doesn't support explicit caching like Anthropic
     
+    def retries_http_errors(self, force_api: bool = False) -> bool:
+        return True
+    
     def _parse_tool_arguments(self, arguments_str: str) -> Dict[str, Any]:
         """Robustly parse tool call arguments that may have malformed JSON"""
         try:
@@ -185,26 +188,26 @@ class OpenAIProvider(LLMProvider):
             "Authorization": f"Bearer {self.api_key}"
         }
         
-        # Make API call
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                json=request_data,
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                return {
-                    "success": True,
-                    "data": response.json(),
-                    "provider": "openai"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"OpenAI API error: {response.status_code} - {response.text}",
-                    "provider": "openai"
-                }
+        # Make API call over the pooled client
+        response = await get_provider_http_client("openai").post(
+            f"{self.base_url}/chat/completions",
+            json=request_data,
+            headers=headers,
+            timeout=120.0
+        )
+        
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "data": response.json(),
+                "provider": "openai"
+            }
+        else:
+            return {
+                "success": False,
+                "error": f"OpenAI API error: {response.status_code} - {response.text}",
+                "provider": "openai"
+            }
     
     def parse_response(self, response_data: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
         """Parse OpenAI response format"""
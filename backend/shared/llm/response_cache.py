@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+LLM response cache for deterministic classification calls
+
+Services opt in per call with LLMService.make_request(response_cache="<name>")
+and hand a response to LLMService.cache_response() once they have parsed it, so
+unparseable responses are never replayed. Responses are keyed on (provider,
+base URL, model, system prompt hash, tool set hash, normalized messages,
+max_tokens, temperature) and kept in an in-process LRU with a TTL, optionally
+backed by Redis so workers share entries. Hit/miss counters are kept per
+service name.
+
+Configuration:
+    LLM_RESPONSE_CACHE_ENABLED        Enable the cache (default: true)
+    LLM_RESPONSE_CACHE_TTL            Entry lifetime in seconds (default: 3600)
+    LLM_RESPONSE_CACHE_MAX_ENTRIES    In-process LRU size (default: 2000)
+    LLM_RESPONSE_CACHE_REDIS          Share entries through Redis at REDIS_URL (default: false)
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("llm-response-cache")
+
+REDIS_KEY_PREFIX = "llm_response"
+
+
+def is_response_cache_enabled() -> bool:
+    return os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _normalize_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return " ".join(content.split())
+    if isinstance(content, list):
+        return [_normalize_content(item) for item in content]
+    if isinstance(content, dict):
+        return {key: _normalize_content(value) for key, value in content.items()}
+    return content
+
+
+class LLMResponseCache:
+    """TTL + LRU response cache with optional Redis backing and per-service metrics"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 use_redis: Optional[bool] = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("LLM_RESPONSE_CACHE_TTL", "3600"))
+        self.max_entries = max_entries or int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+        if use_redis is None:
+            use_redis = os.getenv("LLM_RESPONSE_CACHE_REDIS", "false").lower() in ("1", "true", "yes")
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(provider: str, base_url: Optional[str], model: str, system_prompt: Optional[str],
+                 tools: Optional[List[Dict[str, Any]]], messages: List[Dict[str, Any]],
+                 max_tokens: Optional[int], temperature: Optional[float]) -> str:
+        """Cache key for one request; whitespace differences in messages do not matter"""
+        return _hash({
+            "provider": provider,
+            "base_url": base_url,
+            "model": model,
+            "system": _hash(system_prompt or ""),
+            "tools": _hash(tools or []),
+            "messages": [
+                {"role": message.get("role"), "content": _normalize_content(message.get("content"))}
+                for message in messages
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        })
+
+    def _count(self, service: str, event: str) -> None:
+        counters = self._metrics.setdefault(service, {"memory_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0})
+        counters[event] += 1
+
+    def _remember(self, entry_key: str, response: Dict[str, Any]) -> None:
+        self._entries[entry_key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _redis(self):
+        if not self.use_redis:
+            return None
+        from ..services.redis_client import get_redis_client
+        return await get_redis_client()
+
+    async def get(self, service: str, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for a service's request key, or None"""
+        entry_key = f"{service}:{key}"
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                self._count(service, "memory_hits")
+                return copy.deepcopy(response)
+            del self._entries[entry_key]
+
+        try:
+            client = await self._redis()
+            if client is not None:
+                payload = await client.get(f"{REDIS_KEY_PREFIX}:{entry_key}")
+                if payload:
+                    response = json.loads(payload)
+                    self._remember(entry_key, response)
+                    self._count(service, "redis_hits")
+                    return copy.deepcopy(response)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM response cache Redis read failed: {e}")
+
+        self._count(service, "misses")
+        return None
+
+    async def set(self, service: str, key: str, response: Dict[str, Any]) -> None:
+        """Store a successful response"""
+        entry_key = f"{service}:{key}"
+        self._remember(entry_key, copy.deepcopy(response))
+        self._count(service, "stores")
+        try:
+            client = await self._redis()
+            if client is not None:
+                await client.set(f"{REDIS_KEY_PREFIX}:{entry_key}", json.dumps(response, default=str), ex=int(self.ttl))
+        except Exception as e:
+            logger.warning(f"⚠️ LLM response cache Redis write failed: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters and hit rate per service"""
+        metrics = {}
+        for service, counters in self._metrics.items():
+            hits = counters["memory_hits"] + counters["redis_hits"]
+            lookups = hits + counters["misses"]
+            metrics[service] = {**counters, "hit_rate": hits / lookups if lookups else 0.0}
+        return metrics
+
+
+# Process-wide cache shared by every LLMService
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get or create the shared LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache
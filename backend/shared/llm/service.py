@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional, List
 from .providers import create_provider, LLMProvider
 from .utils import LLMConfig, validate_llm_config
 from .cache import ProviderCacheManager
+from .http_client import get_provider_http_metrics
+from .response_cache import get_llm_response_cache, is_response_cache_enabled
 from .mcp_tools import _mcp_loader
 
 
@@ -174,6 +176,7 @@ class LLMService:
                          max_tokens: Optional[int] = None,
                          temperature: Optional[float] = None,
                          force_api: bool = False,
+                         response_cache: Optional[str] = None,
                          **kwargs) -> Dict[str, Any]:
         """
         Make a request to the LLM provider
@@ -186,8 +189,13 @@ class LLMService:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             force_api: Force API call bypassing cache
+            response_cache: Service name to cache this (deterministic) request's
+                            response under; None disables response caching. A
+                            fetched response is only stored once the service
+                            passes it to cache_response() after parsing it
             **kwargs: Additional provider-specific parameters including:
-                     - max_retries (int): Maximum retry attempts for 500 errors (default: 3)
+                     - max_retries (int): Maximum retry attempts for 500 errors (default: 3;
+                       0 when the provider's pooled HTTP client already retries)
                      - retry_delay (float): Base delay for exponential backoff (default: 1.0)
             
         Returns:
@@ -215,9 +223,30 @@ class LLMService:
             if system_prompt:
                 self.provider.set_system_prompt(system_prompt)
             
+            # Repeated deterministic requests are answered from the response cache
+            cache_key = None
+            if response_cache and not force_api and is_response_cache_enabled():
+                cache = get_llm_response_cache()
+                cache_key = cache.make_key(
+                    provider=self.provider_type,
+                    base_url=self.config.base_url,
+                    model=model,
+                    system_prompt=system_prompt,
+                    tools=self.provider._raw_tools,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+                cached = await cache.get(response_cache, cache_key)
+                if cached is not None:
+                    logger.debug(f"💾 LLM response cache hit for '{response_cache}'")
+                    return {**cached, "cached": True}
+            
             # Make the request using provider's call_api method with retry logic
             # Note: temperature not yet supported by provider interface
-            max_retries = kwargs.get('max_retries', 3)
+            # Providers on the pooled HTTP client already retry 429/5xx with backoff;
+            # retrying here as well would multiply the upstream attempts
+            max_retries = 0 if self.provider.retries_http_errors(force_api) else kwargs.get('max_retries', 3)
             base_delay = kwargs.get('retry_delay', 1.0)
             
             for attempt in range(max_retries + 1):
@@ -271,13 +300,16 @@ class LLMService:
             content, tool_calls = self.provider.parse_response(raw_response.get("data", {}))
             
             # Return standardized response format
-            return {
+            response = {
                 "success": True,
                 "content": content,
                 "tool_calls": tool_calls,
                 "provider": raw_response.get("provider", self.provider_type),
                 "model": model
             }
+            if cache_key:
+                response["cache_entry"] = {"service": response_cache, "key": cache_key}
+            return response
             
         except Exception as e:
             logger.error(f"LLM request failed: {e}")
@@ -287,6 +319,19 @@ class LLMService:
                 "provider": self.provider_type
             }
     
+    async def cache_response(self, response: Dict[str, Any]) -> bool:
+        """Store a response from make_request(response_cache=...) once the caller has parsed it
+
+        Responses that failed to parse should not be passed here, so they are
+        fetched again next time instead of being replayed from the cache.
+        Returns True if the response was stored.
+        """
+        entry = response.pop("cache_entry", None)
+        if not entry:
+            return False
+        await get_llm_response_cache().set(entry["service"], entry["key"], response)
+        return True
+    
     async def simple_completion(self, 
                               prompt: str,
                               model: Optional[str] = None,
@@ -294,7 +339,8 @@ class LLMService:
                               max_tokens: Optional[int] = None,
                               temperature: Optional[float] = None,
                               max_retries: Optional[int] = None,
-                              retry_delay: Optional[float] = None) -> Dict[str, Any]:
+                              retry_delay: Optional[float] = None,
+                              response_cache: Optional[str] = None) -> Dict[str, Any]:
         """
         Simple text completion without tools
         
@@ -306,6 +352,7 @@ class LLMService:
             temperature: Sampling temperature
             max_retries: Maximum retry attempts for 500 errors
             retry_delay: Base delay for exponential backoff
+            response_cache: Service name to cache the response under (see make_request)
             
         Returns:
             Dict with 'success', 'content', etc.
@@ -325,6 +372,7 @@ class LLMService:
             tools=None,  # No tools for simple completion
             max_tokens=max_tokens,
             temperature=temperature,
+            response_cache=response_cache,
             **kwargs
         )
     
@@ -368,7 +416,9 @@ class LLMService:
             "has_api_key": bool(self.config.api_key),
             "base_url": self.config.base_url,
             "max_tokens": self.config.max_tokens,
-            "temperature": self.config.temperature
+            "temperature": self.config.temperature,
+            "http_clients": get_provider_http_metrics(),
+            "response_cache": get_llm_response_cache().get_metrics()
         }
     
     async def health_check(self) -> Dict[str, Any]:
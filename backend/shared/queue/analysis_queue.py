@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 from shared.constants import MessageStatus
+from .notifier import notify_enqueued
 
 logger = logging.getLogger(__name__)
 
@@ -47,14 +48,50 @@ class AnalysisQueueInterface(ABC):
         """
         pass
     
+    async def dequeue_analysis_batch(self, worker_id: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Claim up to n analyses for worker
+        
+        Default implementation claims one at a time; implementations should
+        override with a batched claim.
+        
+        Args:
+            worker_id: Unique identifier for the worker
+            n: Maximum number of jobs to claim
+            
+        Returns:
+            List of claimed analysis job dicts (possibly empty)
+        """
+        jobs = []
+        for _ in range(n):
+            job = await self.dequeue_analysis(worker_id)
+            if not job:
+                break
+            jobs.append(job)
+        return jobs
+    
+    async def extend_leases(self, worker_id: str, job_ids: List[str]) -> int:
+        """
+        Heartbeat: extend the claim lease of jobs still held by worker
+        
+        Args:
+            worker_id: Worker holding the jobs
+            job_ids: Analysis job identifiers
+            
+        Returns:
+            Number of leases extended
+        """
+        return 0
+    
     @abstractmethod
-    async def ack_analysis(self, job_id: str, result: Dict[str, Any]) -> bool:
+    async def ack_analysis(self, job_id: str, result: Dict[str, Any], worker_id: Optional[str] = None) -> bool:
         """
         Mark analysis as completed successfully
         
         Args:
             job_id: Analysis job identifier
             result: Analysis result data
+            worker_id: Worker that claimed the job; the ack is ignored if it no longer holds it
             
         Returns:
             True if successfully acknowledged
@@ -62,7 +99,8 @@ class AnalysisQueueInterface(ABC):
         pass
     
     @abstractmethod
-    async def nack_analysis(self, job_id: str, error: str, retry: bool = True) -> bool:
+    async def nack_analysis(self, job_id: str, error: str, retry: bool = True,
+                            worker_id: Optional[str] = None) -> bool:
         """
         Mark analysis as failed
         
@@ -70,6 +108,7 @@ class AnalysisQueueInterface(ABC):
             job_id: Analysis job identifier
             error: Error message
             retry: Whether to retry the analysis
+            worker_id: Worker that claimed the job; the nack is ignored if it no longer holds it
             
         Returns:
             True if successfully marked as failed
@@ -78,7 +117,18 @@ class AnalysisQueueInterface(ABC):
     
 
 class MongoAnalysisQueue(AnalysisQueueInterface):
-    """MongoDB-based analysis queue implementation"""
+    """MongoDB-based analysis queue implementation
+    
+    Claims are leases: a claimed job carries ``lease_expires_at``, which the
+    worker extends with extend_leases() while it is still processing. Jobs
+    whose lease ran out (worker crashed or hung) are put back to pending (or
+    failed, once out of retries) on the next claim attempt, and their session
+    locks are released. ack/nack only apply while the job is still claimed by
+    the acking worker, so a worker whose lease lapsed cannot overwrite the
+    job's retry.
+    Pending jobs become claimable at ``available_at`` (enqueue time, or the
+    retry time after a failed attempt).
+    """
     
     def __init__(self, db):
         self.db = db
@@ -86,36 +136,122 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
         # Configure max retries and retry delay from environment variables
         self.max_retries = int(os.getenv("ANALYSIS_QUEUE_MAX_RETRIES", "3"))
         self.retry_delay_seconds = int(os.getenv("ANALYSIS_QUEUE_RETRY_DELAY", "60"))
+        self.lease_seconds = int(os.getenv("QUEUE_LEASE_SECONDS", "120"))
+        self._next_lease_sweep = datetime.min
         self._ensure_indexes()
     
+    def _index_specs(self) -> List[tuple]:
+        return [
+            # Claim query: status equality, FIFO sort, available_at range (ESR order)
+            ([("status", 1), ("created_at", 1), ("available_at", 1)], {"name": "analysis_claim_idx"}),
+            # Expired-lease sweep
+            ([("status", 1), ("lease_expires_at", 1)], {"name": "analysis_lease_idx"}),
+            # Index for tracking by worker
+            ([("worker_id", 1), ("status", 1)], {}),
+            # TTL index for automatic cleanup of old completed jobs
+            ("expires_at", {"expireAfterSeconds": 0}),
+        ]
+    
     def _ensure_indexes(self):
         """Create required indexes for analysis queue"""
         try:
-            # Index for efficient dequeue operations
-            self.collection.create_index([
-                ("status", 1),
-                ("created_at", 1)
-            ])
-            
-            # Index for tracking by worker
-            self.collection.create_index([
-                ("worker_id", 1),
-                ("status", 1)
-            ])
+            for keys, options in self._index_specs():
+                self.collection.create_index(keys, **options)
             
-            # TTL index for automatic cleanup of old completed jobs
-            self.collection.create_index(
-                "expires_at",
-                expireAfterSeconds=0
+            # Pending jobs enqueued before available_at existed
+            self.collection.update_many(
+                {"status": MessageStatus.PENDING, "available_at": {"$exists": False}},
+                [{"$set": {"available_at": {"$ifNull": ["$retry_at", "$created_at"]}}}]
             )
             
             logger.info("✅ Analysis queue indexes created")
         except Exception as e:
             logger.warning(f"⚠️ Failed to create analysis queue indexes: {e}")
     
+    async def ensure_indexes(self):
+        """Create required indexes and wait for them"""
+        for keys, options in self._index_specs():
+            await self.collection.create_index(keys, **options)
+    
+    def _claim_filter(self, now: datetime) -> Dict[str, Any]:
+        """Pending jobs that are due; served by analysis_claim_idx"""
+        return {"status": MessageStatus.PENDING, "available_at": {"$lte": now}}
+    
+    def _claim_update(self, worker_id: str, now: datetime, claim_id: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "$set": {
+                "status": "claimed",
+                "worker_id": worker_id,
+                "claimed_at": now,
+                "updated_at": now,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "claim_id": claim_id
+            }
+        }
+    
+    async def _release_expired_leases(self, now: datetime):
+        """Retry (or fail, once out of retries) jobs whose lease ran out and release their session locks
+        
+        Runs at most every quarter lease per queue instance.
+        """
+        if now < self._next_lease_sweep:
+            return
+        self._next_lease_sweep = now + timedelta(seconds=self.lease_seconds / 4)
+        
+        expired = await self.collection.find(
+            {"status": "claimed", "lease_expires_at": {"$lt": now}},
+            {"_id": 1, "job_id": 1, "session_id": 1}
+        ).to_list(100)
+        if not expired:
+            return
+        
+        still_expired = {"_id": {"$in": [j["_id"] for j in expired]}, "status": "claimed", "lease_expires_at": {"$lt": now}}
+        failed = await self.collection.update_many(
+            {**still_expired, "retry_count": {"$gte": self.max_retries}},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Lease expired after the last retry",
+                    "worker_id": None,
+                    "lease_expires_at": None,
+                    "completed_at": now,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(hours=24)
+                }
+            }
+        )
+        retried = await self.collection.update_many(
+            still_expired,
+            {
+                "$set": {
+                    "status": MessageStatus.PENDING,
+                    "worker_id": None,
+                    "claimed_at": None,
+                    "lease_expires_at": None,
+                    "available_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"retry_count": 1}
+            }
+        )
+        logger.warning(
+            f"⚠️ Expired analysis leases: {retried.modified_count} requeued, {failed.modified_count} failed: "
+            f"{[j.get('job_id') for j in expired]}"
+        )
+        if retried.modified_count:
+            notify_enqueued(self.collection)
+        
+        # Release the session locks held by those jobs so users are not locked out
+        sessions = [j["session_id"] for j in expired if j.get("session_id")]
+        if sessions:
+            lock_result = await self.db.session_locks.delete_many({"session_id": {"$in": sessions}})
+            if lock_result.deleted_count:
+                logger.warning(f"🔓 Released {lock_result.deleted_count} stale session lock(s) for sessions: {sessions}")
+    
     async def enqueue_analysis(self, analysis_data: Dict[str, Any]) -> str:
         """Add analysis to queue"""
         job_id = str(uuid.uuid4())
+        now = datetime.utcnow()
         
         job_doc = {
             "job_id": job_id,
@@ -124,10 +260,12 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
             "user_question": analysis_data.get("user_question"),
             "user_message_id": analysis_data.get("user_message_id"),
             "status": MessageStatus.PENDING,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "created_at": now,
+            "updated_at": now,
+            "available_at": now,
             "worker_id": None,
             "claimed_at": None,
+            "lease_expires_at": None,
             "completed_at": None,
             "retry_count": 0,
             "error": None,
@@ -138,6 +276,7 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
         
         try:
             await self.collection.insert_one(job_doc)
+            notify_enqueued(self.collection)
             logger.info(f"📥 Analysis queued: {job_id} for message {analysis_data.get('message_id')}")
             return job_id
         except Exception as e:
@@ -147,34 +286,13 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
     async def dequeue_analysis(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """Get next analysis for worker (atomic claim operation)"""
         try:
-            # Atomically claim next pending job (respect retry_at time)
-            current_time = datetime.utcnow()
+            now = datetime.utcnow()
+            await self._release_expired_leases(now)
+            
+            # Atomically claim next due pending job
             result = await self.collection.find_one_and_update(
-                {
-                    "status": MessageStatus.PENDING,
-                    "$and": [
-                        {
-                            "$or": [
-                                {"worker_id": None},
-                                {"worker_id": worker_id}  # Allow same worker to reclaim
-                            ]
-                        },
-                        {
-                            "$or": [
-                                {"retry_at": None},  # Jobs without retry delay
-                                {"retry_at": {"$lte": current_time}}  # Jobs ready for retry
-                            ]
-                        }
-                    ]
-                },
-                {
-                    "$set": {
-                        "status": "claimed",
-                        "worker_id": worker_id,
-                        "claimed_at": datetime.utcnow(),
-                        "updated_at": datetime.utcnow()
-                    }
-                },
+                self._claim_filter(now),
+                self._claim_update(worker_id, now),
                 sort=[("created_at", 1)],  # FIFO order
                 return_document=True
             )
@@ -189,11 +307,72 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
             logger.error(f"❌ Failed to dequeue analysis: {e}")
             return None
     
-    async def ack_analysis(self, job_id: str, result: Dict[str, Any]) -> bool:
+    async def dequeue_analysis_batch(self, worker_id: str, n: int) -> List[Dict[str, Any]]:
+        """Claim up to n due analyses in three round trips
+        
+        Candidates are selected by the claim index, then claimed with one
+        update_many that re-checks the claim filter per document, so a job
+        raced by another worker is simply skipped.
+        """
+        if n <= 1:
+            job = await self.dequeue_analysis(worker_id)
+            return [job] if job else []
+        try:
+            now = datetime.utcnow()
+            await self._release_expired_leases(now)
+            claim_filter = self._claim_filter(now)
+            
+            candidates = await self.collection.find(claim_filter, {"_id": 1}).sort("created_at", 1).limit(n).to_list(n)
+            if not candidates:
+                return []
+            
+            ids = [c["_id"] for c in candidates]
+            claim_id = uuid.uuid4().hex
+            await self.collection.update_many(
+                {"_id": {"$in": ids}, **claim_filter},
+                self._claim_update(worker_id, now, claim_id)
+            )
+            jobs = await self.collection.find(
+                {"_id": {"$in": ids}, "claim_id": claim_id}
+            ).sort("created_at", 1).to_list(n)
+            
+            if jobs:
+                logger.info(f"📤 {len(jobs)} analyses claimed by {worker_id}: {[j['job_id'] for j in jobs]}")
+            return jobs
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to dequeue analysis batch: {e}")
+            return []
+    
+    async def extend_leases(self, worker_id: str, job_ids: List[str]) -> int:
+        """Heartbeat: extend leases of jobs this worker still holds"""
+        if not job_ids:
+            return 0
+        try:
+            now = datetime.utcnow()
+            result = await self.collection.update_many(
+                {"job_id": {"$in": job_ids}, "worker_id": worker_id, "status": "claimed"},
+                {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "updated_at": now}}
+            )
+            if result.modified_count < len(job_ids):
+                logger.warning(f"⚠️ {worker_id} lost the lease on {len(job_ids) - result.modified_count} analysis job(s)")
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"❌ Failed to extend analysis leases: {e}")
+            return 0
+    
+    def _held_filter(self, job_id: str, worker_id: Optional[str]) -> Dict[str, Any]:
+        """Job still claimed (by worker_id, when given)"""
+        query = {"job_id": job_id, "status": "claimed"}
+        if worker_id is not None:
+            query["worker_id"] = worker_id
+        return query
+    
+    async def ack_analysis(self, job_id: str, result: Dict[str, Any], worker_id: Optional[str] = None) -> bool:
         """Mark analysis as completed successfully"""
         try:
             update_result = await self.collection.update_one(
-                {"job_id": job_id},
+                self._held_filter(job_id, worker_id),
                 {
                     "$set": {
                         "status": "completed",
@@ -209,20 +388,22 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
                 logger.info(f"✅ Analysis completed: {job_id}")
                 return True
             else:
-                logger.warning(f"⚠️ Failed to ack analysis (not found): {job_id}")
+                logger.warning(f"⚠️ Failed to ack analysis (not found or no longer claimed by {worker_id}): {job_id}")
                 return False
                 
         except Exception as e:
             logger.error(f"❌ Failed to ack analysis: {e}")
             return False
     
-    async def nack_analysis(self, job_id: str, error: str, retry: bool = True) -> bool:
+    async def nack_analysis(self, job_id: str, error: str, retry: bool = True,
+                            worker_id: Optional[str] = None) -> bool:
         """Mark analysis as failed"""
         try:
+            held = self._held_filter(job_id, worker_id)
             # Get current job to check retry count
-            job = await self.collection.find_one({"job_id": job_id})
+            job = await self.collection.find_one(held)
             if not job:
-                logger.warning(f"⚠️ Job not found for nack: {job_id}")
+                logger.warning(f"⚠️ Job not found for nack (or no longer claimed by {worker_id}): {job_id}")
                 return False
             
             retry_count = job.get("retry_count", 0)
@@ -233,14 +414,16 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
                 
                 # Retry the job
                 update_result = await self.collection.update_one(
-                    {"job_id": job_id},
+                    held,
                     {
                         "$set": {
                             "status": MessageStatus.PENDING,
                             "worker_id": None,
                             "claimed_at": None,
+                            "lease_expires_at": None,
                             "updated_at": datetime.utcnow(),
                             "retry_at": retry_at,
+                            "available_at": retry_at,
                             "error": error
                         },
                         "$inc": {"retry_count": 1}
@@ -250,7 +433,7 @@ class MongoAnalysisQueue(AnalysisQueueInterface):
             else:
                 # Mark as permanently failed
                 update_result = await self.collection.update_one(
-                    {"job_id": job_id},
+                    held,
                     {
                         "$set": {
                             "status": "failed",
@@ -12,7 +12,7 @@ import uuid
 import sys
 import os
 from shared.queue.worker_context import set_context
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, Optional
 
 # Add shared modules to path
@@ -33,6 +33,7 @@ from ..services.chat_service import ChatHistoryService
 from ..services.cache_service import CacheService
 from ..services.audit_service import AuditService
 from ..db import RepositoryManager, MongoDBClient
+from ..integrations.mcp.mcp_client import mcp_client
 from shared.services.session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
@@ -63,6 +64,7 @@ class AnalysisQueueWorker(BaseQueueWorker):
             worker_type="analysis_worker"
         )
         self.analysis_pipeline = None
+        self.analysis_service = None
         
         logger.info(f"🔧 Analysis Worker Config: poll_interval={self.poll_interval}s, "
                    f"max_concurrent={self.max_concurrent_analyses}, max_retries={self.max_retries}, "
@@ -89,12 +91,12 @@ class AnalysisQueueWorker(BaseQueueWorker):
             repo_manager = RepositoryManager(db_client)
             await repo_manager.initialize()
 
-            # Reclaim any jobs that were stuck in 'processing' state due to a
-            # previous worker crash. Must run before this worker starts polling.
-            await self._reclaim_stale_jobs(db_client.db)
+            # Jobs left behind by a crashed worker are reclaimed by the queue
+            # once their claim lease expires (see MongoAnalysisQueue)
             
             # Create all required services
             analysis_service = AnalysisService()
+            self.analysis_service = analysis_service
             search_service = SearchService()
             chat_history_service = ChatHistoryService(repo_manager)
             cache_service = CacheService(repo_manager)
@@ -138,67 +140,6 @@ class AnalysisQueueWorker(BaseQueueWorker):
             logger.error(f"❌ Failed to initialize analysis pipeline: {e}")
             raise  # Re-raise to stop worker startup
     
-    async def _reclaim_stale_jobs(self, db, stale_after_minutes: int = 10):
-        """
-        On startup, reset any analysis jobs that were stuck in 'processing'
-        state (left behind by a previous worker crash).
-
-        Also releases the session locks held by those stale jobs so users
-        are not locked out.
-        """
-        try:
-            cutoff = datetime.utcnow() - timedelta(minutes=stale_after_minutes)
-            queue_col = db.analysis_queue
-            locks_col = db.session_locks
-
-            # Find stale jobs before resetting so we can collect session_ids
-            stale_cursor = queue_col.find({
-                "status": "processing",
-                "claimed_at": {"$lt": cutoff}
-            })
-            stale_jobs = await stale_cursor.to_list(length=100)
-
-            if not stale_jobs:
-                logger.info("✅ No stale analysis jobs found on startup")
-                return
-
-            stale_ids = [j["_id"] for j in stale_jobs]
-            stale_sessions = [j["session_id"] for j in stale_jobs if j.get("session_id")]
-
-            # Reset jobs to pending
-            result = await queue_col.update_many(
-                {"_id": {"$in": stale_ids}},
-                {
-                    "$set": {
-                        "status": "pending",
-                        "worker_id": None,
-                        "claimed_at": None,
-                        "updated_at": datetime.utcnow(),
-                    },
-                    "$inc": {"retry_count": 1}
-                }
-            )
-            logger.warning(
-                f"⚠️ Reclaimed {result.modified_count} stale analysis job(s) "
-                f"(stuck >{ stale_after_minutes}min): "
-                f"{[j.get('job_id') for j in stale_jobs]}"
-            )
-
-            # Release the session locks held by those stale jobs
-            if stale_sessions:
-                lock_result = await locks_col.delete_many(
-                    {"session_id": {"$in": stale_sessions}}
-                )
-                if lock_result.deleted_count:
-                    logger.warning(
-                        f"🔓 Released {lock_result.deleted_count} stale session lock(s) "
-                        f"for sessions: {stale_sessions}"
-                    )
-
-        except Exception as e:
-            # Non-fatal — log and continue startup
-            logger.error(f"❌ Failed to reclaim stale jobs on startup: {e}")
-
     def _initialize_verification_service(self) -> Optional[StandaloneVerificationService]:
         """
         Initialize verification service for reuse verification (GitHub Issue #117)
@@ -229,10 +170,26 @@ class AnalysisQueueWorker(BaseQueueWorker):
             logger.error(f"❌ Failed to initialize verification service: {e}")
             return None  # Return None so pipeline can still work without verification
     
+    async def _cleanup_services(self):
+        """Terminate persistent MCP server sessions and pooled LLM connections"""
+        if self.analysis_service:
+            await self.analysis_service.close_sessions()
+        await mcp_client.close_all_sessions()
+    
     async def _dequeue_item(self):
         """Dequeue an analysis from the queue"""
         return await self.queue.dequeue_analysis(self.worker_id)
     
+    async def _dequeue_items(self, n: int):
+        """Claim up to n analyses in one batch"""
+        return await self.queue.dequeue_analysis_batch(self.worker_id, n)
+    
+    def _item_id(self, item: Dict[str, Any]) -> Optional[str]:
+        return item.get("job_id")
+    
+    async def _extend_leases(self, item_ids):
+        await self.queue.extend_leases(self.worker_id, item_ids)
+    
     async def _process_item(self, item: Dict[str, Any]):
         """Process a single analysis (renamed from _process_analysis)"""
         return await self._process_analysis(item)
@@ -358,7 +315,7 @@ class AnalysisQueueWorker(BaseQueueWorker):
                 "execution_id": result.get("execution_id"),
             })
 
-            await self.queue.ack_analysis(job_id, result)
+            await self.queue.ack_analysis(job_id, result, worker_id=self.worker_id)
             logger.info(f"✅ Completed analysis: {job_id} (type: {response_type})")
             
         except Exception as e:
@@ -384,7 +341,7 @@ class AnalysisQueueWorker(BaseQueueWorker):
 
             # Use configurable retry logic
             should_retry = hasattr(self, 'max_retries') and self.max_retries > 0
-            await self.queue.nack_analysis(job_id, str(e), retry=should_retry)
+            await self.queue.nack_analysis(job_id, str(e), retry=should_retry, worker_id=self.worker_id)
     
 
 # Worker entry point for standalone execution
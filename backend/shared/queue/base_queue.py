@@ -4,7 +4,7 @@ Abstract queue interface for execution queue implementations
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, AsyncGenerator, Optional
+from typing import Dict, List, Any, AsyncGenerator, Optional, Union
 
 class ExecutionQueueInterface(ABC):
     """Abstract interface for execution queue implementations"""
@@ -35,14 +35,50 @@ class ExecutionQueueInterface(ABC):
         """
         pass
     
+    async def dequeue_batch(self, worker_id: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Claim up to n executions for worker
+        
+        Default implementation claims one at a time; implementations should
+        override with a batched claim.
+        
+        Args:
+            worker_id: Unique identifier for the worker
+            n: Maximum number of executions to claim
+            
+        Returns:
+            List of claimed execution dicts (possibly empty)
+        """
+        executions = []
+        for _ in range(n):
+            execution = await self.dequeue(worker_id)
+            if not execution:
+                break
+            executions.append(execution)
+        return executions
+    
+    async def extend_leases(self, worker_id: str, execution_ids: List[str]) -> int:
+        """
+        Heartbeat: extend the claim lease of executions still held by worker
+        
+        Args:
+            worker_id: Worker holding the executions
+            execution_ids: Execution identifiers
+            
+        Returns:
+            Number of leases extended
+        """
+        return 0
+    
     @abstractmethod
-    async def ack(self, execution_id: str, result: Dict[str, Any]) -> bool:
+    async def ack(self, execution_id: str, result: Dict[str, Any], worker_id: Optional[str] = None) -> bool:
         """
         Mark execution as completed successfully
         
         Args:
             execution_id: Execution identifier
             result: Execution result data
+            worker_id: Worker running the execution; the ack is ignored if it no longer holds it
             
         Returns:
             True if successfully acknowledged
@@ -50,7 +86,8 @@ class ExecutionQueueInterface(ABC):
         pass
     
     @abstractmethod
-    async def nack(self, execution_id: str, error: str, retry: bool = True) -> Dict[str, Any]:
+    async def nack(self, execution_id: str, error: str, retry: bool = True,
+                   worker_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Mark execution as failed
         
@@ -58,6 +95,7 @@ class ExecutionQueueInterface(ABC):
             execution_id: Execution identifier
             error: Error description
             retry: Whether execution should be retried
+            worker_id: Worker running the execution; the nack is ignored if it no longer holds it
             
         Returns:
             Dict with keys:
@@ -82,29 +120,30 @@ class ExecutionQueueInterface(ABC):
         pass
     
     @abstractmethod
-    async def stream_logs(self, execution_id: str) -> AsyncGenerator[Dict, None]:
+    async def stream_logs(self, execution_id: str, since: int = 0) -> AsyncGenerator[Dict, None]:
         """
         Stream real-time execution logs
         
         Args:
             execution_id: Execution identifier
+            since: Log offset to start from (seq of the first entry wanted)
             
         Yields:
-            Log entry dictionaries
+            Log entry dictionaries, each with its seq
         """
         pass
     
     @abstractmethod
-    async def update_logs(self, execution_id: str, log_entry: Dict[str, Any]) -> bool:
+    async def update_logs(self, execution_id: str, log_entry: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
         """
-        Add a log entry to execution
+        Add a log entry, or a batch of entries in one write, to execution
         
         Args:
             execution_id: Execution identifier
-            log_entry: Log entry with timestamp, level, message
+            log_entry: Log entry (or list of entries) with timestamp, level, message
             
         Returns:
-            True if log was added successfully
+            True if logs were added successfully
         """
         pass
     
\ No newline at end of file
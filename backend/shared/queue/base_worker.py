@@ -3,17 +3,66 @@
 Base Queue Worker
 
 Abstract base class for all queue workers with common functionality.
+
+Claiming is event-driven: a worker with free capacity claims immediately,
+then sleeps until the queue notifier signals new work (change stream or local
+enqueue) or its idle back-off expires. The back-off doubles from
+QUEUE_WORKER_MIN_IDLE_DELAY up to poll_interval while the queue stays empty.
+A finished item frees its slot and the worker claims again right away.
+
+Each claim round takes as many items as there are free slots in one batched
+dequeue. Claimed items are leases; while they are processed a heartbeat
+extends them every third of the queue's lease, so a crashed worker's items
+become claimable again once the lease runs out.
 """
 
 import asyncio
 import logging
+import os
 import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Set
-from datetime import datetime
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+
+from .notifier import QueueNotifier, get_queue_notifier
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (seconds) of the queue-wait histogram buckets
+QUEUE_WAIT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative counts, Prometheus style)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = QUEUE_WAIT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        seconds = max(0.0, seconds)
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            cumulative[f"le_{bound:g}"] = running
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": cumulative,
+        }
+
 
 class BaseQueueWorker(ABC):
     """Abstract base class for queue workers"""
@@ -33,44 +82,79 @@ class BaseQueueWorker(ABC):
         self.running = False
         self.active_items: Set[asyncio.Task] = set()
         self.worker_type = worker_type
+        self.min_idle_delay = float(os.getenv("QUEUE_WORKER_MIN_IDLE_DELAY", "0.25"))
+        self.notifier: Optional[QueueNotifier] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._item_ids: Dict[asyncio.Task, str] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.queue_wait = LatencyHistogram()
+        self.stats = {"claims": 0, "empty_claims": 0, "notified_wakeups": 0, "timeout_wakeups": 0}
         
         logger.info(f"🔧 Created {self.worker_type}: {self.worker_id}")
     
     async def start(self):
-        """Start the worker polling loop"""
+        """Start the worker claim loop"""
         logger.info(f"🚀 Starting {self.worker_type} {self.worker_id}")
         
         # Initialize worker-specific services
         await self._initialize_services()
         
         self.running = True
+        self._slots = asyncio.Semaphore(self.max_concurrent_items)
+        self.notifier = self._create_notifier()
+        idle_delay = self.min_idle_delay
+        
+        lease_seconds = getattr(self.queue, "lease_seconds", None)
+        if lease_seconds:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(lease_seconds / 3))
         
         try:
             while self.running:
+                slots_held = 0
                 try:
-                    # Check if we can handle more items
-                    if len(self.active_items) < self.max_concurrent_items:
-                        # Try to claim an item from the queue
-                        item = await self._dequeue_item()
-                        
-                        if item:
-                            # Process item in background
-                            task = asyncio.create_task(self._process_item(item))
-                            self.active_items.add(task)
-                            
-                            # Clean up completed tasks
-                            self._cleanup_completed_tasks()
-                        else:
-                            # No items available, wait before next poll
-                            await asyncio.sleep(self.poll_interval)
+                    # Wait for free capacity; released when an item finishes
+                    await self._slots.acquire()
+                    slots_held = 1
+                    # Take every other free slot without waiting
+                    while not self._slots.locked():
+                        await self._slots.acquire()
+                        slots_held += 1
+                    
+                    # Try to claim items from the queue, one per free slot
+                    items = await self._dequeue_items(slots_held)
+                    
+                    for item in items:
+                        # Process item in background; the slot moves to the task
+                        self._record_claim(item)
+                        task = asyncio.create_task(self._process_item(item))
+                        self.active_items.add(task)
+                        item_id = self._item_id(item)
+                        if item_id:
+                            self._item_ids[task] = item_id
+                        task.add_done_callback(self._on_item_done)
+                        slots_held -= 1
+                    
+                    for _ in range(slots_held):
+                        self._slots.release()
+                    slots_held = 0
+                    
+                    if items:
+                        idle_delay = self.min_idle_delay
+                        continue
+                    
+                    self.stats["empty_claims"] += 1
+                    
+                    # No items available: sleep until notified of new work or back-off expires
+                    if await self._wait_for_work(idle_delay):
+                        self.stats["notified_wakeups"] += 1
+                        idle_delay = self.min_idle_delay
                     else:
-                        # At capacity, wait for some items to complete
-                        await asyncio.sleep(1)
-                        
-                        # Clean up completed tasks
-                        self._cleanup_completed_tasks()
+                        self.stats["timeout_wakeups"] += 1
+                        idle_delay = min(idle_delay * 2, self.poll_interval)
                 
                 except Exception as e:
+                    for _ in range(slots_held):
+                        self._slots.release()
                     logger.error(f"❌ Error in {self.worker_type} polling loop: {e}")
                     await asyncio.sleep(5)  # Wait longer on error
         
@@ -79,6 +163,59 @@ class BaseQueueWorker(ABC):
         finally:
             await self._shutdown()
     
+    def _create_notifier(self) -> Optional[QueueNotifier]:
+        """Wake-up channel for the queue's collection (None falls back to back-off polling)"""
+        collection = getattr(self.queue, "collection", None)
+        if collection is None:
+            return None
+        notifier = get_queue_notifier(collection)
+        notifier.start()
+        return notifier
+    
+    async def _wait_for_work(self, timeout: float) -> bool:
+        """Sleep up to timeout; True if woken because work arrived"""
+        if self.notifier is None:
+            await asyncio.sleep(timeout)
+            return False
+        return await self.notifier.wait(timeout)
+    
+    def _on_item_done(self, task: asyncio.Task):
+        self.active_items.discard(task)
+        self._item_ids.pop(task, None)
+        if self._slots is not None:
+            self._slots.release()
+    
+    async def _heartbeat_loop(self, interval: float):
+        """Extend the leases of items still being processed"""
+        while True:
+            await asyncio.sleep(interval)
+            item_ids = list(self._item_ids.values())
+            if item_ids:
+                try:
+                    await self._extend_leases(item_ids)
+                except Exception as e:
+                    logger.warning(f"⚠️ {self.worker_type} lease heartbeat failed: {e}")
+    
+    def _record_claim(self, item: Dict[str, Any]):
+        """Count the claim and observe how long the item waited in the queue"""
+        self.stats["claims"] += 1
+        created_at = item.get("created_at")
+        if isinstance(created_at, datetime):
+            now = datetime.now(timezone.utc) if created_at.tzinfo else datetime.utcnow()
+            self.queue_wait.observe((now - created_at).total_seconds())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Claim counters, queue-wait histogram and notifier state"""
+        return {
+            "worker_id": self.worker_id,
+            "worker_type": self.worker_type,
+            "active_items": len(self.active_items),
+            "max_concurrent_items": self.max_concurrent_items,
+            **self.stats,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "notifier": self.notifier.get_stats() if self.notifier else None,
+        }
+    
     async def stop(self):
         """Stop the worker gracefully"""
         logger.info(f"🛑 Stopping {self.worker_type} {self.worker_id}")
@@ -95,17 +232,13 @@ class BaseQueueWorker(ABC):
             except asyncio.TimeoutError:
                 logger.warning(f"⚠️ Timeout waiting for {self.worker_type} items to complete")
     
-    def _cleanup_completed_tasks(self):
-        """Clean up completed tasks from active set"""
-        self.active_items = {
-            task for task in self.active_items 
-            if not task.done()
-        }
-    
     async def _shutdown(self):
         """Clean up worker resources"""
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+        
         # Cancel any remaining tasks
-        for task in self.active_items:
+        for task in list(self.active_items):
             if not task.done():
                 task.cancel()
         
@@ -124,6 +257,19 @@ class BaseQueueWorker(ABC):
         """Dequeue an item from the queue"""
         pass
     
+    async def _dequeue_items(self, n: int) -> List[Dict[str, Any]]:
+        """Dequeue up to n items (override with a batched claim where the queue supports it)"""
+        item = await self._dequeue_item()
+        return [item] if item else []
+    
+    def _item_id(self, item: Dict[str, Any]) -> Optional[str]:
+        """Identifier used to extend the item's lease (None: no heartbeat)"""
+        return None
+    
+    async def _extend_leases(self, item_ids: List[str]):
+        """Extend the claim leases of items still being processed"""
+        pass
+    
     @abstractmethod
     async def _process_item(self, item: Dict[str, Any]):
         """Process a single item from the queue"""
@@ -1,19 +1,85 @@
 #!/usr/bin/env python3
 """
 MongoDB implementation of execution queue
+
+Execution logs are stored as separate append-only entries in
+``<collection_name>_logs`` ({execution_id, seq, timestamp, level, message}),
+not in an array on the execution document. Each write reserves a contiguous
+``seq`` range from the execution's ``log_count`` counter, so entries are
+ordered and viewers can resume from any offset. stream_logs pushes new entries
+via a change stream, or falls back to indexed incremental reads (woken
+immediately by writes from this process) on standalone MongoDB. Entries that
+land out of order (concurrent writers) are held back until the missing seqs
+are read, so viewers always see every entry, in seq order.
+
+Claims are leases: a processing execution carries ``lease_expires_at``, which
+the worker extends with extend_leases() while it runs. Executions whose lease
+ran out are retried (or failed once out of retries) on the next claim attempt.
+ack/nack only apply while the execution is still processing under the acking
+worker, so a worker whose lease lapsed cannot overwrite the retry.
 """
 
 import asyncio
 import logging
+import os
+import time
+import uuid
+from contextlib import AsyncExitStack
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, AsyncGenerator, Optional
+from typing import Dict, List, Any, AsyncGenerator, Optional, Set, Union
 from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 from .base_queue import ExecutionQueueInterface
+from .notifier import notify_enqueued
 
 logger = logging.getLogger(__name__)
 
+# "$changeStream is only supported on replica sets"
+CHANGE_STREAM_UNSUPPORTED_CODE = 40573
+TERMINAL_STATUSES = ("completed", "failed")
+# Seconds between finished-checks while streaming (and between reads without change streams)
+LOG_STREAM_CHECK_INTERVAL = 1.0
+# Seconds a missing seq may hold back later entries (its writer reserved it, then died)
+LOG_GAP_TIMEOUT = 5.0
+
+
+class _LogSequencer:
+    """Releases log entries in seq order, holding back entries that arrive ahead of a gap"""
+
+    def __init__(self, execution_id: str, next_seq: int):
+        self.execution_id = execution_id
+        self.next_seq = next_seq
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        self._gap_since: Optional[float] = None
+
+    def add(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Accept entries (duplicates ignored) and return those now ready, in order"""
+        for entry in entries:
+            if entry["seq"] >= self.next_seq:
+                self.pending[entry["seq"]] = entry
+        ready = []
+        while self.next_seq in self.pending:
+            ready.append(self.pending.pop(self.next_seq))
+            self.next_seq += 1
+        if not self.pending:
+            self._gap_since = None
+        elif self._gap_since is None or ready:
+            self._gap_since = time.monotonic()
+        return ready
+
+    def skip_stale_gaps(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Give up on missing seqs that never arrived; force skips all of them"""
+        ready = []
+        while self.pending and (force or time.monotonic() - self._gap_since >= LOG_GAP_TIMEOUT):
+            missing_until = min(self.pending)
+            logger.warning(f"⚠️ Log entries {self.next_seq}-{missing_until - 1} of {self.execution_id} never arrived, skipping")
+            self.next_seq = missing_until
+            ready.extend(self.add([]))
+        return ready
+
+
 class MongoDBExecutionQueue(ExecutionQueueInterface):
     """MongoDB-based execution queue implementation"""
     
@@ -22,17 +88,30 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
         self.collection: AsyncIOMotorCollection = db[collection_name]
         self.collection_name = collection_name
         self.progress_events_collection: AsyncIOMotorCollection = db["progress_events"]
+        self.logs_collection: AsyncIOMotorCollection = db[f"{collection_name}_logs"]
+        # Serializes seq reservation + insert per execution within this process
+        self._log_locks: Dict[str, asyncio.Lock] = {}
+        # Polling-mode log viewers, woken when this process writes logs
+        self._log_waiters: Dict[str, Set[asyncio.Event]] = {}
+        self.lease_seconds = int(os.getenv("QUEUE_LEASE_SECONDS", "120"))
+        self._next_lease_sweep = datetime.min
         
     async def ensure_indexes(self):
         """Create necessary indexes for performance"""
         try:
-            # Index for efficient polling by status and priority
+            # Claim query: status equality, then (priority, created_at) sort
             await self.collection.create_index([
                 ("status", 1),
                 ("priority", 1), 
                 ("created_at", 1)
             ], name="queue_polling_idx")
             
+            # Expired-lease sweep
+            await self.collection.create_index([
+                ("status", 1),
+                ("lease_expires_at", 1)
+            ], name="queue_lease_idx")
+            
             # Index for fast execution_id lookups
             await self.collection.create_index("execution_id", unique=True, name="execution_id_idx")
             
@@ -45,6 +124,12 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
                 ("timestamp", 1)
             ], name="progress_events_idx")
             
+            # Index for ordered, resumable log reads per execution
+            await self.logs_collection.create_index([
+                ("execution_id", 1),
+                ("seq", 1)
+            ], unique=True, name="execution_logs_seq_idx")
+            
             logger.info("✅ MongoDB queue indexes created successfully")
             
         except Exception as e:
@@ -75,13 +160,15 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
                 "retry_count": 0,
                 "max_retries": execution_data.get("max_retries", 3),
                 "worker_id": None,
-                "execution_logs": [],
+                "lease_expires_at": None,
+                "log_count": 0,
                 "result": None,
                 "execution_params": execution_params,
                 "metadata": execution_data.get("metadata", {})
             }
             
             await self.collection.insert_one(document)
+            notify_enqueued(self.collection)
             logger.info(f"✅ Enqueued execution: {execution_id}")
             return execution_id
             
@@ -89,22 +176,55 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             logger.error(f"❌ Failed to enqueue execution: {e}")
             raise
     
+    def _claim_update(self, worker_id: str, claim_id: Optional[str] = None) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        return {
+            "$set": {
+                "status": "processing",
+                "worker_id": worker_id,
+                "started_at": now,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "claim_id": claim_id
+            },
+            "$inc": {"retry_count": 1}
+        }
+    
+    async def _release_expired_leases(self):
+        """Retry (or fail, once out of retries) executions whose lease ran out
+        
+        Runs at most every quarter lease per queue instance.
+        """
+        now = datetime.utcnow()
+        if now < self._next_lease_sweep:
+            return
+        self._next_lease_sweep = now + timedelta(seconds=self.lease_seconds / 4)
+        
+        expired = {"status": "processing", "lease_expires_at": {"$lt": now}}
+        out_of_retries = {"$expr": {"$gte": ["$retry_count", "$max_retries"]}}
+        failed = await self.collection.update_many(
+            {**expired, **out_of_retries},
+            {"$set": {"status": "failed", "worker_id": None, "lease_expires_at": None, "completed_at": now}}
+        )
+        retried = await self.collection.update_many(
+            expired,
+            {"$set": {"status": "pending", "worker_id": None, "lease_expires_at": None}}
+        )
+        if failed.modified_count or retried.modified_count:
+            logger.warning(f"⚠️ Expired execution leases: {retried.modified_count} requeued, {failed.modified_count} failed")
+            if retried.modified_count:
+                notify_enqueued(self.collection)
+    
     async def dequeue(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """Get next execution for worker (atomic operation)"""
         try:
+            await self._release_expired_leases()
+            
             # Atomic find-and-modify to claim execution
             result = await self.collection.find_one_and_update(
                 {
                     "status": "pending"
                 },
-                {
-                    "$set": {
-                        "status": "processing",
-                        "worker_id": worker_id,
-                        "started_at": datetime.now(timezone.utc)
-                    },
-                    "$inc": {"retry_count": 1}
-                },
+                self._claim_update(worker_id),
                 sort=[("priority", 1), ("created_at", 1)],
                 return_document=ReturnDocument.AFTER
             )
@@ -119,11 +239,70 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             logger.error(f"❌ Failed to dequeue execution: {e}")
             return None
     
-    async def ack(self, execution_id: str, result: Dict[str, Any]) -> bool:
+    async def dequeue_batch(self, worker_id: str, n: int) -> List[Dict[str, Any]]:
+        """Claim up to n executions in three round trips
+        
+        Candidates are selected by queue_polling_idx, then claimed with one
+        update_many that re-checks status per document, so an execution raced
+        by another worker is simply skipped.
+        """
+        if n <= 1:
+            execution = await self.dequeue(worker_id)
+            return [execution] if execution else []
+        try:
+            await self._release_expired_leases()
+            sort = [("priority", 1), ("created_at", 1)]
+            
+            candidates = await self.collection.find({"status": "pending"}, {"_id": 1}).sort(sort).limit(n).to_list(n)
+            if not candidates:
+                return []
+            
+            ids = [c["_id"] for c in candidates]
+            claim_id = uuid.uuid4().hex
+            await self.collection.update_many(
+                {"_id": {"$in": ids}, "status": "pending"},
+                self._claim_update(worker_id, claim_id)
+            )
+            executions = await self.collection.find(
+                {"_id": {"$in": ids}, "claim_id": claim_id}
+            ).sort(sort).to_list(n)
+            
+            if executions:
+                logger.info(f"✅ Claimed {len(executions)} executions by worker {worker_id}: {[e['execution_id'] for e in executions]}")
+            return executions
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to dequeue execution batch: {e}")
+            return []
+    
+    async def extend_leases(self, worker_id: str, execution_ids: List[str]) -> int:
+        """Heartbeat: extend leases of executions this worker is still running"""
+        if not execution_ids:
+            return 0
+        try:
+            result = await self.collection.update_many(
+                {"execution_id": {"$in": execution_ids}, "worker_id": worker_id, "status": "processing"},
+                {"$set": {"lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)}}
+            )
+            if result.modified_count < len(execution_ids):
+                logger.warning(f"⚠️ {worker_id} lost the lease on {len(execution_ids) - result.modified_count} execution(s)")
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"❌ Failed to extend execution leases: {e}")
+            return 0
+    
+    def _held_filter(self, execution_id: str, worker_id: Optional[str]) -> Dict[str, Any]:
+        """Execution still processing (under worker_id, when given)"""
+        query = {"execution_id": execution_id, "status": "processing"}
+        if worker_id is not None:
+            query["worker_id"] = worker_id
+        return query
+    
+    async def ack(self, execution_id: str, result: Dict[str, Any], worker_id: Optional[str] = None) -> bool:
         """Mark execution as completed successfully"""
         try:
             update_result = await self.collection.update_one(
-                {"execution_id": execution_id},
+                self._held_filter(execution_id, worker_id),
                 {
                     "$set": {
                         "status": "completed",
@@ -134,10 +313,11 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             )
             
             success = update_result.modified_count > 0
+            self._log_locks.pop(execution_id, None)
             if success:
                 logger.info(f"✅ Acked execution: {execution_id}")
             else:
-                logger.warning(f"⚠️ Failed to ack execution (not found): {execution_id}")
+                logger.warning(f"⚠️ Failed to ack execution (not found or no longer held by {worker_id}): {execution_id}")
             
             return success
             
@@ -145,7 +325,8 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             logger.error(f"❌ Failed to ack execution {execution_id}: {e}")
             return False
     
-    async def nack(self, execution_id: str, error: str, retry: bool = True) -> Dict[str, Any]:
+    async def nack(self, execution_id: str, error: str, retry: bool = True,
+                   worker_id: Optional[str] = None) -> Dict[str, Any]:
         """Mark execution as failed
         
         Returns:
@@ -156,9 +337,19 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             - max_retries: int - maximum retries allowed
         """
         try:
+            held = self._held_filter(execution_id, worker_id)
             # Determine if we should retry or mark as permanently failed
-            execution = await self.collection.find_one({"execution_id": execution_id})
+            execution = await self.collection.find_one(held)
             if not execution:
+                if await self.collection.find_one({"execution_id": execution_id}, {"_id": 1}):
+                    # Lease lapsed: the sweep already requeued (or failed) it
+                    logger.warning(f"⚠️ Ignoring nack for {execution_id}: no longer held by {worker_id}")
+                    return {
+                        "success": False,
+                        "is_final_attempt": False,
+                        "retry_count": 0,
+                        "max_retries": 0
+                    }
                 logger.warning(f"⚠️ Execution not found for nack: {execution_id}")
                 return {
                     "success": False,
@@ -181,24 +372,28 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
                 is_final_attempt = True
                 logger.warning(f"❌ Execution {execution_id} permanently failed after {retry_count} attempts")
             
+            # Logged before the status change so streams that stop on "failed" include it
+            await self.update_logs(execution_id, {
+                "level": "ERROR",
+                "message": f"Execution failed: {error}"
+            })
+            self._log_locks.pop(execution_id, None)
+            
             update_result = await self.collection.update_one(
-                {"execution_id": execution_id},
+                held,
                 {
                     "$set": {
                         "status": new_status,
                         "worker_id": None,
+                        "lease_expires_at": None,
                         "completed_at": datetime.utcnow() if new_status == "failed" else None
-                    },
-                    "$push": {
-                        "execution_logs": {
-                            "timestamp": datetime.utcnow(),
-                            "level": "ERROR",
-                            "message": f"Execution failed: {error}"
-                        }
                     }
                 }
             )
             
+            if new_status == "pending":
+                notify_enqueued(self.collection)
+            
             return {
                 "success": update_result.modified_count > 0,
                 "is_final_attempt": is_final_attempt,
@@ -234,7 +429,8 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
                 "completed_at": execution.get("completed_at"),
                 "worker_id": execution.get("worker_id"),
                 "retry_count": execution.get("retry_count", 0),
-                "execution_logs": execution.get("execution_logs", []),
+                # Documents written before logs moved to their own collection keep an embedded array
+                "execution_logs": execution.get("execution_logs", []) + await self._read_logs(execution_id, include_seq=False),
                 "result": execution.get("result"),
                 "script_name": execution.get("script_name"),
                 "parameters": execution.get("parameters")
@@ -244,56 +440,140 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
             logger.error(f"❌ Failed to get status for {execution_id}: {e}")
             return {"status": "error", "error": str(e)}
     
-    async def stream_logs(self, execution_id: str) -> AsyncGenerator[Dict, None]:
-        """Stream real-time execution logs"""
+    async def _read_logs(self, execution_id: str, since: int = 0, include_seq: bool = True) -> List[Dict[str, Any]]:
+        """Log entries with seq >= since, in order (seq and execution_id left out unless include_seq)"""
+        projection = {"_id": 0} if include_seq else {"_id": 0, "seq": 0, "execution_id": 0}
+        return await self.logs_collection.find(
+            {"execution_id": execution_id, "seq": {"$gte": since}},
+            projection
+        ).sort("seq", 1).to_list(None)
+
+    async def _is_finished(self, execution_id: str) -> bool:
+        execution = await self.collection.find_one({"execution_id": execution_id}, {"status": 1})
+        return execution is None or execution.get("status") in TERMINAL_STATUSES
+
+    def _notify_log_waiters(self, execution_id: str):
+        for waiter in self._log_waiters.get(execution_id, ()):
+            waiter.set()
+
+    async def stream_logs(self, execution_id: str, since: int = 0) -> AsyncGenerator[Dict, None]:
+        """Stream real-time execution logs
+
+        Yields each entry once, as soon as it is written, starting at log offset
+        ``since``. Every entry carries its ``seq``; reconnect with since=seq + 1
+        to resume. Ends once the execution has completed or failed.
+        """
         try:
-            last_log_count = 0
-            
-            while True:
-                execution = await self.collection.find_one({"execution_id": execution_id})
-                if not execution:
-                    break
-                
-                logs = execution.get("execution_logs", [])
-                
-                # Yield new logs since last check
-                if len(logs) > last_log_count:
-                    for log_entry in logs[last_log_count:]:
-                        yield {
-                            "execution_id": execution_id,
-                            "timestamp": log_entry.get("timestamp"),
-                            "level": log_entry.get("level"),
-                            "message": log_entry.get("message")
-                        }
-                    last_log_count = len(logs)
-                
-                # Check if execution is complete
-                status = execution.get("status")
-                if status in ["completed", "failed"]:
-                    break
-                
-                # Wait before next poll
-                await asyncio.sleep(1)
+            if not await self.collection.find_one({"execution_id": execution_id}, {"_id": 1}):
+                return
+
+            async with AsyncExitStack() as stack:
+                try:
+                    stream = await stack.enter_async_context(self.logs_collection.watch(
+                        [{"$match": {"operationType": "insert", "fullDocument.execution_id": execution_id}}],
+                        max_await_time_ms=int(LOG_STREAM_CHECK_INTERVAL * 1000)
+                    ))
+                    entries = self._stream_logs_from_change_stream(execution_id, since, stream)
+                except OperationFailure as e:
+                    if e.code != CHANGE_STREAM_UNSUPPORTED_CODE:
+                        raise
+                    # Standalone MongoDB: incremental reads, woken by local writes
+                    entries = self._stream_logs_from_reads(execution_id, since)
+
+                async for entry in entries:
+                    yield {
+                        "execution_id": execution_id,
+                        "seq": entry.get("seq"),
+                        "timestamp": entry.get("timestamp"),
+                        "level": entry.get("level"),
+                        "message": entry.get("message")
+                    }
                 
         except Exception as e:
             logger.error(f"❌ Failed to stream logs for {execution_id}: {e}")
             yield {"error": str(e)}
+
+    async def _stream_logs_from_change_stream(self, execution_id: str, since: int, stream) -> AsyncGenerator[Dict, None]:
+        sequencer = _LogSequencer(execution_id, since)
+        # Backlog is read after the stream opened, so no entry falls in between
+        for entry in sequencer.add(await self._read_logs(execution_id, since)):
+            yield entry
+
+        while True:
+            change = await stream.try_next()
+            ready = [] if change is None else sequencer.add([change["fullDocument"]])
+            if sequencer.pending:
+                # An entry arrived ahead of an earlier seq; read whatever is missing
+                ready += sequencer.add(await self._read_logs(execution_id, sequencer.next_seq))
+                ready += sequencer.skip_stale_gaps()
+            for entry in ready:
+                yield entry
+            if change is not None:
+                continue
+            # Idle: stop once the execution is done and nothing is left
+            if await self._is_finished(execution_id):
+                ready = sequencer.add(await self._read_logs(execution_id, sequencer.next_seq))
+                for entry in ready + sequencer.skip_stale_gaps(force=True):
+                    yield entry
+                return
+
+    async def _stream_logs_from_reads(self, execution_id: str, since: int) -> AsyncGenerator[Dict, None]:
+        sequencer = _LogSequencer(execution_id, since)
+        waiter = asyncio.Event()
+        self._log_waiters.setdefault(execution_id, set()).add(waiter)
+        try:
+            while True:
+                waiter.clear()
+                finished = await self._is_finished(execution_id)
+                ready = sequencer.add(await self._read_logs(execution_id, sequencer.next_seq))
+                for entry in ready + sequencer.skip_stale_gaps(force=finished):
+                    yield entry
+                if finished:
+                    return
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=LOG_STREAM_CHECK_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            waiters = self._log_waiters.get(execution_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._log_waiters[execution_id]
     
-    async def update_logs(self, execution_id: str, log_entry: Dict[str, Any]) -> bool:
-        """Add a log entry to execution"""
+    async def update_logs(self, execution_id: str, log_entry: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
+        """Add one log entry, or a batch of entries in a single write, to execution"""
+        entries = log_entry if isinstance(log_entry, list) else [log_entry]
+        if not entries:
+            return True
         try:
-            log_with_timestamp = {
-                "timestamp": log_entry.get("timestamp", datetime.utcnow()),
-                "level": log_entry.get("level", "INFO"),
-                "message": log_entry.get("message", "")
-            }
-            
-            update_result = await self.collection.update_one(
-                {"execution_id": execution_id},
-                {"$push": {"execution_logs": log_with_timestamp}}
-            )
+            lock = self._log_locks.setdefault(execution_id, asyncio.Lock())
+            async with lock:
+                # Reserve a contiguous seq range for the batch
+                execution = await self.collection.find_one_and_update(
+                    {"execution_id": execution_id},
+                    {"$inc": {"log_count": len(entries)}},
+                    projection={"log_count": 1},
+                    return_document=ReturnDocument.AFTER
+                )
+                if not execution:
+                    return False
+                
+                first_seq = execution["log_count"] - len(entries)
+                now = datetime.utcnow()
+                await self.logs_collection.insert_many([
+                    {
+                        "execution_id": execution_id,
+                        "seq": first_seq + offset,
+                        "timestamp": entry.get("timestamp", now),
+                        "level": entry.get("level", "INFO"),
+                        "message": entry.get("message", "")
+                    }
+                    for offset, entry in enumerate(entries)
+                ])
             
-            return update_result.modified_count > 0
+            self._notify_log_waiters(execution_id)
+            return True
             
         except Exception as e:
             logger.error(f"❌ Failed to update logs for {execution_id}: {e}")
@@ -303,11 +583,15 @@ class MongoDBExecutionQueue(ExecutionQueueInterface):
         """Clean up old completed/failed executions"""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
-            
-            result = await self.collection.delete_many({
+            old_executions = {
                 "status": {"$in": ["completed", "failed"]},
                 "completed_at": {"$lt": cutoff_date}
-            })
+            }
+            
+            execution_ids = await self.collection.distinct("execution_id", old_executions)
+            result = await self.collection.delete_many(old_executions)
+            if execution_ids:
+                await self.logs_collection.delete_many({"execution_id": {"$in": execution_ids}})
             
             deleted_count = result.deleted_count
             if deleted_count > 0:
@@ -13,7 +13,8 @@ from typing import Dict, Any, Optional
 
 from .base_queue import ExecutionQueueInterface
 from .base_worker import BaseQueueWorker
-from ..execution import execute_script
+from ..execution import execute_script_async, get_warm_pool, shutdown_warm_pool, is_warm_pool_enabled
+from ..execution.indicator_state import is_indicator_state_enabled, load_indicator_state
 from ..storage import get_storage
 from ..services.ui_result_formatter import create_ui_result_formatter
 from ..services.progress_service import send_progress_event, send_execution_running, send_execution_completed, send_execution_failed, send_analysis_error
@@ -28,6 +29,51 @@ from ..db import RepositoryManager, MongoDBClient
 
 logger = logging.getLogger(__name__)
 
+# Script output lines longer than this are truncated in execution logs
+MAX_LOG_LINE_LENGTH = 1000
+
+# Script output lines are written to the execution logs in batches
+LOG_FLUSH_INTERVAL = 0.2
+LOG_FLUSH_MAX_LINES = 50
+
+
+class ExecutionLogBatcher:
+    """Buffers log entries for one execution and writes each batch with a single update_logs call"""
+
+    def __init__(self, queue: ExecutionQueueInterface, execution_id: str):
+        self.queue = queue
+        self.execution_id = execution_id
+        self._pending = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def add(self, entry: Dict[str, Any]):
+        entry.setdefault("timestamp", datetime.utcnow())
+        self._pending.append(entry)
+        if len(self._pending) >= LOG_FLUSH_MAX_LINES:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        # Cleared before writing, so close() only ever cancels a sleeping task
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        entries, self._pending = self._pending, []
+        await self.queue.update_logs(self.execution_id, entries)
+
+    async def close(self):
+        """Write anything still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+
 class ExecutionQueueWorker(BaseQueueWorker):
     """Worker that polls execution queue and processes scripts"""
     
@@ -71,11 +117,33 @@ class ExecutionQueueWorker(BaseQueueWorker):
         
         # Progress communication now uses queue-based messaging via send_progress_event
         logger.info("✅ Progress communication will use queue-based messaging")
+        
+        # Start warm interpreter pool so scripts skip interpreter/library import cost
+        if is_warm_pool_enabled():
+            try:
+                await asyncio.to_thread(get_warm_pool)
+                logger.info("✅ Warm interpreter pool started for script execution")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to start warm interpreter pool, using subprocess execution: {e}")
+    
+    async def _cleanup_services(self):
+        """Shut down the warm interpreter pool"""
+        await asyncio.to_thread(shutdown_warm_pool)
     
     async def _dequeue_item(self):
         """Dequeue an execution from the queue"""
         return await self.queue.dequeue(self.worker_id)
     
+    async def _dequeue_items(self, n: int):
+        """Claim up to n executions in one batch"""
+        return await self.queue.dequeue_batch(self.worker_id, n)
+    
+    def _item_id(self, item: Dict[str, Any]) -> Optional[str]:
+        return item.get("execution_id")
+    
+    async def _extend_leases(self, item_ids):
+        await self.queue.extend_leases(self.worker_id, item_ids)
+    
     async def _process_item(self, item: Dict[str, Any]):
         """Process a single execution (renamed from _process_execution)"""
         return await self._process_execution(item)
@@ -172,7 +240,7 @@ class ExecutionQueueWorker(BaseQueueWorker):
                     except Exception as audit_error:
                         logger.error(f"❌ CRITICAL: Failed to update audit execution: {audit_error}")
                         # Don't ack the queue - let it retry
-                        await self.queue.nack(execution_id, f"Audit save failed: {audit_error}", retry=True)
+                        await self.queue.nack(execution_id, f"Audit save failed: {audit_error}", retry=True, worker_id=self.worker_id)
                         return
                 else:
                     logger.warning(f"⚠️ No audit service available - proceeding with queue ack")
@@ -180,7 +248,7 @@ class ExecutionQueueWorker(BaseQueueWorker):
                 
                 # Only ack the queue AFTER successful audit save
                 if audit_success:
-                    await self.queue.ack(execution_id, result)
+                    await self.queue.ack(execution_id, result, worker_id=self.worker_id)
                     logger.info(f"✅ Acknowledged queue after successful audit save: {execution_id}")
                 
                 # CRITICAL: Send SSE completion update with results via queue
@@ -224,7 +292,7 @@ class ExecutionQueueWorker(BaseQueueWorker):
                         # Even if audit fails, still nack the queue so it can retry everything
                 
                 # Nack the execution in queue (after audit attempt)
-                nack_result = await self.queue.nack(execution_id, error_msg, retry=True)
+                nack_result = await self.queue.nack(execution_id, error_msg, retry=True, worker_id=self.worker_id)
                 
                 # CRITICAL: Send SSE failure update via queue
                 try:
@@ -272,7 +340,7 @@ class ExecutionQueueWorker(BaseQueueWorker):
                 logger.warning(f"⚠️ Failed to send SSE failed status via queue: {sse_error}")
             
             try:
-                nack_result = await self.queue.nack(execution_id, str(e), retry=True)
+                nack_result = await self.queue.nack(execution_id, str(e), retry=True, worker_id=self.worker_id)
                 
                 # CRITICAL: Send final analysis failure message ONLY on final attempt for unexpected errors
                 if nack_result.get("is_final_attempt", True):
@@ -301,6 +369,27 @@ class ExecutionQueueWorker(BaseQueueWorker):
             except Exception as lock_error:
                 logger.warning(f"⚠️ Failed to release session lock after error: {lock_error}")
     
+    def _create_output_logger(self, log_batcher: ExecutionLogBatcher):
+        """Create callback that forwards script output lines to the execution logs"""
+        async def on_output(stream_name: str, line: str):
+            line = line.rstrip()
+            if not line:
+                return
+            level = "INFO"
+            if stream_name == "stderr":
+                # Scripts log with '%(asctime)s - %(levelname)s - %(message)s'
+                for candidate in ("ERROR", "WARNING", "DEBUG", "CRITICAL"):
+                    if f" - {candidate} - " in line:
+                        level = candidate
+                        break
+            if len(line) > MAX_LOG_LINE_LENGTH:
+                line = line[:MAX_LOG_LINE_LENGTH] + "..."
+            await log_batcher.add({
+                "level": level,
+                "message": line
+            })
+        return on_output
+    
     async def _execute_script_with_logging(self, execution: Dict[str, Any]) -> Dict[str, Any]:
         """Execute script and capture logs"""
         execution_id = execution.get("execution_id")
@@ -364,13 +453,31 @@ class ExecutionQueueWorker(BaseQueueWorker):
                     "error": f"Failed to read script from storage: {str(e)}",
                     "execution_time": 0
                 }
+            # Runs without blocking the event loop so other executions proceed in parallel;
+            # script output lines are pushed to the execution logs as they are produced
             # TODO: Change it to False when ready
-            result = execute_script(
-                script_content=script_content,
-                mock_mode=True,  # Production mode for queue executions
-                timeout=timeout_seconds,
-                parameters=parameters
-            )
+            # Incremental indicator state saved with the script lets reruns process only new bars
+            indicator_state = await load_indicator_state(storage, script_name, parameters) if is_indicator_state_enabled() else None
+            log_batcher = ExecutionLogBatcher(self.queue, execution_id)
+            try:
+                result = await execute_script_async(
+                    script_content=script_content,
+                    mock_mode=True,  # Production mode for queue executions
+                    timeout=timeout_seconds,
+                    parameters=parameters,
+                    on_output=self._create_output_logger(log_batcher),
+                    indicator_state_path=indicator_state.path if indicator_state else None
+                )
+                # State from a failed run may be partial, keep the previous one
+                if indicator_state and result.get("success"):
+                    try:
+                        await indicator_state.persist(storage)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to save indicator state for {script_name}: {e}")
+            finally:
+                await log_batcher.close()
+                if indicator_state:
+                    indicator_state.cleanup()
             
             execution_time = (datetime.now() - start_time).total_seconds()
             
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Queue Wake-up Notifier
+
+Wakes idle queue workers when work arrives instead of having every worker
+poll on a fixed interval. There is one notifier per queue collection per
+process:
+- A single change stream watches the collection for jobs becoming claimable
+  (inserts, and updates that put a job back to pending for retry)
+- notify_enqueued() is a local channel for enqueues made in this process,
+  used when change streams are unavailable (standalone MongoDB)
+
+Each notification wakes exactly one idle waiter. If nobody is waiting, the
+notification is kept as a permit so the next worker going idle claims
+immediately instead of sleeping.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# "$changeStream is only supported on replica sets"
+CHANGE_STREAM_UNSUPPORTED_CODE = 40573
+
+# Notifications remembered while no worker is idle
+MAX_PERMITS = 64
+
+
+class QueueNotifier:
+    """Hands out one wake-up per claimable job to idle workers of this process"""
+
+    def __init__(self, collection, pending_status: str = "pending"):
+        self.collection = collection
+        self.pending_status = pending_status
+        self.stream_active = False
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._permits = 0
+        self._watch_task: Optional[asyncio.Task] = None
+        self.metrics = {"notifications": 0, "wakeups": 0, "permits_used": 0}
+
+    def start(self):
+        """Start watching the collection (no-op if already started)"""
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        self.stream_active = False
+
+    def notify(self, count: int = 1):
+        """Wake one idle waiter per notification, or keep it as a permit"""
+        self.metrics["notifications"] += count
+        for _ in range(count):
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(True)
+                    self.metrics["wakeups"] += 1
+                    break
+            else:
+                self._permits = min(self._permits + 1, MAX_PERMITS)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for work. Returns True if woken by a notification."""
+        if self._permits:
+            self._permits -= 1
+            self.metrics["permits_used"] += 1
+            return True
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def _watch(self):
+        pipeline = [{"$match": {"$or": [
+            {"operationType": "insert"},
+            {"operationType": "update", "updateDescription.updatedFields.status": self.pending_status}
+        ]}}]
+        while True:
+            try:
+                async with self.collection.watch(pipeline) as stream:
+                    self.stream_active = True
+                    logger.info(f"📡 Watching {self.collection.name} for new jobs")
+                    async for _ in stream:
+                        self.notify()
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED_CODE:
+                    self.stream_active = False
+                    logger.info(f"ℹ️ Change streams unavailable for {self.collection.name}; "
+                                f"using local notifications and idle back-off")
+                    return
+                logger.warning(f"⚠️ Queue change stream for {self.collection.name} failed: {e}")
+            except PyMongoError as e:
+                logger.warning(f"⚠️ Queue change stream for {self.collection.name} error: {e}")
+            self.stream_active = False
+            await asyncio.sleep(5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "mode": "change_stream" if self.stream_active else "local",
+            "idle_waiters": len(self._waiters),
+            "permits": self._permits,
+        }
+
+
+_notifiers: Dict[str, QueueNotifier] = {}
+
+
+def get_queue_notifier(collection, pending_status: str = "pending") -> QueueNotifier:
+    """Get the process-wide notifier for a queue collection (singleton per collection)"""
+    notifier = _notifiers.get(collection.full_name)
+    if notifier is None:
+        notifier = QueueNotifier(collection, pending_status)
+        _notifiers[collection.full_name] = notifier
+    return notifier
+
+
+def notify_enqueued(collection):
+    """Local wake-up after an enqueue in this process; the change stream covers it when active"""
+    notifier = _notifiers.get(collection.full_name)
+    if notifier is not None and not notifier.stream_active:
+        notifier.notify()
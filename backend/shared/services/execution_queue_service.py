@@ -121,13 +121,13 @@ class ExecutionQueueService:
             logger.error(f"❌ Failed to get execution status {execution_id}: {e}")
             return {"status": "error", "error": str(e)}
     
-    async def stream_execution_logs(self, execution_id: str):
-        """Stream real-time logs for an execution"""
+    async def stream_execution_logs(self, execution_id: str, since: int = 0):
+        """Stream real-time logs for an execution, starting at log offset since"""
         if not self._initialized:
             await self.initialize()
         
         try:
-            async for log_entry in self.queue.stream_logs(execution_id):
+            async for log_entry in self.queue.stream_logs(execution_id, since=since):
                 yield log_entry
         except Exception as e:
             logger.error(f"❌ Failed to stream logs for {execution_id}: {e}")
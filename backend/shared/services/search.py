@@ -10,7 +10,7 @@ import os
 import sys
 import re
 import logging
-from ..analyze.search.library import get_analysis_library
+from ..analyze.search.library import get_analysis_library, get_async_analysis_library
 
 logger = logging.getLogger("search-service")
 
@@ -22,10 +22,12 @@ class SearchService:
         try:
             # Use lazy initialization via get_analysis_library()
             self.library_client = None  # Will be created lazily when needed
+            self.async_library_client = None
             logger.info("✅ Search service initialized (lazy mode)")
         except Exception as e:
             logger.error(f"❌ Failed to initialize search service: {e}")
             self.library_client = None
+            self.async_library_client = None
     
     def _get_library_client(self):
         """Get library instance, creating lazily if needed"""
@@ -38,6 +40,16 @@ class SearchService:
                 return None
         return self.library_client
     
+    def _get_async_library_client(self):
+        """Get the non-blocking library facade, creating lazily if needed"""
+        if self.async_library_client is None:
+            try:
+                self.async_library_client = get_async_analysis_library()
+            except Exception as e:
+                logger.error(f"❌ Failed to create analysis library: {e}")
+                return None
+        return self.async_library_client
+
     def search_and_enhance_message(self, user_question: str) -> tuple[str, list]:
         """Search for similar analyses and enhance user message with context"""
         library_client = self._get_library_client()
@@ -169,6 +181,30 @@ class SearchService:
             logger.error(f"❌ Error saving completed analysis: {e}")
             return {"success": False, "error": str(e)}
     
+    async def save_completed_analysis_async(self, analysis_id: str, original_question: str, addn_meta: dict = None) -> dict:
+        """Save analysis after successful completion without blocking the event loop"""
+        library_client = self._get_async_library_client()
+        if not library_client:
+            return {"success": False, "error": "Analysis library not available"}
+
+        try:
+            result = await library_client.save_analysis(
+                analysis_id=analysis_id,
+                question=original_question,
+                metadata=addn_meta
+            )
+
+            if result.get("success"):
+                logger.info(f"✅ Saved analysis for (ID: {analysis_id})")
+            else:
+                logger.error(f"❌ Failed to save analysis: {result.get('error')}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error saving completed analysis: {e}")
+            return {"success": False, "error": str(e)}
+
     def get_library_stats(self) -> dict:
         """Get analysis library statistics"""
         library_client = self._get_library_client()
@@ -96,7 +96,7 @@ class LocalStorageProvider(StorageInterface):
         scripts = []
         
         for file_path in self.base_path.iterdir():
-            if file_path.is_file() and not file_path.name.endswith('.meta'):
+            if file_path.is_file() and not file_path.name.endswith(('.meta', '.state')):
                 if prefix is None or file_path.name.startswith(prefix):
                     scripts.append(file_path.name)
         
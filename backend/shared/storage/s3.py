@@ -126,7 +126,7 @@ class S3StorageProvider(StorageInterface):
                 if 'Contents' in page:
                     for obj in page['Contents']:
                         key = obj['Key']
-                        if not key.endswith('.meta'):  # Skip metadata files
+                        if not key.endswith(('.meta', '.state')):  # Skip metadata and indicator state files
                             script_name = key[len(self.prefix):]  # Remove prefix
                             scripts.append(script_name)
             